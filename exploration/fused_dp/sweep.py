@@ -119,7 +119,7 @@ class Explorer(fp.Runner[Config, SampleKey, Result]):
         cache_dir = self._open_cache(output_dir)
 
         # look for existing sample
-        sample_file = cache_dir / f'sample_n{key.n}.pkl.gz'
+        sample_file = cache_dir / f'sample_n{key.n}.fpys'
         if not no_cache and sample_file.exists():
             # load from cache
             self.log('sample', f'found cached N={key.n} sample at `{sample_file}`')
@@ -138,7 +138,7 @@ class Explorer(fp.Runner[Config, SampleKey, Result]):
         cache = Sample(sample, ref_vals)
 
         # Create temporary file for this sample
-        sample_file = cache_dir / f'sample_n{key.n}.pkl.gz'
+        sample_file = cache_dir / f'sample_n{key.n}.fpys'
         self._write_cache(sample_file, cache)
 
         self.log('sample', f'saved N={key.n} sample to `{sample_file}`')
@@ -252,6 +252,7 @@ if __name__ == "__main__":
     parser.add_argument('num_inputs', type=int, help='number of input values to use')
     parser.add_argument('--no-cache', action='store_true', help='do not use cached samples/results')
     parser.add_argument('--replot', action='store_true', help='replot from existing results without rerunning experiments')
+    parser.add_argument('--resume', action='store_true', help='skip configurations completed by a previous run')
     args = parser.parse_args()
 
     output_dir: Path = args.output.resolve()
@@ -260,6 +261,7 @@ if __name__ == "__main__":
     num_inputs: int = args.num_inputs
     no_cache: bool = args.no_cache
     replot: bool = args.replot
+    resume: bool = args.resume
 
     explorer = Explorer(PRECS, NS, num_inputs, ICTX, OCTX, method=METHOD, logging=True)
-    explorer.run(output_dir, seed=seed, num_threads=threads, no_cache=no_cache, replot=replot)
+    explorer.run(output_dir, seed=seed, num_threads=threads, no_cache=no_cache, replot=replot, resume=resume)
@@ -41,9 +41,11 @@ from .backend import (
 # runtime support
 from .fpc_context import FPCoreContext, NoSuchContextError
 from .interpret import (
+    BytecodeCache,
     BytecodeInterpreter,
     Foreign,
     Interpreter,
+    Profiler,
     get_default_interpreter,
     set_default_interpreter,
 )
@@ -51,6 +53,11 @@ from .libraries.base import *
 
 # module
 from .module import Module, ModuleCallGraph, ModuleEntry
+
+# instrumentation
+from .number import RoundingCounters, RoundingEvents
+
+# rewriting
 from .rewrite import Rewrite, find, find_all
 
 # runner
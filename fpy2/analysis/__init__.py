@@ -23,6 +23,7 @@ from .defs import DefAnalysis
 from .escape import Escape, EscapeSummary
 from .format_infer import FormatAnalysis, FormatInfer
 from .live_vars import LiveVars
+from .manager import AnalysisManager
 from .partial_eval import PartialEval, PartialEvalInfo
 from .purity import Purity
 from .reachability import Reachability
@@ -28,6 +28,7 @@ from ..types import ListType, TupleType, Type
 from ..utils import Gensym, NamedId, Unionfind
 from .context_use import ContextUse, ContextUseAnalysis, ContextUseSite
 from .define_use import DefineUseAnalysis, Definition, DefSite
+from .manager import memoize_analysis
 from .partial_eval import PartialEval, PartialEvalInfo, Value
 from .type_infer import TypeAnalysis, TypeInfer
 
@@ -913,9 +914,14 @@ class ArraySizeInfer:
         if not isinstance(func, FuncDef):
             raise TypeError(f'Expected `FuncDef`, got {type(func)} for {func}')
 
-        if partial_eval is None:
-            partial_eval = PartialEval.apply(func)
-        if type_info is None:
-            type_info = TypeInfer.check(func, def_use=partial_eval.def_use)
+        if partial_eval is not None:
+            if type_info is None:
+                type_info = TypeInfer.check(func, def_use=partial_eval.def_use)
+            return _ArraySizeInferInstance(func, partial_eval, type_info).analyze()
 
-        return _ArraySizeInferInstance(func, partial_eval, type_info).analyze()
+        def compute():
+            pe = PartialEval.apply(func)
+            ti = TypeInfer.check(func, def_use=pe.def_use) if type_info is None else type_info
+            return _ArraySizeInferInstance(func, pe, ti).analyze()
+
+        return memoize_analysis(ArraySizeInfer, func, compute, deps=((TypeInfer, type_info),))
@@ -20,6 +20,7 @@ from ..number import Context
 from ..types import ContextParam
 from ..utils import Gensym, NamedId, default_repr
 from .define_use import DefineUse, DefineUseAnalysis
+from .manager import memoize_analysis
 from .partial_eval import PartialEval, PartialEvalInfo
 
 __all__ = [
@@ -234,8 +235,11 @@ class ContextUse:
         """
         if not isinstance(func, FuncDef):
             raise TypeError(f'Expected `FuncDef`, got {type(func)} for {func}')
-        if partial_eval is None:
-            if def_use is None:
-                def_use = DefineUse.analyze(func)
-            partial_eval = PartialEval.apply(func, def_use=def_use)
-        return _ContextUseInstance(func, partial_eval).analyze()
+        if partial_eval is not None:
+            return _ContextUseInstance(func, partial_eval).analyze()
+
+        def compute():
+            du = DefineUse.analyze(func) if def_use is None else def_use
+            return _ContextUseInstance(func, PartialEval.apply(func, def_use=du)).analyze()
+
+        return memoize_analysis(ContextUse, func, compute, deps=((DefineUse, def_use),))
@@ -5,6 +5,7 @@ from typing import TypeAlias
 from ..ast.fpyast import *
 from ..ast.visitor import DefaultVisitor
 from ..utils import default_repr
+from .manager import memoize_analysis
 from .reaching_defs import (
     AssignDef,
     DefCtx,
@@ -186,5 +187,9 @@ class DefineUse:
     def analyze(ast: FuncDef | StmtBlock):
         if not isinstance(ast, FuncDef | StmtBlock):
             raise TypeError(f'Expected \'FuncDef\' or \'StmtBlock\', got {type(ast)} for {ast}')
-        reaching_defs = ReachingDefs.analyze(ast)
-        return _DefineUseInstance(ast, reaching_defs).analyze()
+        if isinstance(ast, StmtBlock):
+            return _DefineUseInstance(ast, ReachingDefs.analyze(ast)).analyze()
+        return memoize_analysis(
+            DefineUse, ast,
+            lambda: _DefineUseInstance(ast, ReachingDefs.analyze(ast)).analyze()
+        )
@@ -171,6 +171,7 @@ from ..array_size import (
 from ..call_graph import CallGraph, CallGraphError
 from ..context_use import ContextScope, ContextUse, ContextUseAnalysis, ContextUseSite
 from ..define_use import DefineUse, DefineUseAnalysis
+from ..manager import memoize_analysis
 from ..reaching_defs import AssignDef, Definition, DefSite, PhiDef
 from ..type_infer import TypeAnalysis, TypeInfer
 from .format import AbstractableFormat, AbstractFormat
@@ -2833,6 +2834,9 @@ class FormatInfer:
         for the lifetime of a top-level call to :meth:`analyze`.
         :class:`FormatInfer` itself re-runs per instantiation so each
         callee sees the caller's active rounding context.
+        Within an :class:`AnalysisManager` scope, the result for the
+        default instantiation (no ``fn_fmt`` or ``pre_cache``) is
+        reused across calls on the same :class:`FuncDef`.
 
         The call graph must be acyclic; recursion (direct or mutual)
         is not handled by the per-call-site sub-analysis.  A
@@ -2901,6 +2905,43 @@ class FormatInfer:
         if not isinstance(func, FuncDef):
             raise TypeError(f"expected a 'FuncDef', got {type(func)}")
 
+        if fn_fmt is None and pre_cache is None:
+            # only the default instantiation is shared across passes
+            return memoize_analysis(
+                FormatInfer, func,
+                lambda: FormatInfer._analyze(
+                    func, def_use, type_info, ctx_use, array_size, PreAnalysisCache(),
+                    None, loop_iter_limit, range_set_threshold, set_format_threshold
+                ),
+                loop_iter_limit, range_set_threshold, set_format_threshold,
+                deps=(
+                    (DefineUse, def_use),
+                    (TypeInfer, type_info),
+                    (ContextUse, ctx_use),
+                    (ArraySizeInfer, array_size),
+                )
+            )
+
+        if pre_cache is None:
+            pre_cache = PreAnalysisCache()
+        return FormatInfer._analyze(
+            func, def_use, type_info, ctx_use, array_size, pre_cache,
+            fn_fmt, loop_iter_limit, range_set_threshold, set_format_threshold
+        )
+
+    @staticmethod
+    def _analyze(
+        func: FuncDef,
+        def_use: DefineUseAnalysis | None,
+        type_info: TypeAnalysis | None,
+        ctx_use: ContextUseAnalysis | None,
+        array_size: ArraySizeAnalysis | None,
+        pre_cache: PreAnalysisCache,
+        fn_fmt: FunctionFormat | None,
+        loop_iter_limit: int,
+        range_set_threshold: int,
+        set_format_threshold: int,
+    ) -> FormatAnalysis:
         # Guard against recursion: the per-call-site sub-analysis in
         # `_analyze_callee` would otherwise diverge on a cyclic call
         # graph.  `CallGraph` raises on any cycle reachable from `func`.
@@ -2909,9 +2950,6 @@ class FormatInfer:
         # once per top-level analysis — before any instance is built.
         CallGraph.analyze(func)
 
-        if pre_cache is None:
-            pre_cache = PreAnalysisCache()
-
         pre = pre_cache.get(
             func,
             def_use=def_use,
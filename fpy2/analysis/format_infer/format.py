@@ -651,8 +651,10 @@ class AbstractFormat:
             return False
         if other.neg_bound > self.neg_bound:
             return False
-        # 3. precision — only constraining when other has a finite normal region
-        if not isinstance(other.prec, float) and not isinstance(other.exp, float):
+        # 3. precision — only constraining when other has a finite precision
+        # (whether or not it also has a least exponent: without one, every
+        # value of other has `other.prec` digits, which is no more room)
+        if not isinstance(other.prec, float):
             if self.prec > other.prec:
                 # easy check failed: other's spacing in its normal region widens faster.
                 # Containment still holds if self's bound stays within the region where
@@ -0,0 +1,150 @@
+"""
+Analysis manager: memoizes analyses across passes.
+"""
+
+import weakref
+from collections.abc import Callable, Hashable, Iterable
+from contextvars import ContextVar
+from typing import Any, Self, TypeVar
+
+from ..ast.fpyast import FuncDef
+
+__all__ = [
+    'AnalysisManager',
+]
+
+_T = TypeVar('_T')
+
+_active: ContextVar['AnalysisManager | None'] = ContextVar('fpy2_analysis_manager', default=None)
+"""the analysis manager in scope"""
+
+
+class AnalysisManager:
+    """
+    Memoizes the results of analyses on `FuncDef` nodes.
+
+    While a manager is in scope (via a `with` statement),
+    `DefineUse.analyze`, `TypeInfer.check`, `ContextUse.analyze`,
+    `ArraySizeInfer.analyze`, and `FormatInfer.analyze` return
+    the result stored for a function if there is one, so passes that
+    run on the same function share their analyses. Results are keyed
+    on the identity of the `FuncDef` and are dropped when the function
+    is no longer referenced. Calls that supply their own pre-computed
+    analyses (other than the ones stored here) are not memoized.
+
+    Transforms produce new functions, so their results never see stale
+    analyses. Code that modifies a function in place must call
+    `invalidate`, naming the analyses it preserves.
+
+    Example:
+    ```
+    with AnalysisManager():
+        f = fp.strategies.simplify(f)
+        f = fp.strategies.elim_round(f)
+    ```
+    """
+
+    hits: int
+    """lookups that found a result"""
+
+    misses: int
+    """lookups that computed a result"""
+
+    _results: 'weakref.WeakKeyDictionary[FuncDef, dict[tuple, Any]]'
+    _tokens: list
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._results = weakref.WeakKeyDictionary()
+        self._tokens = []
+
+    def __enter__(self) -> Self:
+        self._tokens.append(_active.set(self))
+        return self
+
+    def __exit__(self, *args) -> None:
+        _active.reset(self._tokens.pop())
+
+    @staticmethod
+    def current() -> 'AnalysisManager | None':
+        """Returns the analysis manager in scope, if any."""
+        return _active.get()
+
+    def get(self, kind: type, func: FuncDef, *params: Hashable) -> Any:
+        """
+        Returns the stored result of analysis `kind` on `func`,
+        or `None` if there is no result.
+        """
+        results = self._results.get(func)
+        if results is None:
+            return None
+        return results.get((kind, *params))
+
+    def put(self, kind: type, func: FuncDef, result: Any, *params: Hashable):
+        """Stores the result of analysis `kind` on `func`."""
+        results = self._results.get(func)
+        if results is None:
+            results = {}
+            self._results[func] = results
+        results[(kind, *params)] = result
+
+    def invalidate(self, func: FuncDef, *, preserve: Iterable[type] = ()):
+        """
+        Drops the results for `func` except for the analyses in `preserve`.
+
+        Call this after modifying `func` in place.
+        """
+        results = self._results.get(func)
+        if results is not None:
+            keep = set(preserve)
+            for key in [key for key in results if key[0] not in keep]:
+                del results[key]
+
+    def clear(self):
+        """Drops every result; the counters are kept."""
+        self._results.clear()
+
+    def memoize(
+        self,
+        kind: type,
+        func: FuncDef,
+        compute: Callable[[], _T],
+        *params: Hashable
+    ) -> _T:
+        """
+        Returns the stored result of analysis `kind` on `func`,
+        computing and storing it with `compute` if there is none.
+        """
+        result = self.get(kind, func, *params)
+        if result is None:
+            self.misses += 1
+            result = compute()
+            self.put(kind, func, result, *params)
+        else:
+            self.hits += 1
+        return result
+
+
+def memoize_analysis(
+    kind: type,
+    func: FuncDef,
+    compute: Callable[[], _T],
+    *params: Hashable,
+    deps: Iterable[tuple[type, Any]] = ()
+) -> _T:
+    """
+    Computes analysis `kind` on `func` with `compute`, reusing the
+    result stored in the analysis manager in scope.
+
+    `deps` lists the pre-computed analyses supplied by the caller;
+    the result is only reused (or stored) if each is either `None`
+    or the result stored for the same function.
+    """
+    manager = _active.get()
+    if manager is None:
+        return compute()
+    for dep_kind, dep in deps:
+        if dep is not None and dep is not manager.get(dep_kind, func):
+            return compute()
+    return manager.memoize(kind, func, compute, *params)
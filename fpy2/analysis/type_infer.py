@@ -2,6 +2,7 @@
 Type checking for FPy programs.
 """
 
+import functools
 from collections.abc import Callable
 from dataclasses import dataclass
 from fractions import Fraction
@@ -14,6 +15,7 @@ from ..types import *
 from ..utils import Gensym, NamedId, Unionfind
 from .call_graph import CallGraph, CallGraphError
 from .define_use import DefineUse, DefineUseAnalysis, Definition, DefSite
+from .manager import memoize_analysis
 
 #####################################################################
 # Type Inference
@@ -930,7 +932,14 @@ class TypeInfer:
         """
         if not isinstance(func, FuncDef):
             raise TypeError(f'expected a \'FuncDef\', got {func}')
+        return memoize_analysis(
+            TypeInfer, func,
+            lambda: TypeInfer._check(func, def_use),
+            deps=((DefineUse, def_use),)
+        )
 
+    @staticmethod
+    def _check(func: FuncDef, def_use: DefineUseAnalysis | None) -> TypeAnalysis:
         # Build the call graph: this guards against recursion (FPy
         # forbids it; `CallGraph` raises on any reachable cycle) and
         # gives the leaves-first order to check callees before callers.
@@ -945,13 +954,19 @@ class TypeInfer:
         # order, so its full analysis is what we return.
         sigs: dict[FuncDef, FunctionType] = {}
         result: TypeAnalysis | None = None
+
+        def analyze_callee(fdef: FuncDef) -> TypeAnalysis:
+            return _TypeInferInstance(fdef, DefineUse.analyze(fdef), sigs).analyze()
+
         for fdef in cg.order:
-            fdef_du = def_use if fdef is func and def_use is not None \
-                else DefineUse.analyze(fdef)
-            analysis = _TypeInferInstance(fdef, fdef_du, sigs).analyze()
-            sigs[fdef] = analysis.fn_type
             if fdef is func:
-                result = analysis
+                fdef_du = DefineUse.analyze(fdef) if def_use is None else def_use
+                result = _TypeInferInstance(fdef, fdef_du, sigs).analyze()
+                sigs[fdef] = result.fn_type
+            else:
+                # callees are analyzed exactly as if checked on their own
+                analysis = memoize_analysis(TypeInfer, fdef, functools.partial(analyze_callee, fdef))
+                sigs[fdef] = analysis.fn_type
         assert result is not None  # func is always in cg.order
         return result
 
@@ -2,6 +2,7 @@
 Abstract Syntax Tree (AST) for the FPy language.
 """
 
+from .fingerprint import Fingerprinter, HashCons, fingerprint
 from .formatter import BaseFormatter, Formatter
 from .fpyast import *
 from .visitor import DefaultTransformVisitor, DefaultVisitor, Visitor
@@ -0,0 +1,302 @@
+"""
+Structural fingerprints of FPy ASTs.
+
+A fingerprint is a digest of a node's structure: its type, its fields,
+and its children, recursively. Two nodes with the same fingerprint
+are interchangeable wherever only structure matters,
+e.g., as the key of a cache that outlives the process.
+
+Fingerprints are computed bottom-up: the fingerprint of a node is
+a digest of the fingerprints of its children, and is cached on the
+node. A node must not be modified once it has been fingerprinted.
+"""
+
+import enum
+import functools
+import hashlib
+import itertools
+import os
+import threading
+import weakref
+from fractions import Fraction
+from typing import Any, ClassVar
+
+from ..number import Context
+from ..utils import Location, LRUCache, NamedId, UnderscoreId
+from .fpyast import Ast, Call, Expr, ForeignVal, FuncMeta
+
+__all__ = [
+    'Fingerprinter',
+    'HashCons',
+    'fingerprint',
+]
+
+_ATOMS = (type(None), bool, int, str, float, Fraction)
+
+_IGNORED = ('__weakref__', '_fp')
+"""slots that are not part of the structure of a node"""
+
+_PROCESS = os.urandom(8).hex()
+"""distinguishes identities of foreign values across processes"""
+
+_IDENTITIES_MAXSIZE = 1024
+"""maximum number of foreign values referenced strongly by `_identities`"""
+
+
+def _structural(x: Any) -> bool:
+    """Does `repr(x)` determine `x`?"""
+    if type(x) in _ATOMS or isinstance(x, (enum.Enum, Context)):
+        return True
+    if type(x) is tuple:
+        return all(_structural(y) for y in x)
+    return False
+
+
+class _Identities:
+    """
+    Tokens of foreign values without a faithful `repr`, by `id`.
+
+    Tokens are never reused: a value is referenced weakly if possible,
+    and strongly otherwise, so its `id` is not reassigned while its
+    token is recorded. Weak entries are dropped when their value dies;
+    strong entries are bounded, and an evicted value gets a fresh token
+    if seen again, so fingerprints that include it simply stop matching.
+    Shared by every `Fingerprinter`, since fingerprints are cached on
+    nodes; safe to use from multiple threads.
+    """
+
+    def __init__(self, maxsize: int):
+        self._lock = threading.RLock()
+        self._weak: dict[int, tuple[weakref.ref, int]] = {}
+        self._strong: LRUCache[int, tuple[Any, int]] = LRUCache(maxsize)
+        self._tokens = itertools.count()
+
+    def token(self, x: Any) -> str:
+        """
+        Token of the object `x`, unique within this process and
+        distinct from every token of another process.
+        """
+        key = id(x)
+        with self._lock:
+            weak = self._weak.get(key)
+            if weak is not None and weak[0]() is x:
+                return f'@{_PROCESS}:{weak[1]}'
+            strong = self._strong.get(key)
+            if strong is not None and strong[0] is x:
+                return f'@{_PROCESS}:{strong[1]}'
+
+            token = next(self._tokens)
+            try:
+                ref = weakref.ref(x, functools.partial(self._forget, key))
+            except TypeError:
+                self._strong[key] = (x, token)
+            else:
+                self._weak[key] = (ref, token)
+            return f'@{_PROCESS}:{token}'
+
+    def _forget(self, key: int, ref: weakref.ref):
+        """Drops the entry for `key` once the value behind `ref` dies."""
+        with self._lock:
+            entry = self._weak.get(key)
+            if entry is not None and entry[0] is ref:
+                del self._weak[key]
+
+
+_identities = _Identities(_IDENTITIES_MAXSIZE)
+"""tokens of foreign values identified by `id`"""
+
+
+def _fields(cls: type) -> tuple[str, ...]:
+    names: list[str] = []
+    for base in reversed(cls.__mro__):
+        slots = base.__dict__.get('__slots__', ())
+        names.extend((slots,) if isinstance(slots, str) else slots)
+    names = [name for name in names if name not in _IGNORED]
+    if issubclass(cls, Call):
+        # resolved from `func`
+        names.remove('fn')
+    return tuple(names)
+
+
+class Fingerprinter:
+    """
+    Computes the fingerprint of an AST node.
+
+    By default, source locations are ignored, and foreign values are
+    identified by their `repr` if it determines them (e.g., numbers,
+    strings, and contexts) and otherwise by identity, so such a value
+    only matches itself, in this process. With `loc=True`, locations are
+    part of the fingerprint; with `foreign=False`, foreign values are
+    identified only by position, and the visited `ForeignVal` nodes are
+    recorded in `foreigns` in the order they were visited.
+    """
+
+    loc: bool
+    foreign: bool
+    foreigns: list[ForeignVal]
+
+    _fields_cache: ClassVar[dict[type, tuple[str, ...]]] = {}
+    _named_types: ClassVar[set[type]] = set()
+
+    def __init__(self, *, loc: bool = False, foreign: bool = True):
+        self.loc = loc
+        self.foreign = foreign
+        self.foreigns = []
+
+    def digest(self, node: Ast) -> str:
+        """Returns the fingerprint of `node` as a hex string."""
+        digest, foreigns = self._node(node)
+        self.foreigns.extend(foreigns)
+        return digest
+
+    def _node(self, node: Ast) -> tuple[str, tuple[ForeignVal, ...]]:
+        """
+        Fingerprint of `node` and the `ForeignVal` nodes beneath it
+        (only recorded with `foreign=False`), cached on `node`.
+        """
+        mode = (self.loc, self.foreign)
+        cache: dict | None = getattr(node, '_fp', None)
+        if cache is None:
+            cache = node._fp = {}
+        else:
+            entry = cache.get(mode)
+            if entry is not None:
+                return entry
+
+        cls = type(node)
+        # tokens are `repr`s, so no token contains the separator
+        out: list[str] = [cls.__qualname__]
+        foreigns: list[ForeignVal] = []
+        if cls is ForeignVal:
+            # the value is identified as in any other position
+            self._walk(node, out, foreigns)
+        else:
+            fields = self._fields_cache.get(cls)
+            if fields is None:
+                fields = self._fields_cache[cls] = _fields(cls)
+            for field in fields:
+                self._walk(getattr(node, field), out, foreigns)
+        entry = (hashlib.sha256('\x1f'.join(out).encode()).hexdigest(), tuple(foreigns))
+        cache[mode] = entry
+        return entry
+
+    def _walk(self, x: Any, out: list[str], foreigns: list[ForeignVal]):
+        cls = type(x)
+        if cls in _ATOMS:
+            out.append(repr(x))
+            return
+        if cls in self._fields_cache:
+            # AST node (other than `ForeignVal`)
+            digest, fs = self._node(x)
+            out.append(digest)
+            foreigns.extend(fs)
+            return
+        if cls in self._named_types:
+            out.append(f'${x.base}#{x.count}')
+            return
+        if cls is Location:
+            if self.loc:
+                out.append(repr((x.source, x.start_line, x.start_column, x.end_line, x.end_column)))
+            else:
+                out.append('None')
+            return
+        if cls is tuple or cls is list:
+            out.append('(')
+            for y in x:
+                self._walk(y, out, foreigns)
+            out.append(')')
+            return
+
+        match x:
+            case ForeignVal():
+                out.append('ForeignVal')
+                self._walk(x.loc, out, foreigns)
+                if self.foreign:
+                    if _structural(x.val):
+                        out.append(repr(repr(x.val)))
+                    else:
+                        out.append(repr(_identities.token(x.val)))
+                else:
+                    # identified by its position among the foreign values
+                    foreigns.append(x)
+                out.append(')')
+            case Ast():
+                digest, fs = self._node(x)
+                out.append(digest)
+                foreigns.extend(fs)
+            case tuple() | list():
+                out.append('(')
+                for y in x:
+                    self._walk(y, out, foreigns)
+                out.append(')')
+            case NamedId():
+                self._named_types.add(cls)
+                out.append(f'${x.base}#{x.count}')
+            case UnderscoreId():
+                out.append('$_')
+            case enum.Enum():
+                out.append(f'{type(x).__qualname__}.{x.name}')
+            case Location():
+                if self.loc:
+                    out.append(repr((x.source, x.start_line, x.start_column, x.end_line, x.end_column)))
+                else:
+                    out.append('None')
+            case set() | frozenset():
+                out.append('{')
+                out.extend(sorted(repr(str(y)) for y in x))
+                out.append('}')
+            case FuncMeta():
+                # the environment, specification and properties do not
+                # change what the function computes
+                out.append('FuncMeta')
+                self._walk(x.ctx, out, foreigns)
+                self._walk(x.free_vars, out, foreigns)
+                out.append(')')
+            case _:
+                out.append(repr(repr(x)))
+
+
+def fingerprint(node: Ast, *, loc: bool = False) -> str:
+    """
+    Returns the structural fingerprint of `node` as a hex string.
+
+    Source locations are ignored unless `loc=True`.
+    """
+    if not isinstance(node, Ast):
+        raise TypeError(f'Expected an `Ast`, got {node}')
+    return Fingerprinter(loc=loc).digest(node)
+
+
+class HashCons:
+    """
+    Hash-consing table for expressions.
+
+    Maps every expression to a single representative among the
+    expressions with the same fingerprint (ignoring locations).
+    Representatives are shared, so they should only be used where
+    node identity does not matter, e.g., as cache keys.
+    """
+
+    _table: dict[str, Expr]
+
+    def __init__(self):
+        self._table = {}
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __contains__(self, e: object) -> bool:
+        return isinstance(e, Expr) and fingerprint(e) in self._table
+
+    def intern(self, e: Expr) -> Expr:
+        """
+        Returns the representative of `e`,
+        making `e` the representative if there is none.
+        """
+        if not isinstance(e, Expr):
+            raise TypeError(f'Expected an `Expr`, got {e}')
+        return self._table.setdefault(fingerprint(e), e)
+
+    def clear(self):
+        """Removes every representative."""
+        self._table.clear()
@@ -213,8 +213,10 @@ __all__ = [
 @default_repr
 class Ast(ABC):
     """FPy AST: abstract base class for all AST nodes."""
-    __slots__ = ('_loc',)
+    __slots__ = ('_fp', '_loc')
     _loc: Location | None
+    _fp: dict
+    """cached fingerprints (see `fingerprint`); unset until computed"""
 
     def __init__(self, loc: Location | None):
         if loc is not None and not isinstance(loc, Location):
@@ -1791,7 +1793,7 @@ class FuncMeta:
 
 class FuncDef(Ast):
     """FPy AST: function definition"""
-    __slots__ = ('_meta', 'args', 'body', 'name')
+    __slots__ = ('__weakref__', '_meta', 'args', 'body', 'name')
 
     name: str
     args: tuple[Argument, ...]
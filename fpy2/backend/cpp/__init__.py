@@ -7,9 +7,15 @@ where storage shape is decided.  See ``docs/todos/backend-cpp.md``
 for design notes.
 """
 
+from .build import CppBuildError, CppKernel, CppLibrary
 from .compiler import CppCompileError, CppCompiler
+from .incremental import SpecCache
 
 __all__ = [
+    'CppBuildError',
     'CppCompileError',
     'CppCompiler',
+    'CppKernel',
+    'CppLibrary',
+    'SpecCache',
 ]
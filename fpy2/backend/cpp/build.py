@@ -0,0 +1,518 @@
+"""
+cpp backend: building and loading compiled kernels.
+
+:meth:`CppCompiler.build` compiles a module's translation unit to a shared
+library with the system C++ compiler and loads it through :mod:`ctypes`.
+A kernel's C++ signature is not callable from C, so each public entry gets an
+``extern "C"`` wrapper spelled from its :class:`CalleeAbi` -- the same ABI
+:meth:`CppCompiler.signature` reports:
+
+- a scalar crosses as itself;
+- a flat list crosses as ``(T* data, size_t len)`` and is copied into the
+  kernel's representation (``std::vector``, ``std::array``, or a handle), and
+  back out when the kernel writes its elements;
+- a tuple result crosses through one out-pointer per element, and a list
+  result through a ``malloc``'d buffer the caller frees.
+
+Anything else (nested lists, tuple parameters) has no wrapper and fails the
+build.  The wrapper also discharges the kernel's one precondition: it enters
+with the ``fesetround`` mode the entry's top-level context names and restores
+the caller's mode on return.
+
+With ``batch=True``, an entry whose arguments and results are scalars also gets
+a batch wrapper (:func:`batch_source`) that evaluates it over arrays, split
+across threads; see :meth:`CppKernel.batch`.
+
+Libraries are cached on disk under a hash of the source, the compiler and its
+flags, so rebuilding an unchanged module only loads the library.
+"""
+
+import ctypes
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from collections.abc import Iterator, Mapping, Sequence
+from pathlib import Path
+
+from ...number import EFloatContext
+from ...utils import cache_dir, write_atomic
+from ..backend import CompileError
+from .emitter import _FE_RM_MACRO
+from .types import CppList, CppScalar, CppTuple, CppType
+from .unbox import CalleeAbi
+
+DEFAULT_FLAGS: tuple[str, ...] = ('-std=c++11', '-O2', '-shared', '-fPIC')
+"""Compiler flags for a shared library of emitted kernels."""
+
+_LIB_SUFFIX = '.dylib' if sys.platform == 'darwin' else '.so'
+
+_CTYPES: dict[CppScalar, type[ctypes._SimpleCData]] = {
+    CppScalar.BOOL: ctypes.c_bool,
+    CppScalar.F32: ctypes.c_float,
+    CppScalar.F64: ctypes.c_double,
+    CppScalar.U8: ctypes.c_uint8,
+    CppScalar.U16: ctypes.c_uint16,
+    CppScalar.U32: ctypes.c_uint32,
+    CppScalar.U64: ctypes.c_uint64,
+    CppScalar.S8: ctypes.c_int8,
+    CppScalar.S16: ctypes.c_int16,
+    CppScalar.S32: ctypes.c_int32,
+    CppScalar.S64: ctypes.c_int64,
+}
+
+_FREE_SYMBOL = 'fpy_free'
+
+
+class CppBuildError(CompileError):
+    """Raised when a kernel has no C boundary or the C++ compiler fails."""
+
+
+def find_cxx() -> str | None:
+    """The system C++ compiler: ``$CXX``, else the first of ``c++``, ``g++``,
+    ``clang++`` on the ``PATH``."""
+    if cxx := os.environ.get('CXX'):
+        return shutil.which(cxx)
+    return shutil.which('c++') or shutil.which('g++') or shutil.which('clang++')
+
+
+# ---------------------------------------------------------------------
+# Wrappers
+
+
+def _convert(ty: CppScalar):
+    """Python value to the scalar's ctypes argument."""
+    if ty is CppScalar.BOOL:
+        return bool
+    if ty.is_float():
+        return float
+    return int
+
+
+def _flat_elt(ty: CppType, what: str) -> CppScalar:
+    """Element type of a flat list *ty*; anything else has no C boundary."""
+    if isinstance(ty, CppList) and isinstance(ty.elt, CppScalar):
+        return ty.elt
+    raise CppBuildError(f'{what} of type `{ty.format()}` has no C boundary')
+
+
+def _elts(abi: CalleeAbi) -> list[CppType]:
+    """The result of *abi* as a list of elements: a tuple's, or itself."""
+    if isinstance(abi.ret, CppTuple):
+        return list(abi.ret.elts)
+    return [abi.ret]
+
+
+def _column(xs, ty: CppScalar, n: int) -> ctypes.Array:
+    """*xs* as an array of *ty*, in place if it is a buffer of that type."""
+    ctype = _CTYPES[ty]
+    try:
+        view = memoryview(xs)
+    except TypeError:
+        view = None
+    if (
+        view is not None
+        and view.c_contiguous
+        and not view.readonly
+        and view.format.lstrip('@=<') == ctype._type_  # type: ignore[attr-defined]
+    ):
+        return (ctype * n).from_buffer(view)
+    return (ctype * n)(*map(_convert(ty), xs))
+
+
+def _deref(ty: CppList, name: str) -> str:
+    return f'(*{name})' if ty.boxed else name
+
+
+def entry_rm(ctx) -> str:
+    """``fesetround`` macro the caller must enter a kernel with, for a top-level
+    context *ctx*: the context's mode if ``fesetround`` spells it, else
+    ``FE_TONEAREST`` (see :meth:`CppCompiler`)."""
+    if isinstance(ctx, EFloatContext) and ctx.rm in _FE_RM_MACRO:
+        return _FE_RM_MACRO[ctx.rm]
+    return 'FE_TONEAREST'
+
+
+def wrapper_source(symbol: str, kernel: str, abi: CalleeAbi, rm: str) -> str:
+    """The ``extern "C"`` wrapper *symbol* around *kernel*."""
+    decls: list[str] = []
+    prologue: list[str] = []
+    epilogue: list[str] = []
+    args: list[str] = []
+    for i, p in enumerate(abi.params):
+        if isinstance(p.ty, CppScalar):
+            decls.append(f'{p.ty.format()} a{i}')
+            args.append(f'a{i}')
+            continue
+        elt = _flat_elt(p.ty, f'parameter {i}').format()
+        assert isinstance(p.ty, CppList)
+        const = '' if p.written else 'const '
+        decls.append(f'{const}{elt}* a{i}')
+        decls.append(f'std::size_t n{i}')
+        if p.ty.boxed:
+            prologue.append(
+                f'auto x{i} = std::make_shared<std::vector<{elt}>>(a{i}, a{i} + n{i});'
+            )
+        elif p.ty.size is not None:
+            prologue.append(f'{p.ty.format()} x{i};')
+            prologue.append(f'std::copy(a{i}, a{i} + n{i}, x{i}.begin());')
+        else:
+            prologue.append(f'{p.ty.format()} x{i}(a{i}, a{i} + n{i});')
+        if p.written:
+            epilogue.append(
+                f'for (std::size_t i = 0; i < n{i}; ++i) '
+                f'a{i}[i] = {_deref(p.ty, f"x{i}")}[i];'
+            )
+        args.append(f'x{i}')
+
+    call = f'{kernel}({", ".join(args)})'
+    ret = abi.ret
+    if isinstance(ret, CppScalar):
+        rty = ret.format()
+        epilogue.append('return r;')
+    elif isinstance(ret, CppTuple):
+        rty = 'void'
+        for j, ety in enumerate(ret.elts):
+            if not isinstance(ety, CppScalar):
+                raise CppBuildError(
+                    f'result of type `{ret.format()}` has no C boundary'
+                )
+            decls.append(f'{ety.format()}* r{j}')
+            epilogue.append(f'*r{j} = std::get<{j}>(r);')
+    else:
+        elt = _flat_elt(ret, 'result').format()
+        assert isinstance(ret, CppList)
+        rty = 'void'
+        decls.append(f'{elt}** rp')
+        decls.append('std::size_t* rn')
+        r = _deref(ret, 'r')
+        epilogue += [
+            f'*rn = {r}.size();',
+            f'*rp = static_cast<{elt}*>(std::malloc(sizeof({elt}) * ({r}.size() + 1)));',
+            f'for (std::size_t i = 0; i < {r}.size(); ++i) (*rp)[i] = {r}[i];',
+        ]
+
+    body = [
+        *prologue,
+        'const int rm = std::fegetround();',
+        f'std::fesetround({rm});',
+        f'auto r = {call};',
+        'std::fesetround(rm);',
+        *epilogue,
+    ]
+    lines = [f'extern "C" {rty} {symbol}({", ".join(decls)}) {{']
+    lines += [f'    {line}' for line in body]
+    lines.append('}')
+    return '\n'.join(lines)
+
+
+def has_batch(abi: CalleeAbi) -> bool:
+    """Whether an entry with *abi* gets a batch wrapper (see :func:`batch_source`):
+    its parameters are scalars, and so is its result or each element of it."""
+    if not all(isinstance(p.ty, CppScalar) for p in abi.params):
+        return False
+    if isinstance(abi.ret, CppTuple):
+        return all(isinstance(elt, CppScalar) for elt in abi.ret.elts)
+    return isinstance(abi.ret, CppScalar)
+
+
+def batch_source(symbol: str, kernel: str, abi: CalleeAbi, rm: str) -> str:
+    """The ``extern "C"`` batch wrapper *symbol* around *kernel*.
+
+    It takes ``n``, a thread count, one input array per parameter and one
+    output array per result element, and evaluates *kernel* on each index.
+    The range is split into contiguous chunks, one per thread, and each thread
+    enters the kernel with rounding mode *rm* (a thread has its own floating
+    point environment) and restores its mode when done.  Requires
+    :func:`has_batch`.
+    """
+    assert has_batch(abi)
+    decls = ['std::size_t n', 'unsigned nthreads']
+    args: list[str] = []
+    for i, p in enumerate(abi.params):
+        decls.append(f'const {p.ty.format()}* a{i}')
+        args.append(f'a{i}[i]')
+    stores: list[str] = []
+    if isinstance(abi.ret, CppTuple):
+        for j, elt in enumerate(abi.ret.elts):
+            decls.append(f'{elt.format()}* r{j}')
+            stores.append(f'r{j}[i] = std::get<{j}>(r);')
+    else:
+        decls.append(f'{abi.ret.format()}* r0')
+        stores.append('r0[i] = r;')
+
+    lines = [
+        f'extern "C" void {symbol}({", ".join(decls)}) {{',
+        '    auto run = [=](std::size_t lo, std::size_t hi) {',
+        '        const int rm = std::fegetround();',
+        f'        std::fesetround({rm});',
+        '        for (std::size_t i = lo; i < hi; ++i) {',
+        f'            auto r = {kernel}({", ".join(args)});',
+        *(f'            {store}' for store in stores),
+        '        }',
+        '        std::fesetround(rm);',
+        '    };',
+        '    if (nthreads <= 1 || n <= 1) {',
+        '        run(0, n);',
+        '        return;',
+        '    }',
+        '    const std::size_t chunk = (n + nthreads - 1) / nthreads;',
+        '    std::vector<std::thread> threads;',
+        '    for (std::size_t lo = 0; lo < n; lo += chunk)',
+        '        threads.emplace_back(run, lo, std::min(n, lo + chunk));',
+        '    for (auto& t : threads)',
+        '        t.join();',
+        '}',
+    ]
+    return '\n'.join(lines)
+
+
+def free_source() -> str:
+    """Releases a list result; exported once per library."""
+    return f'extern "C" void {_FREE_SYMBOL}(void* p) {{ std::free(p); }}'
+
+
+# ---------------------------------------------------------------------
+# Loaded kernels
+
+
+class CppKernel:
+    """A compiled entry point, callable from Python.
+
+    Arguments are converted to the parameter's C type (``float``, ``int`` or
+    ``bool``; a list element-wise), and a list argument the kernel writes is
+    updated in place, as under the interpreter.  Results are Python scalars,
+    tuples and lists.
+    """
+
+    name: str
+    abi: CalleeAbi
+
+    def __init__(
+        self,
+        name: str,
+        abi: CalleeAbi,
+        lib: ctypes.CDLL,
+        symbol: str,
+        batch_symbol: str | None = None,
+    ):
+        self.name = name
+        self.abi = abi
+        self._fn = getattr(lib, symbol)
+        self._batch = None
+        if batch_symbol is not None:
+            self._batch = getattr(lib, batch_symbol)
+            self._batch.restype = None
+            batch_argtypes: list[type] = [ctypes.c_size_t, ctypes.c_uint]
+            for ty in [*(p.ty for p in abi.params), *_elts(abi)]:
+                assert isinstance(ty, CppScalar)
+                batch_argtypes.append(ctypes.POINTER(_CTYPES[ty]))
+            self._batch.argtypes = batch_argtypes
+        self._free = getattr(lib, _FREE_SYMBOL)
+        self._free.restype = None
+        self._free.argtypes = [ctypes.c_void_p]
+
+        argtypes: list[type] = []
+        for p in abi.params:
+            if isinstance(p.ty, CppScalar):
+                argtypes.append(_CTYPES[p.ty])
+            else:
+                assert isinstance(p.ty, CppList) and isinstance(p.ty.elt, CppScalar)
+                argtypes += [ctypes.POINTER(_CTYPES[p.ty.elt]), ctypes.c_size_t]
+        if isinstance(abi.ret, CppScalar):
+            self._fn.restype = _CTYPES[abi.ret]
+        elif isinstance(abi.ret, CppTuple):
+            self._fn.restype = None
+            for e in abi.ret.elts:
+                assert isinstance(e, CppScalar)
+                argtypes.append(ctypes.POINTER(_CTYPES[e]))
+        else:
+            assert isinstance(abi.ret, CppList) and isinstance(abi.ret.elt, CppScalar)
+            self._fn.restype = None
+            argtypes += [
+                ctypes.POINTER(ctypes.POINTER(_CTYPES[abi.ret.elt])),
+                ctypes.POINTER(ctypes.c_size_t),
+            ]
+        self._fn.argtypes = argtypes
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.name!r})'
+
+    def __call__(self, *args):
+        if len(args) != len(self.abi.params):
+            raise TypeError(
+                f'`{self.name}` takes {len(self.abi.params)} arguments, '
+                f'got {len(args)}'
+            )
+
+        cargs: list = []
+        written: list[tuple[list, ctypes.Array]] = []
+        for arg, p in zip(args, self.abi.params):
+            if isinstance(p.ty, CppScalar):
+                cargs.append(_convert(p.ty)(arg))
+                continue
+            assert isinstance(p.ty, CppList) and isinstance(p.ty.elt, CppScalar)
+            xs = list(arg)
+            if p.ty.size is not None and len(xs) != p.ty.size:
+                raise ValueError(
+                    f'`{self.name}` expects a list of length {p.ty.size}, '
+                    f'got {len(xs)}'
+                )
+            conv = _convert(p.ty.elt)
+            buf = (_CTYPES[p.ty.elt] * len(xs))(*map(conv, xs))
+            cargs += [buf, len(xs)]
+            if p.written and isinstance(arg, list):
+                written.append((arg, buf))
+
+        ret = self.abi.ret
+        if isinstance(ret, CppScalar):
+            result = self._fn(*cargs)
+        elif isinstance(ret, CppTuple):
+            outs = []
+            for e in ret.elts:
+                assert isinstance(e, CppScalar)
+                outs.append(_CTYPES[e]())
+            self._fn(*cargs, *map(ctypes.byref, outs))
+            result = tuple(out.value for out in outs)
+        else:
+            assert isinstance(ret, CppList) and isinstance(ret.elt, CppScalar)
+            rp: ctypes._Pointer[ctypes._SimpleCData] = ctypes.POINTER(_CTYPES[ret.elt])()
+            rn = ctypes.c_size_t()
+            self._fn(*cargs, ctypes.byref(rp), ctypes.byref(rn))
+            try:
+                result = rp[:rn.value]
+            finally:
+                self._free(rp)
+
+        for arg, buf in written:
+            arg[:] = buf[:]
+        return result
+
+    def batch(self, *columns, threads: int | None = 1):
+        """Evaluates the kernel at every index of *columns*, one column per
+        argument, on up to *threads* threads (``None``: one per CPU).
+
+        Returns a list of results, or for a tuple result, a tuple of lists.
+        Only built with ``CppCompiler.build(..., batch=True)``, and only for
+        an entry whose arguments and results are scalars.  A column that
+        exposes a writable buffer of the argument's C type (e.g. a NumPy
+        array) is read in place.
+        """
+        if self._batch is None:
+            raise CppBuildError(f'`{self.name}` has no batch entry')
+        if len(columns) != len(self.abi.params):
+            raise TypeError(
+                f'`{self.name}` takes {len(self.abi.params)} columns, '
+                f'got {len(columns)}'
+            )
+        n = len(columns[0]) if columns else 0
+        if any(len(col) != n for col in columns):
+            raise ValueError(f'`{self.name}` expects columns of equal length')
+        if threads is None:
+            threads = os.cpu_count() or 1
+
+        ins = [_column(col, p.ty, n) for col, p in zip(columns, self.abi.params)]  # type: ignore[arg-type]
+        outs = [(_CTYPES[ty] * n)() for ty in _elts(self.abi)]  # type: ignore[index]
+        self._batch(n, threads, *ins, *outs)
+        if isinstance(self.abi.ret, CppTuple):
+            return tuple(out[:] for out in outs)
+        return outs[0][:]
+
+
+class CppLibrary:
+    """A loaded shared library of compiled entry points, by export name."""
+
+    path: Path
+    kernels: dict[str, CppKernel]
+
+    def __init__(
+        self,
+        path: Path,
+        abis: Sequence[tuple[str, str, CalleeAbi]],
+        batch_symbols: Mapping[str, str] | None = None,
+    ):
+        self.path = path
+        self._lib = ctypes.CDLL(str(path))
+        batch_symbols = batch_symbols or {}
+        self.kernels = {
+            name: CppKernel(name, abi, self._lib, symbol, batch_symbols.get(name))
+            for name, symbol, abi in abis
+        }
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({str(self.path)!r})'
+
+    def __getitem__(self, name: str) -> CppKernel:
+        return self.kernels[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.kernels
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.kernels)
+
+    def __len__(self) -> int:
+        return len(self.kernels)
+
+
+# ---------------------------------------------------------------------
+# Compilation
+
+
+def artifact_key(source: str, cxx: str, flags: Sequence[str]) -> str:
+    """Content hash naming the library built from *source* by *cxx* with *flags*.
+
+    The compiler is identified by its resolved path and modification time, so
+    an upgraded toolchain does not reuse stale artifacts.  A bare name like
+    ``g++`` is looked up on ``PATH``.
+    """
+    found = shutil.which(cxx)
+    if found is None:
+        raise CppBuildError(f'C++ compiler `{cxx}` not found')
+    h = hashlib.sha256()
+    path = os.path.realpath(found)
+    h.update(path.encode())
+    h.update(str(os.stat(path).st_mtime_ns).encode())
+    for flag in flags:
+        h.update(b'\0' + flag.encode())
+    h.update(b'\0\0' + source.encode())
+    return h.hexdigest()
+
+
+def build_shared(
+    source: str,
+    *,
+    cxx: str | None = None,
+    flags: Sequence[str] = DEFAULT_FLAGS,
+    cache: Path | None = None,
+) -> Path:
+    """Compile *source* to a shared library, or find it in *cache*.
+
+    The artifact is named by :func:`artifact_key` and moved into place
+    atomically, so concurrent builds of one module agree on the file.
+    """
+    if cxx is None:
+        cxx = find_cxx()
+        if cxx is None:
+            raise CppBuildError('no C++ compiler found; set `CXX`')
+    if cache is None:
+        cache = cache_dir('cpp')
+
+    path = cache / f'{artifact_key(source, cxx, flags)}{_LIB_SUFFIX}'
+    if path.exists():
+        return path
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / 'module.cpp'
+        out = Path(tmp) / f'module{_LIB_SUFFIX}'
+        src.write_text(source)
+        r = subprocess.run(
+            [cxx, *flags, '-o', str(out), str(src)],
+            capture_output=True, text=True, check=False,
+        )
+        if r.returncode != 0:
+            raise CppBuildError(f'C++ compilation failed:\n{r.stderr}')
+        write_atomic(path, out.read_bytes())
+    return path
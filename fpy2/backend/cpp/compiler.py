@@ -8,8 +8,12 @@ inference) on a :class:`Function` and hands the result to
 surface as :class:`CppCompileError`.
 """
 
-from collections.abc import Collection
+import multiprocessing
+import os
+from collections.abc import Collection, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from pathlib import Path
 from typing import TypeAlias
 
 from ...analysis import (
@@ -27,6 +31,7 @@ from ...analysis.define_use import DefineUseAnalysis
 from ...analysis.escape import EscapeSummary
 from ...analysis.format_infer import FormatAnalysis
 from ...analysis.value_class import ValueClassAnalysis
+from ...ast.fingerprint import fingerprint
 from ...ast.fpyast import Call, FuncDef, NamedId
 from ...ast.visitor import DefaultVisitor
 from ...function import Function
@@ -43,7 +48,19 @@ from ...transform import (
 from ...transform.free_var_elim import unclosed_data_free_vars
 from ...types import Type
 from ..backend import Backend, CompileError
+from .build import (
+    DEFAULT_FLAGS,
+    CppKernel,
+    CppLibrary,
+    batch_source,
+    build_shared,
+    entry_rm,
+    free_source,
+    has_batch,
+    wrapper_source,
+)
 from .emitter import CppEmitError, CppEmitter
+from .incremental import SpecCache
 from .storage import StorageSelectionError
 from .storage_infer import StorageAnalysis, StorageInfer
 from .types import CppType
@@ -89,6 +106,22 @@ class SpecAnalyses:
     unbox: UnboxAnalysis | None
 
 
+@dataclass
+class SpecResult:
+    """What emitting one spec leaves for the rest of the module.
+
+    Unlike :class:`SpecAnalyses`, which holds the AST, this pickles, so a worker
+    process can hand it back (see ``jobs`` on :class:`CppCompiler`).
+    """
+
+    source: str
+    """The C++ definition."""
+    summary: EscapeSummary
+    abi: CalleeAbi
+    rm: str
+    """The ``fesetround`` macro an entry wrapper enters it with."""
+
+
 
 # ---------------------------------------------------------------------
 # Compiler
@@ -192,6 +225,57 @@ def _return_storage(a: SpecAnalyses) -> CppType:
     return return_storage(a.format_info.fn_fmt.ret_fmt, a.unbox)
 
 
+def _call_levels(specs: list[Function]) -> list[list[int]]:
+    """The indices of *specs* (leaves-first) grouped by call depth.
+
+    A spec's depth is one more than its deepest callee's, so each level only
+    calls into earlier ones and the specs within a level are independent.
+    """
+    index = {id(f.ast): i for i, f in enumerate(specs)}
+    depth: list[int] = []
+    for f in specs:
+        callees = [index[id(c.ast)] for c in _function_calls(f.ast).values()]
+        depth.append(1 + max((depth[j] for j in callees), default=-1))
+    levels: list[list[int]] = [[] for _ in range(max(depth, default=-1) + 1)]
+    for i, d in enumerate(depth):
+        levels[d].append(i)
+    return levels
+
+
+_worker_state: 'tuple[CppCompiler, list[Function]] | None' = None
+"""The compiler and specs a forked worker emits from: a spec holds its
+defining environment, which does not pickle, so workers inherit them."""
+
+
+def _emit_worker(
+    i: int,
+    is_called: bool,
+    summaries: dict[int, EscapeSummary],
+    abis: dict[int, CalleeAbi],
+) -> SpecResult | Exception:
+    """Emits spec *i* in a worker, given its callees' results by index.
+
+    A failure is returned rather than raised, so the parent can report the one
+    a sequential compile would have.
+    """
+    assert _worker_state is not None
+    compiler, specs = _worker_state
+    try:
+        return compiler._emit_one(specs, i, is_called, summaries, abis)
+    except Exception as e:  # noqa: BLE001 -- reported by the parent
+        return e
+
+
+def _top_ctx(a: SpecAnalyses) -> Context | None:
+    """The context a spec's body runs under, resolved as the emitter does."""
+    for scope in a.ctx_use.scopes:
+        if scope.site is a.ast:
+            if isinstance(scope.ctx, Context):
+                return scope.ctx
+            break
+    return a.format_info.fn_fmt.ctx
+
+
 class CppCompiler(Backend):
     """Format-inference-driven C++ compiler.
 
@@ -227,6 +311,17 @@ class CppCompiler(Backend):
             ``ListType`` *length* gets an array parameter, and a trusted
             ``assert len(xs) == K`` becomes a type-level commitment.  No effect
             under ``unbox=NEVER``, where nothing is a value.  Default ``True``.
+        jobs:
+            Worker processes :meth:`compile_module` and :meth:`build` analyze
+            and emit specs with, one call-graph level at a time; ``None`` uses
+            every CPU.  The output is identical to a sequential compile,
+            including which error is raised.  Needs the ``fork`` start method;
+            elsewhere, compiles sequentially.  Default ``1``.
+        spec_cache:
+            A :class:`~.incremental.SpecCache` :meth:`compile_module` and
+            :meth:`build` reuse per-spec results from, so recompiling a module
+            after an edit only re-analyzes and re-emits the specs the edit
+            reaches.  Default ``None``: every spec is emitted every time.
     """
 
     UnboxMode = UnboxMode
@@ -237,10 +332,13 @@ class CppCompiler(Backend):
     _optimize: bool
     _unbox: _UnboxMode
     _arrays: bool
+    _jobs: int
+    _spec_cache: SpecCache | None
 
     def __init__(
         self, *, unsafe_cast_int: bool = True, optimize: bool = True,
         unbox: _UnboxMode = UnboxMode.STRICT, arrays: bool = True,
+        jobs: int | None = 1, spec_cache: SpecCache | None = None,
     ):
         if not isinstance(unbox, UnboxMode):
             raise TypeError(
@@ -251,6 +349,10 @@ class CppCompiler(Backend):
         self._optimize = optimize
         self._unbox = unbox
         self._arrays = arrays
+        self._jobs = (os.cpu_count() or 1) if jobs is None else jobs
+        if self._jobs < 1:
+            raise ValueError(f'`jobs` must be positive, got {jobs}')
+        self._spec_cache = spec_cache
 
     # ------------------------------------------------------------------
     # Translation-unit preamble.  ``compile`` returns a function definition
@@ -298,11 +400,7 @@ class CppCompiler(Backend):
         leaves-first.
         """
         specs = self.specialize(module)
-        params: dict[FuncDef, CalleeAbi] = {}
-        return '\n\n'.join(
-            self._emit(f, a, params)
-            for f, a in self._analyze_all(specs, params)
-        )
+        return '\n\n'.join(r.source for r in self._emit_all(specs))
 
     def _analyze_all(
         self,
@@ -334,9 +432,155 @@ class CppCompiler(Backend):
             summaries[f.ast] = a.summary
             params[f.ast] = _callee_abi(a)
 
+    def _emit_all(self, specs: list[Function]) -> list[SpecResult]:
+        """Emit every spec, in the order of *specs*.
+
+        With ``jobs > 1``, each call-graph level is emitted by a pool of forked
+        workers once the levels below it are done.  With a ``spec_cache``, a
+        spec whose inputs are unchanged is not emitted again.
+        """
+        index = {id(f.ast): i for i, f in enumerate(specs)}
+        callees = [
+            sorted({index[id(c.ast)] for c in _function_calls(f.ast).values()})
+            for f in specs
+        ]
+        called = {j for cs in callees for j in cs}
+        results: list[SpecResult | None] = [None] * len(specs)
+
+        if self._jobs > 1 and len(specs) > 1:
+            try:
+                mp_context = multiprocessing.get_context('fork')
+            except ValueError:
+                pass
+            else:
+                self._emit_parallel(specs, callees, called, results, mp_context)
+                return results  # type: ignore[return-value]
+
+        for i in range(len(specs)):
+            key = self._spec_key(specs, i, i in called, callees[i], results)
+            r = self._cached(key)
+            if r is None:
+                r = self._emit_one(
+                    specs, i, i in called,
+                    {j: results[j].summary for j in callees[i]},  # type: ignore[union-attr]
+                    {j: results[j].abi for j in callees[i]},  # type: ignore[union-attr]
+                )
+                self._store(key, r)
+            results[i] = r
+        return results  # type: ignore[return-value]
+
+    def _emit_parallel(
+        self,
+        specs: list[Function],
+        callees: list[list[int]],
+        called: set[int],
+        results: list[SpecResult | None],
+        mp_context,
+    ):
+        global _worker_state
+
+        failed: tuple[int, Exception] | None = None
+        _worker_state = (self, specs)
+        try:
+            with ProcessPoolExecutor(self._jobs, mp_context=mp_context) as pool:
+                for level in _call_levels(specs):
+                    # a sequential compile stops at its first failure, so only
+                    # the specs before it can still decide the error
+                    if failed is not None:
+                        level = [i for i in level if i < failed[0]]
+                    futures = []
+                    for i in level:
+                        key = self._spec_key(specs, i, i in called, callees[i], results)
+                        results[i] = self._cached(key)
+                        if results[i] is None:
+                            future = pool.submit(
+                                _emit_worker, i, i in called,
+                                {j: results[j].summary for j in callees[i]},  # type: ignore[union-attr]
+                                {j: results[j].abi for j in callees[i]},  # type: ignore[union-attr]
+                            )
+                            futures.append((i, key, future))
+                    for i, key, future in futures:
+                        r = future.result()
+                        if isinstance(r, Exception):
+                            if failed is None or i < failed[0]:
+                                failed = (i, r)
+                        else:
+                            results[i] = r
+                            self._store(key, r)
+        finally:
+            _worker_state = None
+
+        if failed is not None:
+            raise failed[1]
+
+    def _emit_one(
+        self,
+        specs: list[Function],
+        i: int,
+        is_called: bool,
+        summaries: dict[int, EscapeSummary],
+        abis: dict[int, CalleeAbi],
+    ) -> SpecResult:
+        """Emit spec *i* of *specs*, given its callees' results by index."""
+        params = {specs[j].ast: abi for j, abi in abis.items()}
+        a = self.analyze(
+            specs[i],
+            is_called=is_called,
+            summaries={specs[j].ast: s for j, s in summaries.items()},
+            callee_abis=params,
+        )
+        return self._result(specs[i], a, params)
+
+    def _spec_key(
+        self,
+        specs: list[Function],
+        i: int,
+        is_called: bool,
+        callees: list[int],
+        results: list[SpecResult | None],
+    ) -> str | None:
+        """The ``spec_cache`` key of spec *i*, once its callees are emitted:
+        its structure, how it is called, its callees' names, ABIs and escape
+        summaries, and the compiler's options."""
+        if self._spec_cache is None:
+            return None
+        parts = [
+            fingerprint(specs[i].ast),
+            repr((self._unsafe_cast_int, self._optimize, self._unbox, self._arrays)),
+            repr(is_called),
+        ]
+        for j in callees:
+            r = results[j]
+            assert r is not None
+            parts.append(f'{specs[j].ast.name}:{r.abi!r}:{sorted(r.summary.retained)}')
+        return self._spec_cache.key(*parts)
+
+    def _cached(self, key: str | None) -> SpecResult | None:
+        if key is None or self._spec_cache is None:
+            return None
+        return self._spec_cache.get(key)
+
+    def _store(self, key: str | None, r: SpecResult):
+        if key is not None and self._spec_cache is not None:
+            self._spec_cache.put(key, r)
+
+    def _result(
+        self,
+        func: Function,
+        a: SpecAnalyses,
+        params: dict[FuncDef, CalleeAbi],
+    ) -> SpecResult:
+        source = self._emit(func, a, params)
+        return SpecResult(source, a.summary, _callee_abi(a), entry_rm(_top_ctx(a)))
+
     def specialize(self, module: Module) -> list[Function]:
         """Steps 1-3 of the pipeline: the fully-specialized functions, in
         leaves-first emission order."""
+        return list(self._specialize_module(module).call_graph().order)
+
+    def _specialize_module(self, module: Module) -> Module:
+        """:meth:`specialize`, keeping the module: each public entry maps to its
+        spec under the entry's export name."""
         if not isinstance(module, Module):
             raise TypeError(f'Expected `Module`, got {type(module)} for {module}')
 
@@ -366,7 +610,7 @@ class CppCompiler(Backend):
         if self._optimize:
             specialized = specialized.map(lambda _m, fd: RoundElim.apply(fd))
 
-        return list(specialized.call_graph().order)
+        return specialized
 
     def analyze(
         self,
@@ -499,6 +743,76 @@ class CppCompiler(Backend):
         abi = _callee_abi(a)
         return [p.ty for p in abi.params], abi.ret
 
+    def build(
+        self,
+        module: Module,
+        *,
+        cxx: str | None = None,
+        flags: Sequence[str] = DEFAULT_FLAGS,
+        cache_dir: str | os.PathLike | None = None,
+        batch: bool = False,
+    ) -> CppLibrary:
+        """Compile a :class:`~fpy2.Module` to a shared library and load it.
+
+        Every public entry is callable by its export name, with the ABI
+        :meth:`signature` reports; see :mod:`.build` for how each C++ type
+        crosses the boundary.  *cxx* defaults to :func:`.build.find_cxx`, and
+        libraries are cached under *cache_dir* (default
+        :func:`~fpy2.utils.cache_dir` ``('cpp')``) by content hash.
+
+        With *batch*, each entry whose arguments and results are scalars can
+        also be evaluated over arrays of inputs, on several threads; see
+        :meth:`.CppKernel.batch`.
+        """
+        spec_module = self._specialize_module(module)
+        specs = list(spec_module.call_graph().order)
+        results = {f.ast: r for f, r in zip(specs, self._emit_all(specs))}
+        units = [self.prelude(), '#include <cstdlib>']
+        if batch:
+            units.append('#include <thread>')
+            if '-pthread' not in flags:
+                flags = [*flags, '-pthread']
+        units.extend(r.source for r in results.values())
+
+        abis: list[tuple[str, str, CalleeAbi]] = []
+        batch_symbols: dict[str, str] = {}
+        for entry in spec_module:
+            r = results[entry.func.ast]
+            symbol = f'fpy_entry_{entry.name}'
+            units.append(wrapper_source(symbol, entry.func.ast.name, r.abi, r.rm))
+            abis.append((entry.name, symbol, r.abi))
+            if batch and has_batch(r.abi):
+                batch_symbols[entry.name] = f'fpy_batch_{entry.name}'
+                units.append(batch_source(
+                    batch_symbols[entry.name], entry.func.ast.name, r.abi, r.rm,
+                ))
+        units.append(free_source())
+
+        path = build_shared(
+            '\n\n'.join(units) + '\n',
+            cxx=cxx,
+            flags=flags,
+            cache=None if cache_dir is None else Path(cache_dir),
+        )
+        return CppLibrary(path, abis, batch_symbols)
+
+    def load(
+        self,
+        func: Function,
+        *,
+        ctx: Context | None = None,
+        arg_types: Collection[Type | None] | None = None,
+        **kwargs,
+    ) -> CppKernel:
+        """Compile *func* alone to a shared library and return its entry point.
+
+        A thin wrapper around :meth:`build` over a one-entry module; keyword
+        arguments other than *ctx* and *arg_types* are passed through.
+        """
+        m = Module()
+        m.add(func, ctx=ctx, arg_types=arg_types)
+        return self.build(m, **kwargs)[func.name]
+
     def _compile_function(
         self, func: Function, *, is_called: bool = False,
     ) -> str:
@@ -41,6 +41,8 @@ from ...analysis.format_infer import (
     round_is_identity,
 )
 from ...ast.fpyast import (
+    Abs,
+    Add,
     AllOf,
     AMax,
     AMin,
@@ -73,6 +75,7 @@ from ...ast.fpyast import (
     Decnum,
     Digits,
     Dim,
+    Div,
     EffectStmt,
     Empty,
     Enumerate,
@@ -101,6 +104,7 @@ from ...ast.fpyast import (
     NamedId,
     NamedUnaryOp,
     NaryOp,
+    Neg,
     Not,
     NullaryOp,
     Or,
@@ -115,7 +119,9 @@ from ...ast.fpyast import (
     Signbit,
     Size,
     Snd,
+    Sqrt,
     StmtBlock,
+    Sub,
     Sum,
     TernaryOp,
     TupleBinding,
@@ -134,17 +140,20 @@ from ...number import (
     EFloatContext,
     Float,
     MPBFixedContext,
+    MPBFloatContext,
     MPFixedContext,
     OverflowMode,
     RealFloat,
 )
 from ...number.context.context import Context
+from .emulate import Edge, Emulation, EmulationError, emulation_of
 from .ops import CppOp, ScalarOpTable
 from .storage import (
     StorageSelectionError,
     bound_fits_in_scalar,
     choose_storage,
     exact_integer_bits,
+    magnitude_bound,
     scalar_fits_in,
     scalar_sup,
 )
@@ -919,8 +928,11 @@ class CppEmitter(Visitor):
             storage = self._validate_context_rm(func_ctx, at=func)
             # only a floating-point context in float storage rounds through
             # `fesetround`; integer storage and the libm fixed-point lowering
-            # both round by other means and want no scope
-            if storage.is_float() and isinstance(func_ctx, EFloatContext):
+            # both round by other means and want no scope, and an emulated
+            # context computes in round-to-nearest whatever its own mode
+            if self._emulation(func_ctx) is not None:
+                entry_rm = RM.RNE
+            elif storage.is_float() and isinstance(func_ctx, EFloatContext):
                 entry_rm = func_ctx.rm
         if entry_rm is None:
             self._visit_block(func.body, None)
@@ -1401,8 +1413,9 @@ class CppEmitter(Visitor):
 
         Float storage needs an ``fesetround`` mode (RNE/RTZ/RTP/RTN) -- unless the
         context is fixed-point, which instead needs an integral spelling; integer
-        storage needs RTZ, which is what C++ integer arithmetic does -- anything
-        else would need per-operation emulation.  Bool, list and tuple are out of
+        storage needs RTZ, which is what C++ integer arithmetic does.  A context
+        in float storage that has neither is emulated (:meth:`_emulation`), or
+        refused for the reason it cannot be.  Bool, list and tuple are out of
         scope.  *at* anchors the error location.
         """
         try:
@@ -1418,6 +1431,9 @@ class CppEmitter(Visitor):
                 f'unsupported context storage `{storage!r}` for `{rctx}`',
                 at=at,
             )
+        if self._emulation(rctx, at=at) is not None:
+            # rounds in generated code, under whatever mode it states
+            return storage
         if isinstance(rctx, MPFixedContext | MPBFixedContext):
             # A fixed-point context rounds by a libm call (float storage) or a
             # cast (integer storage).  Neither goes through ``fesetround``, so
@@ -1503,6 +1519,45 @@ class CppEmitter(Visitor):
             )
         return storage
 
+    def _emulation(self, rctx: Context, at: Ast | None = None) -> Emulation | None:
+        """How to emulate *rctx* in generated code (see :mod:`.emulate`), or
+        ``None`` for a context with a lowering of its own.
+
+        Those are the native contexts, whatever lands in integer storage, and the
+        fixed-point contexts at position zero the libm rounding reproduces
+        (:meth:`_emit_integral_round`) -- each keeps the lowering and the refusals
+        it had.  Any other floating-point or fixed-point context in float storage
+        is emulated, or refused here with the reason it cannot be.
+        """
+        if rctx is REAL or is_native_ctx(rctx):
+            return None
+        if not isinstance(
+            rctx, EFloatContext | MPBFloatContext | MPFixedContext | MPBFixedContext
+        ):
+            return None
+        try:
+            storage = choose_storage(rctx.format())
+        except StorageSelectionError:
+            # the caller's own storage lookup says why
+            return None
+        if not isinstance(storage, CppScalar) or not storage.is_float():
+            return None
+        if isinstance(rctx, MPFixedContext | MPBFixedContext) and (
+            rctx.nmin == -1
+            and rctx.enable_neg_zero
+            and not (
+                isinstance(rctx, MPBFixedContext)
+                and rctx.overflow is not OverflowMode.ASSERT
+            )
+        ):
+            return None
+        try:
+            return emulation_of(rctx)
+        except EmulationError as e:
+            raise CppEmitError(
+                f'rounding under `{rctx}` has no C++ analogue: {e}', at=at,
+            ) from e
+
     @contextmanager
     def _fenv_scope(self, target_rm: RM):
         """Wrap the contained emission in a ``fesetround`` save/set/restore, unless the
@@ -1544,6 +1599,12 @@ class CppEmitter(Visitor):
             self._visit_block(stmt.body, ctx)
             return
         storage = self._validate_context_rm(rctx, at=stmt)
+        if self._emulation(rctx) is not None:
+            # the emulated rounding names its own mode, and needs the
+            # round-to-nearest arithmetic underneath it
+            with self._fenv_scope(RM.RNE):
+                self._visit_block(stmt.body, ctx)
+            return
         if storage.is_integer() or isinstance(rctx, MPFixedContext | MPBFixedContext):
             # A fixed-point scope sets no ``fenv`` mode whichever storage it
             # lands in: it rounds by a cast or by a libm call naming its mode.
@@ -1743,6 +1804,8 @@ class CppEmitter(Visitor):
         every operand losslessly -- skipped when that context has no C++ storage.
         Failing that, **widening**, sound only under ``REAL``, where the wider op
         gives the exact result and rounds to itself; see :meth:`_try_widen`.
+        A context the table has no signature for at all may instead be emulated
+        (:meth:`_emit_emulated_op`).
 
         A literal operand of a call-form signature needs its type spelled even on a
         direct match: it matched on storage, not on the token's type.
@@ -1786,6 +1849,11 @@ class CppEmitter(Visitor):
                         casts = spell(casts, want)
                     return sig.format(*casts)
 
+        # a context with no C++ type is emulated instead
+        emu = self._emulation(active, at=e)
+        if emu is not None:
+            return self._emit_emulated_op(e, emu, list(zip(codes, srcs, storages)))
+
         # (3) widen, only under REAL
         if active is REAL:
             widened = self._try_widen(e, sigs, list(zip(codes, storages)))
@@ -2787,11 +2855,14 @@ class CppEmitter(Visitor):
         bypass it, so the same discipline is applied here.
 
         Fixed-point contexts are exempt: `_emit_integral_round` (`Round`) and
-        `_assert_fixed_exact` (`Cast`) lower or refuse them.
+        `_assert_fixed_exact` (`Cast`) lower or refuse them.  So are emulated
+        contexts, whose rounding is generated (:meth:`_emit_emulated_round`).
         """
         active = self._active_ctx_for(e)
         if isinstance(active, MPFixedContext | MPBFixedContext):
             return
+        if self._emulation(active, at=e) is not None:
+            return
         # resolved first: a context with no storage at all -- ``REAL``, or a
         # format wider than the ladder -- has a more specific complaint than this
         storage = self._scalar_for_ctx(active, at=e)
@@ -2830,21 +2901,28 @@ class CppEmitter(Visitor):
         self._require_cast_is_round(e)
         arg_ty, target_ty = self._scalar_cast_types(e)
         active = self._active_ctx_for(e)
-        if isinstance(active, MPFixedContext | MPBFixedContext):
-            # storage *contains* such a context rather than equalling it, so the
-            # roundtrip below cannot see which values it represents, nor its
-            # bound
-            arg = self._assert_fixed_exact(active, arg, arg_ty, e)
-        # Same-type is a guaranteed no-op, no assert.
-        if arg_ty == target_ty:
-            return arg
-        # Bind the rounded value to a temp so the assertion
-        # can name it without re-evaluating the source.
-        tmp = self._fresh_temp()
-        self.writer.add_line(
-            f'{target_ty.format()} {tmp} = '
-            f'{self._explicit_cast(arg, target_ty)};'
-        )
+        emu = self._emulation(active, at=e)
+        if emu is not None:
+            # the emulated rounding is the context's own, so the roundtrip below
+            # asks the context's question -- even between two `float`s
+            arg = self._bind_operand(arg)
+            tmp = self._bind_operand(self._emit_emulated_round(e, emu, arg))
+        else:
+            if isinstance(active, MPFixedContext | MPBFixedContext):
+                # storage *contains* such a context rather than equalling it, so
+                # the roundtrip below cannot see which values it represents, nor
+                # its bound
+                arg = self._assert_fixed_exact(active, arg, arg_ty, e)
+            # Same-type is a guaranteed no-op, no assert.
+            if arg_ty == target_ty:
+                return arg
+            # Bind the rounded value to a temp so the assertion
+            # can name it without re-evaluating the source.
+            tmp = self._fresh_temp()
+            self.writer.add_line(
+                f'{target_ty.format()} {tmp} = '
+                f'{self._explicit_cast(arg, target_ty)};'
+            )
         # NaN-aware comparison: ``NaN == NaN`` is false in C++, so FP operands
         # need an extra ``isnan`` guard to avoid false asserts when both sides
         # round to NaN.  Skipped for purely integer operand pairs, and for an
@@ -2923,9 +3001,13 @@ class CppEmitter(Visitor):
         if not isinstance(e.arg, RationalVal):
             return None
         active = self._active_ctx_for(e)
-        if not isinstance(active, EFloatContext):
+        if not isinstance(active, EFloatContext) and self._emulation(active, at=e) is None:
+            return None
+        try:
+            rounded = active.round(e.arg.as_rational())
+        except (ValueError, OverflowError):
+            # a value the context refuses: the emitted rounding asserts so
             return None
-        rounded = active.round(e.arg.as_rational())
         if rounded.isinf or rounded.isnan:
             # An overflowing literal is a value the target format does have,
             # but ``HUGE_VAL``/``NAN`` are a separate spelling; leave it.
@@ -2979,6 +3061,9 @@ class CppEmitter(Visitor):
         if folded is not None:
             return folded
         arg = self._visit_expr(e.arg, ctx)
+        emu = self._emulation(self._active_ctx_for(e), at=e)
+        if emu is not None:
+            return self._emit_emulated_round(e, emu, arg)
         integral = self._emit_integral_round(e, arg)
         if integral is not None:
             return integral
@@ -3255,6 +3340,350 @@ class CppEmitter(Visitor):
         # -128 but only to 127 -- and `fabs` cannot say that
         return f'{self._emit_numeric_literal(lo, at=at)} <= {operand} && {upper}'
 
+    # ------------------------------------------------------------------
+    # Emulated contexts -- see `.emulate`
+
+    _EMULATED_OPS = (Add, Sub, Mul, Div, Sqrt, Neg, Abs)
+    """Ops an emulated context rounds: those whose error in ``double`` is exact."""
+
+    def _emit_emulated_round(self, e, emu: Emulation, arg: str) -> str:
+        """``round(v)`` under an emulated context.
+
+        The operand is the exact value, so it is rounded as it is, and may be of
+        any type a ``double`` holds.
+        """
+        arg_ty = self._scalar_storage_for_expr(e.arg)
+        if not (
+            scalar_fits_in(arg_ty, CppScalar.F64)
+            or bound_fits_in_scalar(self.format_info.by_expr.get(e.arg), CppScalar.F64)
+        ):
+            raise CppEmitError(
+                f'rounding a `{arg_ty.format()}` under `{emu.ctx}` has no C++ '
+                'analogue: the emulated rounding reads its operand as a `double`, '
+                'which does not hold every value of it',
+                at=e,
+            )
+        if arg_ty is not CppScalar.F64:
+            arg = self._explicit_cast(arg, CppScalar.F64)
+        return self._emit_emulated_rounding(
+            e, emu, arg, cls=self._value_class(e.arg))
+
+    def _emit_emulated_op(
+        self, e, emu: Emulation,
+        operands: Sequence[tuple[str, Expr, CppScalar]],
+    ) -> str:
+        """*e* under an emulated context: computed in ``double``, made
+        round-to-odd from its exact error term, and rounded.
+
+        The error term is exact where nothing it takes leaves the normal range of
+        a ``double``: sure for operands whose every value a ``float`` holds, or
+        integers a ``double`` holds.  Any other operand is refused.  So is every
+        op but ``+ - * /`` and ``sqrt``, whose error term has a spelling, and
+        ``neg`` and ``abs``, which have none.
+        """
+        name = type(e).__name__
+        if not isinstance(e, self._EMULATED_OPS):
+            raise CppEmitError(
+                f'no matching signature for {name} under context `{emu.ctx}`, '
+                'which has no C++ type: only `+`, `-`, `*`, `/`, `sqrt`, `neg` '
+                'and `abs` are emulated, whose error in `double` is exact',
+                at=e,
+            )
+        exact = isinstance(e, Neg | Abs)
+        if not exact and not emu.bounded:
+            raise CppEmitError(
+                f'{name} under unbounded `{emu.ctx}` has no C++ analogue: its '
+                'result may have more digits than a `double` rounds exactly',
+                at=e,
+            )
+        args: list[str] = []
+        for code, src, have in operands:
+            if not (
+                scalar_fits_in(have, CppScalar.F32)
+                or (have.is_integer() and scalar_fits_in(have, CppScalar.F64))
+                or bound_fits_in_scalar(self.format_info.by_expr.get(src), CppScalar.F32)
+            ):
+                raise CppEmitError(
+                    f'no matching signature for {name} under context '
+                    f'`{emu.ctx}`: emulating it needs operands a `float` holds, '
+                    f'got `{have.format()}`.  Round the operand under the '
+                    'context first.',
+                    at=e,
+                )
+            if have is not CppScalar.F64:
+                code = self._explicit_cast(code, CppScalar.F64)
+            args.append(self._bind_operand(code))
+
+        match e:
+            case Neg():
+                value = f'-{args[0]}'
+            case Abs():
+                value = f'std::fabs({args[0]})'
+            case _:
+                width = self._emulated_wrap_width(e, emu, operands)
+                value = self._emit_round_to_odd(e, args, width=width)
+        return self._emit_emulated_rounding(e, emu, value)
+
+    def _emulated_wrap_width(
+        self, e, emu: Emulation,
+        operands: Sequence[tuple[str, Expr, CppScalar]],
+    ) -> Fraction | None:
+        """The width of *emu*'s range, if *e*'s result wraps into it.
+
+        A round-to-odd value has two digits to spare only below
+        ``2 ** (expmin + 51)``, so a result that may be larger is first reduced
+        by the width, exactly (see :meth:`_emit_round_to_odd`): the reduced
+        result lies within half the width, which must then be below
+        ``2 ** (expmin + 50)``.  A quotient is reduced through its dividend,
+        which needs a power-of-two width, and a square root cannot be reduced,
+        so its operand must be small enough that it never needs to be.
+        """
+        if not (emu.bounded and Edge.WRAP in (emu.pos_overflow, emu.neg_overflow)):
+            return None
+        assert emu.pos_maxval is not None and emu.neg_maxval is not None
+        width = emu.pos_maxval - emu.neg_maxval + Fraction(2) ** emu.expmin
+        limit = Fraction(2) ** (emu.expmin + 51)
+        name = type(e).__name__
+        if isinstance(e, Sqrt):
+            _, src, have = operands[0]
+            bound = magnitude_bound(self.format_info.by_expr.get(src), have)
+            if bound is None or bound >= limit ** 2:
+                raise CppEmitError(
+                    f'{name} under wrapping `{emu.ctx}` has no C++ analogue: '
+                    'its result may be too large to wrap exactly.  Round the '
+                    'operand under the context first.',
+                    at=e,
+                )
+            return None
+        if width > limit / 2:
+            raise CppEmitError(
+                f'{name} under wrapping `{emu.ctx}` has no C++ analogue: its '
+                'range is too wide to wrap a result exactly in `double`',
+                at=e,
+            )
+        n, d = width.numerator, width.denominator
+        if isinstance(e, Div) and (n & (n - 1) or d & (d - 1)):
+            raise CppEmitError(
+                f'{name} under wrapping `{emu.ctx}` has no C++ analogue: the '
+                'width of its range is not a power of two, so a quotient '
+                'cannot be wrapped exactly',
+                at=e,
+            )
+        return width
+
+    def _emit_round_to_odd(self, e, args: list[str], *, width: Fraction | None = None) -> str:
+        """*e*'s exact result rounded to odd in ``double``, as a temporary.
+
+        The nearest ``double`` comes with an exact error term -- ``TwoSum`` for a
+        sum, an ``fma`` residual otherwise -- both valid only in FE_TONEAREST,
+        which an emulated scope sets.  An inexact result that landed on an even
+        significand moves one step toward the exact value, onto the odd one.
+
+        With a *width*, a result as large as the width is first reduced by a
+        multiple of it, which wrapping does not see: a sum or product is the
+        nearest ``double`` plus its error, each reduced exactly by
+        ``std::remainder`` and added back with ``TwoSum``; a quotient is
+        recomputed from its dividend reduced by the width times the divisor,
+        exact for a power-of-two width.
+        """
+        q = self._fresh_temp()
+        err = self._fresh_temp()
+        w = None if width is None else self._emit_numeric_literal(width, at=e)
+        # reduced only if overflowing: the common case keeps its value
+        reduce = None if w is None else f'std::isfinite({q}) && std::fabs({q}) >= {w}'
+        err_decl = 'const double' if w is None else 'double'
+        match e:
+            case Add() | Sub():
+                a, b = args
+                op, inv = ('+', '-') if isinstance(e, Add) else ('-', '+')
+                t = self._fresh_temp()
+                self.writer.add_line(f'double {q} = {a} {op} {b};')
+                self.writer.add_line(f'const double {t} = {q} - {a};')
+                self.writer.add_line(
+                    f'{err_decl} {err} = ({a} - ({q} - {t})) {op} ({b} {inv} {t});')
+            case Mul():
+                a, b = args
+                self.writer.add_line(f'double {q} = {a} * {b};')
+                self.writer.add_line(f'{err_decl} {err} = std::fma({a}, {b}, -{q});')
+            case Div():
+                a, b = args
+                r = self._fresh_temp()
+                self.writer.add_line(f'double {q} = {a} / {b};')
+                if reduce is not None:
+                    # `a = k * w * b + a'` makes `a / b = k * w + a' / b`
+                    reduced = self._fresh_temp()
+                    self.writer.add_line(f'double {reduced} = {a};')
+                    self.writer.add_line(f'if ({reduce}) {{')
+                    self.writer.indent()
+                    self.writer.add_line(f'{reduced} = std::remainder({a}, {w} * {b});')
+                    self.writer.add_line(f'{q} = {reduced} / {b};')
+                    self.writer.dedent()
+                    self.writer.add_line('}')
+                    a = reduced
+                self.writer.add_line(f'const double {r} = std::fma(-{q}, {b}, {a});')
+                # the error is the residual over `b`: only its sign is needed
+                self.writer.add_line(f'const double {err} = {b} < 0 ? -{r} : {r};')
+                reduce = None
+            case Sqrt():
+                (a,) = args
+                self.writer.add_line(f'double {q} = std::sqrt({a});')
+                self.writer.add_line(f'const double {err} = std::fma(-{q}, {q}, {a});')
+            case _:
+                raise CppInternalError(f'no error term for {type(e).__name__}', at=e)
+        if reduce is not None:
+            # `q + err` is exact, and so is each remainder
+            m, d, t = self._fresh_temp(), self._fresh_temp(), self._fresh_temp()
+            self.writer.add_line(f'if ({reduce}) {{')
+            self.writer.indent()
+            self.writer.add_line(f'const double {m} = std::remainder({q}, {w});')
+            self.writer.add_line(f'const double {d} = std::remainder({err}, {w});')
+            self.writer.add_line(f'{q} = {m} + {d};')
+            self.writer.add_line(f'const double {t} = {q} - {m};')
+            self.writer.add_line(f'{err} = ({m} - ({q} - {t})) + ({d} - {t});')
+            self.writer.dedent()
+            self.writer.add_line('}')
+        # a special operand leaves a NaN error term, and an exact result none
+        self.writer.add_line(
+            f'if ({err} != 0 && std::isfinite({err}) && '
+            f'std::fmod(std::scalbn({q}, 52 - std::ilogb({q})), 2) == 0) {{')
+        self.writer.indent()
+        self.writer.add_line(
+            f'{q} = std::nextafter({q}, '
+            f'std::copysign(std::numeric_limits<double>::infinity(), {err}));')
+        self.writer.dedent()
+        self.writer.add_line('}')
+        return q
+
+    def _emit_emulated_rounding(
+        self, e, emu: Emulation, value: str, *,
+        cls: ValueClass | None = None,
+    ) -> str:
+        """*value*, a ``double``, rounded under *emu*'s context, in *e*'s storage.
+
+        The value is scaled so the last digit the context keeps at its magnitude
+        is the units digit, rounded to an integral value by
+        :meth:`_emit_integral_value`, and scaled back -- exact but for that
+        rounding, and correct for an exact *value* or a round-to-odd one with two
+        digits to spare.  A fixed-point context keeps every digit down to its
+        last, which is 53 digits as far as a ``double`` is concerned.
+
+        *cls*, where known, is *value*'s class, to leave out edges it cannot
+        reach.
+        """
+        prec = 53 if emu.prec is None else emu.prec
+        v = self._bind_operand(value)
+        lsb = self._fresh_temp()
+        self.writer.add_line(
+            f'const int {lsb} = '
+            f'std::max(std::ilogb({v}), {emu.expmin + prec - 1}) - {prec - 1};')
+        scaled = self._bind_operand(f'std::scalbn({v}, -{lsb})')
+        integral = self._emit_integral_value(emu.rm, scaled)
+        if integral is None:
+            raise CppEmitError(
+                f'rounding mode {emu.rm} for context `{emu.ctx}` has no '
+                'spelling that rounds to an integral value',
+                at=e,
+            )
+        out = self._fresh_temp()
+        self.writer.add_line(f'double {out} = std::scalbn({integral}, {lsb});')
+        self._emit_emulated_edges(e, emu, out, cls=cls)
+
+        result_ty = self._scalar_storage_for_expr(e)
+        if result_ty is CppScalar.F64:
+            return out
+        # the value is in the context's format, which the storage contains
+        return self._explicit_cast(out, result_ty)
+
+    def _emit_emulated_edges(
+        self, e, emu: Emulation, out: str, *,
+        cls: ValueClass | None,
+    ) -> None:
+        """Apply *emu*'s edge rules to the rounded value *out*, in place.
+
+        A rule that raises in the interpreter is an assertion, as for every
+        rounding the backend lowers; the others are a chain of branches, an
+        infinity first so no overflow test mistakes one for an overflow.
+        """
+        nan_lit = 'std::numeric_limits<double>::quiet_NaN()'
+        inf_lit = 'std::numeric_limits<double>::infinity()'
+        nans = cls is None or bool(cls & ValueClass.NAN)
+        infs = cls is None or bool(cls & ValueClass.INF)
+        if nans and emu.nan is Edge.ASSERT:
+            self._emit_assert(f'!std::isnan({out})', 'rounding is undefined for this value')
+        if infs and emu.inf is Edge.ASSERT:
+            self._emit_assert(f'!std::isinf({out})', 'rounding is undefined for this value')
+
+        branches: list[tuple[str, list[str]]] = []
+        if infs and emu.inf is Edge.NAN:
+            branches.append((f'std::isinf({out})', [f'{out} = {nan_lit};']))
+        if emu.bounded:
+            assert emu.pos_maxval is not None and emu.neg_maxval is not None
+            tests: list[str] = []
+            for edge, maxval, cmp, sign in (
+                (emu.pos_overflow, emu.pos_maxval, '>', ''),
+                (emu.neg_overflow, emu.neg_maxval, '<', '-'),
+            ):
+                test = f'{out} {cmp} {self._emit_numeric_literal(maxval, at=e)}'
+                if infs and emu.inf is Edge.INF and edge is not Edge.INF:
+                    # an infinity has not overflowed, and stays
+                    test = f'std::isfinite({out}) && {test}'
+                match edge:
+                    case Edge.ASSERT:
+                        self._emit_assert(
+                            f'!({test})', 'overflow occurred so rounding is undefined')
+                    case Edge.INF:
+                        branches.append((test, [f'{out} = {sign}{inf_lit};']))
+                    case Edge.NAN:
+                        branches.append((test, [f'{out} = {nan_lit};']))
+                    case Edge.MAXVAL:
+                        lit = self._emit_numeric_literal(maxval, at=e)
+                        branches.append((test, [f'{out} = {lit};']))
+                    case Edge.WRAP:
+                        tests.append(test)
+            if tests:
+                branches.append((' || '.join(tests), self._wrap_lines(e, emu, out)))
+
+        for i, (test, body) in enumerate(branches):
+            self.writer.add_line(f'if ({test}) {{' if i == 0 else f'}} else if ({test}) {{')
+            self.writer.indent()
+            for line in body:
+                self.writer.add_line(line)
+            self.writer.dedent()
+        if branches:
+            self.writer.add_line('}')
+
+        if not emu.neg_zero:
+            self.writer.add_line(f'if ({out} == 0) {{')
+            self.writer.indent()
+            # `-0.0 == 0`, so this stores `+0.0` over either zero
+            self.writer.add_line(f'{out} = 0;')
+            self.writer.dedent()
+            self.writer.add_line('}')
+
+    def _wrap_lines(self, e, emu: Emulation, out: str) -> list[str]:
+        """Statements wrapping the overflowing value *out* into *emu*'s range.
+
+        ``fmod`` is exact, so the value is reduced by the width of the range
+        first and only then offset by the least value, which keeps every
+        intermediate within the digits of the range.  A rounded result of an
+        arithmetic op is within the width already (see
+        :meth:`_emulated_wrap_width`).
+        """
+        assert emu.pos_maxval is not None and emu.neg_maxval is not None
+        width = self._emit_numeric_literal(
+            emu.pos_maxval - emu.neg_maxval + Fraction(2) ** emu.expmin, at=e)
+        k = self._fresh_temp()
+        lines = [f'double {k} = std::fmod({out}, {width});']
+        if emu.neg_maxval != 0:
+            least = self._emit_numeric_literal(-emu.neg_maxval, at=e)
+            lines.append(f'{k} = std::fmod({k} + {least}, {width});')
+        lines += [f'if ({k} < 0) {{', f'    {k} += {width};', '}']
+        if emu.neg_maxval != 0:
+            lines.append(f'{out} = {k} - {least};')
+        else:
+            lines.append(f'{out} = {k};')
+        return lines
+
     def _visit_round_at(self, e, ctx):
         self._unsupported('RoundAt', at=e)
 
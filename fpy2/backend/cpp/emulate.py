@@ -0,0 +1,265 @@
+"""
+cpp backend: software emulation of contexts with no C++ type.
+
+The op table dispatches on the contexts whose rounding *is* a C++ type's:
+`FP32`/`FP64` under an ``fesetround`` mode, and the native integer widths (see
+:func:`.target.is_native_ctx`).  Any other context whose values a ``double``
+holds with two digits to spare -- `FP16`, `BF16`, `TF32`, the MX formats, a
+fixed-point format off position zero -- is emulated in generated code instead:
+
+1. the operation is computed in ``double`` and its result made round-to-odd,
+   from the operation's exact error term (``TwoSum``, or an ``fma`` residual);
+2. that value is scaled so the context's last digit is the units digit,
+   rounded to an integral value in the context's mode, and scaled back.
+
+Every step is exact but the integral rounding, and rounding a round-to-odd
+value that has at least two more digits than the target is the same as
+rounding the exact value once -- so the result agrees with `Context.round` bit
+for bit.  What the context does at its edges (overflow, an infinity, a NaN, a
+negative zero) is then applied as the context states it, and
+:class:`Emulation` records those rules once per context.
+
+The error terms are exact only for operands whose every value a ``float``
+holds, or integers a ``double`` holds, which the emitter checks; a `round` or
+`cast` has no error term, so its operand may be any ``double``.
+"""
+
+import dataclasses
+import enum
+from fractions import Fraction
+
+from ...number import (
+    RM,
+    EFloatContext,
+    EFloatNanKind,
+    MPBFixedContext,
+    MPBFloatContext,
+    MPFixedContext,
+    OverflowMode,
+    RoundingDirection,
+)
+from ...number.context.context import Context
+
+__all__ = [
+    'Edge',
+    'Emulation',
+    'EmulationError',
+    'emulation_of',
+]
+
+MAX_PREC = 51
+"""Most significant digits an emulated context may have: two fewer than a
+``double``, so the round-to-odd value carries the two digits (2) needs."""
+
+MIN_EXP = -500
+"""Smallest last digit (``2 ** MIN_EXP``) of an emulated context.  Keeps the
+digit being rounded, and the error term of any ``float`` operation near it,
+well inside the normal range of a ``double``."""
+
+
+class EmulationError(Exception):
+    """Raised when a context cannot be emulated in ``double``."""
+
+
+@enum.unique
+class Edge(enum.Enum):
+    """What a value at an edge of an emulated context becomes."""
+    INF = 'inf'
+    """the correctly signed infinity"""
+    NAN = 'nan'
+    """a NaN"""
+    MAXVAL = 'maxval'
+    """the correctly signed largest finite value"""
+    WRAP = 'wrap'
+    """the value modulo the range of the format (fixed point only)"""
+    ASSERT = 'assert'
+    """nothing: `Context.round` raises"""
+
+
+@dataclasses.dataclass(frozen=True)
+class Emulation:
+    """
+    How to round under an emulated context `ctx` (see :mod:`.emulate`).
+
+    Values are rounded to `prec` significant digits (any number, for fixed
+    point), none below the digit `2 ** expmin`, under `rm`.  A rounded value
+    above `pos_maxval` or below `neg_maxval` overflows, becoming
+    `pos_overflow` or `neg_overflow`; an unbounded context has neither bound.
+    """
+
+    ctx: Context
+    prec: int | None
+    expmin: int
+    rm: RM
+    pos_maxval: Fraction | None
+    neg_maxval: Fraction | None
+    pos_overflow: Edge
+    neg_overflow: Edge
+    inf: Edge
+    """what an infinity becomes"""
+    nan: Edge
+    """what a NaN becomes"""
+    neg_zero: bool
+    """is a negative zero kept?"""
+
+    @property
+    def bounded(self) -> bool:
+        return self.pos_maxval is not None
+
+
+def _to_infinity(rm: RM, s: bool) -> bool:
+    """Does an overflow of sign `s` round to infinity (rather than to the
+    largest value) under `rm`?  Mirrors `_overflow_to_infinity`."""
+    _, direction = rm.to_direction(s)
+    return direction != RoundingDirection.RTZ
+
+
+def _efloat(ctx: EFloatContext) -> Emulation:
+    # `EFloatContext.round` rounds by an `MPBFloatContext` with both specials,
+    # then replaces what the format lacks (`_fixup`)
+    if ctx.nan_kind == EFloatNanKind.NONE:
+        raise EmulationError(
+            'it has no NaN, and what replaces one depends on the sign of the '
+            'NaN, which C++ arithmetic does not pin down'
+        )
+    inf = Edge.INF if ctx.enable_inf else Edge.NAN
+
+    def overflow(s: bool) -> Edge:
+        match ctx.overflow:
+            case OverflowMode.OVERFLOW:
+                return inf if _to_infinity(ctx.rm, s) else Edge.MAXVAL
+            case OverflowMode.SATURATE:
+                return Edge.MAXVAL
+            case _:
+                return Edge.ASSERT
+
+    return Emulation(
+        ctx=ctx,
+        prec=ctx.pmax,
+        expmin=ctx.expmin,
+        rm=ctx.rm,
+        pos_maxval=ctx.maxval(False).as_rational(),
+        neg_maxval=ctx.maxval(True).as_rational(),
+        pos_overflow=overflow(False),
+        neg_overflow=overflow(True),
+        inf=inf,
+        nan=Edge.NAN,
+        neg_zero=ctx.nan_kind != EFloatNanKind.NEG_ZERO,
+    )
+
+
+def _specials(ctx: MPBFloatContext | MPFixedContext | MPBFixedContext) -> tuple[Edge, Edge]:
+    """What an infinity and a NaN become, for a context that either has each or
+    refuses it."""
+    inf = Edge.INF if ctx.enable_inf else Edge.ASSERT
+    nan = Edge.NAN if ctx.enable_nan else Edge.ASSERT
+    return inf, nan
+
+
+def _overflow(ctx: MPBFloatContext | MPBFixedContext, s: bool, inf: Edge) -> Edge:
+    match ctx.overflow:
+        case OverflowMode.OVERFLOW:
+            return inf if _to_infinity(ctx.rm, s) else Edge.MAXVAL
+        case OverflowMode.SATURATE:
+            return Edge.MAXVAL
+        case OverflowMode.WRAP:
+            return Edge.WRAP
+        case _:
+            return Edge.ASSERT
+
+
+def _mpb_float(ctx: MPBFloatContext) -> Emulation:
+    inf, nan = _specials(ctx)
+    return Emulation(
+        ctx=ctx,
+        prec=ctx.pmax,
+        expmin=ctx.expmin,
+        rm=ctx.rm,
+        pos_maxval=ctx.pos_maxval.as_rational(),
+        neg_maxval=ctx.neg_maxval.as_rational(),
+        pos_overflow=_overflow(ctx, False, inf),
+        neg_overflow=_overflow(ctx, True, inf),
+        inf=inf,
+        nan=nan,
+        neg_zero=True,
+    )
+
+
+def _fixed(ctx: MPFixedContext | MPBFixedContext) -> Emulation:
+    inf, nan = _specials(ctx)
+    pos_maxval: Fraction | None
+    neg_maxval: Fraction | None
+    if isinstance(ctx, MPBFixedContext):
+        pos_maxval = ctx.pos_maxval.as_rational()
+        neg_maxval = ctx.neg_maxval.as_rational()
+        # the grid must be resolved at every magnitude short of overflow
+        if max(pos_maxval, -neg_maxval) >= Fraction(2) ** (ctx.nmin + 1 + MAX_PREC):
+            raise EmulationError(
+                f'it has more than {MAX_PREC} digits, '
+                'more than a `double` rounds exactly'
+            )
+        pos_overflow = _overflow(ctx, False, inf)
+        neg_overflow = _overflow(ctx, True, inf)
+    else:
+        pos_maxval = neg_maxval = None
+        pos_overflow = neg_overflow = Edge.ASSERT
+    return Emulation(
+        ctx=ctx,
+        prec=None,
+        expmin=ctx.nmin + 1,
+        rm=ctx.rm,
+        pos_maxval=pos_maxval,
+        neg_maxval=neg_maxval,
+        pos_overflow=pos_overflow,
+        neg_overflow=neg_overflow,
+        inf=inf,
+        nan=nan,
+        neg_zero=ctx.enable_neg_zero,
+    )
+
+
+def emulation_of(ctx: Context) -> Emulation:
+    """
+    How to emulate `ctx` in ``double``.
+
+    Raises :class:`EmulationError` for a context that is not a floating-point
+    or fixed-point one, or that cannot be emulated exactly: too many digits, a
+    digit too small, stochastic rounding, or a substitute value for NaN or an
+    infinity.
+    """
+    match ctx:
+        case EFloatContext() | MPBFloatContext() | MPFixedContext() | MPBFixedContext():
+            pass
+        case _:
+            raise EmulationError('it is not a floating-point or fixed-point context')
+
+    if ctx.num_randbits != 0:
+        raise EmulationError('its rounding is stochastic, and draws random bits')
+    if ctx.nan_value is not None or ctx.inf_value is not None:
+        raise EmulationError('it substitutes a value for NaN or an infinity')
+
+    match ctx:
+        case EFloatContext():
+            emu = _efloat(ctx)
+        case MPBFloatContext():
+            emu = _mpb_float(ctx)
+        case _:
+            emu = _fixed(ctx)
+
+    if emu.prec is not None and emu.prec > MAX_PREC:
+        raise EmulationError(
+            f'it has {emu.prec} digits, '
+            f'more than a `double` rounds exactly ({MAX_PREC})'
+        )
+    if emu.expmin < MIN_EXP:
+        raise EmulationError(
+            f'its smallest digit, 2 ** {emu.expmin}, is too small '
+            'to round exactly in `double`'
+        )
+    if (
+        emu.pos_maxval is not None
+        and emu.neg_maxval is not None
+        and max(emu.pos_maxval, -emu.neg_maxval) >= Fraction(2) ** -MIN_EXP
+    ):
+        raise EmulationError('its largest value is too large to round exactly in `double`')
+    return emu
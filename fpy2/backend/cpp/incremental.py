@@ -0,0 +1,136 @@
+"""
+cpp backend: incremental recompilation.
+
+Emitting a spec is a function of the spec's AST, whether compiled code calls
+it, the ABIs and escape summaries of its callees, and the compiler's options.
+A :class:`SpecCache` stores each spec's :class:`SpecResult` under a key over
+exactly these inputs, so a rebuilt module only re-analyzes and re-emits the
+specs whose inputs changed: an edited function, and a caller whose view of it
+(its ABI or summary) changed.
+
+The AST is keyed by its structural :func:`~fpy2.ast.fingerprint`, which
+covers the context and argument formats ``Specialize`` writes into it.
+"""
+
+import functools
+import hashlib
+import importlib.metadata
+import os
+import pickle
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from ...utils import LRUCache, cache_dir, write_atomic
+
+if TYPE_CHECKING:
+    from .compiler import SpecResult
+
+__all__ = [
+    'SpecCache',
+]
+
+
+@functools.cache
+def _cache_salt() -> bytes:
+    """
+    Distinguishes results emitted by different implementations:
+    the fpy2 version and the source of every module of the package,
+    since emitting a spec depends on the analyses, the transforms,
+    and the number library, not only the backend.
+    """
+    try:
+        version = importlib.metadata.version('fpy2')
+    except importlib.metadata.PackageNotFoundError:
+        version = 'unknown'
+    h = hashlib.sha256()
+    h.update(version.encode())
+    root = Path(__file__).parent.parent.parent
+    for path in sorted(root.rglob('*.py')):
+        h.update(str(path.relative_to(root)).encode() + b'\0')
+        h.update(path.read_bytes())
+    return h.digest()
+
+
+class SpecCache:
+    """
+    Per-spec results of :class:`CppCompiler`, keyed on everything that decides
+    them (see :mod:`.incremental`).
+
+    Results are kept in memory, and with `persist=True` also on disk under
+    `path` (by default, `cache_dir('cpp', 'specs')`), so a later process
+    compiling the same specs can reuse them.
+
+    Example:
+    ```
+    compiler = CppCompiler(spec_cache=SpecCache())
+    compiler.compile_module(m)
+    # ... edit one function in `m`
+    compiler.compile_module(m)  # only re-emits the edited spec (and callers
+                                # whose view of it changed)
+    ```
+    """
+
+    persist: bool
+    hits: int
+    """lookups that found a result"""
+    misses: int
+    """lookups that found no result"""
+
+    _path: Path | None
+    _memory: LRUCache[str, 'SpecResult']
+
+    def __init__(
+        self,
+        path: str | os.PathLike | None = None,
+        *,
+        persist: bool = True,
+        maxsize: int | None = 4096
+    ):
+        self.persist = persist
+        self.hits = 0
+        self.misses = 0
+        self._path = None if path is None else Path(path)
+        self._memory = LRUCache(maxsize)
+
+    def key(self, *parts: str) -> str:
+        """Returns the key over `parts`, salted with the implementation."""
+        h = hashlib.sha256(_cache_salt())
+        for part in parts:
+            h.update(b'\0' + part.encode())
+        return h.hexdigest()
+
+    def get(self, key: str) -> 'SpecResult | None':
+        """Returns the result stored under `key`, if any."""
+        result = self._memory.get(key)
+        if result is None and self.persist:
+            result = self._load(self._file(key))
+            if result is not None:
+                self._memory[key] = result
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def put(self, key: str, result: 'SpecResult'):
+        """Stores `result` under `key`."""
+        self._memory[key] = result
+        if self.persist:
+            path = self._file(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(path, pickle.dumps(result))
+
+    def clear(self):
+        """Removes every result held in memory; the counters are kept."""
+        self._memory.clear()
+
+    def _file(self, key: str) -> Path:
+        root = cache_dir('cpp', 'specs') if self._path is None else self._path
+        return root / f'{key}.pickle'
+
+    def _load(self, path: Path) -> 'SpecResult | None':
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
@@ -18,8 +18,13 @@ The module also exposes:
   conversion the type-level test refuses.
 - :func:`exact_integer_bits` — a float rung's exact-integer width, for
   diagnosing a refused conversion.
+- :func:`magnitude_bound` — the largest finite magnitude a value stored
+  in a scalar can have.
 """
 
+import math
+from fractions import Fraction
+
 from ...analysis.format_infer import (
     AbstractableFormat,
     AbstractFormat,
@@ -41,6 +46,7 @@ from ...number import (
     UINT16,
     UINT32,
     UINT64,
+    RealFloat,
 )
 from ...number.context.mp_fixed import MPFixedFormat
 from ...number.context.real import REAL_FORMAT
@@ -113,6 +119,33 @@ def bound_fits_in_scalar(bound: FormatBound, ty: CppScalar) -> bool:
     return af is not None and af <= _LADDER_LOOKUP[ty]
 
 
+def _largest_magnitude(af: AbstractFormat) -> Fraction | None:
+    bounds = []
+    for b in (af.pos_bound, af.neg_bound):
+        if isinstance(b, RealFloat):
+            bounds.append(abs(b.as_rational()))
+        elif math.isinf(b):
+            return None
+        else:
+            bounds.append(abs(Fraction(b)))
+    return max(bounds)
+
+
+def magnitude_bound(bound: FormatBound, ty: CppScalar) -> Fraction | None:
+    """The largest magnitude of a finite value stored in *ty* that *bound*
+    admits -- the tighter of the two -- or ``None`` for ``BOOL``."""
+    if ty is CppScalar.BOOL:
+        return None
+    limit = _largest_magnitude(_LADDER_LOOKUP[ty])
+    if isinstance(bound, AbstractableFormat | SetFormat):
+        af = _to_abstract(bound)
+        if af is not None:
+            tighter = _largest_magnitude(af)
+            if tighter is not None and (limit is None or tighter < limit):
+                limit = tighter
+    return limit
+
+
 class StorageSelectionError(Exception):
     """Raised when no storage type contains the inferred format."""
 
@@ -0,0 +1,22 @@
+"""
+Benchmark suite for FPy.
+
+Run it with `python -m fpy2.bench` (see `--help`): the results are
+written as JSON and, with `--baseline`, compared against a previous run.
+"""
+
+from .compare import Change, Comparison, compare
+from .suite import (
+    OPS,
+    SECTIONS,
+    BenchResults,
+    Corpus,
+    Metric,
+    bench_cpp,
+    bench_import,
+    bench_interpret,
+    bench_ops,
+    default_corpus,
+    run_benchmarks,
+    standard_contexts,
+)
@@ -0,0 +1,92 @@
+"""
+Runs the FPy benchmark suite.
+
+Example:
+```
+python -m fpy2.bench -o baseline.json
+python -m fpy2.bench -o current.json --baseline baseline.json --threshold ops=0.25
+```
+Exits with status 1 if a metric regressed against the baseline.
+"""
+
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
+from .compare import compare
+from .suite import OPS, SECTIONS, BenchResults, run_benchmarks, standard_contexts
+
+
+def _parse_threshold(s: str) -> tuple[str | None, float]:
+    # either `0.1` or `<prefix>=0.1`
+    prefix, sep, value = s.rpartition('=')
+    return (prefix if sep else None), float(value)
+
+def main(argv: list[str] | None = None) -> int:
+    parser = ArgumentParser(prog='python -m fpy2.bench', description='runs the FPy benchmark suite')
+    parser.add_argument('sections', nargs='*', metavar='section',
+                        help=f'sections to run: {", ".join(SECTIONS)} (default: all)')
+    parser.add_argument('-o', '--output', type=Path, help='write the results to this JSON file')
+    parser.add_argument('--baseline', type=Path, help='compare against results in this JSON file')
+    parser.add_argument('--threshold', action='append', default=[], metavar='[PREFIX=]T',
+                        help='relative change tolerated before a metric regresses (default: 0.1); '
+                             'with a prefix, only for metrics under it, e.g., `ops.add=0.25`')
+    parser.add_argument('--corpus', type=Path, nargs='+', help='FPy source files to interpret and compile')
+    parser.add_argument('--contexts', nargs='+', choices=sorted(standard_contexts()), metavar='CTX',
+                        help='contexts measured by `ops` (default: every standard context)')
+    parser.add_argument('--ops', nargs='+', choices=list(OPS), help='operations measured by `ops`')
+    parser.add_argument('--repeat', type=int, default=3, help='measurements per benchmark; the best is kept')
+    parser.add_argument('--time-limit', type=float, default=1.0,
+                        help='skip programs that take longer (in seconds) to interpret once')
+    parser.add_argument('-v', '--verbose', action='store_true', help='report every metric and comparison')
+    args = parser.parse_args(argv)
+
+    threshold = 0.1
+    thresholds: dict[str, float] = {}
+    for s in args.threshold:
+        try:
+            prefix, value = _parse_threshold(s)
+        except ValueError:
+            parser.error(f'invalid threshold `{s}`')
+        if prefix is None:
+            threshold = value
+        else:
+            thresholds[prefix] = value
+    for section in args.sections:
+        if section not in SECTIONS:
+            parser.error(f'unknown section `{section}`, expected one of {", ".join(SECTIONS)}')
+    if args.repeat < 1:
+        parser.error(f'expected --repeat >= 1, got {args.repeat}')
+
+    baseline = None if args.baseline is None else BenchResults.load(args.baseline)
+    contexts = None
+    if args.contexts is not None:
+        all_contexts = standard_contexts()
+        contexts = { name: all_contexts[name] for name in args.contexts }
+
+    log = (lambda msg: print(f'[bench] {msg}', file=sys.stderr)) if args.verbose else None
+    results = run_benchmarks(
+        args.sections or SECTIONS,
+        corpus=args.corpus,
+        contexts=contexts,
+        op_names=args.ops,
+        repeat=args.repeat,
+        time_limit=args.time_limit,
+        log=log
+    )
+
+    if args.output is not None:
+        results.save(args.output)
+    if args.verbose or args.output is None:
+        print(results.report())
+
+    if baseline is not None:
+        comparison = compare(baseline, results, threshold=threshold, thresholds=thresholds)
+        print(comparison.report(verbose=args.verbose))
+        if comparison.regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
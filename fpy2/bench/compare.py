@@ -0,0 +1,146 @@
+"""
+Comparison of benchmark results against a baseline.
+"""
+
+from dataclasses import dataclass
+
+from .suite import BenchResults
+
+__all__ = [
+    'Change',
+    'Comparison',
+    'compare',
+]
+
+
+@dataclass(frozen=True)
+class Change:
+    """The change of one metric from the baseline."""
+
+    name: str
+    """metric name"""
+
+    baseline: float
+    """value in the baseline"""
+
+    current: float
+    """value in the current results"""
+
+    slowdown: float
+    """
+    factor by which the metric got worse: `baseline / current` for
+    a throughput, `current / baseline` for a time (< 1 if it improved)
+    """
+
+    threshold: float
+    """the relative change tolerated for this metric"""
+
+    @property
+    def regressed(self) -> bool:
+        return self.slowdown > 1 + self.threshold
+
+    @property
+    def improved(self) -> bool:
+        return self.slowdown * (1 + self.threshold) < 1
+
+
+@dataclass
+class Comparison:
+    """Changes of the metrics of two benchmark runs."""
+
+    changes: list[Change]
+    """metrics measured in both runs"""
+
+    missing: list[str]
+    """metrics of the baseline that were not measured"""
+
+    added: list[str]
+    """metrics that the baseline does not have"""
+
+    @property
+    def regressions(self) -> list[Change]:
+        return [c for c in self.changes if c.regressed]
+
+    @property
+    def improvements(self) -> list[Change]:
+        return [c for c in self.changes if c.improved]
+
+    def report(self, verbose: bool = False) -> str:
+        """
+        Returns a table of the regressions and improvements
+        (every change, if `verbose`), followed by a summary.
+        """
+        changes = self.changes if verbose else self.regressions + self.improvements
+        width = max((len(c.name) for c in changes), default=0)
+        lines = []
+        for c in sorted(changes, key=lambda c: c.slowdown, reverse=True):
+            if c.regressed:
+                status = 'REGRESSED'
+            elif c.improved:
+                status = 'improved'
+            else:
+                status = ''
+            if c.slowdown < 1:
+                speedup = 1 / c.slowdown if c.slowdown > 0 else float('inf')
+                change = f'{speedup:>6.3f}x faster'
+            else:
+                change = f'{c.slowdown:>6.3f}x slower'
+            lines.append(
+                f'{c.name:<{width}}  {c.baseline:>12.6g} -> {c.current:<12.6g}  '
+                f'{change}  {status}'.rstrip()
+            )
+        lines.append(
+            f'{len(self.regressions)} regressed, {len(self.improvements)} improved, '
+            f'{len(self.changes)} compared, {len(self.missing)} missing, {len(self.added)} new'
+        )
+        return '\n'.join(lines)
+
+
+def _threshold(name: str, default: float, thresholds: dict[str, float]) -> float:
+    """The threshold of the longest prefix of `name` (by components) in `thresholds`."""
+    parts = name.split('.')
+    for i in range(len(parts), 0, -1):
+        prefix = '.'.join(parts[:i])
+        if prefix in thresholds:
+            return thresholds[prefix]
+    return default
+
+def compare(
+    baseline: BenchResults,
+    current: BenchResults,
+    *,
+    threshold: float = 0.1,
+    thresholds: dict[str, float] | None = None
+) -> Comparison:
+    """
+    Compares `current` against `baseline`.
+
+    A metric regresses if it is worse than its baseline by more than
+    its threshold, e.g., with `threshold=0.1`, a throughput that
+    drops below `1 / 1.1` of the baseline, or a time that grows
+    past `1.1` times the baseline.  `thresholds` overrides `threshold`
+    by metric name or prefix, e.g., `{'ops': 0.25, 'import.fpy2': 0.5}`;
+    the longest matching prefix applies.
+    """
+    if thresholds is None:
+        thresholds = {}
+    for t in [threshold, *thresholds.values()]:
+        if t < 0:
+            raise ValueError(f'Expected a threshold >= 0, got {t}')
+
+    changes: list[Change] = []
+    missing: list[str] = []
+    for name, base in baseline.metrics.items():
+        cur = current.metrics.get(name)
+        if cur is None:
+            missing.append(name)
+            continue
+        if base.higher_is_better:
+            slowdown = base.value / cur.value if cur.value > 0 else float('inf')
+        else:
+            slowdown = cur.value / base.value if base.value > 0 else float('inf')
+        t = _threshold(name, threshold, thresholds)
+        changes.append(Change(name, base.value, cur.value, slowdown, t))
+
+    added = [name for name in current.metrics if name not in baseline.metrics]
+    return Comparison(changes, missing, added)
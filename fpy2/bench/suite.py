@@ -0,0 +1,527 @@
+"""
+Benchmarks of FPy itself.
+
+Each section measures one part of FPy and adds named metrics to a
+`BenchResults`:
+- `ops`: throughput of rounded operations under each standard context;
+- `interpret`: throughput of the bytecode interpreter over a corpus
+  of FPy programs (by default, the FPBench corpus in `examples/`);
+- `cpp`: time to parse, analyze, and compile the corpus with `CppCompiler`;
+- `import`: time to import `fpy2`.
+"""
+
+import functools
+import importlib.util
+import json
+import os
+import platform
+import random
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any
+
+from .. import ops
+from ..ast.fpyast import (
+    AnyTypeAnn,
+    BoolTypeAnn,
+    ListTypeAnn,
+    RealTypeAnn,
+    TupleTypeAnn,
+    TypeAnn,
+)
+from ..backend import CppCompiler
+from ..function import Function
+from ..interpret import BytecodeInterpreter
+from ..module import Module
+from ..number import FP64, Context
+from ..number import context as _context
+from ..types import BoolType, ListType, RealType, TupleType, Type
+from ..utils.loader import CachingSourceFileLoader
+
+__all__ = [
+    'OPS',
+    'SECTIONS',
+    'BenchResults',
+    'Corpus',
+    'Metric',
+    'bench_cpp',
+    'bench_import',
+    'bench_interpret',
+    'bench_ops',
+    'default_corpus',
+    'run_benchmarks',
+    'standard_contexts',
+]
+
+
+@dataclass(frozen=True)
+class Metric:
+    """A measured quantity."""
+
+    value: float
+    """measured value"""
+
+    unit: str
+    """unit of `value`, e.g., `op/s` or `s`"""
+
+    higher_is_better: bool
+    """is a larger value an improvement?"""
+
+
+@dataclass
+class BenchResults:
+    """Results of a benchmark run."""
+
+    metrics: dict[str, Metric] = field(default_factory=dict)
+    """metrics by name, e.g., `ops.add.FP64`"""
+
+    skipped: dict[str, list[str]] = field(default_factory=dict)
+    """for each metric, what was left out of it (and why)"""
+
+    meta: dict[str, Any] = field(default_factory=dict)
+    """description of the machine and the run"""
+
+    def add(self, name: str, metric: Metric, skipped: list[str] | None = None):
+        self.metrics[name] = metric
+        if skipped:
+            self.skipped[name] = skipped
+
+    def to_json(self) -> dict:
+        """Returns the results as a JSON-compatible dictionary."""
+        return {
+            'meta': self.meta,
+            'metrics': {
+                name: { 'value': m.value, 'unit': m.unit, 'higher_is_better': m.higher_is_better }
+                for name, m in self.metrics.items()
+            },
+            'skipped': self.skipped,
+        }
+
+    @staticmethod
+    def from_json(data: dict) -> 'BenchResults':
+        """Reads results written by `to_json`."""
+        metrics = {
+            name: Metric(float(m['value']), m['unit'], bool(m['higher_is_better']))
+            for name, m in data['metrics'].items()
+        }
+        return BenchResults(metrics, dict(data.get('skipped', {})), dict(data.get('meta', {})))
+
+    def save(self, path: str | os.PathLike):
+        """Writes the results to `path` as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.to_json(), f, indent=2)
+            f.write('\n')
+
+    @staticmethod
+    def load(path: str | os.PathLike) -> 'BenchResults':
+        """Reads results written by `save`."""
+        with open(path) as f:
+            return BenchResults.from_json(json.load(f))
+
+    def report(self) -> str:
+        """Returns a table of the metrics."""
+        width = max((len(name) for name in self.metrics), default=0)
+        lines = []
+        for name, m in self.metrics.items():
+            line = f'{name:<{width}}  {m.value:>14.6g} {m.unit}'
+            if name in self.skipped:
+                line += f'  ({len(self.skipped[name])} skipped)'
+            lines.append(line)
+        return '\n'.join(lines)
+
+
+def _best_of(fn: Callable[[], Any], repeat: int) -> float:
+    """Returns the least time of `repeat` calls to `fn`."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _apply_all(fn: Callable, args: list[tuple]):
+    for a in args:
+        fn(*a)
+
+
+class _Timeout(Exception):
+    pass
+
+@contextmanager
+def _time_limit(seconds: float | None):
+    """
+    Raises `_Timeout` in the body after `seconds`.
+    Only enforced on the main thread of platforms with `SIGALRM`.
+    """
+    if (
+        seconds is None
+        or not hasattr(signal, 'SIGALRM')
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise _Timeout()
+
+    old = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, old)
+
+
+###########################################################
+# Operations
+
+OPS: dict[str, Callable] = {
+    'add': ops.add,
+    'sub': ops.sub,
+    'mul': ops.mul,
+    'div': ops.div,
+    'sqrt': ops.sqrt,
+    'fma': ops.fma,
+}
+"""operations measured by `bench_ops`, by name"""
+
+def standard_contexts() -> dict[str, Context]:
+    """The standard contexts of `fpy2.number.context` (e.g., `FP64`), by name."""
+    return {
+        name: ctx for name, ctx in vars(_context).items()
+        if name.isupper() and isinstance(ctx, Context)
+    }
+
+def bench_ops(
+    results: BenchResults,
+    *,
+    contexts: dict[str, Context] | None = None,
+    op_names: Iterable[str] | None = None,
+    number: int = 200,
+    repeat: int = 5,
+    seed: int = 1
+):
+    """
+    Measures the throughput of each operation in `OPS` (or `op_names`)
+    under each context of `standard_contexts()` (or `contexts`),
+    bound to the context with `ops.bind`.
+
+    Each measurement evaluates `number` operations on arguments
+    already rounded under the context; the best of `repeat`
+    measurements is kept.  An operation not supported under
+    a context is skipped.
+    """
+    if contexts is None:
+        contexts = standard_contexts()
+    if op_names is None:
+        op_names = OPS
+    op_names = list(op_names)
+    for name in op_names:
+        if name not in OPS:
+            raise ValueError(f'unknown operation `{name}`, expected one of {list(OPS)}')
+
+    rng = random.Random(seed)
+    values = [rng.uniform(1.0, 2.0) for _ in range(3 * number)]
+    for ctx_name, ctx in contexts.items():
+        xs = [ctx.round(v) for v in values]
+        for op_name in op_names:
+            op = OPS[op_name]
+            fn = ops.bind(op, ctx)
+            arity = op.__code__.co_argcount - 1
+            args = [tuple(xs[i + j * number] for j in range(arity)) for i in range(number)]
+            run = functools.partial(_apply_all, fn, args)
+
+            metric = f'ops.{op_name}.{ctx_name}'
+            try:
+                run()
+            except (NotImplementedError, ValueError, TypeError) as e:
+                results.skipped[metric] = [f'{type(e).__name__}: {e}']
+                continue
+            t = _best_of(run, repeat)
+            results.add(metric, Metric(number / t, 'op/s', True))
+
+
+###########################################################
+# Corpus
+
+def default_corpus() -> list[Path]:
+    """
+    The FPBench corpus of the FPy repository (`examples/fpbench`),
+    or nothing if FPy is not run from a checkout.
+    """
+    root = Path(__file__).resolve().parent.parent.parent / 'examples' / 'fpbench'
+    return sorted(root.glob('*.py'))
+
+
+@dataclass
+class Corpus:
+    """FPy programs loaded from Python source files."""
+
+    functions: dict[str, list[Function]]
+    """FPy functions, by file name (without suffix)"""
+
+    load_seconds: dict[str, float]
+    """time to load each file, mostly parsing FPy functions"""
+
+    failed: dict[str, str]
+    """files that could not be loaded, with the error"""
+
+    @staticmethod
+    def load(paths: Iterable[str | os.PathLike]) -> 'Corpus':
+        """Loads each file in `paths` as a module."""
+        corpus = Corpus({}, {}, {})
+        for i, path in enumerate(map(Path, paths)):
+            name = path.stem
+            mod_name = f'_fpy2_bench_corpus_{i}_{name}'
+            # FPy reparses the source of each function, so the source
+            # must be kept as it is loaded (see `fpy2.utils.loader`)
+            loader = CachingSourceFileLoader(mod_name, str(path))
+            spec = importlib.util.spec_from_file_location(mod_name, path, loader=loader)
+            assert spec is not None
+            mod = importlib.util.module_from_spec(spec)
+            sys.modules[mod_name] = mod
+            try:
+                start = time.perf_counter()
+                loader.exec_module(mod)
+                elapsed = time.perf_counter() - start
+            except Exception as e:  # noqa: BLE001 -- recorded in `failed`
+                del sys.modules[mod_name]
+                corpus.failed[name] = f'{type(e).__name__}: {e}'.splitlines()[0]
+                continue
+
+            corpus.functions[name] = [v for v in vars(mod).values() if isinstance(v, Function)]
+            corpus.load_seconds[name] = elapsed
+        return corpus
+
+
+def _arg_value(ann: TypeAnn, length: int):
+    """An argument of type `ann`: reals are `1.0`, lists have `length` elements."""
+    match ann:
+        case AnyTypeAnn() | RealTypeAnn():
+            return 1.0
+        case BoolTypeAnn():
+            return True
+        case ListTypeAnn():
+            n = ann.length if isinstance(ann.length, int) else length
+            return [_arg_value(ann.elt, length) for _ in range(n)]
+        case TupleTypeAnn():
+            return tuple(_arg_value(elt, length) for elt in ann.elts)
+        case _:
+            raise NotImplementedError(f'cannot generate an argument of type `{ann}`')
+
+def _arg_type(ann: TypeAnn, ctx: Context) -> Type:
+    """The type of an argument of type `ann` whose reals are in `ctx`."""
+    match ann:
+        case AnyTypeAnn() | RealTypeAnn():
+            return RealType(ctx)
+        case BoolTypeAnn():
+            return BoolType()
+        case ListTypeAnn():
+            return ListType(_arg_type(ann.elt, ctx), ann.length)
+        case TupleTypeAnn():
+            return TupleType(*(_arg_type(elt, ctx) for elt in ann.elts))
+        case _:
+            raise NotImplementedError(f'cannot compile an argument of type `{ann}`')
+
+
+###########################################################
+# Interpreter
+
+def bench_interpret(
+    results: BenchResults,
+    corpus: Corpus,
+    *,
+    ctx: Context = FP64,
+    repeat: int = 3,
+    time_limit: float | None = 1.0,
+    length: int = 3
+):
+    """
+    Measures the throughput of `BytecodeInterpreter` over each file
+    of `corpus`, in programs evaluated per second.
+
+    Each program is evaluated under `ctx` with every real argument
+    `1.0` and every list argument of `length` elements; the best of
+    `repeat` evaluations is kept, after one to compile it.
+    A program that fails, or that takes longer than `time_limit`
+    seconds to evaluate once, is skipped.
+    """
+    for name, funcs in corpus.functions.items():
+        rt = BytecodeInterpreter()
+        total = 0.0
+        evaluated = 0
+        skipped: list[str] = []
+        for func in funcs:
+            try:
+                args = [_arg_value(arg.type, length) for arg in func.args]
+                with _time_limit(time_limit):
+                    rt.eval(func, args, ctx=ctx)
+            except _Timeout:
+                skipped.append(f'{func.name}: exceeded {time_limit}s')
+                continue
+            except Exception as e:  # noqa: BLE001 -- reported as skipped
+                skipped.append(f'{func.name}: {type(e).__name__}')
+                continue
+            total += _best_of(functools.partial(rt.eval, func, args, ctx=ctx), repeat)
+            evaluated += 1
+
+        if evaluated > 0:
+            results.add(f'interpret.{name}', Metric(evaluated / total, 'prog/s', True), skipped)
+
+
+###########################################################
+# C++ backend
+
+def bench_cpp(
+    results: BenchResults,
+    corpus: Corpus,
+    *,
+    ctx: Context = FP64,
+    repeat: int = 1
+):
+    """
+    Measures `CppCompiler` over each file of `corpus`, in seconds:
+    - `parse`: loading the file (parsing each FPy function);
+    - `specialize`: the module-level transforms and specialization;
+    - `analyze`: the analyses of each specialized function;
+    - `compile`: the whole pipeline, through emitting C++.
+
+    Each program is compiled as an entry under `ctx` with the reals
+    of its arguments in `ctx`.  A program the compiler rejects is
+    skipped from every phase.
+    """
+    compiler = CppCompiler()
+    for name, funcs in corpus.functions.items():
+        phases = { 'specialize': 0.0, 'analyze': 0.0, 'compile': 0.0 }
+        compiled = 0
+        skipped: list[str] = []
+        for func in funcs:
+            try:
+                arg_types = [_arg_type(arg.type, ctx) for arg in func.args]
+                module = Module()
+                module.add(func, ctx=ctx, arg_types=arg_types)
+                compiler.compile_module(module)
+            except Exception as e:  # noqa: BLE001 -- reported as skipped
+                skipped.append(f'{func.name}: {type(e).__name__}')
+                continue
+
+            specs = [(f,) for f in compiler.specialize(module)]
+            phases['specialize'] += _best_of(functools.partial(compiler.specialize, module), repeat)
+            phases['analyze'] += _best_of(functools.partial(_apply_all, compiler.analyze, specs), repeat)
+            phases['compile'] += _best_of(functools.partial(compiler.compile_module, module), repeat)
+            compiled += 1
+
+        if name in corpus.load_seconds:
+            results.add(f'cpp.{name}.parse', Metric(corpus.load_seconds[name], 's', False))
+        if compiled > 0:
+            for phase, seconds in phases.items():
+                results.add(f'cpp.{name}.{phase}', Metric(seconds, 's', False), skipped)
+
+
+###########################################################
+# Import
+
+def bench_import(results: BenchResults, *, repeat: int = 5):
+    """Measures the time to import `fpy2` in a new interpreter."""
+    script = 'import time; t = time.perf_counter(); import fpy2; print(time.perf_counter() - t)'
+    env = dict(os.environ)
+    root = str(Path(__file__).resolve().parent.parent.parent)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [root, env.get('PYTHONPATH')]))
+    best = float('inf')
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, '-c', script],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        best = min(best, float(out.stdout.strip().splitlines()[-1]))
+    results.add('import.fpy2', Metric(best, 's', False))
+
+
+###########################################################
+# Driver
+
+SECTIONS = ('ops', 'interpret', 'cpp', 'import')
+"""sections of the benchmark suite"""
+
+def _meta() -> dict[str, Any]:
+    try:
+        fpy2_version = version('fpy2')
+    except PackageNotFoundError:
+        fpy2_version = None
+    return {
+        'fpy2': fpy2_version,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'date': datetime.now(UTC).isoformat(timespec='seconds'),
+    }
+
+def run_benchmarks(
+    sections: Iterable[str] = SECTIONS,
+    *,
+    corpus: Iterable[str | os.PathLike] | None = None,
+    contexts: dict[str, Context] | None = None,
+    op_names: Iterable[str] | None = None,
+    repeat: int = 3,
+    time_limit: float | None = 1.0,
+    log: Callable[[str], None] | None = None
+) -> BenchResults:
+    """
+    Runs the given `sections` of the benchmark suite (see `SECTIONS`).
+
+    The `interpret` and `cpp` sections run over the files in `corpus`
+    (by default, `default_corpus()`); `contexts` and `op_names` select
+    what the `ops` section measures.
+    """
+    sections = list(sections)
+    for section in sections:
+        if section not in SECTIONS:
+            raise ValueError(f'unknown section `{section}`, expected one of {list(SECTIONS)}')
+
+    def info(msg: str):
+        if log is not None:
+            log(msg)
+
+    results = BenchResults(meta=_meta())
+    results.meta['sections'] = sections
+
+    loaded: Corpus | None = None
+    if 'interpret' in sections or 'cpp' in sections:
+        paths = default_corpus() if corpus is None else [Path(p) for p in corpus]
+        info(f'loading {len(paths)} corpus files')
+        loaded = Corpus.load(paths)
+        for name, err in loaded.failed.items():
+            info(f'failed to load `{name}`: {err}')
+        results.meta['corpus'] = [str(p) for p in paths]
+        results.meta['corpus_failed'] = loaded.failed
+
+    for section in sections:
+        info(f'running `{section}`')
+        match section:
+            case 'ops':
+                bench_ops(results, contexts=contexts, op_names=op_names, repeat=repeat)
+            case 'interpret':
+                assert loaded is not None
+                bench_interpret(results, loaded, repeat=repeat, time_limit=time_limit)
+            case 'cpp':
+                assert loaded is not None
+                bench_cpp(results, loaded)
+            case 'import':
+                bench_import(results, repeat=max(repeat, 3))
+    return results
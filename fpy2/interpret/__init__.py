@@ -1,7 +1,8 @@
 """Interpreters for FPy."""
 
-from .byte import BytecodeInterpreter
+from .byte import BytecodeCache, BytecodeInterpreter
 from .interpreter import Interpreter, get_default_interpreter, set_default_interpreter
+from .profiler import Profiler
 from .value import Foreign, RealValue, ScalarValue, Value
 
 set_default_interpreter(BytecodeInterpreter())
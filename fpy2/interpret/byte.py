@@ -5,24 +5,38 @@ Interpreter backed by Python bytecode.
 import ast as pyast
 import copy
 import functools
+import hashlib
+import importlib.metadata
+import importlib.util
 import inspect
+import marshal
+import os
 import sys
-from collections.abc import Callable
+from collections.abc import Callable, Hashable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
 from fractions import Fraction
-from typing import Any
+from pathlib import Path
+from types import CodeType
+from typing import TYPE_CHECKING, Any
 
 from .. import ops
 from ..analysis.define_use import DefineUse
+from ..ast.fingerprint import Fingerprinter
 from ..ast.fpyast import *
 from ..ast.visitor import Visitor
 from ..env import ForeignEnv
+from ..fpc_context import NoSuchContextError
 from ..function import Function
 from ..number import FP64, INTEGER, REAL, Float, RealFloat
 from ..primitive import Primitive
-from ..utils import Gensym, is_dyadic
+from ..utils import Gensym, LRUCache, cache_dir, is_dyadic, write_atomic
 from .interpreter import Interpreter, get_default_interpreter
+from .profiler import Profiler, ProfileSite
 from .value import Foreign, RealValue, Value, from_value, to_value, unwrap_foreign
 
+if TYPE_CHECKING:
+    from .optimize import Optimizer
+
 ###########################################################
 # Runtime
 
@@ -536,6 +550,12 @@ _NARY_TABLE: dict[type[NaryOp], object] = {
     Empty: ops.empty,
 }
 
+_UNROUNDED_OPS: frozenset[type[Expr]] = frozenset([
+    IsFinite, IsInf, IsNan, IsNormal, Signbit,
+    Dim, Fst, Snd, Enumerate, Size, Empty,
+])
+"""operations in the tables that do not round a result"""
+
 ###########################################################
 # Eval namespace
 
@@ -574,28 +594,98 @@ def make_namespace() -> dict[str, object]:
 
     return namespace
 
+def _link(func: FuncDef, env: ForeignEnv, code: CodeType, foreign_vals: dict[str, object]):
+    # inject runtime symbols
+    namespace = make_namespace()
+    # add free variables to the namespace
+    for var in func.free_vars:
+        name = str(var)
+        namespace[name] = to_value(env[name])
+    # add foreign values to the namespace
+    namespace.update(foreign_vals)
+    # return the function object
+    exec(code, namespace)  # noqa: S102 -- executing generated FPy bytecode is the interpreter's purpose
+    return namespace[func.name]
+
 ###########################################################
 # Bytecode compiler
 
 class BytecodeCompiler(Visitor):
     """
     Compiler that compiles FPy AST to Python bytecode.
+
+    With `specialize`, an operation whose rounding context is known
+    at compile time (see `ContextUse`) calls a version of itself bound
+    to that context (see `ops.bind`) instead of passing `__ctx__`.
+    With a `profiler`, the function and each operation record their
+    calls in it (see `Profiler`).  The bound and recording operations
+    are kept in `bound_ops`.
     """
 
     func: FuncDef
     env: ForeignEnv
     gensym: Gensym
     foreign_vals: dict[str, object]
-
-    def __init__(self, func: FuncDef, env: ForeignEnv):
+    foreign_sites: dict[str, ForeignVal]
+    bound_ops: dict[str, Callable]
+    profiler: Profiler | None
+
+    def __init__(
+        self,
+        func: FuncDef,
+        env: ForeignEnv,
+        *,
+        specialize: bool = True,
+        profiler: Profiler | None = None,
+    ):
         self.func = func
         self.env = env
         # reserve the program's own names: a bare `fresh('__fpy_cmp')` would
         # otherwise return that very name and shadow a source variable
         self.gensym = Gensym(reserved=DefineUse.analyze(func).names())
         self.foreign_vals = {}
+        self.foreign_sites = {}
+        self.bound_ops = {}
+        self.profiler = profiler
+        self._bound_names: dict[tuple[type, int], str] = {}
+        self._use_to_ctx = self._static_contexts(func) if specialize else {}
+        self._func_site = self._profile_site(func.loc, func.name)
+
+    @staticmethod
+    def _static_contexts(func: FuncDef) -> dict[Expr, Context]:
+        """Maps each operation under a context known at compile time to that context."""
+        # imported here: partial evaluation depends on this package
+        from ..analysis.context_use import ContextUse
+        try:
+            info = ContextUse.analyze(func)
+        except NoSuchContextError:
+            # an FPCore context with no counterpart fails when it is entered
+            return {}
+        return {
+            use: scope.ctx
+            for use, scope in info.use_to_scope.items()
+            if isinstance(scope.ctx, Context)
+        }
 
     def compile(self):
+        fn = self.link(self.compile_code(), self.foreign_vals)
+        if self.profiler is not None:
+            fn = self.profiler.wrap_function(self._func_site, fn)
+        return fn
+
+    def _profile_site(self, loc: Location | None, name: str, func: ProfileSite | None = None):
+        if loc is None:
+            return ProfileSite(self._location_to_name(loc), 0, 0, name, func)
+        return ProfileSite(loc.source, loc.start_line, loc.start_column, name, func)
+
+    def compile_code(self) -> CodeType:
+        """
+        Compiles the function to a module code object.
+
+        The code refers to each foreign value by a name recorded in
+        `foreign_vals` (and its node in `foreign_sites`), so the code
+        object itself holds no foreign values.
+        """
         # compile the function to a Python AST
         ast = self._visit_function(self.func, None)
         # print(pyast.unparse(ast))
@@ -603,18 +693,11 @@ class BytecodeCompiler(Visitor):
         mod = pyast.Module(body=[ast], type_ignores=[])
         # compile the Python AST to bytecode
         source_name = self._location_to_name(self.func.loc)
-        code = compile(mod, filename=source_name, mode='exec')
-        # inject runtime symbols
-        namespace = make_namespace()
-        # add free variables to the namespace
-        for var in self.func.free_vars:
-            name = str(var)
-            namespace[name] = to_value(self.env[name])
-        # add foreign values to the namespace
-        namespace.update(self.foreign_vals)
-        # return the function object
-        exec(code, namespace)  # noqa: S102 -- executing generated FPy bytecode is the interpreter's purpose
-        return namespace[self.func.name]
+        return compile(mod, filename=source_name, mode='exec')
+
+    def link(self, code: CodeType, foreign_vals: dict[str, object]) -> Callable:
+        """Executes `code` from `compile_code` and returns the function object."""
+        return _link(self.func, self.env, code, foreign_vals | self.bound_ops)
 
     def _location_to_name(self, loc: Location | None) -> str:
         return '<unknown>' if loc is None else loc.source
@@ -675,6 +758,7 @@ class BytecodeCompiler(Visitor):
         # create a fresh name for the foreign value and add it to the namespace
         name = str(self.gensym.fresh('__fpy_foreign'))
         self.foreign_vals[name] = to_value(e.val)
+        self.foreign_sites[name] = e
 
         # lookup the identifier
         attrs = self._location_to_attributes(e.loc)
@@ -695,14 +779,46 @@ class BytecodeCompiler(Visitor):
     def _visit_digits(self, e: Digits, ctx: None):
         return self._rational_to_ast(e)
 
+    def _op_call(self, e: Expr, fn: object, args: list[pyast.expr], attrs) -> pyast.Call:
+        """
+        Calls `fn`, the operation of `e`, on `args`: bound to the context
+        of `e` when it is known, otherwise with `__ctx__`.
+        """
+        ctx = self._use_to_ctx.get(e)
+        op_name = type(e).__name__
+        keywords: list[pyast.keyword] = []
+        if ctx is None:
+            ctx_val = pyast.Name(id=CTX_NAME, ctx=pyast.Load(), **attrs)
+            keywords.append(pyast.keyword(arg='ctx', value=ctx_val, **attrs))
+
+        if self.profiler is not None:
+            # one recording operation per site
+            site = self._profile_site(e.loc, op_name, self._func_site)
+            rounds = type(e) not in _UNROUNDED_OPS
+            if ctx is None:
+                op = self.profiler.wrap_op(site, fn, rounds)  # type: ignore[arg-type]
+            else:
+                op = self.profiler.wrap_op(site, ops.bind(fn, ctx), rounds, ctx)  # type: ignore[arg-type]
+            name = str(self.gensym.fresh(f'__fpy_prof_{op_name}'))
+            self.bound_ops[name] = op
+        elif ctx is None:
+            name = f'__fpy_{op_name}'
+        else:
+            # by identity: a context need not be hashable
+            key = (type(e), id(ctx))
+            name = self._bound_names.get(key)  # type: ignore[assignment]
+            if name is None:
+                name = str(self.gensym.fresh(f'__fpy_bound_{op_name}'))
+                self.bound_ops[name] = ops.bind(fn, ctx)  # type: ignore[arg-type]
+                self._bound_names[key] = name
+
+        func = pyast.Name(id=name, ctx=pyast.Load(), **attrs)
+        return pyast.Call(func=func, args=args, keywords=keywords, **attrs)
+
     def _visit_nullaryop(self, e: NullaryOp, ctx: None):
         if type(e) in _NULLARY_TABLE:
-            name = f'__fpy_{type(e).__name__}'
             attrs = self._location_to_attributes(e.loc)
-            func = pyast.Name(id=name, ctx=pyast.Load(), **attrs)
-            ctx_val = pyast.Name(id=CTX_NAME, ctx=pyast.Load(), **attrs)
-            ctx_kw = pyast.keyword(arg='ctx', value=ctx_val, **attrs)
-            return pyast.Call(func=func, args=[], keywords=[ctx_kw], **attrs)
+            return self._op_call(e, _NULLARY_TABLE[type(e)], [], attrs)
         else:
             raise NotImplementedError(f'unsupported nullary operation: {type(e).__name__}')
 
@@ -711,11 +827,7 @@ class BytecodeCompiler(Visitor):
         attrs = self._location_to_attributes(e.loc)
 
         if type(e) in _UNARY_TABLE:
-            name = f'__fpy_{type(e).__name__}'
-            func = pyast.Name(id=name, ctx=pyast.Load(), **attrs)
-            ctx_val = pyast.Name(id=CTX_NAME, ctx=pyast.Load(), **attrs)
-            ctx_kw = pyast.keyword(arg='ctx', value=ctx_val, **attrs)
-            return pyast.Call(func=func, args=[arg], keywords=[ctx_kw], **attrs)
+            return self._op_call(e, _UNARY_TABLE[type(e)], [arg], attrs)
 
         match e:
             case Not():
@@ -751,11 +863,7 @@ class BytecodeCompiler(Visitor):
         attrs = self._location_to_attributes(e.loc)
 
         if type(e) in _BINARY_TABLE:
-            name = f'__fpy_{type(e).__name__}'
-            func = pyast.Name(id=name, ctx=pyast.Load(), **attrs)
-            ctx_val = pyast.Name(id=CTX_NAME, ctx=pyast.Load(), **attrs)
-            ctx_kw = pyast.keyword(arg='ctx', value=ctx_val, **attrs)
-            return pyast.Call(func=func, args=[arg1, arg2], keywords=[ctx_kw], **attrs)
+            return self._op_call(e, _BINARY_TABLE[type(e)], [arg1, arg2], attrs)
 
         match e:
             case Range2():
@@ -772,11 +880,7 @@ class BytecodeCompiler(Visitor):
         attrs = self._location_to_attributes(e.loc)
 
         if type(e) in _TERNARY_TABLE:
-            name = f'__fpy_{type(e).__name__}'
-            func = pyast.Name(id=name, ctx=pyast.Load(), **attrs)
-            ctx_val = pyast.Name(id=CTX_NAME, ctx=pyast.Load(), **attrs)
-            ctx_kw = pyast.keyword(arg='ctx', value=ctx_val, **attrs)
-            return pyast.Call(func=func, args=[arg1, arg2, arg3], keywords=[ctx_kw], **attrs)
+            return self._op_call(e, _TERNARY_TABLE[type(e)], [arg1, arg2, arg3], attrs)
 
         match e:
             case Range3():
@@ -789,11 +893,7 @@ class BytecodeCompiler(Visitor):
         attrs = self._location_to_attributes(e.loc)
         args = [self._visit_expr(arg, ctx) for arg in e.args]
         if type(e) in _NARY_TABLE:
-            name = f'__fpy_{type(e).__name__}'
-            func = pyast.Name(id=name, ctx=pyast.Load(), **attrs)
-            ctx_val = pyast.Name(id=CTX_NAME, ctx=pyast.Load(), **attrs)
-            ctx_kw = pyast.keyword(arg='ctx', value=ctx_val, **attrs)
-            return pyast.Call(func=func, args=args, keywords=[ctx_kw], **attrs)
+            return self._op_call(e, _NARY_TABLE[type(e)], args, attrs)
 
         match e:
             case And():
@@ -1169,19 +1269,207 @@ class BytecodeCompiler(Visitor):
                 **attrs
             )   
 
+###########################################################
+# Persistent cache
+
+@functools.cache
+def _cache_salt() -> bytes:
+    """
+    Distinguishes code objects produced by different compilers:
+    the Python bytecode format, the fpy2 version, and this module.
+    """
+    try:
+        version = importlib.metadata.version('fpy2')
+    except importlib.metadata.PackageNotFoundError:
+        version = 'unknown'
+    h = hashlib.sha256()
+    h.update(importlib.util.MAGIC_NUMBER)
+    h.update(version.encode())
+    with open(__file__, 'rb') as f:
+        h.update(f.read())
+    return h.digest()
+
+
+def _foreign_positions(compiler: BytecodeCompiler, foreigns: list[ForeignVal]):
+    """
+    Pairs each foreign value name of `compiler` with the position of its
+    node in `foreigns`, as recorded by a `Fingerprinter`.
+    """
+    index = { id(e): i for i, e in enumerate(foreigns) }
+    return tuple((name, index[id(e)]) for name, e in compiler.foreign_sites.items())
+
+def _relink_foreign(sites: tuple[tuple[str, int], ...], foreigns: list[ForeignVal]):
+    """Inverse of `_foreign_positions` for a structurally identical function."""
+    return { name: to_value(foreigns[i].val) for name, i in sites }
+
+
+class BytecodeCache:
+    """
+    On-disk cache of compiled functions, shared across processes.
+
+    Entries are keyed by the structural fingerprint of the function,
+    including source locations since they are part of the code object.
+    Each entry stores the code object, via `marshal`, and the position
+    of each foreign value in the function, so that foreign values are
+    taken from the function being loaded rather than the one compiled.
+    For the same reason, cached code is not specialized to the contexts
+    of the function (see `BytecodeCompiler`).
+    """
+
+    path: Path
+
+    def __init__(self, path: str | os.PathLike | None = None):
+        if path is None:
+            self.path = cache_dir('bytecode')
+        else:
+            self.path = Path(path)
+            self.path.mkdir(parents=True, exist_ok=True)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({str(self.path)!r})'
+
+    def compile(self, func: FuncDef, env: ForeignEnv) -> Callable:
+        """Compiles `func`, reusing the cached code object if any."""
+        fp = Fingerprinter(loc=True, foreign=False)
+        key = hashlib.sha256(_cache_salt() + fp.digest(func).encode()).hexdigest()
+        path = self.path / f'{key}.bin'
+
+        try:
+            code, sites = marshal.loads(path.read_bytes())
+            return _link(func, env, code, _relink_foreign(sites, fp.foreigns))
+        except FileNotFoundError:
+            pass
+        except (EOFError, ValueError, TypeError, IndexError):
+            # unreadable entry: overwrite it
+            pass
+
+        # generic code: a context bound at compile time would be
+        # reused by a function whose foreign values differ
+        compiler = BytecodeCompiler(func, env, specialize=False)
+        code = compiler.compile_code()
+        sites = _foreign_positions(compiler, fp.foreigns)
+        write_atomic(path, marshal.dumps((code, sites)))
+        return compiler.link(code, compiler.foreign_vals)
+
+    def clear(self):
+        """Removes every entry."""
+        for path in self.path.glob('*.bin'):
+            path.unlink(missing_ok=True)
+
+
 ###########################################################
 # Interpreter
 
+@dataclass(frozen=True)
+class _FuncEntry:
+    """Cached compilation of a function."""
+    ast: FuncDef
+    """the function as compiled, after optimization"""
+    fn: Callable
+
+
+@dataclass(frozen=True)
+class _ExprEntry:
+    """Cached compilation of an expression."""
+    code: CodeType
+    sites: tuple[tuple[str, int], ...]
+    fn: Callable
+
+
 class BytecodeInterpreter(Interpreter):
     """
     Interpreter that compiles to Python bytecode and executes it.
-    """
 
-    func_cache: dict[FuncDef, Callable]
+    Compiled functions (by `FuncDef`) and expressions (by structure and
+    free variables) share `func_cache`, which holds at most `cache_size`
+    entries (`None` for unbounded). With a `disk_cache`, compiled
+    functions are also shared across processes.
+
+    With `opt_level` above 0, or an explicit list of `passes`, each
+    function is optimized before it is compiled (see `.optimized`);
+    the optimized function is cached with its compiled code, and the
+    time spent in each pass is accumulated in `optimizer.stats`.
+
+    With a `profiler`, each function records its time and that of its
+    operations in it (see `Profiler`); profiled code is not cached on disk.
+    """
 
-    def __init__(self, ctx: Context | None = None):
+    func_cache: LRUCache[Hashable, Any]
+    disk_cache: BytecodeCache | None
+    optimizer: 'Optimizer | None'
+    profiler: Profiler | None
+
+    def __init__(
+        self,
+        ctx: Context | None = None,
+        *,
+        disk_cache: BytecodeCache | None = None,
+        cache_size: int | None = 1024,
+        opt_level: int = 0,
+        passes: Iterable[str] | None = None,
+        profiler: Profiler | None = None,
+    ):
         super().__init__(ctx=ctx)
-        self.func_cache = {}
+        self.func_cache = LRUCache(cache_size)
+        self.disk_cache = disk_cache
+        self.profiler = profiler
+        self.optimizer = None
+        if passes is not None or opt_level != 0:
+            # imported here: the transforms depend on this package
+            from .optimize import Optimizer
+            if passes is not None:
+                self.optimizer = Optimizer(passes)
+            else:
+                self.optimizer = Optimizer.for_level(opt_level)
+
+    def _compile_entry(self, func: Function) -> _FuncEntry:
+        """Optimizes and compiles `func`, reusing a cached compilation."""
+        entry: _FuncEntry | None = self.func_cache.get(func.ast)
+        if entry is None:
+            ast = func.ast if self.optimizer is None else self.optimizer.run(func.ast)
+            if self.disk_cache is None or self.profiler is not None:
+                fn = BytecodeCompiler(ast, func.env, profiler=self.profiler).compile()
+            else:
+                fn = self.disk_cache.compile(ast, func.env)
+            entry = _FuncEntry(ast, fn)
+            self.func_cache[func.ast] = entry
+        return entry
+
+    def _compile(self, func: Function) -> Callable:
+        """Compiles `func` to bytecode, reusing a cached compilation."""
+        return self._compile_entry(func).fn
+
+    def optimized(self, func: Function) -> FuncDef:
+        """Returns `func` as this interpreter compiles it, after optimization."""
+        if not isinstance(func, Function):
+            raise TypeError(f'Expected Function, got `{func}`')
+        return self._compile_entry(func).ast
+
+    def _compile_expr(self, expr: Expr, ast: FuncDef, names: list[NamedId]) -> Callable:
+        """
+        Compiles `ast`, the function form of `expr`, reusing the code of
+        a structurally identical expression over the same free variables.
+        """
+        fp = Fingerprinter(foreign=False)
+        key = (fp.digest(expr), tuple(names))
+        entry: _ExprEntry | None = self.func_cache.get(key)
+        if entry is None:
+            # generic code: partial evaluation, which decides what is
+            # specialized, evaluates its expressions through here
+            compiler = BytecodeCompiler(ast, ast.env, specialize=False)
+            code = compiler.compile_code()
+            fn = compiler.link(code, compiler.foreign_vals)
+            self.func_cache[key] = _ExprEntry(code, _foreign_positions(compiler, fp.foreigns), fn)
+            return fn
+        elif entry.sites:
+            # foreign values belong to this expression:
+            # relink in a copy of the namespace it was linked in
+            namespace = dict(entry.fn.__globals__)
+            namespace.update(_relink_foreign(entry.sites, fp.foreigns))
+            exec(entry.code, namespace)  # noqa: S102 -- executing generated FPy bytecode is the interpreter's purpose
+            return namespace[ast.name]
+        else:
+            return entry.fn
 
     def _expr_to_func(self, expr: Expr, env: dict[NamedId, Any]):
         """
@@ -1214,12 +1502,7 @@ class BytecodeInterpreter(Interpreter):
         if not isinstance(func, Function):
             raise TypeError(f'Expected Function, got `{func}`')
         # compile the function to bytecode
-        if func.ast in self.func_cache:
-            fn = self.func_cache[func.ast]
-        else:
-            compiler = BytecodeCompiler(func.ast, func.env)
-            fn = compiler.compile()
-            self.func_cache[func.ast] = fn
+        fn = self._compile(func)
         # compute the context to use during evaluation
         ctx = self._func_ctx(func.ast, ctx)
         if convert:
@@ -1228,6 +1511,22 @@ class BytecodeInterpreter(Interpreter):
         res = fn(*args, __ctx__=ctx)
         return from_value(res) if convert else res
 
+    def eval_batch(
+        self, func: Function, arg_batches: Sequence[Iterable], ctx: Context | None = None,
+    ) -> Iterator:
+        # Compilation, context resolution, and the arity check are done
+        # once for the whole batch; only argument and result conversion
+        # remain per call.
+        if not isinstance(func, Function):
+            raise TypeError(f'Expected Function, got `{func}`')
+        if len(arg_batches) != len(func.args):
+            raise TypeError(f'Expected {len(func.args)} argument columns, got {len(arg_batches)}')
+        return self._eval_batch(self._compile(func), arg_batches, self._func_ctx(func.ast, ctx))
+
+    def _eval_batch(self, fn: Callable, arg_batches: Sequence[Iterable], ctx: Context):
+        for args in zip(*arg_batches, strict=True):
+            yield from_value(fn(*map(to_value, args), __ctx__=ctx))
+
     def eval_expr(self, expr: Expr, env: dict[NamedId, Any], ctx: Context):
         # Always converts: the only caller is `PartialEval`, whose environment
         # holds analysis-time values rather than a running FPy program's, so
@@ -1237,8 +1536,7 @@ class BytecodeInterpreter(Interpreter):
         # convert the expression to a function definition
         ast, names = self._expr_to_func(expr, env)
         # compile the function to bytecode
-        compiler = BytecodeCompiler(ast, ast.env)
-        fn = compiler.compile()
+        fn = self._compile_expr(expr, ast, names)
         # compute the context to use during evaluation
         ctx = self._func_ctx(ast, ctx)
         # call the function with the given arguments
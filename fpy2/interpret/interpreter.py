@@ -3,6 +3,7 @@ Defines the abstract base class for FPy interpreters.
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator, Sequence
 from typing import Any
 
 from ..ast.fpyast import Expr, FuncDef, NamedId
@@ -40,6 +41,21 @@ class Interpreter(ABC):
         """
         ...
 
+    def eval_batch(
+        self, func: Function, arg_batches: Sequence[Iterable], ctx: Context | None = None,
+    ) -> Iterator:
+        """
+        Evaluates a function `func` over a batch of inputs under
+        a rounding context `ctx`.
+
+        `arg_batches` holds one column per parameter of `func`;
+        the i-th call receives the i-th element of every column.
+        Results are yielded lazily, in order.
+        All columns must have the same length.
+        """
+        for args in zip(*arg_batches, strict=True):
+            yield self.eval(func, args, ctx)
+
     @abstractmethod
     def eval_expr(self, expr: Expr, env: dict[NamedId, Any], ctx: Context):
         """
@@ -0,0 +1,155 @@
+"""
+Optimizing tier of the bytecode interpreter.
+
+An :class:`Optimizer` runs a pipeline of semantics-preserving transforms over
+a function before it is compiled to bytecode.  The pipeline runs once per
+function, and the interpreter caches its result with the compiled code.
+"""
+
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+from ..analysis import AnalysisManager, CallGraphError, FPySyntaxError, TypeInferError
+from ..ast.fpyast import FuncDef
+from ..fpc_context import NoSuchContextError
+from ..transform import (
+    ConstFold,
+    CopyPropagate,
+    DeadCodeEliminate,
+    ForUnroll,
+    RoundElim,
+    TransformError,
+)
+
+__all__ = [
+    'OPT_LEVELS',
+    'PASSES',
+    'Optimizer',
+    'PassStats',
+]
+
+
+def _round_elim(func: FuncDef) -> tuple[FuncDef, bool]:
+    out = RoundElim.apply(func)
+    return out, out is not func
+
+
+def _for_unroll(func: FuncDef) -> tuple[FuncDef, bool]:
+    out = ForUnroll.apply(func)
+    return out, out is not func
+
+
+PASSES: dict[str, Callable[[FuncDef], tuple[FuncDef, bool]]] = {
+    'const_fold': ConstFold.apply_with_status,
+    'copy_propagate': CopyPropagate.apply_with_status,
+    'dead_code': DeadCodeEliminate.apply_with_status,
+    'round_elim': _round_elim,
+    'for_unroll': _for_unroll,
+}
+"""passes by name: each returns the transformed function and whether it changed"""
+
+_SIMPLIFY = ('const_fold', 'copy_propagate', 'dead_code')
+
+OPT_LEVELS: dict[int, tuple[str, ...]] = {
+    0: (),
+    1: _SIMPLIFY,
+    # `RoundElim` leaves temporaries behind for the cleanup to fold away
+    2: (*_SIMPLIFY, 'round_elim', *_SIMPLIFY),
+}
+"""pipeline of each optimization level"""
+
+_DECLINED = (CallGraphError, FPySyntaxError, NoSuchContextError, TransformError, TypeInferError)
+"""errors with which a pass rejects a function it cannot transform"""
+
+
+@dataclass
+class PassStats:
+    """Accumulated statistics of one pass."""
+
+    runs: int = 0
+    """number of times the pass ran (a pass may appear twice in a pipeline)"""
+
+    changed: int = 0
+    """number of runs that changed the function"""
+
+    declined: int = 0
+    """number of runs that rejected the function, leaving it unchanged"""
+
+    seconds: float = 0.0
+    """total time spent in the pass"""
+
+
+class Optimizer:
+    """
+    Runs a pipeline of passes, by name (see `PASSES`), over a function.
+
+    Passes run once each, in order.  Time spent in each pass is
+    accumulated in `stats`.  All passes of one run share their analyses
+    through an `AnalysisManager`.
+
+    A pass that rejects the function, e.g., because it fails type
+    inference, leaves it as it was: the program may still run, and if it
+    fails, the interpreter reports it where it fails.  Any other error
+    raised by a pass is a bug in the pass and is not caught.
+
+    Example:
+    ```
+    opt = Optimizer.for_level(2)
+    ast = opt.run(f.ast)
+    print(opt.report())
+    ```
+    """
+
+    passes: tuple[str, ...]
+    stats: dict[str, PassStats]
+
+    def __init__(self, passes: Iterable[str]):
+        self.passes = tuple(passes)
+        for name in self.passes:
+            if name not in PASSES:
+                raise ValueError(f'unknown pass `{name}`, expected one of {list(PASSES)}')
+        self.stats = { name: PassStats() for name in self.passes }
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({list(self.passes)!r})'
+
+    @staticmethod
+    def for_level(level: int) -> 'Optimizer':
+        """Returns an optimizer running the pipeline of `level` (see `OPT_LEVELS`)."""
+        if level not in OPT_LEVELS:
+            raise ValueError(f'unknown optimization level {level}, expected one of {list(OPT_LEVELS)}')
+        return Optimizer(OPT_LEVELS[level])
+
+    def run(self, func: FuncDef) -> FuncDef:
+        """Returns `func` transformed by the pipeline."""
+        if not isinstance(func, FuncDef):
+            raise TypeError(f'Expected `FuncDef`, got {type(func)} for {func}')
+        with AnalysisManager():
+            for name in self.passes:
+                stats = self.stats[name]
+                start = time.perf_counter()
+                try:
+                    func, changed = PASSES[name](func)
+                except _DECLINED:
+                    changed = False
+                    stats.declined += 1
+                stats.seconds += time.perf_counter() - start
+                stats.runs += 1
+                stats.changed += changed
+        return func
+
+    def reset(self):
+        """Clears the accumulated statistics."""
+        self.stats = { name: PassStats() for name in self.passes }
+
+    def report(self) -> str:
+        """Returns a table of the accumulated statistics, one row per pass."""
+        width = max((len(name) for name in self.stats), default=4)
+        lines = [f'{"pass":<{width}}  {"runs":>6}  {"changed":>7}  {"declined":>8}  {"ms":>10}']
+        for name, stats in self.stats.items():
+            lines.append(
+                f'{name:<{width}}  {stats.runs:>6}  {stats.changed:>7}  '
+                f'{stats.declined:>8}  {stats.seconds * 1000:>10.3f}'
+            )
+        return '\n'.join(lines)
@@ -0,0 +1,284 @@
+"""
+Source-level profiler for the bytecode interpreter.
+
+A :class:`Profiler` attributes time, call counts, and rounding counts
+to the FPy functions and operations that incur them, identified by
+their source location.  Code compiled for a profiling interpreter
+calls each operation through a wrapper that records it.
+"""
+
+import marshal
+import os
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from ..number import Context
+
+__all__ = [
+    'ProfileSite',
+    'Profiler',
+    'SiteStats',
+]
+
+
+@dataclass(frozen=True)
+class ProfileSite:
+    """A profiled location: an FPy function or an operation in one."""
+
+    source: str
+    """source file"""
+
+    line: int
+    """line number"""
+
+    column: int
+    """column number"""
+
+    name: str
+    """function name, or operation name (e.g., `Add`)"""
+
+    func: 'ProfileSite | None' = None
+    """for an operation, the function it is in"""
+
+    def __str__(self):
+        return f'{self.source}:{self.line}:{self.column}({self.name})'
+
+
+@dataclass
+class SiteStats:
+    """Accumulated statistics of one site."""
+
+    calls: int = 0
+    """number of evaluations"""
+
+    seconds: float = 0.0
+    """total time: the operation itself, or all of the function (including its callees)"""
+
+    roundings: dict[str, int] = field(default_factory=dict)
+    """number of roundings by context"""
+
+    callers: dict[ProfileSite | None, list] = field(default_factory=dict)
+    """for a function, calls and time by calling function (`None` from Python)"""
+
+    def _clear(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.roundings.clear()
+        self.callers.clear()
+
+
+class Profiler:
+    """
+    Profiler for FPy programs run by a `BytecodeInterpreter`.
+
+    Statistics accumulate in `sites`, by `ProfileSite`.  The time of an
+    operation excludes the evaluation of its arguments; the time of a
+    function includes everything it calls.  `report` summarizes them
+    by operation and by source line, and `dump_stats` writes them in the
+    format of `pstats`, as does `cProfile`.
+
+    Example:
+    ```
+    prof = Profiler()
+    rt = BytecodeInterpreter(profiler=prof)
+    rt.eval(f, args)
+    print(prof.report())
+    ```
+
+    A call from one FPy function to another is evaluated by the callee's
+    interpreter (see `Function.runtime`), usually the default interpreter,
+    so set the profiling interpreter as the default to profile callees.
+    """
+
+    sites: dict[ProfileSite, SiteStats]
+    stats: dict
+    """statistics in the format of `pstats`, after `create_stats`"""
+
+    def __init__(self):
+        self.sites = {}
+        self.stats = {}
+        self._stack: list[ProfileSite] = []
+        self._ctx_names: dict[int, tuple[Context, str]] = {}
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(sites={len(self.sites)})'
+
+    def _site_stats(self, site: ProfileSite) -> SiteStats:
+        stats = self.sites.get(site)
+        if stats is None:
+            stats = SiteStats()
+            self.sites[site] = stats
+        return stats
+
+    def _ctx_name(self, ctx: Context) -> str:
+        # by identity: contexts need not be hashable, and `str` is slow;
+        # the context is kept so that its identity is not reused
+        entry = self._ctx_names.get(id(ctx))
+        if entry is None:
+            entry = (ctx, str(ctx))
+            self._ctx_names[id(ctx)] = entry
+        return entry[1]
+
+    def wrap_op(self, site: ProfileSite, fn: Callable, rounds: bool, ctx: Context | None = None) -> Callable:
+        """
+        Returns `fn`, an operation at `site`, recording each call.
+        With `ctx`, `fn` is bound to it; otherwise the result takes `ctx`
+        as a keyword argument, as `fn` does.
+        """
+        stats = self._site_stats(site)
+        clock = time.perf_counter
+
+        def op_ctx(*args, ctx: Context):
+            start = clock()
+            try:
+                return fn(*args, ctx=ctx)
+            finally:
+                stats.seconds += clock() - start
+                stats.calls += 1
+                if rounds:
+                    name = self._ctx_name(ctx)
+                    stats.roundings[name] = stats.roundings.get(name, 0) + 1
+
+        if ctx is None:
+            return op_ctx
+
+        ctx_name = self._ctx_name(ctx)
+
+        def op_bound(*args):
+            start = clock()
+            try:
+                return fn(*args)
+            finally:
+                stats.seconds += clock() - start
+                stats.calls += 1
+                if rounds:
+                    stats.roundings[ctx_name] = stats.roundings.get(ctx_name, 0) + 1
+
+        return op_bound
+
+    def wrap_function(self, site: ProfileSite, fn: Callable) -> Callable:
+        """Returns `fn`, a compiled FPy function at `site`, recording each call."""
+        stats = self._site_stats(site)
+        stack = self._stack
+        clock = time.perf_counter
+
+        def call(*args, **kwargs):
+            caller = stack[-1] if stack else None
+            stack.append(site)
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                stack.pop()
+                stats.seconds += elapsed
+                stats.calls += 1
+                entry = stats.callers.get(caller)
+                if entry is None:
+                    stats.callers[caller] = [1, elapsed]
+                else:
+                    entry[0] += 1
+                    entry[1] += elapsed
+
+        call.__name__ = getattr(fn, '__name__', site.name)
+        call.__qualname__ = getattr(fn, '__qualname__', site.name)
+        return call
+
+    def reset(self):
+        """Clears the accumulated statistics."""
+        # in place: compiled code holds on to each `SiteStats`
+        for stats in self.sites.values():
+            stats._clear()
+        self.stats = {}
+
+    def by_line(self) -> dict[tuple[str, int], SiteStats]:
+        """Statistics of the operations, summed over each source line."""
+        lines: dict[tuple[str, int], SiteStats] = {}
+        for site, stats in self.sites.items():
+            if site.func is None:
+                continue
+            total = lines.setdefault((site.source, site.line), SiteStats())
+            total.calls += stats.calls
+            total.seconds += stats.seconds
+            for name, n in stats.roundings.items():
+                total.roundings[name] = total.roundings.get(name, 0) + n
+        return lines
+
+    def report(self, limit: int | None = 20) -> str:
+        """
+        Returns tables of the functions, the operations, and the source
+        lines, each with at most `limit` rows, most time first.
+        """
+        def rows(items):
+            items = sorted(items, key=lambda kv: kv[1].seconds, reverse=True)
+            return items if limit is None else items[:limit]
+
+        def roundings(stats: SiteStats) -> str:
+            return ', '.join(f'{name}: {n}' for name, n in stats.roundings.items())
+
+        def table(title: str, items: list[tuple[str, SiteStats]]) -> list[str]:
+            width = max((len(where) for where, _ in items), default=0)
+            width = max(width, len('location'))
+            lines = [title, f'{"calls":>9}  {"ms":>10}  {"us/call":>9}  {"location":<{width}}  roundings']
+            for where, stats in items:
+                per_call = stats.seconds / stats.calls * 1e6 if stats.calls else 0.0
+                lines.append(
+                    f'{stats.calls:>9}  {stats.seconds * 1000:>10.3f}  {per_call:>9.2f}  '
+                    f'{where:<{width}}  {roundings(stats)}'.rstrip()
+                )
+            return lines
+
+        funcs = [(str(site), s) for site, s in self.sites.items() if site.func is None]
+        ops = [(str(site), s) for site, s in self.sites.items() if site.func is not None]
+        lines = [(f'{source}:{line}', s) for (source, line), s in self.by_line().items()]
+        return '\n'.join([
+            *table('functions (including callees)', rows(funcs)), '',
+            *table('operations', rows(ops)), '',
+            *table('lines (operations only)', rows(lines)),
+        ])
+
+    @staticmethod
+    def _pstats_key(site: ProfileSite) -> tuple[str, int, str]:
+        if site.func is None:
+            return (site.source, site.line, site.name)
+        return (site.source, site.line, f'{site.name}:{site.column}')
+
+    def create_stats(self):
+        """
+        Computes `stats` in the format of `pstats`, so that a `Profiler`
+        can be passed to `pstats.Stats` directly.
+        """
+        # time in each function not spent in its operations or callees
+        inner: dict[ProfileSite, float] = {}
+        for site, stats in self.sites.items():
+            if site.func is not None:
+                inner[site.func] = inner.get(site.func, 0.0) + stats.seconds
+            else:
+                for caller, (_, seconds) in stats.callers.items():
+                    if caller is not None:
+                        inner[caller] = inner.get(caller, 0.0) + seconds
+
+        self.stats = {}
+        for site, stats in self.sites.items():
+            if site.func is None:
+                tt = max(stats.seconds - inner.get(site, 0.0), 0.0)
+                callers = {
+                    self._pstats_key(caller): (n, n, seconds, seconds)
+                    for caller, (n, seconds) in stats.callers.items()
+                    if caller is not None
+                }
+            else:
+                tt = stats.seconds
+                func = self.sites.get(site.func)
+                callers = {} if func is None else {
+                    self._pstats_key(site.func): (stats.calls, stats.calls, tt, tt)
+                }
+            key = self._pstats_key(site)
+            self.stats[key] = (stats.calls, stats.calls, tt, stats.seconds, callers)
+
+    def dump_stats(self, path: str | os.PathLike):
+        """Writes the statistics to `path` in the format of `pstats`."""
+        self.create_stats()
+        with open(path, 'wb') as f:
+            marshal.dump(self.stats, f)
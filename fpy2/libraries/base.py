@@ -62,6 +62,7 @@ from ..number import (
     FixedContext,
     # number types
     Float,
+    FloatArray,
     IEEEContext,
     MPBFixedContext,
     MPBFloatContext,
@@ -54,9 +54,17 @@ from .context import (
     SMFixedContext,
 )
 
+# Instrumentation
+from .counters import (
+    RoundingCounters,
+    RoundingEvents,
+    get_rounding_counters,
+    set_rounding_counters,
+)
+
 # Miscellaneous
 from .native import default_float_convert, default_str_convert
-from .number import Float, Real, RealFloat, same_value
+from .number import Float, FloatArray, Real, RealFloat, same_value
 
 # Rounding
 from .round import OV, RM, OverflowMode, RoundingDirection, RoundingMode
@@ -2,7 +2,7 @@ from enum import IntEnum
 
 from ...utils import DEFAULT, DefaultOr, bitmask, default_repr, enum_repr
 from ..number import RNG, Float, RealFloat
-from ..round import OverflowMode, RoundingMode
+from ..round import OverflowMode, RoundingDirection, RoundingMode
 from .context import EncodableContext
 from .format import EncodableFormat
 from .mpb_float import MPBFloatContext, MPBFloatFormat
@@ -449,6 +449,9 @@ class EFloatContext(EncodableContext):
     _mpb_ctx: MPBFloatContext
     """precomputed context this one rounds through"""
 
+    _bits_params: tuple[int, int, int, int, int, int, int]
+    """precomputed constants for `round_to_bits` and `round_from_bits`"""
+
     def __init__(
         self,
         es: int,
@@ -512,6 +515,16 @@ class EFloatContext(EncodableContext):
             neg_maxval=self._fmt._mpb_fmt.neg_maxval, rng=rng,
         )
 
+        # bit-level rounding: precision, smallest exponent, mantissa size,
+        # largest normalized exponent, and the largest finite magnitudes
+        # (as encodings without the sign bit) by sign
+        pmax, expmin, emin, m = self._fmt.pmax, self._fmt.expmin, self._fmt.emin, self._fmt.m
+        self._bits_params = (
+            pmax, expmin, emin, self._fmt.emax, m,
+            _encode_magnitude(self._fmt._mpb_fmt.pos_maxval, pmax, expmin, emin, m),
+            _encode_magnitude(self._fmt._mpb_fmt.neg_maxval, pmax, expmin, emin, m),
+        )
+
     def __eq__(self, other):
         return (
             isinstance(other, EFloatContext)
@@ -680,6 +693,89 @@ class EFloatContext(EncodableContext):
         x._ctx = self
         return self._fixup(x)
 
+    def round_to_bits(self, s: bool, exp: int, c: int) -> int:
+        """
+        Rounds the finite value `(-1)^s * c * 2^exp` under this context
+        and returns the encoding of the result.
+
+        Equivalent to `self.encode(self.round(Float(s=s, exp=exp, c=c)))`
+        but computed with integer operations only, without constructing
+        any intermediate numbers.
+        """
+        if c < 0:
+            raise ValueError(f'c={c} must be non-negative')
+        if self.num_randbits != 0:
+            # stochastic rounding
+            return self.encode(self.round(Float(s=s, exp=exp, c=c)))
+
+        pmax, expmin, emin, emax, m, pos_mag, neg_mag = self._bits_params
+        sbit = (1 << (self.nbits - 1)) if s else 0
+        if c == 0:
+            return 0 if s and self.nan_kind == EFloatNanKind.NEG_ZERO else sbit
+
+        # step 1. round to `pmax` digits, but no lower than `expmin`
+        p = c.bit_length()
+        lsb = max(exp + p - pmax, expmin)
+        shift = lsb - exp
+        if shift <= 0:
+            q = c << -shift
+        else:
+            q = c >> shift
+            rem = c & ((1 << shift) - 1)
+            if rem != 0:
+                nearest, direction = self.rm.to_direction(s)
+                if nearest:
+                    half = 1 << (shift - 1)
+                    if rem > half:
+                        q += 1
+                    elif rem == half:
+                        q += _round_tie(q, direction)
+                else:
+                    q += _round_tie(q, direction)
+
+        # step 2. encode the magnitude
+        if q == 0:
+            return 0 if s and self.nan_kind == EFloatNanKind.NEG_ZERO else sbit
+        if q.bit_length() > pmax:
+            # carried into the next binade
+            q >>= 1
+            lsb += 1
+        e = lsb + q.bit_length() - 1
+        if e < emin:
+            mag = q
+        elif e > emax:
+            mag = -1
+        else:
+            mag = ((e - emin + 1) << m) | (q & bitmask(m))
+
+        # step 3. check for overflow
+        if mag < 0 or mag > (neg_mag if s else pos_mag):
+            return self.encode(self.round(Float(s=s, exp=exp, c=c)))
+        return sbit | mag
+
+    def round_from_bits(self, x: int) -> Float:
+        """
+        Decodes the encoding `x` as a number under this context.
+
+        Equivalent to `self.decode(x)`, the inverse of `round_to_bits`.
+        """
+        if not isinstance(x, int) or x < 0 or x >> self.nbits:
+            raise TypeError(f'Expected integer x={x} on [0, 2 ** {self.nbits})')
+        if self.num_randbits != 0:
+            return self.decode(x)
+
+        _, expmin, _, _, m, pos_mag, neg_mag = self._bits_params
+        s = (x >> (self.nbits - 1)) != 0
+        mag = x & bitmask(self.nbits - 1)
+        if mag > (neg_mag if s else pos_mag) or (s and mag == 0 and self.nan_kind == EFloatNanKind.NEG_ZERO):
+            # infinity or NaN
+            return self.decode(x)
+
+        ebits = mag >> m
+        if ebits == 0:
+            return Float(s=s, c=mag, exp=expmin, ctx=self)
+        return Float(s=s, c=(1 << m) | (mag & bitmask(m)), exp=expmin + ebits - 1, ctx=self)
+
     def zero(self, s: bool = False) -> Float:
         return Float(x=self._fmt.zero(s), ctx=self)
 
@@ -696,6 +792,34 @@ class EFloatContext(EncodableContext):
         return Float(x=self._fmt.max_normal(s), ctx=self)
 
 
+def _encode_magnitude(x: RealFloat, pmax: int, expmin: int, emin: int, m: int) -> int:
+    """Encodes `|x|`, a finite value of the format, without the sign bit."""
+    if x.is_zero():
+        return 0
+    if x.e < emin:
+        offset = x.exp - expmin
+        return x.c << offset if offset >= 0 else x.c >> -offset
+    offset = x.p - pmax
+    c = x.c >> offset if offset >= 0 else x.c << -offset
+    return ((x.e - emin + 1) << m) | (c & bitmask(m))
+
+def _round_tie(q: int, direction: RoundingDirection) -> int:
+    """
+    Returns the increment to the truncated significand `q`
+    for an inexact result rounded in `direction`.
+    """
+    match direction:
+        case RoundingDirection.RTZ:
+            return 0
+        case RoundingDirection.RAZ:
+            return 1
+        case RoundingDirection.RTE:
+            return q & 1
+        case RoundingDirection.RTO:
+            return 1 - (q & 1)
+        case _:
+            raise RuntimeError(f'unreachable: {direction}')
+
 def _format_is_valid(
     es: int,
     nbits: int,
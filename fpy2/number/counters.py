@@ -0,0 +1,242 @@
+"""
+Counters of exceptional events when rounding.
+
+Every `Float` records the exceptions raised when it was rounded
+(see `Flags`), but only for itself.  A `RoundingCounters` instance
+accumulates them across a run, by context and by operation, e.g.,
+to monitor how often a low-precision format overflows.
+
+Counting is opt-in: operations in `fpy2.ops` record each rounding
+only while counters are active (see `set_rounding_counters`).
+"""
+
+import threading
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, fields
+from typing import Self
+
+from ..utils import LRUCache
+from .context import Context
+from .number import Float
+from .number.flags import _DIVZERO, _INEXACT, _INVALID, _OVERFLOW, _TINY_POST
+
+__all__ = [
+    'RoundingCounters',
+    'RoundingEvents',
+    'get_rounding_counters',
+    'set_rounding_counters',
+]
+
+
+@dataclass
+class RoundingEvents:
+    """Numbers of roundings and of the exceptions they raised."""
+
+    roundings: int = 0
+    """number of roundings"""
+
+    inexact: int = 0
+    """number of inexact results"""
+
+    overflow: int = 0
+    """number of results that overflowed"""
+
+    underflow: int = 0
+    """number of results that underflowed (tiny after rounding and inexact)"""
+
+    invalid: int = 0
+    """number of invalid operations"""
+
+    divzero: int = 0
+    """number of divisions by zero"""
+
+    def __iadd__(self, other: 'RoundingEvents') -> Self:
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+        return self
+
+    def __add__(self, other: 'RoundingEvents') -> 'RoundingEvents':
+        result = RoundingEvents()
+        result += self
+        result += other
+        return result
+
+
+# columns of an entry of `RoundingCounters._counts`
+_ROUNDINGS, _INEXACT_N, _OVERFLOW_N, _UNDERFLOW_N, _INVALID_N, _DIVZERO_N = range(6)
+
+_CTX_NAMES_MAXSIZE = 256
+"""maximum number of context names cached by `RoundingCounters`"""
+
+class RoundingCounters:
+    """
+    Counts of rounding events, by context and by operation.
+
+    While active, each operation in `fpy2.ops` that rounds a result
+    records it, along with whether it was inexact, overflowed,
+    underflowed, was invalid, or divided by zero.  Contexts are
+    identified by their string representation and operations by
+    their name in `fpy2.ops` (e.g., `add`).
+
+    Counters are active in the thread (or `asyncio` task) that
+    activates them, and in threads that run in a copy of its context
+    (see `contextvars.copy_context`).  They are safe to share
+    between threads, e.g., by activating them in each one.  They can be
+    pickled and combined with `merge`, e.g., to collect the counts
+    of worker processes; a `Runner` does this automatically
+    if counters are active when it runs.
+
+    Example:
+    ```
+    with RoundingCounters() as counters:
+        f(x, y, ctx=FP8P4)
+    print(counters.by_context()[str(FP8P4)].overflow)
+    ```
+    """
+
+    _counts: dict[tuple[str, str], list[int]]
+    _ctx_names: LRUCache[int, tuple[Context, str]]
+    _lock: threading.Lock
+
+    def __init__(self):
+        self._counts = {}
+        self._ctx_names = LRUCache(maxsize=_CTX_NAMES_MAXSIZE)
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(entries={len(self._counts)})'
+
+    def __getstate__(self):
+        with self._lock:
+            return { '_counts': { k: list(v) for k, v in self._counts.items() } }
+
+    def __setstate__(self, state):
+        self._counts = state['_counts']
+        self._ctx_names = LRUCache(maxsize=_CTX_NAMES_MAXSIZE)
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> Self:
+        _entered.set((*_entered.get(), _active.set(self)))
+        return self
+
+    def __exit__(self, *args):
+        *entered, token = _entered.get()
+        _entered.set(tuple(entered))
+        _active.reset(token)
+
+    def _ctx_name(self, ctx: Context) -> str:
+        # by identity: contexts need not be hashable, and `str` is slow;
+        # a cached context is kept so that its identity is not reused
+        entry = self._ctx_names.get(id(ctx))
+        if entry is None:
+            entry = (ctx, str(ctx))
+            self._ctx_names[id(ctx)] = entry
+        return entry[1]
+
+    def record(self, op: str, ctx: Context, x: Float):
+        """Records that the operation `op` rounded `x` under `ctx`."""
+        flags = x._real._flags._flags
+        with self._lock:
+            key = (self._ctx_name(ctx), op)
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = [0] * 6
+                self._counts[key] = counts
+            counts[_ROUNDINGS] += 1
+            if flags:
+                if flags & _INEXACT:
+                    counts[_INEXACT_N] += 1
+                    if flags & _TINY_POST:
+                        counts[_UNDERFLOW_N] += 1
+                if flags & _OVERFLOW:
+                    counts[_OVERFLOW_N] += 1
+                if flags & _INVALID:
+                    counts[_INVALID_N] += 1
+                if flags & _DIVZERO:
+                    counts[_DIVZERO_N] += 1
+
+    def reset(self):
+        """Clears the counts."""
+        with self._lock:
+            self._counts.clear()
+
+    def merge(self, other: 'RoundingCounters'):
+        """Adds the counts of `other` to this one."""
+        if other is self:
+            raise ValueError('cannot merge counters into themselves')
+        with other._lock:
+            counts = { k: list(v) for k, v in other._counts.items() }
+        with self._lock:
+            for key, n in counts.items():
+                entry = self._counts.get(key)
+                if entry is None:
+                    self._counts[key] = n
+                else:
+                    for i, m in enumerate(n):
+                        entry[i] += m
+
+    def counts(self) -> dict[tuple[str, str], RoundingEvents]:
+        """Returns the counts by context and operation."""
+        with self._lock:
+            return { key: RoundingEvents(*n) for key, n in self._counts.items() }
+
+    def by_context(self) -> dict[str, RoundingEvents]:
+        """Returns the counts by context, summed over operations."""
+        totals: dict[str, RoundingEvents] = {}
+        for (ctx, _), events in self.counts().items():
+            if ctx in totals:
+                totals[ctx] += events
+            else:
+                totals[ctx] = events
+        return totals
+
+    def by_op(self) -> dict[str, RoundingEvents]:
+        """Returns the counts by operation, summed over contexts."""
+        totals: dict[str, RoundingEvents] = {}
+        for (_, op), events in self.counts().items():
+            if op in totals:
+                totals[op] += events
+            else:
+                totals[op] = events
+        return totals
+
+    def total(self) -> RoundingEvents:
+        """Returns the counts summed over contexts and operations."""
+        total = RoundingEvents()
+        for events in self.counts().values():
+            total += events
+        return total
+
+    def report(self) -> str:
+        """Returns a table of the counts by context and operation."""
+        rows = sorted(self.counts().items())
+        names = [f.name for f in fields(RoundingEvents)]
+        width = max((len(ctx) for (ctx, _), _ in rows), default=0)
+        width = max(width, len('context'))
+        op_width = max((len(op) for (_, op), _ in rows), default=0)
+        op_width = max(op_width, len('op'))
+        lines = [f'{"context":<{width}}  {"op":<{op_width}}  ' + '  '.join(f'{n:>10}' for n in names)]
+        for (ctx, op), events in rows:
+            values = '  '.join(f'{getattr(events, n):>10}' for n in names)
+            lines.append(f'{ctx:<{width}}  {op:<{op_width}}  {values}')
+        return '\n'.join(lines)
+
+
+_active: ContextVar[RoundingCounters | None] = ContextVar('fpy2_rounding_counters', default=None)
+"""counters recording roundings, if any"""
+
+_entered: ContextVar[tuple[Token, ...]] = ContextVar('fpy2_rounding_counters_entered', default=())
+"""tokens restoring the counters active before each enclosing `with` statement"""
+
+def get_rounding_counters() -> RoundingCounters | None:
+    """Returns the active rounding counters, if any."""
+    return _active.get()
+
+def set_rounding_counters(counters: RoundingCounters | None):
+    """
+    Sets the active rounding counters of the current context.
+    With `None`, roundings are no longer counted.
+    """
+    if counters is not None and not isinstance(counters, RoundingCounters):
+        raise TypeError(f'Expected \'RoundingCounters\' or \'None\', got \'{type(counters)}\'')
+    _active.set(counters)
@@ -2,18 +2,24 @@
 Engine interface for round-to-odd arithmetic implementations.
 """
 
-from .engine import ENGINES, Engine, register_engine
+from .engine import ENGINES, Engine, register_engine, unregister_engine
 from .gmp import MPFREngine
+from .native import NativeEngine
 from .real import RealEngine
+from .table import TableEngine
 
 __all__ = [
     'ENGINES',
     'Engine',
     'MPFREngine',
+    'NativeEngine',
     'RealEngine',
+    'TableEngine',
     'register_engine',
+    'unregister_engine',
 ]
 
 # register default engines
+register_engine(NativeEngine.instance(), priority=2) # falls back to MPFR
 register_engine(MPFREngine.instance(), priority=1)
 register_engine(RealEngine.instance(), priority=0) # lower priority than MPFR
@@ -20,8 +20,9 @@ the operation with the given inputs/context. This allows for
 efficient dispatch to alternative engines without exception overhead.
 """
 
+import functools
 from abc import ABC, abstractmethod
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 from fractions import Fraction
 from typing import TypeAlias
 
@@ -31,6 +32,8 @@ from ..number import Float
 __all__ = [
     'Engine',
     'EngineArg',
+    'EngineFn',
+    'EngineKinds',
     'EngineList',
     'EngineRes',
 ]
@@ -38,6 +41,8 @@ __all__ = [
 
 EngineArg: TypeAlias = Float | Fraction
 EngineRes: TypeAlias = Float | Fraction | None
+EngineFn: TypeAlias = Callable[..., EngineRes]
+EngineKinds: TypeAlias = tuple[type, ...]
 
 
 class Engine(ABC):
@@ -56,8 +61,24 @@ class Engine(ABC):
         - args are the Float operands
         - ctx is the rounding context (provides precision via ctx.round_params())
         - Returns Float with round-to-odd result, or None if can't handle
+
+    Constants may instead be returned already rounded under `ctx`
+    (with `ctx` as their context); these are not rounded again.
     """
 
+    def resolve(self, op: str, ctx: Context, kinds: EngineKinds) -> EngineFn | None:
+        """
+        Resolves the method for operation `op` under `ctx`
+        when its arguments have types `kinds`.
+
+        Returns a callable taking only the arguments, or None if this
+        engine can never handle the combination. The callable may still
+        return None for particular argument values.
+        Engines may override this method to precompute anything that
+        depends only on `ctx` and `kinds`.
+        """
+        return functools.partial(getattr(self, op), ctx=ctx)
+
     # Unary operations
 
     @abstractmethod
@@ -377,6 +398,10 @@ class Engine(ABC):
         ...
 
 
+_DISPATCH_CACHE_SIZE = 4096
+"""maximum number of entries in the dispatch cache before it is flushed"""
+
+
 class EngineList:
     """
     Engine registry and dispatcher.
@@ -385,6 +410,7 @@ class EngineList:
     def __init__(self):
         self._items: list[tuple[int, Engine]] = []
         self._cached_engines: list[Engine] = []
+        self._dispatch: dict[tuple[str, Context, EngineKinds], tuple[EngineFn, ...]] = {}
 
     def register(self, engine: Engine, priority: int = 0):
         """
@@ -394,12 +420,53 @@ class EngineList:
         self._items.append((priority, engine))
         self._items.sort(key=lambda x: x[0], reverse=True)
         self._cached_engines = [e for _, e in self._items]
+        self._dispatch.clear()
+
+    def unregister(self, engine: Engine):
+        """Removes every registration of `engine` from the list."""
+        self._items = [(p, e) for p, e in self._items if e is not engine]
+        self._cached_engines = [e for _, e in self._items]
+        self._dispatch.clear()
 
     def __iter__(self) -> Iterator[Engine]:
         return iter(self._cached_engines)
 
+    def dispatch(self, op: str, ctx: Context, kinds: EngineKinds) -> tuple[EngineFn, ...]:
+        """
+        Returns the resolved methods, in priority order, of every engine
+        that may handle operation `op` under `ctx` when its arguments
+        have types `kinds`.
+
+        The first non-None result of these methods is the result of the
+        operation. Resolution happens once for each combination;
+        the cache is cleared whenever an engine is registered.
+        """
+        key = (op, ctx, kinds)
+        try:
+            return self._dispatch[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # unhashable context: resolve every time
+            return self._resolve(op, ctx, kinds)
+
+        fns = self._resolve(op, ctx, kinds)
+        if len(self._dispatch) >= _DISPATCH_CACHE_SIZE:
+            self._dispatch.clear()
+        self._dispatch[key] = fns
+        return fns
+
+    def _resolve(self, op: str, ctx: Context, kinds: EngineKinds) -> tuple[EngineFn, ...]:
+        fns: list[EngineFn] = []
+        for engine in self._cached_engines:
+            fn = engine.resolve(op, ctx, kinds)
+            if fn is not None:
+                fns.append(fn)
+        return tuple(fns)
+
 
 ENGINES = EngineList()
 """list of all engines"""
 
 register_engine = ENGINES.register
+unregister_engine = ENGINES.unregister
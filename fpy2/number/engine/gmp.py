@@ -6,17 +6,18 @@ round-to-odd arithmetic operations.
 """
 
 import enum
+import functools
 import math
 from collections.abc import Callable
 from fractions import Fraction
 
 import gmpy2 as gmp
 
-from ...utils import enum_repr
+from ...utils import LRUCache, enum_repr
 from ..context import Context
 from ..gmputils import float_to_mpfr, mpfr_call
 from ..number import Float
-from .engine import Engine, EngineArg, EngineRes
+from .engine import Engine, EngineArg, EngineFn, EngineKinds, EngineRes
 
 
 @enum_repr
@@ -109,17 +110,96 @@ def _mpfr_constant(x: _Constant, *, prec: int | None = None, n: int | None = Non
         raise ValueError(f'unknown constant {e.args[0]!r}') from None
 
 
+_mpfr_functions: dict[str, Callable[..., gmp.mpfr]] = {
+    'acos': gmp.acos,
+    'acosh': gmp.acosh,
+    'asin': gmp.asin,
+    'asinh': gmp.asinh,
+    'atan': gmp.atan,
+    'atanh': gmp.atanh,
+    'cbrt': gmp.cbrt,
+    'cos': gmp.cos,
+    'cosh': gmp.cosh,
+    'erf': gmp.erf,
+    'erfc': gmp.erfc,
+    'exp': gmp.exp,
+    'exp2': gmp.exp2,
+    'exp10': gmp.exp10,
+    'expm1': gmp.expm1,
+    'fabs': _gmp_abs,
+    'lgamma': _gmp_lgamma,
+    'log': gmp.log,
+    'log10': gmp.log10,
+    'log1p': gmp.log1p,
+    'log2': gmp.log2,
+    'neg': _gmp_neg,
+    'sin': gmp.sin,
+    'sinh': gmp.sinh,
+    'sqrt': gmp.sqrt,
+    'tan': gmp.tan,
+    'tanh': gmp.tanh,
+    'tgamma': gmp.gamma,
+    'add': gmp.add,
+    'atan2': gmp.atan2,
+    'copysign': gmp.copy_sign,
+    'div': gmp.div,
+    'fmod': gmp.fmod,
+    'fmax': gmp.maxnum,
+    'fmin': gmp.minnum,
+    'hypot': gmp.hypot,
+    'mul': gmp.mul,
+    'pow': _gmp_pow,
+    'remainder': gmp.remainder,
+    'sub': gmp.sub,
+    'fma': gmp.fma,
+}
+"""operations computed by a single call to `_mpfr_eval`"""
+
+_mpfr_constants: dict[str, _Constant] = {
+    'const_e': _Constant.E,
+    'const_log2e': _Constant.LOG2E,
+    'const_log10e': _Constant.LOG10E,
+    'const_ln2': _Constant.LN2,
+    'const_ln10': _Constant.LN10,
+    'const_pi': _Constant.PI,
+    'const_pi_2': _Constant.PI_2,
+    'const_pi_4': _Constant.PI_4,
+    'const_1_pi': _Constant.M_1_PI,
+    'const_2_pi': _Constant.M_2_PI,
+    'const_2_sqrtpi': _Constant.M_2_SQRTPI,
+    'const_sqrt2': _Constant.SQRT2,
+    'const_sqrt1_2': _Constant.SQRT1_2,
+}
+"""constants computed by `_mpfr_constant`"""
+
 _mpfr_engine_inst = None
 """single instance of MPFR engine"""
 
+_CONSTANT_CACHE_SIZE = 256
+"""maximum number of cached constants at each level"""
+
 
 class MPFREngine(Engine):
     """
     Engine that uses MPFR (via gmpy2) and round-to-odd arithmetic.
 
     This engine can handle all operations except exact arithmetic.
+
+    Constants are cached at two levels: round-to-odd values keyed
+    by the rounding parameters of a context, and values rounded
+    under a (non-stochastic) context keyed by the context.
     """
 
+    _constants: LRUCache[tuple[_Constant, int | None, int | None], Float]
+    """round-to-odd constants keyed by constant and rounding parameters"""
+
+    _rounded: LRUCache[tuple[_Constant, Context], Float]
+    """constants rounded under a context keyed by constant and context"""
+
+    def __init__(self, cache_size: int = _CONSTANT_CACHE_SIZE):
+        self._constants = LRUCache(maxsize=cache_size)
+        self._rounded = LRUCache(maxsize=cache_size)
+
     @staticmethod
     def instance() -> 'MPFREngine':
         """Returns the singleton instance of the MPFR engine."""
@@ -128,6 +208,55 @@ class MPFREngine(Engine):
             _mpfr_engine_inst = MPFREngine()
         return _mpfr_engine_inst
 
+    def resolve(self, op: str, ctx: Context, kinds: EngineKinds) -> EngineFn | None:
+        if Fraction in kinds:
+            return None
+        prec, n = ctx.round_params()
+        if prec is None and n is None:
+            return None
+        # bind the rounding parameters once for the common operations
+        if op in _mpfr_functions:
+            return functools.partial(_mpfr_eval, _mpfr_functions[op], prec=prec, n=n)
+        if op in _mpfr_constants:
+            return functools.partial(self._constant, _mpfr_constants[op], ctx)
+        return super().resolve(op, ctx, kinds)
+
+    def clear(self):
+        """Removes every cached constant."""
+        self._constants.clear()
+        self._rounded.clear()
+
+    def _constant(self, x: _Constant, ctx: Context) -> EngineRes:
+        """
+        Computes constant `x` under `ctx`.
+
+        The result is rounded under `ctx` unless `ctx` is stochastic,
+        in which case it may be safely re-rounded under `ctx`.
+        """
+        stochastic = ctx.is_stochastic()
+        if not stochastic:
+            r = self._rounded.get((x, ctx))
+            if r is not None:
+                return r
+
+        prec, n = ctx.round_params()
+        if prec is None and n is None:
+            return None
+
+        key = (x, prec, n)
+        r = self._constants.get(key)
+        if r is None:
+            r = _mpfr_constant(x, prec=prec, n=n)
+            self._constants[key] = r
+
+        if stochastic:
+            # each use of the constant is rounded separately
+            return r
+
+        y = ctx.round(r)
+        self._rounded[(x, ctx)] = y
+        return y
+
     def acos(self, x: EngineArg, ctx: Context) -> EngineRes:
         if isinstance(x, Fraction):
             return None
@@ -538,80 +667,41 @@ class MPFREngine(Engine):
         return _mpfr_eval(gmp.fma, x, y, z, prec=prec, n=n)
 
     def const_e(self, ctx: Context) -> EngineRes:
-        prec, n = ctx.round_params()
-        if prec is None and n is None:
-            return None
-        return _mpfr_constant(_Constant.E, prec=prec, n=n)
+        return self._constant(_Constant.E, ctx)
 
     def const_log2e(self, ctx: Context) -> EngineRes:
-        prec, n = ctx.round_params()
-        if prec is None and n is None:
-            return None
-        return _mpfr_constant(_Constant.LOG2E, prec=prec, n=n)
+        return self._constant(_Constant.LOG2E, ctx)
 
     def const_log10e(self, ctx: Context) -> EngineRes:
-        prec, n = ctx.round_params()
-        if prec is None and n is None:
-            return None
-        return _mpfr_constant(_Constant.LOG10E, prec=prec, n=n)
+        return self._constant(_Constant.LOG10E, ctx)
 
     def const_ln2(self, ctx: Context) -> EngineRes:
-        prec, n = ctx.round_params()
-        if prec is None and n is None:
-            return None
-        return _mpfr_constant(_Constant.LN2, prec=prec, n=n)
+        return self._constant(_Constant.LN2, ctx)
 
     def const_ln10(self, ctx: Context) -> EngineRes:
-        prec, n = ctx.round_params()
-        if prec is None and n is None:
-            return None
-        return _mpfr_constant(_Constant.LN10, prec=prec, n=n)
+        return self._constant(_Constant.LN10, ctx)
 
     def const_pi(self, ctx: Context) -> EngineRes:
-        prec, n = ctx.round_params()
-        if prec is None and n is None:
-            return None
-        return _mpfr_constant(_Constant.PI, prec=prec, n=n)
+        return self._constant(_Constant.PI, ctx)
 
     def const_pi_2(self, ctx: Context) -> EngineRes:
-        prec, n = ctx.round_params()
-        if prec is None and n is None:
-            return None
-        return _mpfr_constant(_Constant.PI_2, prec=prec, n=n)
+        return self._constant(_Constant.PI_2, ctx)
 
     def const_pi_4(self, ctx: Context) -> EngineRes:
-        prec, n = ctx.round_params()
-        if prec is None and n is None:
-            return None
-        return _mpfr_constant(_Constant.PI_4, prec=prec, n=n)
+        return self._constant(_Constant.PI_4, ctx)
 
     def const_1_pi(self, ctx: Context) -> EngineRes:
-        prec, n = ctx.round_params()
-        if prec is None and n is None:
-            return None
-        return _mpfr_constant(_Constant.M_1_PI, prec=prec, n=n)
+        return self._constant(_Constant.M_1_PI, ctx)
 
     def const_2_pi(self, ctx: Context) -> EngineRes:
-        prec, n = ctx.round_params()
-        if prec is None and n is None:
-            return None
-        return _mpfr_constant(_Constant.M_2_PI, prec=prec, n=n)
+        return self._constant(_Constant.M_2_PI, ctx)
 
     def const_2_sqrtpi(self, ctx: Context) -> EngineRes:
-        prec, n = ctx.round_params()
-        if prec is None and n is None:
-            return None
-        return _mpfr_constant(_Constant.M_2_SQRTPI, prec=prec, n=n)
+        return self._constant(_Constant.M_2_SQRTPI, ctx)
 
     def const_sqrt2(self, ctx: Context) -> EngineRes:
-        prec, n = ctx.round_params()
-        if prec is None and n is None:
-            return None
-        return _mpfr_constant(_Constant.SQRT2, prec=prec, n=n)
+        return self._constant(_Constant.SQRT2, ctx)
 
     def const_sqrt1_2(self, ctx: Context) -> EngineRes:
-        prec, n = ctx.round_params()
-        if prec is None and n is None:
-            return None
-        return _mpfr_constant(_Constant.SQRT1_2, prec=prec, n=n)
+        return self._constant(_Constant.SQRT1_2, ctx)
 
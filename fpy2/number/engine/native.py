@@ -0,0 +1,381 @@
+"""
+Native engine for hardware floating-point arithmetic.
+
+This engine computes the basic arithmetic operations with native
+Python floats, i.e., IEEE 754 double-precision arithmetic.
+The (exact) error of each result is recovered with an error-free
+transformation, so the engine returns a value that can be safely
+re-rounded, just like the other engines.
+
+It only handles contexts with at most 53 bits of precision
+and arguments that are exactly representable as doubles whose results
+stay well inside the normal range of double-precision; anything else
+is left to the next engine, e.g., `MPFREngine`.
+"""
+
+import math
+from fractions import Fraction
+
+from ..context import Context
+from ..number import Float
+from .engine import Engine, EngineArg, EngineFn, EngineKinds, EngineRes
+
+_NATIVE_PREC = 53
+"""precision of a Python float"""
+
+_NATIVE_SCALE = float(1 << _NATIVE_PREC)
+"""scale factor from a `frexp` mantissa to an integer significand"""
+
+_NATIVE_EMIN = -1021
+"""smallest normalized exponent handled; one binade above the subnormals"""
+
+_NATIVE_EMAX = 1021
+"""largest normalized exponent handled (exclusive); two binades below overflow"""
+
+_NATIVE_MIN = 2.0 ** _NATIVE_EMIN
+"""smallest magnitude handled"""
+
+_NATIVE_MAX = 2.0 ** _NATIVE_EMAX
+"""largest magnitude handled"""
+
+_NATIVE_OPS = frozenset(['add', 'div', 'fabs', 'mul', 'neg', 'sqrt', 'sub'])
+"""operations handled by the native engine"""
+
+_native_engine_inst = None
+"""single instance of Native engine"""
+
+
+def _supports(ctx: Context) -> bool:
+    """Can every re-roundable result under `ctx` be derived from a double?"""
+    prec, _ = ctx.round_params()
+    return prec is not None and prec <= _NATIVE_PREC
+
+def _in_range(x: float) -> bool:
+    """Is `x` zero or well inside the normal range of doubles?"""
+    return x == 0.0 or _NATIVE_MIN <= abs(x) <= _NATIVE_MAX
+
+def _to_native(x: EngineArg) -> float | None:
+    """
+    Converts `x` to a native float exactly,
+    or returns `None` if `x` is outside the native envelope.
+    """
+    if isinstance(x, Fraction) or x.is_nar():
+        return None
+    c = x.c
+    if c == 0:
+        return -0.0 if x.s else 0.0
+    p = c.bit_length()
+    if p > _NATIVE_PREC or not _NATIVE_EMIN <= x.exp + p - 1 < _NATIVE_EMAX:
+        return None
+    f = math.ldexp(c, x.exp)
+    return -f if x.s else f
+
+def _decompose(x: float) -> tuple[bool, int, int]:
+    """Decomposes a finite float `x` into `(s, exp, c)`."""
+    m, e = math.frexp(x)
+    return math.copysign(1.0, x) < 0, e - _NATIVE_PREC, int(abs(m) * _NATIVE_SCALE)
+
+def _cmp_scaled(c1: int, e1: int, c2: int, e2: int) -> int:
+    """Compares `c1 * 2**e1` against `c2 * 2**e2`, returning -1, 0, or 1."""
+    if e1 >= e2:
+        a, b = c1 << (e1 - e2), c2
+    else:
+        a, b = c1, c2 << (e2 - e1)
+    return (a > b) - (a < b)
+
+def _sticky(x: float, cmp: int) -> Float:
+    """
+    Returns a re-roundable value for a correctly-rounded double `x`
+    where `cmp` is the sign of `|exact| - |x|`.
+
+    The result is an eighth of an ulp from `x` towards the exact value,
+    so the two lie on the same side of every rounding boundary
+    at 53 bits of precision or fewer.
+    """
+    s, exp, c = _decompose(x)
+    if cmp == 0:
+        return Float(s=s, exp=exp, c=c)
+    return Float(s=s, exp=exp - 3, c=(c << 3) + cmp)
+
+def _exact_sum(hi: float, lo: float) -> Float:
+    """Returns `hi + lo` exactly for the output of an error-free transform."""
+    shi, ehi, chi = _decompose(hi)
+    slo, elo, clo = _decompose(lo)
+    c = (-chi if shi else chi) << (ehi - elo)
+    c += -clo if slo else clo
+    return Float(s=c < 0, exp=elo, c=abs(c))
+
+
+class NativeEngine(Engine):
+    """
+    Engine that uses native Python floats.
+
+    This engine only handles basic arithmetic operations whose
+    arguments and results fit comfortably in double-precision.
+    """
+
+    @staticmethod
+    def instance() -> 'NativeEngine':
+        """Returns the singleton instance of the Native engine."""
+        global _native_engine_inst
+        if _native_engine_inst is None:
+            _native_engine_inst = NativeEngine()
+        return _native_engine_inst
+
+    def resolve(self, op: str, ctx: Context, kinds: EngineKinds) -> EngineFn | None:
+        if op not in _NATIVE_OPS or Fraction in kinds or not _supports(ctx):
+            return None
+        return super().resolve(op, ctx, kinds)
+
+    # Unary operations
+
+    def acos(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def acosh(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def asin(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def asinh(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def atan(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def atanh(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def cbrt(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def ceil(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def cos(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def cosh(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def erf(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def erfc(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def exp(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def exp2(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def exp10(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def expm1(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def fabs(self, x: EngineArg, ctx: Context) -> EngineRes:
+        if not _supports(ctx) or not isinstance(x, Float) or _to_native(x) is None:
+            return None
+        return Float(s=False, x=x, ctx=None)
+
+    def floor(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def lgamma(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def log(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def log10(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def log1p(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def log2(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def neg(self, x: EngineArg, ctx: Context) -> EngineRes:
+        if not _supports(ctx) or not isinstance(x, Float) or _to_native(x) is None:
+            return None
+        return Float(s=not x.s, x=x, ctx=None)
+
+    def roundint(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def sin(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def sinh(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def sqrt(self, x: EngineArg, ctx: Context) -> EngineRes:
+        if not _supports(ctx) or not isinstance(x, Float):
+            return None
+        a = _to_native(x)
+        if a is None or a < 0.0:
+            return None
+        if a == 0.0:
+            # sqrt(-0) = -0
+            return Float(x=x, ctx=None)
+        d = math.sqrt(a)
+        # the square root of a double never lies on a rounding boundary,
+        # so the direction of the error is all we need
+        _, de, dc = _decompose(d)
+        return _sticky(d, _cmp_scaled(x.c, x.exp, dc * dc, 2 * de))
+
+    def tan(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def tanh(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def tgamma(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def trunc(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    # Binary operations
+
+    def _add(self, a: float, b: float) -> EngineRes:
+        d = a + b
+        if not _in_range(d):
+            return None
+        # TwoSum: `d + err` is exactly `a + b`
+        bb = d - a
+        err = (a - (d - bb)) + (b - bb)
+        if err == 0.0:
+            return Float.from_float(d)
+        return _exact_sum(d, err)
+
+    def add(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        if not _supports(ctx):
+            return None
+        a = _to_native(x)
+        b = _to_native(y)
+        if a is None or b is None:
+            return None
+        return self._add(a, b)
+
+    def atan2(self, y: EngineArg, x: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def copysign(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def div(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        if not _supports(ctx) or not isinstance(x, Float) or not isinstance(y, Float):
+            return None
+        a = _to_native(x)
+        b = _to_native(y)
+        if a is None or b is None or b == 0.0:
+            return None
+        if a == 0.0:
+            return Float(s=x.s != y.s, c=0)
+        d = a / b
+        if d == 0.0 or not _in_range(d):
+            # underflow or overflow
+            return None
+        # a quotient of doubles never lies on a rounding boundary,
+        # so the direction of the error is all we need
+        _, de, dc = _decompose(d)
+        return _sticky(d, _cmp_scaled(x.c, x.exp, dc * y.c, de + y.exp))
+
+    def fdim(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def fmod(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def fmax(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def fmin(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def hypot(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def mod(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def mul(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        if not _supports(ctx) or not isinstance(x, Float) or not isinstance(y, Float):
+            return None
+        a = _to_native(x)
+        b = _to_native(y)
+        if a is None or b is None:
+            return None
+        d = a * b
+        if not _in_range(d):
+            return None
+        # the product of two 53-bit significands fits in 106 bits,
+        # so the exact product is the error-free transform
+        return Float(s=x.s != y.s, exp=x.exp + y.exp, c=x.c * y.c)
+
+    def pow(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def remainder(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    def sub(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        if not _supports(ctx):
+            return None
+        a = _to_native(x)
+        b = _to_native(y)
+        if a is None or b is None:
+            return None
+        return self._add(a, -b)
+
+    # Ternary operations
+
+    def fma(self, x: EngineArg, y: EngineArg, z: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    # Constants
+
+    def const_e(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_log2e(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_log10e(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_ln2(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_ln10(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_pi(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_pi_2(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_pi_4(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_1_pi(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_2_pi(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_2_sqrtpi(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_sqrt2(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_sqrt1_2(self, ctx: Context) -> EngineRes:
+        return None
@@ -0,0 +1,458 @@
+"""
+Table-driven engine for small number formats.
+
+For formats with only a few bits, e.g., 8-bit floating-point formats,
+every input to a unary or binary operation can be enumerated.
+This engine precomputes, for each operation and context, the
+re-roundable result of every combination of encodings (as computed
+by the other engines) and then answers by table lookup.
+
+Tables store the round-to-odd intermediate, not the rounded result,
+so that re-rounding under the context produces the same value
+and the same flags as the other engines.
+Tables are built on first use and cached on disk.
+
+This engine is opt-in:
+```
+register_engine(TableEngine(), priority=3)
+```
+"""
+
+import functools
+import hashlib
+import importlib.metadata
+import io
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+import gmpy2 as gmp
+import numpy as np
+
+from ...utils import cache_dir, write_atomic
+from ..context import Context, EncodableContext
+from ..number import Float, FloatArray
+from .engine import ENGINES, Engine, EngineArg, EngineFn, EngineKinds, EngineRes
+
+__all__ = [
+    'TableEngine',
+]
+
+_UNARY_OPS = frozenset([
+    'acos', 'acosh', 'asin', 'asinh', 'atan', 'atanh', 'cbrt', 'ceil',
+    'cos', 'cosh', 'erf', 'erfc', 'exp', 'exp2', 'exp10', 'expm1', 'fabs',
+    'floor', 'lgamma', 'log', 'log10', 'log1p', 'log2', 'neg', 'roundint',
+    'sin', 'sinh', 'sqrt', 'tan', 'tanh', 'tgamma', 'trunc',
+])
+"""operations of one argument handled by tables"""
+
+_BINARY_OPS = frozenset([
+    'add', 'atan2', 'copysign', 'div', 'fdim', 'fmax', 'fmin', 'fmod',
+    'hypot', 'mod', 'mul', 'pow', 'remainder', 'sub',
+])
+"""operations of two arguments handled by tables"""
+
+_COLUMNS = ('s', 'exp', 'c', 'isinf', 'isnan', 'flags')
+"""columns of a stored table"""
+
+_Key = tuple[int, bool, int, int]
+
+
+@functools.cache
+def _cache_salt() -> bytes:
+    """
+    Distinguishes tables computed by different implementations:
+    the fpy2 version, the MPFR version, and the engine sources.
+    """
+    try:
+        version = importlib.metadata.version('fpy2')
+    except importlib.metadata.PackageNotFoundError:
+        version = 'unknown'
+    h = hashlib.sha256()
+    h.update(version.encode())
+    h.update(gmp.mpfr_version().encode())
+    for path in sorted(Path(__file__).parent.glob('*.py')):
+        h.update(path.read_bytes())
+    return h.digest()
+
+def _key(x: Float) -> _Key:
+    """
+    Returns a key identifying the value of `x`:
+    finite values are normalized so that equal values
+    with different representations share a key.
+    """
+    if x.isnan:
+        return (2, x.s, 0, 0)
+    if x.isinf:
+        return (1, x.s, 0, 0)
+    c = x.c
+    if c == 0:
+        return (0, x.s, 0, 0)
+    tz = (c & -c).bit_length() - 1
+    return (0, x.s, x.exp + tz, c >> tz)
+
+
+class _Table:
+    """Results of one operation under one context."""
+
+    def __init__(self, index: dict[_Key, int], nbits: int, results: FloatArray):
+        self.index = index
+        self.nbits = nbits
+        self.results = results
+
+    def unary(self, x: EngineArg) -> EngineRes:
+        if not isinstance(x, Float):
+            return None
+        i = self.index.get(_key(x))
+        if i is None:
+            return None
+        return self.results[i]
+
+    def binary(self, x: EngineArg, y: EngineArg) -> EngineRes:
+        if not isinstance(x, Float) or not isinstance(y, Float):
+            return None
+        i = self.index.get(_key(x))
+        j = self.index.get(_key(y))
+        if i is None or j is None:
+            return None
+        return self.results[(i << self.nbits) | j]
+
+
+class TableEngine(Engine):
+    """
+    Engine that answers operations under small encodable contexts
+    by looking up precomputed results.
+
+    Only contexts with at most `max_bits` bits are handled;
+    a binary operation needs a table of `4 ** max_bits` entries.
+    Tables are cached in the directory `path`
+    (by default, `cache_dir('optables')`);
+    with `persist=False`, they are kept in memory only.
+    """
+
+    max_bits: int
+    """largest number of bits of a context handled by this engine"""
+
+    persist: bool
+    """are tables cached on disk?"""
+
+    _path: Path | None
+    _tables: dict[tuple[str, Context], _Table | None]
+    _lock: threading.Lock
+
+    def __init__(self, max_bits: int = 8, *, path: Path | str | None = None, persist: bool = True):
+        if max_bits < 1:
+            raise ValueError(f'Expected max_bits >= 1, got {max_bits}')
+        self.max_bits = max_bits
+        self.persist = persist
+        self._path = None if path is None else Path(path)
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def clear(self):
+        """Forgets every table held in memory; tables on disk are kept."""
+        with self._lock:
+            self._tables.clear()
+
+    def resolve(self, op: str, ctx: Context, kinds: EngineKinds) -> EngineFn | None:
+        if any(k is not Float for k in kinds) or not self._supports(ctx):
+            return None
+        if op in _UNARY_OPS:
+            table = self._table(op, ctx, 1)
+            return None if table is None else table.unary
+        if op in _BINARY_OPS:
+            table = self._table(op, ctx, 2)
+            return None if table is None else table.binary
+        return None
+
+    def _supports(self, ctx: Context) -> bool:
+        return isinstance(ctx, EncodableContext) and ctx.total_bits() <= self.max_bits
+
+    def _table(self, op: str, ctx: Context, arity: int) -> _Table | None:
+        """Returns the table for `op` under `ctx`, building it if needed."""
+        with self._lock:
+            try:
+                return self._tables[(op, ctx)]
+            except KeyError:
+                pass
+            except TypeError:
+                # unhashable context
+                return None
+            table = self._build(op, ctx, arity)
+            self._tables[(op, ctx)] = table
+            return table
+
+    def _build(self, op: str, ctx: Context, arity: int) -> _Table | None:
+        assert isinstance(ctx, EncodableContext)
+        nbits = ctx.total_bits()
+        xs = [ctx.decode(i) for i in range(1 << nbits)]
+        index: dict[_Key, int] = {}
+        for i, x in enumerate(xs):
+            index.setdefault(_key(x), i)
+
+        path = self._table_path(op, ctx)
+        if path is not None and path.exists():
+            results = self._load(path, len(xs) ** arity)
+            if results is not None:
+                return _Table(index, nbits, results)
+
+        fns = self._fallback(op, ctx, (Float,) * arity)
+        results_list: list[Float] = []
+        if arity == 1:
+            argss: list[tuple[Float, ...]] = [(x,) for x in xs]
+        else:
+            argss = [(x, y) for x in xs for y in xs]
+        for args in argss:
+            r = self._eval(fns, args)
+            if r is None:
+                # some input has no re-roundable result
+                return None
+            results_list.append(r if r.ctx is None else Float(x=r, ctx=None))
+
+        results = FloatArray(results_list, None)
+        if path is not None:
+            self._store(path, results)
+        return _Table(index, nbits, results)
+
+    def _fallback(self, op: str, ctx: Context, kinds: EngineKinds) -> tuple[EngineFn, ...]:
+        """Resolves `op` with every registered engine other than a table engine."""
+        fns: list[EngineFn] = []
+        for engine in ENGINES:
+            if not isinstance(engine, TableEngine):
+                fn = engine.resolve(op, ctx, kinds)
+                if fn is not None:
+                    fns.append(fn)
+        return tuple(fns)
+
+    def _eval(self, fns: tuple[Callable[..., EngineRes], ...], args: tuple[Float, ...]) -> Float | None:
+        for fn in fns:
+            r = fn(*args)
+            if r is not None:
+                return r if isinstance(r, Float) else None
+        return None
+
+    def _table_path(self, op: str, ctx: Context) -> Path | None:
+        if not self.persist:
+            return None
+        root = cache_dir('optables') if self._path is None else self._path
+        key = hashlib.sha256(_cache_salt() + f'{op}:{ctx!r}'.encode()).hexdigest()
+        return root / f'{key}.npz'
+
+    def _load(self, path: Path, n: int) -> FloatArray | None:
+        try:
+            with np.load(path) as data:
+                cols = { name: data[name] for name in _COLUMNS }
+        except (OSError, ValueError, KeyError):
+            return None
+        if any(len(col) != n for col in cols.values()):
+            return None
+        return FloatArray.from_columns(**cols)
+
+    def _store(self, path: Path, results: FloatArray):
+        if results.c.dtype == object:
+            # significands too wide to store
+            return
+        buf = io.BytesIO()
+        np.savez(buf, **{ name: getattr(results, name) for name in _COLUMNS })
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, buf.getvalue())
+
+    # Unary operations
+
+    def acos(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('acos', x, ctx)
+
+    def acosh(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('acosh', x, ctx)
+
+    def asin(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('asin', x, ctx)
+
+    def asinh(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('asinh', x, ctx)
+
+    def atan(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('atan', x, ctx)
+
+    def atanh(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('atanh', x, ctx)
+
+    def cbrt(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('cbrt', x, ctx)
+
+    def ceil(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('ceil', x, ctx)
+
+    def cos(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('cos', x, ctx)
+
+    def cosh(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('cosh', x, ctx)
+
+    def erf(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('erf', x, ctx)
+
+    def erfc(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('erfc', x, ctx)
+
+    def exp(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('exp', x, ctx)
+
+    def exp2(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('exp2', x, ctx)
+
+    def exp10(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('exp10', x, ctx)
+
+    def expm1(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('expm1', x, ctx)
+
+    def fabs(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('fabs', x, ctx)
+
+    def floor(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('floor', x, ctx)
+
+    def lgamma(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('lgamma', x, ctx)
+
+    def log(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('log', x, ctx)
+
+    def log10(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('log10', x, ctx)
+
+    def log1p(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('log1p', x, ctx)
+
+    def log2(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('log2', x, ctx)
+
+    def neg(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('neg', x, ctx)
+
+    def roundint(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('roundint', x, ctx)
+
+    def sin(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('sin', x, ctx)
+
+    def sinh(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('sinh', x, ctx)
+
+    def sqrt(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('sqrt', x, ctx)
+
+    def tan(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('tan', x, ctx)
+
+    def tanh(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('tanh', x, ctx)
+
+    def tgamma(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('tgamma', x, ctx)
+
+    def trunc(self, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._unary('trunc', x, ctx)
+
+    def _unary(self, op: str, x: EngineArg, ctx: Context) -> EngineRes:
+        if not isinstance(x, Float) or not self._supports(ctx):
+            return None
+        table = self._table(op, ctx, 1)
+        return None if table is None else table.unary(x)
+
+    # Binary operations
+
+    def add(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return self._binary('add', x, y, ctx)
+
+    def atan2(self, y: EngineArg, x: EngineArg, ctx: Context) -> EngineRes:
+        return self._binary('atan2', y, x, ctx)
+
+    def copysign(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return self._binary('copysign', x, y, ctx)
+
+    def div(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return self._binary('div', x, y, ctx)
+
+    def fdim(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return self._binary('fdim', x, y, ctx)
+
+    def fmod(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return self._binary('fmod', x, y, ctx)
+
+    def fmax(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return self._binary('fmax', x, y, ctx)
+
+    def fmin(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return self._binary('fmin', x, y, ctx)
+
+    def hypot(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return self._binary('hypot', x, y, ctx)
+
+    def mod(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return self._binary('mod', x, y, ctx)
+
+    def mul(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return self._binary('mul', x, y, ctx)
+
+    def pow(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return self._binary('pow', x, y, ctx)
+
+    def remainder(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return self._binary('remainder', x, y, ctx)
+
+    def sub(self, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        return self._binary('sub', x, y, ctx)
+
+    def _binary(self, op: str, x: EngineArg, y: EngineArg, ctx: Context) -> EngineRes:
+        if not isinstance(x, Float) or not isinstance(y, Float) or not self._supports(ctx):
+            return None
+        table = self._table(op, ctx, 2)
+        return None if table is None else table.binary(x, y)
+
+    # Ternary operations
+
+    def fma(self, x: EngineArg, y: EngineArg, z: EngineArg, ctx: Context) -> EngineRes:
+        return None
+
+    # Constants
+
+    def const_e(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_log2e(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_log10e(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_ln2(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_ln10(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_pi(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_pi_2(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_pi_4(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_1_pi(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_2_pi(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_2_sqrtpi(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_sqrt1_2(self, ctx: Context) -> EngineRes:
+        return None
+
+    def const_sqrt2(self, ctx: Context) -> EngineRes:
+        return None
@@ -6,7 +6,7 @@ the `Float` type and the `gmpy2.mpfr` type,
 as well as wrappers for round-to-odd arithmetic.
 """
 
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 
 import gmpy2 as gmp
 
@@ -17,6 +17,7 @@ __all__ = [
     'MPFR_EMIN',
     'float_to_mpfr',
     'mpfr_call',
+    'mpfr_call_many',
     'mpfr_to_float',
     'mpfr_value',
 ]
@@ -30,12 +31,61 @@ MPFR_EMIN = gmp.get_emin_min()
 MPFR_EMAX = gmp.get_emax_max()
 """Minimum exponent for MPFR numbers."""
 
+###########################################################
+# Contexts
+
+_MAX_CONTEXTS = 1024
+"""maximum number of cached contexts of each kind"""
+
+_exact_contexts: dict[int, gmp.context] = {}
+"""contexts for exact conversions keyed by precision"""
+
+_rtz_contexts: dict[int, gmp.context] = {}
+"""contexts for round-towards-zero arithmetic keyed by precision"""
+
+def _cached_context(cache: dict[int, gmp.context], prec: int, **kwargs) -> gmp.context:
+    """
+    Returns the context in `cache` with `prec` digits of precision,
+    constructing it from `kwargs` if it does not exist.
+
+    Contexts are shared, so they must never be modified.
+    """
+    ctx = cache.get(prec)
+    if ctx is None:
+        if len(cache) >= _MAX_CONTEXTS:
+            cache.clear()
+        ctx = gmp.context(
+            precision=prec,
+            emin=MPFR_EMIN,
+            emax=MPFR_EMAX,
+            trap_underflow=False,
+            trap_overflow=False,
+            trap_inexact=False,
+            trap_divzero=False,
+            **kwargs
+        )
+        cache[prec] = ctx
+    return ctx
+
+def _exact_context(prec: int) -> gmp.context:
+    """Context for constructing values with at most `prec` digits exactly."""
+    return _cached_context(_exact_contexts, prec)
+
+def _rtz_context(prec: int) -> gmp.context:
+    """Context for computing with `prec` digits, rounding towards zero (RTZ)."""
+    return _cached_context(_rtz_contexts, prec, round=gmp.RoundToZero)
+
+_POS_ZERO = gmp.mpfr(0)
+_NEG_ZERO = gmp.set_sign(_POS_ZERO, True)
+
 ###########################################################
 # Conversions between Float and gmp.mpfr
 
 def float_to_mpfr(x: RealFloat | Float):
     """
     Converts `x` into an MPFR type exactly.
+
+    The precision of the result is the precision of `x`.
     """
     if isinstance(x, Float):
         if x.isnan:
@@ -44,9 +94,14 @@ def float_to_mpfr(x: RealFloat | Float):
         elif x.isinf:
             return gmp.set_sign(gmp.inf(), x.s)
 
-    s_fmt = '-' if x.s else '+'
-    fmt = f'{s_fmt}{hex(x.c)}p{x.exp}'
-    return gmp.mpfr(fmt, precision=x.p, base=16)
+    c = x.c
+    if c == 0:
+        return _NEG_ZERO if x.s else _POS_ZERO
+
+    # `c` fits in the precision of the context and the exponent range
+    # is as large as possible, so scaling by a power of two is exact
+    ctx = _exact_context(c.bit_length())
+    return ctx.mul_2exp(-c if x.s else c, x.exp)
 
 def mpfr_to_float(x):
     """
@@ -92,18 +147,21 @@ def _mpfr_call_with_prec(prec: int, fn: Callable[..., gmp.mpfr], args: tuple[gmp
     Calls an MPFR method `fn` with arguments `args` using `prec` digits
     of precision and round towards zero (RTZ).
     """
-    with gmp.context(
-        precision=prec,
-        emin=MPFR_EMIN,
-        emax=MPFR_EMAX,
-        trap_underflow=False,
-        trap_overflow=False,
-        trap_inexact=False,
-        trap_divzero=False,
-        round=gmp.RoundToZero,
-    ):
+    with _rtz_context(prec):
         return fn(*args)
 
+def _mpfr_call_many_with_prec(
+    prec: int,
+    fn: Callable[..., gmp.mpfr],
+    argss: Sequence[tuple[gmp.mpfr, ...]]
+):
+    """
+    Like `_mpfr_call_with_prec` but calls `fn` on each
+    argument tuple in `argss` within a single context.
+    """
+    with _rtz_context(prec):
+        return [fn(*args) for args in argss]
+
 def mpfr_call(
     fn: Callable[..., gmp.mpfr],
     args: tuple[gmp.mpfr, ...],
@@ -149,6 +207,43 @@ def mpfr_call(
         result = _mpfr_call_with_prec(prec + 2, fn, args)
         return _round_odd(result, result.rc != 0)
 
+def mpfr_call_many(
+    fn: Callable[..., gmp.mpfr],
+    argss: Sequence[tuple[gmp.mpfr, ...]],
+    prec: int | None = None,
+    n: int | None = None
+) -> list[Float]:
+    """
+    Evaluates `fn(args)` for each `args` in `argss` such that
+    each result may be safely re-rounded.
+
+    Equivalent to calling `mpfr_call` on each argument tuple,
+    but enters each MPFR context at most once per precision.
+    """
+    if prec is None:
+        if n is None:
+            raise ValueError('Either `prec` or `n` must be specified')
+
+        # compute everything with 2 digits of precision
+        results = _mpfr_call_many_with_prec(2, fn, argss)
+
+        # group the results that must be re-computed by precision
+        recompute: dict[int, list[int]] = {}
+        for i, result in enumerate(results):
+            if not (result.is_nan() or result.is_infinite() or result.is_zero()):
+                e: int = gmp.get_exp(result) - 1
+                if e > n:
+                    recompute.setdefault(e - n + 2, []).append(i)
+
+        for p, idxs in recompute.items():
+            with _rtz_context(p):
+                for i in idxs:
+                    results[i] = fn(*argss[i])
+    else:
+        results = _mpfr_call_many_with_prec(prec + 2, fn, argss)
+
+    return [_round_odd(result, result.rc != 0) for result in results]
+
 def mpfr_value(x, *, prec: int | None = None, n: int | None = None):
     """
     Converts `x` into an MPFR type such that it may be safely re-rounded
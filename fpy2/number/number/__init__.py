@@ -5,12 +5,14 @@ This module defines number types.
 from fractions import Fraction
 from typing import TypeAlias
 
+from .array import FloatArray
 from .floats import Float, same_value
 from .reals import RNG, RealFloat
 
 __all__ = [
     'RNG',
     'Float',
+    'FloatArray',
     'Real',
     'RealFloat'
 ]
@@ -0,0 +1,313 @@
+"""
+This module defines the `FloatArray` type,
+a compact, columnar sequence of `Float` values.
+"""
+
+from collections.abc import Iterable, Iterator, Sequence
+from typing import TYPE_CHECKING, Self, overload
+
+import numpy as np
+
+from .flags import Flags
+from .floats import Float
+from .reals import RealFloat
+
+# avoids circular dependency issues (useful for type checking)
+if TYPE_CHECKING:
+    from ..context import Context, EncodableContext
+
+__all__ = [
+    'FloatArray',
+]
+
+_BLOCK = 4096
+"""number of elements converted at once when iterating"""
+
+_UINT64_MAX = (1 << 64) - 1
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+def _make_float(
+    s: bool,
+    exp: int,
+    c: int,
+    isinf: bool,
+    isnan: bool,
+    flags: int,
+    ctx: 'Context | None'
+) -> Float:
+    """Constructs a `Float` directly from its fields."""
+    fl = Flags.__new__(Flags)
+    fl._flags = flags
+    r = RealFloat.__new__(RealFloat)
+    r._s = s
+    r._exp = exp
+    r._c = c
+    r._flags = fl
+    x = Float.__new__(Float)
+    x._isinf = isinf
+    x._isnan = isnan
+    x._ctx = ctx
+    x._real = r
+    return x
+
+def _significands(cs: Sequence[int]) -> np.ndarray:
+    """Stores significands as `uint64` if they fit, otherwise as Python integers."""
+    if all(c <= _UINT64_MAX for c in cs):
+        return np.array(cs, dtype=np.uint64)
+    arr = np.empty(len(cs), dtype=object)
+    arr[:] = cs
+    return arr
+
+def _exponents(exps: Sequence[int]) -> np.ndarray:
+    """Stores exponents as `int64` if they fit, otherwise as Python integers."""
+    if all(_INT64_MIN <= e <= _INT64_MAX for e in exps):
+        return np.array(exps, dtype=np.int64)
+    arr = np.empty(len(exps), dtype=object)
+    arr[:] = exps
+    return arr
+
+def _readonly(arr: np.ndarray) -> np.ndarray:
+    view = arr.view()
+    view.flags.writeable = False
+    return view
+
+
+class FloatArray(Sequence[Float]):
+    """
+    A sequence of `Float` values stored in parallel columns.
+
+    Each number is stored as a sign, an exponent, a significand,
+    infinity and NaN markers, and its rounding flags, each in
+    a separate `numpy` array; every element shares the rounding
+    context `ctx`. Exponents and significands are 64-bit integers
+    when every one fits, and arbitrary-precision integers otherwise.
+
+    Elements are constructed as `Float` values only when accessed.
+    Slicing returns a view that shares the columns of this array.
+    """
+
+    __slots__ = ('_c', '_ctx', '_exp', '_flags', '_isinf', '_isnan', '_s')
+
+    _s: np.ndarray
+    """is the sign negative? (`bool`)"""
+
+    _exp: np.ndarray
+    """the exponent (`int64` or `object`)"""
+
+    _c: np.ndarray
+    """the significand (`uint64` or `object`)"""
+
+    _isinf: np.ndarray
+    """is the number infinite? (`bool`)"""
+
+    _isnan: np.ndarray
+    """is the number NaN? (`bool`)"""
+
+    _flags: np.ndarray
+    """rounding flags (`uint8`)"""
+
+    _ctx: 'Context | None'
+    """rounding context of every element"""
+
+    def __init__(self, xs: Iterable[Float | RealFloat] = (), ctx: 'Context | None' = None):
+        """
+        Creates an array from a sequence of numbers.
+
+        Every `Float` in `xs` must have been constructed under `ctx`;
+        if `ctx` is not given, it is the context shared by the elements.
+        """
+        ss: list[bool] = []
+        exps: list[int] = []
+        cs: list[int] = []
+        isinfs: list[bool] = []
+        isnans: list[bool] = []
+        flags: list[int] = []
+        ctxs: set[int] = set()
+        shared: Context | None = None
+        for x in xs:
+            match x:
+                case Float():
+                    r = x._real
+                    isinfs.append(x._isinf)
+                    isnans.append(x._isnan)
+                    if ctx is None and x._ctx is not None and id(x._ctx) not in ctxs:
+                        ctxs.add(id(x._ctx))
+                        if len(ctxs) > 1:
+                            raise ValueError('elements have different contexts, specify `ctx`')
+                        shared = x._ctx
+                case RealFloat():
+                    r = x
+                    isinfs.append(False)
+                    isnans.append(False)
+                case _:
+                    raise TypeError(f'expected \'Float\' or \'RealFloat\', got {type(x)} for x={x}')
+            ss.append(r._s)
+            exps.append(r._exp)
+            cs.append(r._c)
+            flags.append(r._flags._flags)
+
+        self._s = np.array(ss, dtype=np.bool_)
+        self._exp = _exponents(exps)
+        self._c = _significands(cs)
+        self._isinf = np.array(isinfs, dtype=np.bool_)
+        self._isnan = np.array(isnans, dtype=np.bool_)
+        self._flags = np.array(flags, dtype=np.uint8)
+        self._ctx = shared if ctx is None else ctx
+
+    @classmethod
+    def from_columns(
+        cls,
+        s: np.ndarray,
+        exp: np.ndarray,
+        c: np.ndarray,
+        *,
+        isinf: np.ndarray | None = None,
+        isnan: np.ndarray | None = None,
+        flags: np.ndarray | None = None,
+        ctx: 'Context | None' = None
+    ) -> Self:
+        """
+        Creates an array from its columns without copying them.
+
+        Omitted columns are filled with zeros.
+        """
+        n = len(s)
+        for name, col in (('exp', exp), ('c', c), ('isinf', isinf), ('isnan', isnan), ('flags', flags)):
+            if col is not None and len(col) != n:
+                raise ValueError(f'column `{name}` has length {len(col)}, expected {n}')
+
+        arr = cls.__new__(cls)
+        arr._s = np.asarray(s, dtype=np.bool_)
+        arr._exp = exp if exp.dtype == object else np.asarray(exp, dtype=np.int64)
+        arr._c = c if c.dtype == object else np.asarray(c, dtype=np.uint64)
+        arr._isinf = np.zeros(n, dtype=np.bool_) if isinf is None else np.asarray(isinf, dtype=np.bool_)
+        arr._isnan = np.zeros(n, dtype=np.bool_) if isnan is None else np.asarray(isnan, dtype=np.bool_)
+        arr._flags = np.zeros(n, dtype=np.uint8) if flags is None else np.asarray(flags, dtype=np.uint8)
+        arr._ctx = ctx
+        return arr
+
+    @classmethod
+    def decode(cls, xs: Iterable[int], ctx: 'EncodableContext') -> Self:
+        """Decodes each bitstring in `xs` under `ctx`."""
+        return cls((ctx.decode(int(x)) for x in xs), ctx)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}([{", ".join(repr(x) for x in self)}], ctx={self._ctx!r})'
+
+    def __len__(self) -> int:
+        return len(self._s)
+
+    @overload
+    def __getitem__(self, idx: int) -> Float: ...
+    @overload
+    def __getitem__(self, idx: slice) -> 'FloatArray': ...
+
+    def __getitem__(self, idx: int | slice):
+        if isinstance(idx, slice):
+            return self._view(idx)
+        return _make_float(
+            self._s.item(idx),
+            self._exp.item(idx),
+            self._c.item(idx),
+            self._isinf.item(idx),
+            self._isnan.item(idx),
+            self._flags.item(idx),
+            self._ctx
+        )
+
+    def __iter__(self) -> Iterator[Float]:
+        ctx = self._ctx
+        for start in range(0, len(self), _BLOCK):
+            block = slice(start, start + _BLOCK)
+            yield from (
+                _make_float(s, exp, c, isinf, isnan, flags, ctx)
+                for s, exp, c, isinf, isnan, flags in zip(
+                    self._s[block].tolist(),
+                    self._exp[block].tolist(),
+                    self._c[block].tolist(),
+                    self._isinf[block].tolist(),
+                    self._isnan[block].tolist(),
+                    self._flags[block].tolist()
+                )
+            )
+
+    def _view(self, idx: slice) -> 'FloatArray':
+        arr = FloatArray.__new__(FloatArray)
+        arr._s = self._s[idx]
+        arr._exp = self._exp[idx]
+        arr._c = self._c[idx]
+        arr._isinf = self._isinf[idx]
+        arr._isnan = self._isnan[idx]
+        arr._flags = self._flags[idx]
+        arr._ctx = self._ctx
+        return arr
+
+    @property
+    def ctx(self) -> 'Context | None':
+        """Rounding context of every element."""
+        return self._ctx
+
+    @property
+    def s(self) -> np.ndarray:
+        """Read-only column of signs."""
+        return _readonly(self._s)
+
+    @property
+    def exp(self) -> np.ndarray:
+        """Read-only column of exponents."""
+        return _readonly(self._exp)
+
+    @property
+    def c(self) -> np.ndarray:
+        """Read-only column of significands."""
+        return _readonly(self._c)
+
+    @property
+    def isinf(self) -> np.ndarray:
+        """Read-only column of infinity markers."""
+        return _readonly(self._isinf)
+
+    @property
+    def isnan(self) -> np.ndarray:
+        """Read-only column of NaN markers."""
+        return _readonly(self._isnan)
+
+    @property
+    def flags(self) -> np.ndarray:
+        """Read-only column of rounding flags (see `Flags`)."""
+        return _readonly(self._flags)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Number of bytes used by the columns
+        (excluding arbitrary-precision exponents and significands).
+        """
+        return sum(col.nbytes for col in (self._s, self._exp, self._c, self._isinf, self._isnan, self._flags))
+
+    def tolist(self) -> list[Float]:
+        """Returns the elements as a list of `Float` values."""
+        return list(self)
+
+    def round(self, ctx: 'Context') -> 'FloatArray':
+        """Rounds each element under `ctx`."""
+        return FloatArray((ctx.round(x) for x in self), ctx)
+
+    def encode(self) -> np.ndarray:
+        """
+        Encodes each element as a bitstring under the context of this array.
+
+        The result is a `uint64` array if the encoding has
+        at most 64 bits, and an array of Python integers otherwise.
+        """
+        from ..context import EncodableContext
+        if not isinstance(self._ctx, EncodableContext):
+            raise TypeError(f'expected an \'EncodableContext\', got {self._ctx!r}')
+        encoded = [self._ctx.encode(x) for x in self]
+        if self._ctx.total_bits() <= 64:
+            return np.array(encoded, dtype=np.uint64)
+        arr = np.empty(len(encoded), dtype=object)
+        arr[:] = encoded
+        return arr
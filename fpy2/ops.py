@@ -2,11 +2,14 @@
 Mathematical functions under rounding contexts.
 """
 
+import functools
+from collections.abc import Callable
 from fractions import Fraction
-from unittest import case
 
 from .number import REAL, Context, Float, Real, RealFloat
+from .number import counters as _counters
 from .number.engine import ENGINES
+from .number.engine.engine import EngineFn
 from .utils import UNINIT, digits_to_fraction, hexnum_to_fraction, is_dyadic
 
 __all__ = [
@@ -131,7 +134,23 @@ def _cvt_to_float(x: Real) -> Float:
         case _:
             raise TypeError(f'Expected \'Float\' or \'Fraction\', got \'{type(t)}\' for x={x}')
 
-def _normalize(x: Float | Fraction, ctx: Context, args: tuple[Float | Fraction, ...] = ()):
+def _dispatch(op: str, ctx: Context, *args: Float | Fraction) -> tuple[EngineFn, ...]:
+    """Engine methods that may compute `op` on `args` under `ctx`."""
+    return ENGINES.dispatch(op, ctx, tuple(map(type, args)))
+
+def _record(op: str, ctx: Context, x):
+    """Counts the rounding of `x` by `op` under `ctx`, if counting; returns `x`."""
+    counters = _counters._active.get()
+    if counters is not None and isinstance(x, Float):
+        counters.record(op, ctx, x)
+    return x
+
+def _normalize(
+    x: Float | Fraction,
+    ctx: Context,
+    args: tuple[Float | Fraction, ...] = (),
+    op: str | None = None
+):
     if ctx is REAL and isinstance(x, Fraction):
         return x
     else:
@@ -143,8 +162,18 @@ def _normalize(x: Float | Fraction, ctx: Context, args: tuple[Float | Fraction,
             elif result.isinf and not result.inexact:
                 if all(isinstance(a, Fraction) or not a.is_nar() for a in args):
                     result._real._flags._set_divzero(True)
+        if op is not None:
+            counters = _counters._active.get()
+            if counters is not None:
+                counters.record(op, ctx, result)
         return result
 
+def _normalize_constant(x: Float | Fraction, ctx: Context, op: str | None = None):
+    # engines may return constants that are already rounded under `ctx`
+    if isinstance(x, Float) and (x.ctx is ctx or x.ctx == ctx):
+        return x if op is None else _record(op, ctx, x)
+    return _normalize(x, ctx, (), op)
+
 def _empty(dims_list: list[int]) -> list:
     if len(dims_list) == 1:
         return [UNINIT for _ in range(dims_list[0])]
@@ -170,10 +199,10 @@ def acos(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.acos(xr, ctx)
+    for fn in _dispatch('acos', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'acos')
 
     raise NotImplementedError(f'acos() not implemented for ctx={ctx}')
 
@@ -183,10 +212,10 @@ def acosh(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.acosh(xr, ctx)
+    for fn in _dispatch('acosh', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'acosh')
 
     raise NotImplementedError(f'acosh() not implemented for ctx={ctx}')
 
@@ -197,10 +226,10 @@ def add(x: Real, y: Real, ctx: Context = REAL):
 
     xr = _cvt_to_real(x)
     yr = _cvt_to_real(y)
-    for engine in ENGINES:
-        r = engine.add(xr, yr, ctx)
+    for fn in _dispatch('add', ctx, xr, yr):
+        r = fn(xr, yr)
         if r is not None:
-            return _normalize(r, ctx, (xr, yr))
+            return _normalize(r, ctx, (xr, yr), 'add')
 
     raise NotImplementedError(f'add() not implemented for ctx={ctx}')
 
@@ -210,10 +239,10 @@ def asin(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.asin(xr, ctx)
+    for fn in _dispatch('asin', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'asin')
 
     raise NotImplementedError(f'asin() not implemented for ctx={ctx}')
 
@@ -223,10 +252,10 @@ def asinh(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.asinh(xr, ctx)
+    for fn in _dispatch('asinh', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'asinh')
 
     raise NotImplementedError(f'asinh() not implemented for ctx={ctx}')
 
@@ -236,10 +265,10 @@ def atan(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.atan(xr, ctx)
+    for fn in _dispatch('atan', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'atan')
 
     raise NotImplementedError(f'atan() not implemented for ctx={ctx}')
 
@@ -253,10 +282,10 @@ def atan2(y: Real, x: Real, ctx: Context = REAL):
 
     yr = _cvt_to_real(y)
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.atan2(yr, xr, ctx)
+    for fn in _dispatch('atan2', ctx, yr, xr):
+        r = fn(yr, xr)
         if r is not None:
-            return _normalize(r, ctx, (yr, xr))
+            return _normalize(r, ctx, (yr, xr), 'atan2')
 
     raise NotImplementedError(f'atan2() not implemented for ctx={ctx}')
 
@@ -266,10 +295,10 @@ def atanh(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.atanh(xr, ctx)
+    for fn in _dispatch('atanh', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'atanh')
 
     raise NotImplementedError(f'atanh() not implemented for ctx={ctx}')
 
@@ -279,10 +308,10 @@ def cbrt(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.cbrt(xr, ctx)
+    for fn in _dispatch('cbrt', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'cbrt')
 
     raise NotImplementedError(f'cbrt() not implemented for ctx={ctx}')
 
@@ -293,10 +322,10 @@ def copysign(x: Real, y: Real, ctx: Context = REAL):
 
     xr = _cvt_to_real(x)
     yr = _cvt_to_real(y)
-    for engine in ENGINES:
-        r = engine.copysign(xr, yr, ctx)
+    for fn in _dispatch('copysign', ctx, xr, yr):
+        r = fn(xr, yr)
         if r is not None:
-            return _normalize(r, ctx, (xr, yr))
+            return _normalize(r, ctx, (xr, yr), 'copysign')
 
     raise NotImplementedError(f'copysign() not implemented for ctx={ctx}')
 
@@ -306,10 +335,10 @@ def cos(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.cos(xr, ctx)
+    for fn in _dispatch('cos', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'cos')
 
     raise NotImplementedError(f'cos() not implemented for ctx={ctx}')
 
@@ -319,10 +348,10 @@ def cosh(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.cosh(xr, ctx)
+    for fn in _dispatch('cosh', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'cosh')
 
     raise NotImplementedError(f'cosh() not implemented for ctx={ctx}')
 
@@ -333,10 +362,10 @@ def div(x: Real, y: Real, ctx: Context = REAL):
 
     xr = _cvt_to_real(x)
     yr = _cvt_to_real(y)
-    for engine in ENGINES:
-        r = engine.div(xr, yr, ctx)
+    for fn in _dispatch('div', ctx, xr, yr):
+        r = fn(xr, yr)
         if r is not None:
-            return _normalize(r, ctx, (xr, yr))
+            return _normalize(r, ctx, (xr, yr), 'div')
 
     raise NotImplementedError(f'div() not implemented for ctx={ctx}')
 
@@ -346,10 +375,10 @@ def erf(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.erf(xr, ctx)
+    for fn in _dispatch('erf', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'erf')
 
     raise NotImplementedError(f'erf() not implemented for ctx={ctx}')
 
@@ -359,10 +388,10 @@ def erfc(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.erfc(xr, ctx)
+    for fn in _dispatch('erfc', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'erfc')
 
     raise NotImplementedError(f'erfc() not implemented for ctx={ctx}')
 
@@ -372,10 +401,10 @@ def exp(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.exp(xr, ctx)
+    for fn in _dispatch('exp', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'exp')
 
     raise NotImplementedError(f'exp() not implemented for ctx={ctx}')
 
@@ -385,10 +414,10 @@ def exp2(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.exp2(xr, ctx)
+    for fn in _dispatch('exp2', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'exp2')
 
     raise NotImplementedError(f'exp2() not implemented for ctx={ctx}')
 
@@ -398,10 +427,10 @@ def exp10(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.exp10(xr, ctx)
+    for fn in _dispatch('exp10', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'exp10')
 
     raise NotImplementedError(f'exp10() not implemented for ctx={ctx}')
 
@@ -411,10 +440,10 @@ def expm1(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.expm1(xr, ctx)
+    for fn in _dispatch('expm1', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'expm1')
 
     raise NotImplementedError(f'expm1() not implemented for ctx={ctx}')
 
@@ -424,10 +453,10 @@ def fabs(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.fabs(xr, ctx)
+    for fn in _dispatch('fabs', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'fabs')
 
     raise NotImplementedError(f'fabs() not implemented for ctx={ctx}')
 
@@ -438,10 +467,10 @@ def fdim(x: Real, y: Real, ctx: Context = REAL):
 
     xr = _cvt_to_real(x)
     yr = _cvt_to_real(y)
-    for engine in ENGINES:
-        r = engine.fdim(xr, yr, ctx)
+    for fn in _dispatch('fdim', ctx, xr, yr):
+        r = fn(xr, yr)
         if r is not None:
-            return _normalize(r, ctx, (xr, yr))
+            return _normalize(r, ctx, (xr, yr), 'fdim')
 
     raise NotImplementedError(f'fdim() not implemented for ctx={ctx}')
 
@@ -453,10 +482,10 @@ def fma(x: Real, y: Real, z: Real, ctx: Context = REAL):
     xr = _cvt_to_real(x)
     yr = _cvt_to_real(y)
     zr = _cvt_to_real(z)
-    for engine in ENGINES:
-        r = engine.fma(xr, yr, zr, ctx)
+    for fn in _dispatch('fma', ctx, xr, yr, zr):
+        r = fn(xr, yr, zr)
         if r is not None:
-            return _normalize(r, ctx, (xr, yr, zr))
+            return _normalize(r, ctx, (xr, yr, zr), 'fma')
 
     raise NotImplementedError(f'fma() not implemented for ctx={ctx}')
 
@@ -467,10 +496,10 @@ def fmax(x: Real, y: Real, ctx: Context = REAL):
 
     xr = _cvt_to_real(x)
     yr = _cvt_to_real(y)
-    for engine in ENGINES:
-        r = engine.fmax(xr, yr, ctx)
+    for fn in _dispatch('fmax', ctx, xr, yr):
+        r = fn(xr, yr)
         if r is not None:
-            return _normalize(r, ctx, (xr, yr))
+            return _normalize(r, ctx, (xr, yr), 'fmax')
 
     raise NotImplementedError(f'fmax() not implemented for ctx={ctx}')
 
@@ -481,10 +510,10 @@ def fmin(x: Real, y: Real, ctx: Context = REAL):
 
     xr = _cvt_to_real(x)
     yr = _cvt_to_real(y)
-    for engine in ENGINES:
-        r = engine.fmin(xr, yr, ctx)
+    for fn in _dispatch('fmin', ctx, xr, yr):
+        r = fn(xr, yr)
         if r is not None:
-            return _normalize(r, ctx, (xr, yr))
+            return _normalize(r, ctx, (xr, yr), 'fmin')
 
     raise NotImplementedError(f'fmin() not implemented for ctx={ctx}')
 
@@ -500,10 +529,10 @@ def fmod(x: Real, y: Real, ctx: Context = REAL):
 
     xr = _cvt_to_real(x)
     yr = _cvt_to_real(y)
-    for engine in ENGINES:
-        r = engine.fmod(xr, yr, ctx)
+    for fn in _dispatch('fmod', ctx, xr, yr):
+        r = fn(xr, yr)
         if r is not None:
-            return _normalize(r, ctx, (xr, yr))
+            return _normalize(r, ctx, (xr, yr), 'fmod')
 
     raise NotImplementedError(f'fmod() not implemented for ctx={ctx}')
 
@@ -514,10 +543,10 @@ def hypot(x: Real, y: Real, ctx: Context = REAL):
 
     xr = _cvt_to_real(x)
     yr = _cvt_to_real(y)
-    for engine in ENGINES:
-        r = engine.hypot(xr, yr, ctx)
+    for fn in _dispatch('hypot', ctx, xr, yr):
+        r = fn(xr, yr)
         if r is not None:
-            return _normalize(r, ctx, (xr, yr))
+            return _normalize(r, ctx, (xr, yr), 'hypot')
 
     raise NotImplementedError(f'hypot() not implemented for ctx={ctx}')
 
@@ -527,10 +556,10 @@ def lgamma(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.lgamma(xr, ctx)
+    for fn in _dispatch('lgamma', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'lgamma')
 
     raise NotImplementedError(f'lgamma() not implemented for ctx={ctx}')
 
@@ -540,10 +569,10 @@ def log(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.log(xr, ctx)
+    for fn in _dispatch('log', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'log')
 
     raise NotImplementedError(f'log() not implemented for ctx={ctx}')
 
@@ -553,10 +582,10 @@ def log10(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.log10(xr, ctx)
+    for fn in _dispatch('log10', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'log10')
 
     raise NotImplementedError(f'log10() not implemented for ctx={ctx}')
 
@@ -566,10 +595,10 @@ def log1p(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.log1p(xr, ctx)
+    for fn in _dispatch('log1p', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'log1p')
 
     raise NotImplementedError(f'log1p() not implemented for ctx={ctx}')
 
@@ -579,10 +608,10 @@ def log2(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.log2(xr, ctx)
+    for fn in _dispatch('log2', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'log2')
 
     raise NotImplementedError(f'log2() not implemented for ctx={ctx}')
 
@@ -599,10 +628,10 @@ def mod(x: Real, y: Real, ctx: Context = REAL):
 
     xr = _cvt_to_real(x)
     yr = _cvt_to_real(y)
-    for engine in ENGINES:
-        r = engine.mod(xr, yr, ctx)
+    for fn in _dispatch('mod', ctx, xr, yr):
+        r = fn(xr, yr)
         if r is not None:
-            return _normalize(r, ctx, (xr, yr))
+            return _normalize(r, ctx, (xr, yr), 'mod')
 
     raise NotImplementedError(f'mod() not implemented for ctx={ctx}')
 
@@ -613,10 +642,10 @@ def mul(x: Real, y: Real, ctx: Context = REAL):
 
     xr = _cvt_to_real(x)
     yr = _cvt_to_real(y)
-    for engine in ENGINES:
-        r = engine.mul(xr, yr, ctx)
+    for fn in _dispatch('mul', ctx, xr, yr):
+        r = fn(xr, yr)
         if r is not None:
-            return _normalize(r, ctx, (xr, yr))
+            return _normalize(r, ctx, (xr, yr), 'mul')
 
     raise NotImplementedError(f'mul() not implemented for ctx={ctx}')
 
@@ -626,10 +655,10 @@ def neg(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for ctx={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.neg(xr, ctx)
+    for fn in _dispatch('neg', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'neg')
 
     raise NotImplementedError(f'neg() not implemented for ctx={ctx}')
 
@@ -640,10 +669,10 @@ def pow(x: Real, y: Real, ctx: Context = REAL):
 
     xr = _cvt_to_real(x)
     yr = _cvt_to_real(y)
-    for engine in ENGINES:
-        r = engine.pow(xr, yr, ctx)
+    for fn in _dispatch('pow', ctx, xr, yr):
+        r = fn(xr, yr)
         if r is not None:
-            return _normalize(r, ctx, (xr, yr))
+            return _normalize(r, ctx, (xr, yr), 'pow')
 
     raise NotImplementedError(f'pow() not implemented for ctx={ctx}')
 
@@ -659,10 +688,10 @@ def remainder(x: Real, y: Real, ctx: Context = REAL):
 
     xr = _cvt_to_real(x)
     yr = _cvt_to_real(y)
-    for engine in ENGINES:
-        r = engine.remainder(xr, yr, ctx)
+    for fn in _dispatch('remainder', ctx, xr, yr):
+        r = fn(xr, yr)
         if r is not None:
-            return _normalize(r, ctx, (xr, yr))
+            return _normalize(r, ctx, (xr, yr), 'remainder')
 
     raise NotImplementedError(f'remainder() not implemented for ctx={ctx}')
 
@@ -672,10 +701,10 @@ def sin(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.sin(xr, ctx)
+    for fn in _dispatch('sin', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'sin')
 
     raise NotImplementedError(f'sin() not implemented for ctx={ctx}')
 
@@ -685,10 +714,10 @@ def sinh(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.sinh(xr, ctx)
+    for fn in _dispatch('sinh', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'sinh')
 
     raise NotImplementedError(f'sinh() not implemented for ctx={ctx}')
 
@@ -698,10 +727,10 @@ def sqrt(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.sqrt(xr, ctx)
+    for fn in _dispatch('sqrt', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'sqrt')
 
     raise NotImplementedError(f'sqrt() not implemented for ctx={ctx}')
 
@@ -712,10 +741,10 @@ def sub(x: Real, y: Real, ctx: Context = REAL):
 
     xr = _cvt_to_real(x)
     yr = _cvt_to_real(y)
-    for engine in ENGINES:
-        r = engine.sub(xr, yr, ctx)
+    for fn in _dispatch('sub', ctx, xr, yr):
+        r = fn(xr, yr)
         if r is not None:
-            return _normalize(r, ctx, (xr, yr))
+            return _normalize(r, ctx, (xr, yr), 'sub')
 
     raise NotImplementedError(f'sub() not implemented for ctx={ctx}')
 
@@ -725,10 +754,10 @@ def tan(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.tan(xr, ctx)
+    for fn in _dispatch('tan', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'tan')
 
     raise NotImplementedError(f'tan() not implemented for ctx={ctx}')
 
@@ -738,10 +767,10 @@ def tanh(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.tanh(xr, ctx)
+    for fn in _dispatch('tanh', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'tanh')
 
     raise NotImplementedError(f'tanh() not implemented for ctx={ctx}')
 
@@ -751,10 +780,10 @@ def tgamma(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.tgamma(xr, ctx)
+    for fn in _dispatch('tgamma', ctx, xr):
+        r = fn(xr)
         if r is not None:
-            return _normalize(r, ctx, (xr,))
+            return _normalize(r, ctx, (xr,), 'tgamma')
 
     raise NotImplementedError(f'tgamma() not implemented for ctx={ctx}')
 
@@ -771,7 +800,7 @@ def _round(x: Real, ctx: Context | None, exact: bool):
         else:
             return REAL.round(x)
     else:
-        return ctx.round(x, exact=exact)
+        return _record('round_exact' if exact else 'round', ctx, ctx.round(x, exact=exact))
 
 def round(x: Real, ctx: Context = REAL):
     """
@@ -802,7 +831,7 @@ def round_at(x: Real, n: Real, ctx: Context = REAL) -> Float:
     if ctx is None or ctx is REAL:
         raise ValueError(f'round_at() not supported for ctx={ctx}')
     else:
-        return ctx.round_at(x, int(n))
+        return _record('round_at', ctx, ctx.round_at(x, int(n)))
 
 def cast(x: Real, ctx: Context = REAL):
     """
@@ -817,7 +846,7 @@ def cast(x: Real, ctx: Context = REAL):
     else:
         # Check if x can be exactly represented in ctx
         rounded = ctx.round(x, exact=True)
-        return rounded
+        return _record('cast', ctx, rounded)
 
 #############################################################################
 # Round-to-integer operations
@@ -833,14 +862,14 @@ def ceil(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.ceil(xr, ctx)
+    for fn in _dispatch('ceil', ctx, xr):
+        r = fn(xr)
         if r is not None:
             y = _normalize(r, ctx)
             # set the inexact flag if the result does not equal the original value
             if isinstance(y, Float) and y.is_finite() and y != x:
                 y._real._flags._set_inexact(True)
-            return y
+            return _record('ceil', ctx, y)
 
     raise NotImplementedError(f'ceil() not implemented for ctx={ctx}')
 
@@ -855,14 +884,14 @@ def floor(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.floor(xr, ctx)
+    for fn in _dispatch('floor', ctx, xr):
+        r = fn(xr)
         if r is not None:
             y = _normalize(r, ctx)
             # set the inexact flag if the result does not equal the original value
             if isinstance(y, Float) and y.is_finite() and y != x:
                 y._real._flags._set_inexact(True)
-            return y
+            return _record('floor', ctx, y)
 
     raise NotImplementedError(f'floor() not implemented for ctx={ctx}')
 
@@ -878,14 +907,14 @@ def trunc(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.trunc(xr, ctx)
+    for fn in _dispatch('trunc', ctx, xr):
+        r = fn(xr)
         if r is not None:
             y = _normalize(r, ctx)
             # set the inexact flag if the result does not equal the original value
             if isinstance(y, Float) and y.is_finite() and y != x:
                 y._real._flags._set_inexact(True)
-            return y
+            return _record('trunc', ctx, y)
 
     raise NotImplementedError(f'trunc() not implemented for ctx={ctx}')
 
@@ -901,7 +930,7 @@ def nearbyint(x: Real, ctx: Context = REAL):
     if ctx is None or ctx is REAL:
         raise RuntimeError('nearbyint() not supported in RealContext')
     else:
-        return ctx.round_integer(x)
+        return _record('nearbyint', ctx, ctx.round_integer(x))
 
 def roundint(x: Real, ctx: Context = REAL):
     """
@@ -914,14 +943,14 @@ def roundint(x: Real, ctx: Context = REAL):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
     xr = _cvt_to_real(x)
-    for engine in ENGINES:
-        r = engine.roundint(xr, ctx)
+    for fn in _dispatch('roundint', ctx, xr):
+        r = fn(xr)
         if r is not None:
             y = _normalize(r, ctx)
             # set the inexact flag if the result does not equal the original value
             if isinstance(y, Float) and y.is_finite() and y != x:
                 y._real._flags._set_inexact(True)
-            return y
+            return _record('roundint', ctx, y)
 
     raise NotImplementedError(f'roundint() not implemented for ctx={ctx}')
 
@@ -1101,7 +1130,7 @@ def digits(m: int, e: int, b: int, ctx: Context = REAL) -> Float:
         return Float(m=m, exp=exp)
     else:
         x = digits_to_fraction(m, e, b)
-        return ctx.round(x)
+        return _record('digits', ctx, ctx.round(x))
 
 def hexfloat(s: str, ctx: Context = REAL) -> Float:
     """
@@ -1118,7 +1147,7 @@ def hexfloat(s: str, ctx: Context = REAL) -> Float:
         return Float(m=m, exp=exp)
     else:
         x = hexnum_to_fraction(s)
-        return ctx.round(x)
+        return _record('hexfloat', ctx, ctx.round(x))
 
 def rational(n: int, d: int, ctx: Context = REAL) -> Float:
     """
@@ -1138,7 +1167,7 @@ def rational(n: int, d: int, ctx: Context = REAL) -> Float:
         return Float(m=m, exp=exp)
     else:
         x = Fraction(n, d)
-        return ctx.round(x)
+        return _record('rational', ctx, ctx.round(x))
 
 def nan(ctx: Context = REAL) -> Float:
     """
@@ -1166,10 +1195,10 @@ def const_pi(ctx: Context = REAL) -> Float:
     if ctx is not None and not isinstance(ctx, Context):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
-    for engine in ENGINES:
-        r = engine.const_pi(ctx)
+    for fn in _dispatch('const_pi', ctx):
+        r = fn()
         if r is not None:
-            return _normalize(r, ctx)
+            return _normalize_constant(r, ctx, 'const_pi')
 
     raise NotImplementedError(f'const_pi() not implemented for ctx={ctx}')
 
@@ -1181,10 +1210,10 @@ def const_e(ctx: Context = REAL) -> Float:
     if ctx is not None and not isinstance(ctx, Context):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
-    for engine in ENGINES:
-        r = engine.const_e(ctx)
+    for fn in _dispatch('const_e', ctx):
+        r = fn()
         if r is not None:
-            return _normalize(r, ctx)
+            return _normalize_constant(r, ctx, 'const_e')
 
     raise NotImplementedError(f'const_e() not implemented for ctx={ctx}')
 
@@ -1196,10 +1225,10 @@ def const_log2e(ctx: Context = REAL) -> Float:
     if ctx is not None and not isinstance(ctx, Context):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
-    for engine in ENGINES:
-        r = engine.const_log2e(ctx)
+    for fn in _dispatch('const_log2e', ctx):
+        r = fn()
         if r is not None:
-            return _normalize(r, ctx)
+            return _normalize_constant(r, ctx, 'const_log2e')
 
     raise NotImplementedError(f'const_log2e() not implemented for ctx={ctx}')
 
@@ -1211,10 +1240,10 @@ def const_log10e(ctx: Context = REAL) -> Float:
     if ctx is not None and not isinstance(ctx, Context):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
-    for engine in ENGINES:
-        r = engine.const_log10e(ctx)
+    for fn in _dispatch('const_log10e', ctx):
+        r = fn()
         if r is not None:
-            return _normalize(r, ctx)
+            return _normalize_constant(r, ctx, 'const_log10e')
 
     raise NotImplementedError(f'const_log10e() not implemented for ctx={ctx}')
 
@@ -1226,10 +1255,10 @@ def const_ln2(ctx: Context = REAL) -> Float:
     if ctx is not None and not isinstance(ctx, Context):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
-    for engine in ENGINES:
-        r = engine.const_ln2(ctx)
+    for fn in _dispatch('const_ln2', ctx):
+        r = fn()
         if r is not None:
-            return _normalize(r, ctx)
+            return _normalize_constant(r, ctx, 'const_ln2')
 
     raise NotImplementedError(f'const_ln2() not implemented for ctx={ctx}')
 
@@ -1241,10 +1270,10 @@ def const_pi_2(ctx: Context = REAL) -> Float:
     if ctx is not None and not isinstance(ctx, Context):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
-    for engine in ENGINES:
-        r = engine.const_pi_2(ctx)
+    for fn in _dispatch('const_pi_2', ctx):
+        r = fn()
         if r is not None:
-            return _normalize(r, ctx)
+            return _normalize_constant(r, ctx, 'const_pi_2')
 
     raise NotImplementedError(f'const_pi_2() not implemented for ctx={ctx}')
 
@@ -1256,10 +1285,10 @@ def const_pi_4(ctx: Context = REAL) -> Float:
     if ctx is not None and not isinstance(ctx, Context):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
-    for engine in ENGINES:
-        r = engine.const_pi_4(ctx)
+    for fn in _dispatch('const_pi_4', ctx):
+        r = fn()
         if r is not None:
-            return _normalize(r, ctx)
+            return _normalize_constant(r, ctx, 'const_pi_4')
 
     raise NotImplementedError(f'const_pi_4() not implemented for ctx={ctx}')
 
@@ -1271,10 +1300,10 @@ def const_1_pi(ctx: Context = REAL) -> Float:
     if ctx is not None and not isinstance(ctx, Context):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
-    for engine in ENGINES:
-        r = engine.const_1_pi(ctx)
+    for fn in _dispatch('const_1_pi', ctx):
+        r = fn()
         if r is not None:
-            return _normalize(r, ctx)
+            return _normalize_constant(r, ctx, 'const_1_pi')
 
     raise NotImplementedError(f'const_1_pi() not implemented for ctx={ctx}')
 
@@ -1286,10 +1315,10 @@ def const_2_pi(ctx: Context = REAL) -> Float:
     if ctx is not None and not isinstance(ctx, Context):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
-    for engine in ENGINES:
-        r = engine.const_2_pi(ctx)
+    for fn in _dispatch('const_2_pi', ctx):
+        r = fn()
         if r is not None:
-            return _normalize(r, ctx)
+            return _normalize_constant(r, ctx, 'const_2_pi')
 
     raise NotImplementedError(f'const_2_pi() not implemented for ctx={ctx}')
 
@@ -1301,10 +1330,10 @@ def const_2_sqrt_pi(ctx: Context = REAL) -> Float:
     if ctx is not None and not isinstance(ctx, Context):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
-    for engine in ENGINES:
-        r = engine.const_2_sqrtpi(ctx)
+    for fn in _dispatch('const_2_sqrtpi', ctx):
+        r = fn()
         if r is not None:
-            return _normalize(r, ctx)
+            return _normalize_constant(r, ctx, 'const_2_sqrt_pi')
 
     raise NotImplementedError(f'const_2_sqrt_pi() not implemented for ctx={ctx}')
 
@@ -1316,10 +1345,10 @@ def const_sqrt2(ctx: Context = REAL) -> Float:
     if ctx is not None and not isinstance(ctx, Context):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
-    for engine in ENGINES:
-        r = engine.const_sqrt2(ctx)
+    for fn in _dispatch('const_sqrt2', ctx):
+        r = fn()
         if r is not None:
-            return _normalize(r, ctx)
+            return _normalize_constant(r, ctx, 'const_sqrt2')
 
     raise NotImplementedError(f'const_sqrt2() not implemented for ctx={ctx}')
 
@@ -1331,9 +1360,88 @@ def const_sqrt1_2(ctx: Context = REAL) -> Float:
     if ctx is not None and not isinstance(ctx, Context):
         raise TypeError(f'Expected \'Context\' or \'None\', got \'{type(ctx)}\' for x={ctx}')
 
-    for engine in ENGINES:
-        r = engine.const_sqrt1_2(ctx)
+    for fn in _dispatch('const_sqrt1_2', ctx):
+        r = fn()
         if r is not None:
-            return _normalize(r, ctx)
+            return _normalize_constant(r, ctx, 'const_sqrt1_2')
 
     raise NotImplementedError(f'const_sqrt1_2() not implemented for ctx={ctx}')
+
+################################################################################
+# Context binding
+
+_engine_ops: dict[Callable, str] = {
+    fn: fn.__name__
+    for fn in (
+        acos, acosh, add, asin, asinh, atan, atan2, atanh, cbrt, copysign,
+        cos, cosh, div, erf, erfc, exp, exp2, exp10, expm1, fabs, fdim, fma,
+        fmax, fmin, fmod, hypot, lgamma, log, log10, log1p, log2, mod, mul,
+        neg, pow, remainder, sin, sinh, sqrt, sub, tan, tanh, tgamma,
+        const_1_pi, const_2_pi, const_e, const_ln2, const_log2e, const_log10e,
+        const_pi, const_pi_2, const_pi_4, const_sqrt1_2, const_sqrt2,
+    )
+}
+_engine_ops[const_2_sqrt_pi] = 'const_2_sqrtpi'
+"""operations that round a single engine result, by engine method name"""
+
+def bind(op: Callable, ctx: Context) -> Callable:
+    """
+    Specializes the operation `op` to the rounding context `ctx`.
+
+    The result takes the positional arguments of `op` (but not `ctx`).
+    The context is validated once, here, rather than on every call.
+    For operations computed by the engines, each call goes straight
+    to the dispatch cache, which resolves the engine methods for
+    a combination of argument types once.
+    Any other operation is simply applied with `ctx`.
+    """
+    if not isinstance(ctx, Context):
+        raise TypeError(f'Expected \'Context\', got \'{type(ctx)}\' for ctx={ctx}')
+
+    name = _engine_ops.get(op)
+    if name is None:
+        return functools.partial(op, ctx=ctx)
+
+    dispatch = ENGINES.dispatch
+    op_name = op.__name__
+    bound: Callable
+    # one closure per arity: no argument tuples to build,
+    # and a `Float` argument needs no conversion
+    match op.__code__.co_argcount - 1:
+        case 0:
+            def bound():
+                for fn in dispatch(name, ctx, ()):
+                    r = fn()
+                    if r is not None:
+                        return _normalize_constant(r, ctx, op_name)
+                raise NotImplementedError(f'{name}() not implemented for ctx={ctx}')
+        case 1:
+            def bound(x: Real):
+                xr = x if type(x) is Float else _cvt_to_real(x)
+                for fn in dispatch(name, ctx, (type(xr),)):
+                    r = fn(xr)
+                    if r is not None:
+                        return _normalize(r, ctx, (xr,), op_name)
+                raise NotImplementedError(f'{name}() not implemented for ctx={ctx}')
+        case 2:
+            def bound(x: Real, y: Real):
+                xr = x if type(x) is Float else _cvt_to_real(x)
+                yr = y if type(y) is Float else _cvt_to_real(y)
+                for fn in dispatch(name, ctx, (type(xr), type(yr))):
+                    r = fn(xr, yr)
+                    if r is not None:
+                        return _normalize(r, ctx, (xr, yr), op_name)
+                raise NotImplementedError(f'{name}() not implemented for ctx={ctx}')
+        case _:
+            def bound(*args: Real):
+                xs = tuple(map(_cvt_to_real, args))
+                for fn in dispatch(name, ctx, tuple(map(type, xs))):
+                    r = fn(*xs)
+                    if r is not None:
+                        return _normalize(r, ctx, xs, op_name)
+                raise NotImplementedError(f'{name}() not implemented for ctx={ctx}')
+
+    bound.__name__ = op.__name__
+    bound.__qualname__ = op.__qualname__
+    bound.__doc__ = op.__doc__
+    return bound
@@ -5,11 +5,28 @@ This module defines a running for design-space exploration tasks.
 import concurrent.futures
 import gzip
 import hashlib
+import io
+import mmap
 import pickle
+import struct
+import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Generic, TypeVar
+from typing import Any, Generic, TypeVar
+
+import numpy as np
+
+from .number import (
+    Float,
+    FloatArray,
+    RealFloat,
+    RoundingCounters,
+    get_rounding_counters,
+    set_rounding_counters,
+)
+from .utils import LRUCache, write_atomic
 
 __all__ = [
     'Runner',
@@ -20,6 +37,7 @@ __all__ = [
 C = TypeVar("C") # Config type
 K = TypeVar("K") # Sample key type
 R = TypeVar("R") # Result type
+T = TypeVar("T") # Task type
 
 @dataclass(frozen=True)
 class SampleWorkerTask(Generic[K]):
@@ -55,6 +73,179 @@ class RunnerWorkerTask(Generic[C]):
     """the index of this worker"""
 
 
+_worker_runner: 'Runner | None' = None
+"""the runner of a worker process"""
+
+def _init_worker(runner: 'Runner', counting: bool = False):
+    global _worker_runner
+    _worker_runner = runner
+    set_rounding_counters(RoundingCounters() if counting else None)
+
+def _run_chunk(method: str, tasks: list):
+    """
+    Runs `method` of the worker's runner on each task.
+
+    Returns the results of the tasks that completed, the exception
+    raised by the next one, if any, so that completed results are kept,
+    and the rounding counts of the chunk, if counting.
+    """
+    fn = getattr(_worker_runner, method)
+    counters = get_rounding_counters()
+    if counters is not None:
+        counters.reset()
+    results = []
+    for task in tasks:
+        try:
+            results.append(fn(task))
+        except Exception as e:  # noqa: BLE001 -- re-raised by the parent
+            return results, e, counters
+    return results, None, counters
+
+
+_SAMPLE_SUFFIX = '.fpys'
+_SAMPLE_MAGIC = b'FPYS\x02'
+_SAMPLE_COLUMNS = ('s', 'exp', 'c', 'isinf', 'isnan', 'flags')
+
+_sample_memo: LRUCache[tuple[str, int, int, int], tuple[bytes, list[list[Any]]]] = LRUCache(maxsize=8)
+"""decoded numbers of the samples read by this process, keyed by path, inode, size, and modification time"""
+
+
+def _encode_samples(data) -> bytes:
+    """
+    Encodes `data` with every `Float` and `RealFloat` stored in columns.
+
+    The rest of `data` is pickled with each number replaced by its
+    position in a `FloatArray`; there is one array per context
+    (and one for `RealFloat` values).
+    Layout: magic, header length (8 bytes), pickled header,
+    then each column, 8-byte aligned.
+    """
+    groups: list[tuple[bool, Any, list]] = [] # (is real?, context, elements)
+    group_ids: dict[tuple[bool, int], int] = {}
+    rows: dict[int, tuple[int, int]] = {}
+
+    class _Pickler(pickle.Pickler):
+        def persistent_id(self, obj):
+            if not isinstance(obj, (Float, RealFloat)):
+                return None
+            row = rows.get(id(obj))
+            if row is None:
+                if isinstance(obj, Float):
+                    is_real, ctx = False, obj.ctx
+                else:
+                    is_real, ctx = True, None
+                gid = group_ids.get((is_real, id(ctx)))
+                if gid is None:
+                    gid = group_ids[(is_real, id(ctx))] = len(groups)
+                    groups.append((is_real, ctx, []))
+                elts = groups[gid][2]
+                row = rows[id(obj)] = (gid, len(elts))
+                elts.append(obj)
+            return row
+
+    buf = io.BytesIO()
+    _Pickler(buf, protocol=pickle.HIGHEST_PROTOCOL).dump(data)
+
+    # columns of arbitrary-precision significands are pickled instead
+    columns: list[np.ndarray] = []
+    layout: list[tuple[bool, Any, int, dict[str, tuple[str, int] | list[int]]]] = []
+    offset = 0
+    for is_real, ctx, elts in groups:
+        arr = FloatArray(elts, ctx)
+        cols: dict[str, tuple[str, int] | list[int]] = {}
+        for name in _SAMPLE_COLUMNS:
+            col: np.ndarray = getattr(arr, name)
+            if col.dtype == object:
+                cols[name] = col.tolist()
+            else:
+                cols[name] = (col.dtype.str, offset)
+                columns.append(col)
+                offset += -(-col.nbytes // 8) * 8
+        layout.append((is_real, ctx, len(arr), cols))
+    header = pickle.dumps({
+        'skeleton': buf.getvalue(),
+        'groups': layout,
+    }, protocol=pickle.HIGHEST_PROTOCOL)
+
+    start = len(_SAMPLE_MAGIC) + 8 + len(header)
+    start += -start % 8
+    out = bytearray(start + offset)
+    out[:len(_SAMPLE_MAGIC)] = _SAMPLE_MAGIC
+    struct.pack_into('<Q', out, len(_SAMPLE_MAGIC), len(header))
+    out[len(_SAMPLE_MAGIC) + 8:len(_SAMPLE_MAGIC) + 8 + len(header)] = header
+    pos = start
+    for col in columns:
+        out[pos:pos + col.nbytes] = col.tobytes()
+        pos += -(-col.nbytes // 8) * 8
+    return bytes(out)
+
+def _decode_columns(buf) -> tuple[bytes, list[list[Any]]]:
+    """
+    Decodes the numbers of a buffer produced by `_encode_samples`.
+
+    Returns the pickled skeleton and, for each group, its numbers.
+    """
+    if bytes(buf[:len(_SAMPLE_MAGIC)]) != _SAMPLE_MAGIC:
+        raise ValueError('not an encoded sample')
+    (size,) = struct.unpack_from('<Q', buf, len(_SAMPLE_MAGIC))
+    header = pickle.loads(buf[len(_SAMPLE_MAGIC) + 8:len(_SAMPLE_MAGIC) + 8 + size])
+    start = len(_SAMPLE_MAGIC) + 8 + size
+    start += -start % 8
+
+    groups: list[list[Any]] = []
+    for is_real, ctx, n, cols in header['groups']:
+        fields: dict[str, np.ndarray] = {}
+        for name, col in cols.items():
+            if isinstance(col, list):
+                fields[name] = np.empty(n, dtype=object)
+                fields[name][:] = col
+            else:
+                dtype, offset = col
+                fields[name] = np.frombuffer(buf, dtype=dtype, count=n, offset=start + offset)
+        elts = FloatArray.from_columns(**fields, ctx=ctx).tolist()
+        groups.append([x.as_real() for x in elts] if is_real else elts)
+        del fields
+
+    return header['skeleton'], groups
+
+def _load_skeleton(skeleton: bytes, groups: list[list[Any]]) -> Any:
+    """
+    Rebuilds a sample from its pickled skeleton and decoded numbers.
+
+    The containers of the sample are new; the numbers, which are
+    immutable, are those of `groups`.
+    """
+    unpickler = pickle.Unpickler(io.BytesIO(skeleton))
+    unpickler.persistent_load = lambda pid: groups[pid[0]][pid[1]] # type: ignore[method-assign]
+    return unpickler.load()
+
+def _decode_samples(buf) -> Any:
+    """Decodes a buffer produced by `_encode_samples`."""
+    return _load_skeleton(*_decode_columns(buf))
+
+
+class _Progress:
+    """Reports progress and throughput of a runner stage."""
+
+    def __init__(self, runner: 'Runner', where: str, total: int):
+        self.runner = runner
+        self.where = where
+        self.total = total
+        self.done = 0
+        self.start = time.monotonic()
+        self.last = self.start
+
+    def update(self, n: int):
+        self.done += n
+        now = time.monotonic()
+        if now - self.last >= self.runner.progress_interval or self.done == self.total:
+            self.last = now
+            elapsed = now - self.start
+            rate = self.done / elapsed if elapsed > 0 else float('inf')
+            eta = (self.total - self.done) / rate if rate > 0 else float('inf')
+            self.runner.log(self.where, f'completed {self.done}/{self.total} ({rate:.2f}/s, {elapsed:.0f}s elapsed, eta {eta:.0f}s)')
+
+
 class Runner(ABC, Generic[C, K, R]):
     """
     Abstract base class defining a design-space explorer.
@@ -65,8 +256,31 @@ class Runner(ABC, Generic[C, K, R]):
     - R: The result type.
     """
 
-    def __init__(self, logging: bool = False):
+    def __init__(
+        self,
+        logging: bool = False,
+        *,
+        chunk_size: int = 1,
+        max_in_flight: int | None = None,
+        progress_interval: float = 10.0
+    ):
+        """
+        Parameters:
+        - logging: If True, logs progress messages.
+        - chunk_size: The number of tasks sent to a worker process at once.
+        - max_in_flight: The maximum number of chunks submitted but not
+          yet completed (by default, twice the number of threads).
+        - progress_interval: The minimum number of seconds between
+          progress messages.
+        """
+        if chunk_size < 1:
+            raise ValueError(f'Expected chunk_size >= 1, got {chunk_size}')
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError(f'Expected max_in_flight >= 1, got {max_in_flight}')
         self.logging = logging
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight
+        self.progress_interval = progress_interval
 
     @abstractmethod
     def configs(self) -> list[C]:
@@ -134,6 +348,17 @@ class Runner(ABC, Generic[C, K, R]):
         """
         ...
 
+    def estimate_cost(self, config: C) -> float:
+        """
+        Estimates the relative cost of running a configuration.
+
+        In parallel sweeps, configurations are started in order of
+        decreasing cost so that the longest ones do not run last.
+        Override this method when costs vary; by default, all
+        configurations have the same cost.
+        """
+        return 1.0
+
     def log(self, where: str, *args):
         """
         Logs a message if logging is enabled.
@@ -147,7 +372,8 @@ class Runner(ABC, Generic[C, K, R]):
         seed: int = 1,
         num_threads: int = 1,
         no_cache: bool = False,
-        replot: bool = False
+        replot: bool = False,
+        resume: bool = False
     ):
         """
         Runs the design-space exploration.
@@ -158,6 +384,8 @@ class Runner(ABC, Generic[C, K, R]):
         - num_threads: The number of threads to use for parallel execution.
         - no_cache: If True, disables caching of samples
         - replot: If True, only replots existing results from cache.
+        - resume: If True, skips configurations whose results were saved
+          by a previous run, including one that did not finish.
         """
 
         # resolve output directory and create if not exists
@@ -182,11 +410,19 @@ class Runner(ABC, Generic[C, K, R]):
             configs = self.configs()
             self.log('run', f'generated {len(configs)} configurations')
 
+            # recover results of a previous run
+            completed: dict[C, R] = {}
+            if resume:
+                completed = self._read_completed(cache_file, configs)
+                self.log('run', f'resuming with {len(completed)} of {len(configs)} configurations completed')
+
             # generate sampling tasks
             uniq_keys: set[K] = set()
             key_by_config: dict[C, K] = {}
             sampling_tasks: list[SampleWorkerTask[K]] = []
             for config in configs:
+                if config in completed:
+                    continue
                 key = self.sample_key(config, seed)
                 key_by_config[config] = key
                 if key not in uniq_keys:
@@ -201,10 +437,11 @@ class Runner(ABC, Generic[C, K, R]):
             sweep_tasks: list[RunnerWorkerTask[C]] = [
                 RunnerWorkerTask(config, samples[key_by_config[config]], output_dir, seed, idx)
                 for idx, config in enumerate(configs)
+                if config not in completed
             ]
 
             # run sweep
-            results = self._run_sweep(sweep_tasks, cache_file, num_threads)
+            results = self._run_sweep(sweep_tasks, cache_file, num_threads, configs=configs, completed=completed)
 
         # plot results
         self.log('run', 'plotting results')
@@ -214,28 +451,16 @@ class Runner(ABC, Generic[C, K, R]):
         """
         Internal method to run a sweep of sampling tasks.
         """
-        # run workers
-        samples = {}
+        samples: dict[K, Path] = {}
+
+        def on_result(task: SampleWorkerTask[K], path: Path):
+            samples[task.key] = path
+
         if num_threads > 1 and len(tasks) > 1:
-            # run with multiple processes
             self.log('run_sampling', f'running {len(tasks)} samples with {num_threads} threads')
-            with concurrent.futures.ProcessPoolExecutor(max_workers=num_threads) as executor:
-                futures = { executor.submit(self._sample_one, task): task for task in tasks }
-                for future in concurrent.futures.as_completed(futures):
-                    task = futures[future]
-                    try:
-                        path = future.result()
-                        samples[task.key] = path
-                    except Exception:
-                        self.log('run_sampling', f'sample {task.key} generated an exception')
-                        raise
         else:
-            # single-threaded mode
             self.log('run_sampling', f'running {len(tasks)} samples in single-threaded mode')
-            for task in tasks:
-                path = self._sample_one(task)
-                samples[task.key] = path
-
+        self._schedule('run_sampling', '_sample_one', tasks, num_threads, on_result, lambda task: f'sample {task.key}')
         return samples
 
     def _sample_one(self, task: SampleWorkerTask[K]) -> Path:
@@ -247,38 +472,110 @@ class Runner(ABC, Generic[C, K, R]):
         self.log('_sample_one', f'completed sample for key {task.key} (idx={task.idx})')
         return sample_path
 
-    def _run_sweep(self, tasks: list[RunnerWorkerTask[C]], cache_path: Path, num_threads: int) -> dict[C, R]:
+    def _run_sweep(
+        self,
+        tasks: list[RunnerWorkerTask[C]],
+        cache_path: Path,
+        num_threads: int,
+        *,
+        configs: list[C] | None = None,
+        completed: dict[C, R] | None = None
+    ) -> dict[C, R]:
         """
         Internal method to run a sweep of configurations.
+
+        Each result is appended to a checkpoint file as it completes;
+        `completed` holds results recovered from a previous run.
+        Once every task finishes, all results for `configs`
+        (by default, those of `tasks`) are saved to `cache_path`
+        and the checkpoint file is removed.
         """
-        # run workers
-        results = {}
-        if num_threads > 1 and len(tasks) > 1:
-            # run with multiple processes
-            self.log('run_sweep', f'running {len(tasks)} configs with {num_threads} threads')
-            with concurrent.futures.ProcessPoolExecutor(max_workers=num_threads) as executor:
-                futures = { executor.submit(self._run_one, task): task for task in tasks }
-                for future in concurrent.futures.as_completed(futures):
-                    task = futures[future]
-                    try:
-                        r = future.result()
-                        results[task.config] = r
-                    except Exception:
-                        self.log('run', f'config {task.config} generated an exception')
-                        raise
-        else:
-            # single-threaded mode
-            self.log('run_sweep', f'running {len(tasks)} configs in single-threaded mode')
-            for task in tasks:
-                r = self._run_one(task)
+        if configs is None:
+            configs = [task.config for task in tasks]
+        results: dict[C, R] = {} if completed is None else dict(completed)
+
+        # an existing checkpoint is kept only if we are resuming from it
+        checkpoint_path = self._checkpoint_path(cache_path)
+        with open(checkpoint_path, 'ab' if completed else 'wb') as checkpoint:
+            def on_result(task: RunnerWorkerTask[C], r: R):
                 results[task.config] = r
+                self._write_checkpoint(checkpoint, task.config, r)
+
+            if num_threads > 1 and len(tasks) > 1:
+                # start the most expensive configurations first
+                self.log('run_sweep', f'running {len(tasks)} configs with {num_threads} threads')
+                tasks = sorted(tasks, key=lambda task: self.estimate_cost(task.config), reverse=True)
+            else:
+                self.log('run_sweep', f'running {len(tasks)} configs in single-threaded mode')
+            self._schedule('run', '_run_one', tasks, num_threads, on_result, lambda task: f'config {task.config}')
 
         # save results to cache
         self.log('run_sweep', 'saving results to cache')
-        configs = [task.config for task in tasks]
         self._write_cache(cache_path, (configs, results))
+        checkpoint_path.unlink(missing_ok=True)
         return results
 
+    def _schedule(
+        self,
+        where: str,
+        method: str,
+        tasks: Sequence[T],
+        num_threads: int,
+        on_result: Callable[[T, Any], None],
+        describe: Callable[[T], str]
+    ):
+        """
+        Internal method to run `self.<method>(task)` for each task,
+        calling `on_result(task, result)` for each result in the
+        parent process as it completes.
+
+        With multiple threads, tasks are sent to worker processes in
+        chunks of `chunk_size`, with at most `max_in_flight` chunks
+        outstanding; the runner itself is sent to each worker once.
+        If rounding counters are active (see `RoundingCounters`),
+        the counts of each worker are merged into them.
+        """
+        progress = _Progress(self, where, len(tasks))
+        counters = get_rounding_counters()
+        if num_threads > 1 and len(tasks) > 1:
+            # run with multiple processes
+            chunks = [list(tasks[i:i + self.chunk_size]) for i in range(0, len(tasks), self.chunk_size)]
+            max_in_flight = self.max_in_flight or 2 * num_threads
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=num_threads,
+                initializer=_init_worker,
+                initargs=(self, counters is not None)
+            ) as executor:
+                pending = iter(chunks)
+                in_flight: dict[concurrent.futures.Future, list[T]] = {}
+
+                def submit():
+                    chunk = next(pending, None)
+                    if chunk is not None:
+                        in_flight[executor.submit(_run_chunk, method, chunk)] = chunk
+
+                for _ in range(max_in_flight):
+                    submit()
+                while in_flight:
+                    done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        chunk = in_flight.pop(future)
+                        results, exc, counts = future.result()
+                        if counters is not None and counts is not None:
+                            counters.merge(counts)
+                        for task, r in zip(chunk, results):
+                            on_result(task, r)
+                        progress.update(len(results))
+                        if exc is not None:
+                            self.log(where, f'{describe(chunk[len(results)])} generated an exception')
+                            raise exc
+                        submit()
+        else:
+            # single-threaded mode
+            for task in tasks:
+                on_result(task, getattr(self, method)(task))
+                progress.update(1)
+
     def _run_one(self, task: RunnerWorkerTask[C]) -> R:
         """
         Internal method to run a single configuration.
@@ -288,6 +585,60 @@ class Runner(ABC, Generic[C, K, R]):
         self.log('_run_one', f'completed config {task.config} (idx={task.idx})')
         return result
 
+    def _checkpoint_path(self, cache_path: Path) -> Path:
+        """
+        Returns the path of the checkpoint file for the results
+        saved at `cache_path`.
+        """
+        return cache_path.with_name(cache_path.name + '.ckpt')
+
+    def _write_checkpoint(self, f, config: C, result: R):
+        """
+        Appends a result to an open checkpoint file.
+
+        Records are flushed, so they survive the runner crashing,
+        but not the machine.
+        """
+        pickle.dump((config, result), f)
+        f.flush()
+
+    def _read_checkpoint(self, path: Path) -> dict[C, R]:
+        """
+        Reads the results from a checkpoint file.
+
+        A partially-written last record is discarded and truncated
+        so that new records can be appended.
+        """
+        results: dict[C, R] = {}
+        try:
+            with open(path, 'r+b') as f:
+                end = 0
+                while True:
+                    try:
+                        config, result = pickle.load(f)
+                    except (EOFError, pickle.UnpicklingError, ValueError, TypeError):
+                        if f.seek(0, 2) != end:
+                            self.log('read_checkpoint', f'discarding partial record in `{path}`')
+                            f.truncate(end)
+                        break
+                    results[config] = result
+                    end = f.tell()
+        except FileNotFoundError:
+            pass
+        return results
+
+    def _read_completed(self, cache_path: Path, configs: list[C]) -> dict[C, R]:
+        """
+        Returns the results for `configs` saved by a previous run,
+        either in the results cache or in a checkpoint file.
+        """
+        completed: dict[C, R] = {}
+        cached: tuple[list[C], dict[C, R]] | None = self._read_cache(cache_path)
+        if cached is not None:
+            completed.update(cached[1])
+        completed.update(self._read_checkpoint(self._checkpoint_path(cache_path)))
+        return { config: completed[config] for config in configs if config in completed }
+
     def _format_cache_name(self, name: str) -> str:
         """
         Formats a cache file name.
@@ -316,17 +667,51 @@ class Runner(ABC, Generic[C, K, R]):
         return cache_dir
 
     def _write_cache(self, path: Path, data):
-        """Writes data to a gzipped cache file."""
+        """
+        Writes data to a gzipped cache file.
+
+        If `path` ends with `.fpys`, the data is written as a sample:
+        numbers are stored in compact columns that workers can read
+        without unpickling each one (see `_read_cache`).
+        """
         self.log('write_cache', f'writing cache to `{path}`')
-        with gzip.open(path, 'wb') as f:
-            pickle.dump(data, f)
+        if path.suffix == _SAMPLE_SUFFIX:
+            write_atomic(path, _encode_samples(data))
+        else:
+            with gzip.open(path, 'wb') as f:
+                pickle.dump(data, f)
 
     def _read_cache(self, path: Path):
-        """Reads data from a gzipped cache file."""
+        """
+        Reads data from a gzipped cache file.
+
+        A sample (`.fpys`) file is memory-mapped and its columns decoded
+        once per process, however many tasks read it.  The numbers
+        are shared between reads, but each read rebuilds the lists,
+        dicts, and other containers of the sample, so callers own
+        them and may modify them.
+        """
         self.log('read_cache', f'reading cache from `{path}`')
+        if path.suffix == _SAMPLE_SUFFIX:
+            return self._read_samples(path)
         try:
             with gzip.open(path, 'rb') as f:
                 return pickle.load(f)
         except (pickle.PickleError, gzip.BadGzipFile, EOFError, FileNotFoundError):
             self.log('read_cache', f'failed to read cache: `{path}`')
             return None
+
+    def _read_samples(self, path: Path):
+        """Reads a sample file, reusing this process's decoded numbers if possible."""
+        try:
+            st = path.stat()
+            key = (str(path.resolve()), st.st_ino, st.st_size, st.st_mtime_ns)
+            decoded = _sample_memo.get(key)
+            if decoded is None:
+                with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    decoded = _decode_columns(mm)
+                _sample_memo[key] = decoded
+            return _load_skeleton(*decoded)
+        except (pickle.PickleError, ValueError, EOFError, struct.error, FileNotFoundError):
+            self.log('read_cache', f'failed to read cache: `{path}`')
+            return None
@@ -173,4 +173,8 @@ class ConstFold:
         if partial_eval is None:
             partial_eval = PartialEval.apply(func, def_use=def_use)
         inst = _ConstFoldInstance(func, partial_eval, enable_context, enable_op)
-        return inst.apply(), inst.changed
+        out = inst.apply()
+        if not inst.changed:
+            # keep the original so its analyses remain valid
+            return func, False
+        return out, True
@@ -11,7 +11,9 @@ class CopyPropagate:
     """
     Copy propagation.
 
-    This transform replaces any variable that is assigned another variable.
+    This transform replaces any variable that is assigned another variable,
+    provided the other variable is defined only once: otherwise a use of the
+    copy might see a later definition of it.
     """
 
     @staticmethod
@@ -40,6 +42,7 @@ class CopyPropagate:
                 and isinstance(d.site, Assign)
                 and isinstance(d.site.target, Id)
                 and isinstance(d.site.expr, Var)
+                and len(def_use.name_to_defs.get(d.site.expr.name, ())) <= 1
             ):
                 # direct assignment: x = y
                 # substitute all occurences of this definition of `x` with `y`
@@ -338,6 +338,9 @@ class DeadCodeEliminate:
             raise TypeError(f'Expected `FuncDef`, got {type(func)} for {func}')
         if def_use is None:
             def_use = DefineUse.analyze(func)
-        func, eliminated = _DeadCodeEliminate(func, def_use).apply()
-        SyntaxCheck.check(func)
-        return func, eliminated
+        out, eliminated = _DeadCodeEliminate(func, def_use).apply()
+        if not eliminated:
+            # keep the original so its analyses remain valid
+            return func, False
+        SyntaxCheck.check(out)
+        return out, True
@@ -147,6 +147,7 @@ class _RoundElimInstance(DefaultTransformVisitor):
     format_info: FormatAnalysis
     gensym: Gensym
     outer_ctx: Context | None
+    changed: bool
 
     def __init__(
         self,
@@ -160,6 +161,7 @@ class _RoundElimInstance(DefaultTransformVisitor):
         self.ctx_use = ctx_use
         self.format_info = format_info
         self.gensym = Gensym(reserved=def_use.names())
+        self.changed = False
         # Outer ctx pinning used to resolve symbolic ``with`` scopes
         # — identical to the resolution :class:`FormatAnalysis` does
         # internally.  Programs analyzed standalone may not have a
@@ -338,6 +340,7 @@ class _RoundElimInstance(DefaultTransformVisitor):
             isinstance(e, (Round, Cast))
             and self._is_eliminable(e)
         ):
+            self.changed = True
             return self._visit_expr(e.arg, ctx)
         # Arithmetic-op hoist: only at statement-level positions
         # where ``ctx`` carries a preamble buffer.  Comprehension
@@ -386,6 +389,7 @@ class _RoundElimInstance(DefaultTransformVisitor):
         # Inherit *e*'s location for hoist-introduced nodes so
         # downstream errors that reference the temps point back at
         # the original source position.
+        self.changed = True
         loc = e.loc
         new_operands: list[Expr] = []
         for operand in operands(e):
@@ -463,7 +467,8 @@ class RoundElim:
     @staticmethod
     def apply(func: FuncDef) -> FuncDef:
         """Apply the transformation to a :class:`FuncDef`.  Returns a
-        new ``FuncDef``; the input is not mutated.
+        new ``FuncDef``, or *func* itself if no rounding was eliminated;
+        the input is not mutated.
 
         Runs :class:`DefineUse`, :class:`ContextUse`, and
         :class:`FormatInfer` internally — these are pre-analyses the
@@ -476,8 +481,10 @@ class RoundElim:
         format_info = FormatInfer.analyze(
             func, def_use=def_use, ctx_use=ctx_use,
         )
-        out = _RoundElimInstance(
-            func, def_use, ctx_use, format_info,
-        ).apply()
+        inst = _RoundElimInstance(func, def_use, ctx_use, format_info)
+        out = inst.apply()
+        if not inst.changed:
+            # keep the original so its analyses remain valid
+            return func
         SyntaxCheck.check(out, ignore_unknown=True)
         return out
@@ -1,6 +1,7 @@
 """Common utilities for the FPy infrastructure."""
 
 from .bits import bitmask, bits_to_float, float_to_bits, is_power_of_two, trailing_zeros
+from .cache import cache_dir, write_atomic
 from .compare import CompareOp
 from .decorator import default_repr, enum_repr, rcomparable
 from .default import DEFAULT, DefaultOr
@@ -32,6 +33,7 @@ from .inspect import getfunclines, has_keyword
 from .iterator import sliding_window
 from .loader import get_module_source, install_caching_loader
 from .location import Location
+from .lru import CacheStats, LRUCache
 from .ordering import Ordering
 from .string import pythonize_id
 from .uninit import UNINIT
@@ -0,0 +1,38 @@
+"""
+On-disk artifact caches.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+
+def cache_dir(*parts: str) -> Path:
+    """
+    Returns the directory for on-disk artifacts named by `parts`.
+
+    The root is `$FPY2_CACHE_DIR` if set, otherwise `fpy2` under
+    `$XDG_CACHE_HOME` (default `~/.cache`).
+    The directory is created if it does not exist.
+    """
+    root = os.environ.get('FPY2_CACHE_DIR')
+    if root is None:
+        xdg = os.environ.get('XDG_CACHE_HOME', os.path.join('~', '.cache'))
+        root = os.path.join(xdg, 'fpy2')
+    path = Path(root).expanduser().joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+def write_atomic(path: Path, data: bytes):
+    """
+    Writes `data` to `path` so that concurrent readers see either
+    the old contents or the new ones, never a partial write.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
@@ -0,0 +1,99 @@
+"""Bounded least-recently-used cache."""
+
+from collections import OrderedDict
+from collections.abc import Hashable, Iterator
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+_K = TypeVar('_K', bound=Hashable)
+_V = TypeVar('_V')
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters of an `LRUCache`."""
+
+    hits: int
+    """lookups that found an entry"""
+    misses: int
+    """lookups that found no entry"""
+    evictions: int
+    """entries dropped to stay within `maxsize`"""
+    size: int
+    """current number of entries"""
+    maxsize: int | None
+    """maximum number of entries (`None` for unbounded)"""
+
+
+class LRUCache(Generic[_K, _V]):
+    """
+    A mapping that holds at most `maxsize` entries,
+    evicting the least-recently-used entry when full.
+
+    Only `get` counts as a use; iteration and `in` do not
+    affect the order or the counters.
+    """
+
+    maxsize: int | None
+    hits: int
+    misses: int
+    evictions: int
+
+    _entries: OrderedDict[_K, _V]
+
+    def __init__(self, maxsize: int | None = 1024):
+        if maxsize is not None and maxsize < 0:
+            raise ValueError(f'Expected maxsize >= 0, got {maxsize}')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(maxsize={self.maxsize}, size={len(self)})'
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[_K]:
+        return iter(self._entries)
+
+    def get(self, key: _K) -> _V | None:
+        """
+        Returns the entry for `key`, marking it as most recently used,
+        or `None` if there is no entry.
+        """
+        try:
+            val = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return val
+
+    def __setitem__(self, key: _K, val: _V):
+        self._entries[key] = val
+        self._entries.move_to_end(key)
+        if self.maxsize is not None:
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Removes every entry; the counters are kept."""
+        self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """Returns a snapshot of the counters."""
+        return CacheStats(self.hits, self.misses, self.evictions, len(self), self.maxsize)
+
+    def reset_stats(self):
+        """Zeroes the counters."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
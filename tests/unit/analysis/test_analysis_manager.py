@@ -0,0 +1,105 @@
+"""
+Unit tests for the analysis manager.
+"""
+
+import gc
+
+import fpy2 as fp
+
+from fpy2.analysis import (
+    AnalysisManager,
+    ArraySizeInfer,
+    ContextUse,
+    DefineUse,
+    FormatInfer,
+    TypeInfer,
+)
+
+
+@fp.fpy
+def _callee(x: fp.Real) -> fp.Real:
+    with fp.FP32:
+        return x * x
+
+@fp.fpy
+def _caller(xs: list[fp.Real]) -> fp.Real:
+    with fp.FP64:
+        t = 0.0
+        for x in xs:
+            t += _callee(x)
+        return t
+
+
+class TestAnalysisManager:
+
+    def test_unmanaged(self):
+        # without a manager, every call recomputes
+        assert DefineUse.analyze(_caller.ast) is not DefineUse.analyze(_caller.ast)
+        assert AnalysisManager.current() is None
+
+    def test_memoized(self):
+        func = _caller.ast
+        with AnalysisManager() as am:
+            assert AnalysisManager.current() is am
+            def_use = DefineUse.analyze(func)
+            type_info = TypeInfer.check(func)
+            ctx_use = ContextUse.analyze(func)
+            array_size = ArraySizeInfer.analyze(func)
+            fmt_info = FormatInfer.analyze(func)
+            assert DefineUse.analyze(func) is def_use
+            assert TypeInfer.check(func) is type_info
+            assert TypeInfer.check(func, def_use=def_use) is type_info
+            assert ContextUse.analyze(func, def_use=def_use) is ctx_use
+            assert ArraySizeInfer.analyze(func) is array_size
+            assert FormatInfer.analyze(func) is fmt_info
+            # the callee was checked on the way
+            assert am.get(TypeInfer, _callee.ast) is not None
+        assert AnalysisManager.current() is None
+        assert am.hits > 0
+
+    def test_foreign_deps(self):
+        func = _caller.ast
+        other = DefineUse.analyze(func)
+        with AnalysisManager():
+            type_info = TypeInfer.check(func)
+            # analyses computed outside the manager are not mixed in
+            assert TypeInfer.check(func, def_use=other) is not type_info
+            assert TypeInfer.check(func) is type_info
+
+    def test_parameters(self):
+        func = _caller.ast
+        with AnalysisManager():
+            fmt_info = FormatInfer.analyze(func)
+            assert FormatInfer.analyze(func, loop_iter_limit=3) is not fmt_info
+            assert FormatInfer.analyze(func) is fmt_info
+
+    def test_invalidate(self):
+        func = _caller.ast
+        with AnalysisManager() as am:
+            def_use = DefineUse.analyze(func)
+            type_info = TypeInfer.check(func)
+            am.invalidate(func, preserve=(DefineUse,))
+            assert DefineUse.analyze(func) is def_use
+            assert TypeInfer.check(func) is not type_info
+            am.invalidate(func)
+            assert DefineUse.analyze(func) is not def_use
+
+    def test_strategies(self):
+        with AnalysisManager() as am:
+            f = fp.strategies.simplify(_caller)
+            hits = am.hits
+            # an unchanged program is not re-analyzed
+            fp.strategies.simplify(f)
+            assert am.hits > hits
+
+    def test_weak(self):
+        @fp.fpy
+        def f(x: fp.Real) -> fp.Real:
+            return x + 1
+
+        with AnalysisManager() as am:
+            DefineUse.analyze(f.ast)
+            assert len(am._results) == 1
+            del f
+            gc.collect()
+            assert len(am._results) == 0
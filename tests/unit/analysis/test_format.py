@@ -335,6 +335,16 @@ class TestAbstractFormat():
         CTX2 = AbstractFormat(4, 0, fp.RealFloat.from_int(12))
         assert CTX1 <= CTX2, "Expected INT4 to be contained in A(4, 0, 12)."
 
+    def test_precision_bounds_a_format_without_a_least_exponent(self):
+        """`MPFloatContext(11)` has no subnormals but still only 11 digits,
+        so neither the reals nor `FP64` fit in it.  Containment used to skip
+        the precision check without a least exponent, and `RoundElim` then
+        dropped rounding to it."""
+        MP11 = AbstractFormat.from_format(fp.MPFloatContext(11).format())
+        for ctx in (fp.REAL, fp.FP64):
+            assert not AbstractFormat.from_format(ctx.format()) <= MP11, ctx
+        assert AbstractFormat.from_format(fp.FP16.format()) <= MP11
+
     # ------------------------------------------------------------------
     # Subnormal-region containment: the asymmetric branch of
     # ``_is_contained_in`` where ``self.prec > other.prec`` but every
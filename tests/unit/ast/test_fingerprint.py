@@ -0,0 +1,132 @@
+"""
+Unit tests for structural fingerprints.
+
+Two functions written identically at different source locations share
+a fingerprint; any difference in structure, names, or literals does not.
+"""
+
+import numpy as np
+
+import fpy2 as fp
+
+from fpy2.ast import DefaultTransformVisitor, Fingerprinter, ForeignVal, HashCons, fingerprint
+from fpy2.ast.fingerprint import _Identities
+
+
+@fp.fpy
+def _f(x: fp.Real, y: fp.Real) -> fp.Real:
+    return x * y + 1
+
+
+@fp.fpy
+def _g(x: fp.Real, y: fp.Real) -> fp.Real:
+    return x * y + 1
+
+
+@fp.fpy
+def _h(x: fp.Real, y: fp.Real) -> fp.Real:
+    return x * y + 2
+
+
+@fp.fpy
+def _rounded(x: fp.Real) -> fp.Real:
+    with fp.FP32:
+        return x + 1
+
+
+@fp.fpy
+def _tagged(x: fp.Real):
+    return ('a', x)
+
+
+class TestFingerprint:
+
+    def test_ignores_location(self):
+        assert fingerprint(_f.ast.body) == fingerprint(_g.ast.body)
+        assert fingerprint(_f.ast.body, loc=True) != fingerprint(_g.ast.body, loc=True)
+
+    def test_structure(self):
+        assert fingerprint(_f.ast.body) != fingerprint(_h.ast.body)
+        assert fingerprint(_f.ast) != fingerprint(_g.ast)  # name differs
+        assert fingerprint(_rounded.ast) == fingerprint(_rounded.ast)
+
+    def test_foreign_positions(self):
+        fp_ = Fingerprinter(foreign=False)
+        fp_.digest(_tagged.ast)
+        assert [e.val for e in fp_.foreigns] == ['a']
+
+    def test_cached(self):
+        digest = fingerprint(_f.ast)
+        assert _f.ast._fp and _f.ast.body._fp
+        assert fingerprint(_f.ast) == digest
+
+    def test_rebuilt(self):
+        # a copy of a fingerprinted tree has the same fingerprint
+        body, _ = DefaultTransformVisitor()._visit_block(_f.ast.body, None)
+        assert body is not _f.ast.body
+        assert fingerprint(body) == fingerprint(_f.ast.body)
+
+    def test_cached_foreign_positions(self):
+        Fingerprinter(foreign=False).digest(_tagged.ast)
+        fp_ = Fingerprinter(foreign=False)
+        fp_.digest(_tagged.ast)
+        assert [e.val for e in fp_.foreigns] == ['a']
+
+    def test_foreign_same_repr(self):
+        # `repr` elides the middle of a large array
+        a = np.zeros(2000)
+        b = np.zeros(2000)
+        b[1000] = 1
+        assert repr(a) == repr(b)
+        assert fingerprint(ForeignVal(a, None)) != fingerprint(ForeignVal(b, None))
+        assert fingerprint(ForeignVal(a, None)) == fingerprint(ForeignVal(a, None))
+        # values determined by their `repr` are still compared by it
+        assert fingerprint(ForeignVal((1, 'a'), None)) == fingerprint(ForeignVal((1, 'a'), None))
+        assert fingerprint(ForeignVal(fp.FP32, None)) == fingerprint(ForeignVal(fp.IEEEContext(8, 32), None))
+
+
+class TestIdentities:
+
+    def test_weak(self):
+        ids = _Identities(2)
+        a = np.zeros(3)
+        token = ids.token(a)
+        assert ids.token(a) == token
+        del a
+        assert not ids._weak
+
+    def test_strong_bounded(self):
+        # lists cannot be referenced weakly
+        ids = _Identities(2)
+        xs, ys, zs = [1], [2], [3]
+        token = ids.token(xs)
+        assert ids.token(xs) == token
+        ids.token(ys)
+        ids.token(zs)
+        assert len(ids._strong) == 2
+        # an evicted value gets a fresh token
+        assert ids.token(xs) != token
+
+
+class TestHashCons:
+
+    def test_intern(self):
+        table = HashCons()
+        e1 = _f.ast.body.stmts[0].expr
+        e2 = _g.ast.body.stmts[0].expr
+        e3 = _h.ast.body.stmts[0].expr
+        assert e1 not in table
+        assert table.intern(e1) is e1
+        assert e2 in table
+        assert table.intern(e2) is e1
+        assert table.intern(e3) is e3
+        assert len(table) == 2
+        table.clear()
+        assert len(table) == 0
+
+    def test_intern_foreign_same_repr(self):
+        table = HashCons()
+        e1 = ForeignVal(np.arange(2000), None)
+        e2 = ForeignVal(np.arange(2000)[::-1].copy(), None)
+        assert table.intern(e1) is e1
+        assert table.intern(e2) is e2
@@ -0,0 +1,169 @@
+"""
+Tests for building and loading compiled kernels.
+
+A kernel loaded through `CppCompiler.load` must agree with the interpreter
+on every boundary type it accepts, enter with its context's rounding mode,
+and be built at most once per distinct source.
+"""
+
+import array
+import os
+
+import pytest
+
+import fpy2 as fp
+
+from fpy2.backend.cpp import CppBuildError, CppCompiler
+from fpy2.backend.cpp.build import find_cxx
+from fpy2.types import ListType, RealType
+
+pytestmark = pytest.mark.skipif(find_cxx() is None, reason='no C++ compiler')
+
+_F64 = RealType(fp.FP64)
+_F64S = ListType(_F64)
+
+
+@fp.fpy(ctx=fp.FP64)
+def _axpy(a: fp.Real, x: fp.Real, y: fp.Real) -> fp.Real:
+    return a * x + y
+
+
+@fp.fpy(ctx=fp.FP64.with_params(rm=fp.RM.RTP))
+def _third_up(x: fp.Real) -> fp.Real:
+    return x / 3
+
+
+@fp.fpy(ctx=fp.FP64)
+def _dot(xs: list[fp.Real], ys: list[fp.Real]) -> fp.Real:
+    return sum([x * y for x, y in zip(xs, ys)])
+
+
+@fp.fpy(ctx=fp.FP64)
+def _scale(xs: list[fp.Real], a: fp.Real) -> list[fp.Real]:
+    return [x * a for x in xs]
+
+
+@fp.fpy(ctx=fp.FP64)
+def _sum_diff(a: fp.Real, b: fp.Real) -> tuple[fp.Real, fp.Real]:
+    return a + b, a - b
+
+
+@fp.fpy(ctx=fp.FP64)
+def _zero_first(xs: list[fp.Real]) -> fp.Real:
+    xs[0] = 0
+    return xs[1]
+
+
+class TestBuild:
+
+    def test_scalar(self, tmp_path):
+        k = CppCompiler().load(_axpy, arg_types=[_F64] * 3, cache_dir=tmp_path)
+        for args in [(2.0, 3.0, 0.1), (0.1, 0.2, 0.3), (-1.5, 1e300, 1e-300)]:
+            assert k(*args) == float(_axpy(*args))
+
+    def test_rounding_mode(self, tmp_path):
+        k = CppCompiler().load(_third_up, arg_types=[_F64], cache_dir=tmp_path)
+        for x in [1.0, 2.0, -1.0, 10.0]:
+            assert k(x) == float(_third_up(x))
+
+    def test_lists(self, tmp_path):
+        cc = CppCompiler()
+        dot = cc.load(_dot, arg_types=[_F64S, _F64S], cache_dir=tmp_path)
+        assert dot([0.1, 0.2, 0.3], [3.0, 2.0, 1.0]) == float(_dot([0.1, 0.2, 0.3], [3.0, 2.0, 1.0]))
+        scale = cc.load(_scale, arg_types=[_F64S, _F64], cache_dir=tmp_path)
+        assert scale([1.0, 0.1], 3.0) == [float(x) for x in _scale([1.0, 0.1], 3.0)]
+        assert scale([], 3.0) == []
+
+    def test_sized_list(self, tmp_path):
+        k = CppCompiler().load(
+            _dot, arg_types=[ListType(_F64, 2)] * 2, cache_dir=tmp_path
+        )
+        assert k([1.0, 2.0], [3.0, 4.0]) == 11.0
+        with pytest.raises(ValueError):
+            k([1.0], [3.0])
+
+    def test_written(self, tmp_path):
+        k = CppCompiler(unbox=CppCompiler.UnboxMode.ALLOW).load(
+            _zero_first, arg_types=[_F64S], cache_dir=tmp_path
+        )
+        xs = [1.0, 2.0]
+        assert k(xs) == 2.0
+        assert xs == [0.0, 2.0]
+
+    def test_tuple(self, tmp_path):
+        k = CppCompiler().load(_sum_diff, arg_types=[_F64] * 2, cache_dir=tmp_path)
+        assert k(1.0, 0.25) == (1.25, 0.75)
+
+    def test_module(self, tmp_path):
+        m = fp.Module()
+        m.add(_axpy, arg_types=[_F64] * 3)
+        m.add(_sum_diff, name='sd', arg_types=[_F64] * 2)
+        lib = CppCompiler().build(m, cache_dir=tmp_path)
+        assert sorted(lib) == ['_axpy', 'sd']
+        assert lib['sd'](3.0, 1.0) == (4.0, 2.0)
+        with pytest.raises(TypeError):
+            lib['_axpy'](1.0)
+
+    def test_cached(self, tmp_path):
+        cc = CppCompiler()
+        k1 = cc.load(_axpy, arg_types=[_F64] * 3, cache_dir=tmp_path)
+        assert len(list(tmp_path.iterdir())) == 1
+        k2 = cc.load(_axpy, arg_types=[_F64] * 3, cache_dir=tmp_path)
+        assert len(list(tmp_path.iterdir())) == 1
+        assert k1(1.0, 2.0, 3.0) == k2(1.0, 2.0, 3.0)
+        # a different source is a different artifact
+        cc.load(_third_up, arg_types=[_F64], cache_dir=tmp_path)
+        assert len(list(tmp_path.iterdir())) == 2
+
+    def test_bad_compiler(self, tmp_path):
+        with pytest.raises(CppBuildError):
+            CppCompiler().load(
+                _axpy, arg_types=[_F64] * 3, cache_dir=tmp_path,
+                flags=['-std=c++11', '-shared', '-fPIC', '-fno-such-flag'],
+            )
+
+    def test_compiler_by_name(self, tmp_path):
+        # a bare name is looked up on `PATH`, not in the working directory
+        cxx = find_cxx()
+        k = CppCompiler().load(_axpy, arg_types=[_F64] * 3, cache_dir=tmp_path, cxx=os.path.basename(cxx))
+        assert k(2.0, 3.0, 1.0) == 7.0
+        with pytest.raises(CppBuildError, match='no-such-c[+][+]'):
+            CppCompiler().load(_axpy, arg_types=[_F64] * 3, cache_dir=tmp_path, cxx='no-such-c++')
+
+
+class TestBatch:
+
+    def test_scalar(self, tmp_path):
+        k = CppCompiler().load(_axpy, arg_types=[_F64] * 3, cache_dir=tmp_path, batch=True)
+        cols = [[2.0, 0.1, -1.5], [3.0, 0.2, 1e300], [0.1, 0.3, 1e-300]]
+        expect = [k(*args) for args in zip(*cols)]
+        assert k.batch(*cols) == expect
+        assert k.batch(*cols, threads=2) == expect
+        assert k.batch([], [], []) == []
+
+    def test_rounding_mode(self, tmp_path):
+        k = CppCompiler().load(_third_up, arg_types=[_F64], cache_dir=tmp_path, batch=True)
+        xs = [float(x) for x in range(1, 100)]
+        # every thread enters with the entry's mode
+        assert k.batch(xs, threads=4) == [float(_third_up(x)) for x in xs]
+
+    def test_buffer(self, tmp_path):
+        k = CppCompiler().load(_third_up, arg_types=[_F64], cache_dir=tmp_path, batch=True)
+        xs = array.array('d', [1.0, 2.0, 10.0])
+        assert k.batch(xs) == [k(x) for x in xs]
+
+    def test_tuple(self, tmp_path):
+        k = CppCompiler().load(_sum_diff, arg_types=[_F64] * 2, cache_dir=tmp_path, batch=True)
+        assert k.batch([1.0, 3.0], [0.25, 1.0], threads=2) == ([1.25, 4.0], [0.75, 2.0])
+
+    def test_no_batch(self, tmp_path):
+        m = fp.Module()
+        m.add(_axpy, arg_types=[_F64] * 3)
+        m.add(_dot, arg_types=[_F64S, _F64S])
+        lib = CppCompiler().build(m, cache_dir=tmp_path, batch=True)
+        with pytest.raises(CppBuildError):
+            lib['_dot'].batch([[1.0]], [[1.0]])
+        with pytest.raises(CppBuildError):
+            CppCompiler().load(_axpy, arg_types=[_F64] * 3, cache_dir=tmp_path).batch([], [], [])
+        with pytest.raises(ValueError):
+            lib['_axpy'].batch([1.0], [1.0, 2.0], [1.0])
@@ -47,6 +47,8 @@ _BOUNDED_1024 = fp.MPBFixedContext(-1, fp.RealFloat(exp=10, c=1), rm=fp.RM.RTZ)
 _ASYMMETRIC = fp.MPBFixedContext(
     -1, fp.RealFloat(exp=0, c=127),
     neg_maxval=fp.RealFloat(s=True, exp=0, c=128), rm=fp.RM.RTZ)
+# multiples of 2 ** -7 up to 16, in float storage
+_POSITION_8 = fp.MPBFixedContext(-8, fp.RealFloat(exp=4, c=1), rm=fp.RM.RTZ)
 
 # every edge the assertions decide on: both zeros, the specials, non-integers,
 # and off-by-one at each bound
@@ -87,6 +89,7 @@ class TestAgreesWithTheInterpreter:
         pytest.param(_ASYMMETRIC, id='asymmetric'),
         pytest.param(fp.SINT8, id='sint8'),
         pytest.param(fp.UINT16, id='uint16'),
+        pytest.param(_POSITION_8, id='position_8'),
     ])
     def test_it_aborts_exactly_where_the_interpreter_raises(self, ctx):
         if _CXX is None:
@@ -132,9 +135,11 @@ class TestValuesExactInStorageOnly:
 
 class TestWhatIsEmitted:
     def test_asymmetric_bounds_get_two_comparisons(self):
-        """``fabs`` states one magnitude; these two bounds are independent."""
+        """``fabs`` states one magnitude; these two bounds are independent.  The
+        context wraps, so it is emulated, and the cast round-trips through its
+        rounding."""
         out = _emit(_ASYMMETRIC)
-        assert '-128 <= v && v <= 127' in out
+        assert '> 127 ||' in out and '< -128' in out
         assert 'fabs' not in out
 
     def test_an_integer_operand_needs_only_the_bound(self):
@@ -167,8 +172,7 @@ class TestUncheckableIsRefused:
     ``2 ** (nmin + 1)``; scaling the operand to test that would round it first,
     so there is no test to emit."""
 
-    # integer storage, so `_validate_context_rm` (which checks the position only
-    # for float storage) does not catch it first
+    # integer storage: in float storage the context would be emulated instead
     _INT_STORAGE = fp.MPBFixedContext(
         3, fp.RealFloat(exp=8, c=1), rm=fp.RM.RTZ, enable_neg_zero=False)
 
@@ -181,9 +185,7 @@ class TestUncheckableIsRefused:
         with pytest.raises(CppCompileError, match='cannot be checked'):
             _emit(self._INT_STORAGE, arg_ctx=arg_ctx)
 
-    def test_float_storage_is_refused_earlier(self):
-        """`_validate_context_rm` gets there first for float storage, naming the
-        same fix."""
-        ctx = fp.MPBFixedContext(-8, fp.RealFloat(exp=4, c=1), rm=fp.RM.RTZ)
-        with pytest.raises(CppCompileError, match='digits at position zero'):
-            _emit(ctx)
+    def test_float_storage_is_emulated(self):
+        """In float storage the context is emulated, which scales by an exact
+        ``std::scalbn``; `TestAgreesWithTheInterpreter` checks it."""
+        assert 'std::scalbn(' in _emit(_POSITION_8)
@@ -364,7 +364,8 @@ class TestRejection:
     non-RTZ mode."""
 
     def test_rna_float_rejected(self):
-        """RNA isn't one of the four ``fesetround`` modes."""
+        """RNA isn't one of the four ``fesetround`` modes, and `FP64` has too
+        many digits to emulate."""
 
         @fp.fpy(ctx=_RNA_64)
         def f(x: fp.Real, y: fp.Real) -> fp.Real:
@@ -372,7 +373,7 @@ class TestRejection:
 
         with pytest.raises(
             CppCompileError,
-            match='not supported by ``fesetround``',
+            match='it has 53 digits',
         ):
             CppCompiler(optimize=False).compile(
                 f, arg_types=[RealType(fp.FP64), RealType(fp.FP64)],
@@ -206,13 +206,14 @@ class TestAssertions:
 class TestDeclines:
     """Shapes the libm lowering must not claim."""
 
-    def test_non_zero_position_is_refused(self):
+    def test_non_zero_position_is_not_claimed(self):
         """A position other than zero rounds to a multiple of ``2 ** n``, which
-        needs the operand scaled first — `rescale_fixed`'s job, not the
-        backend's, since doing it here would reintroduce an inexact ``exp2``."""
-        # float storage, so `_validate_context_rm` names it first
-        with pytest.raises(CppCompileError, match='digits at position zero'):
-            _emit(MPBFixedContext(-4, fp.RealFloat(exp=10, c=1), overflow=ASSERT))
+        needs the operand scaled first.  The libm lowering has no exact ``exp2``
+        to do it with; in float storage the context is emulated, which scales by
+        ``std::scalbn``."""
+        out = _emit(MPBFixedContext(-4, fp.RealFloat(exp=10, c=1), overflow=ASSERT))
+        assert 'std::scalbn(' in out
+        assert 'std::exp2' not in out
 
     def test_signed_zero_decides_the_lowering(self):
         """The two lowerings want opposite answers: libm keeps a signed zero
@@ -249,9 +250,10 @@ class TestFloatContextUnaffected:
     def test_non_float_context_in_float_storage_is_reported(self):
         """``storage.is_float()`` does not imply a float context — that used to
         be a bare ``assert`` and is now a diagnostic."""
-        # a fixed-point context at a non-zero position lands here
-        with pytest.raises(CppCompileError):
-            _emit(MPBFixedContext(-8, fp.RealFloat(exp=4, c=1), overflow=ASSERT))
+        # a fixed-point context that cannot be emulated lands here
+        with pytest.raises(CppCompileError, match='stochastic'):
+            _emit(MPBFixedContext(-8, fp.RealFloat(exp=4, c=1), overflow=ASSERT,
+                                  num_randbits=4))
 
 
 class TestScaleByPowerOfTwo:
@@ -462,7 +464,7 @@ class TestScaleByPowerOfTwo:
     def test_does_not_rescue_a_program_the_dispatch_refuses(self):
         """``ldexp`` computes the *exact* product, so it may only stand in for
         ``round_C`` where that rounding is the identity.  The op-table refuses
-        this program because `FP16` has no storage matching its `FP64` operand;
+        this program because `FP16` is emulated, and ``**`` is not;
         were the peephole to fire it would answer first, and the emitted
         ``ldexp`` would skip the narrowing rounding the context asked for.
 
@@ -0,0 +1,200 @@
+"""
+Emulated contexts (:mod:`fpy2.backend.cpp.emulate`).
+
+A context with no C++ type rounds in generated code: the operation in
+``double``, made round-to-odd, then rounded to the context's digits.  The claim
+is bit-for-bit agreement with the interpreter, so the kernels here are built and
+run against it on random ``float`` operands.
+"""
+
+import math
+import random
+import struct
+
+import pytest
+
+import fpy2 as fp
+
+from fpy2.backend.cpp import CppCompiler
+from fpy2.backend.cpp.build import find_cxx
+from fpy2.backend.cpp.compiler import CppCompileError
+from fpy2.backend.cpp.emulate import Edge, EmulationError, emulation_of
+from fpy2.types import RealType
+
+_F32 = RealType(fp.FP32)
+_F64 = RealType(fp.FP64)
+
+_CONTEXTS = [
+    pytest.param(fp.FP16, id='fp16'),
+    pytest.param(fp.BF16, id='bf16'),
+    pytest.param(fp.MX_E4M3, id='e4m3'),
+    pytest.param(fp.MPBFloatContext(8, -14, fp.FP16.maxval().as_real()), id='mpb_float'),
+    pytest.param(fp.FixedContext(True, -8, 16), id='fixed_wrap'),
+    pytest.param(fp.FP16.with_params(rm=fp.RM.RTZ, overflow=fp.OverflowMode.SATURATE),
+                 id='fp16_rtz_saturate'),
+    pytest.param(fp.BF16.with_params(rm=fp.RM.RTN), id='bf16_rtn'),
+]
+
+
+def _kernels(ctx):
+    @fp.fpy
+    def fma_like(x: fp.Real, y: fp.Real) -> fp.Real:
+        with ctx:
+            return x * y + x
+
+    @fp.fpy
+    def quotient(x: fp.Real, y: fp.Real) -> fp.Real:
+        with ctx:
+            return fp.round(x) / y
+
+    @fp.fpy
+    def root(x: fp.Real, y: fp.Real) -> fp.Real:
+        with ctx:
+            return fp.sqrt(fp.fabs(x)) - y
+
+    return [fma_like, quotient, root]
+
+
+def _float32(x: float) -> float:
+    return struct.unpack('<f', struct.pack('<f', x))[0]
+
+
+def _operands(n: int):
+    rng = random.Random(0)
+    scales = [1e-3, 4.0, 300.0, 1e5]
+    for _ in range(n):
+        yield tuple(
+            _float32(rng.choice([0.0, 1.0, -0.5, rng.uniform(-1, 1) * rng.choice(scales)]))
+            for _ in range(2)
+        )
+
+
+def _same(a: float, b: float) -> bool:
+    if math.isnan(a) or math.isnan(b):
+        return math.isnan(a) and math.isnan(b)
+    return a == b and math.copysign(1, a) == math.copysign(1, b)
+
+
+@pytest.mark.skipif(find_cxx() is None, reason='no C++ compiler')
+class TestAgreesWithTheInterpreter:
+
+    @pytest.mark.parametrize('ctx', _CONTEXTS)
+    def test_bit_for_bit(self, ctx, tmp_path):
+        for fn in _kernels(ctx):
+            k = CppCompiler().load(fn, arg_types=[_F32, _F32], cache_dir=tmp_path)
+            bad = []
+            for x, y in _operands(500):
+                try:
+                    want = float(fn(x, y))
+                except Exception:
+                    # the kernel asserts here; `NDEBUG` builds do not
+                    continue
+                got = k(x, y)
+                if not _same(got, want):
+                    bad.append(f'{fn.name}({x!r}, {y!r}): cpp {got!r} vs py {want!r}')
+            assert not bad, '; '.join(bad[:6])
+
+    def test_overflow_to_nan(self, tmp_path):
+        """`MX_E4M3` has no infinity: an overflow is its NaN."""
+        @fp.fpy
+        def q(x: fp.Real) -> fp.Real:
+            with fp.MX_E4M3:
+                return fp.round(x)
+
+        k = CppCompiler().load(q, arg_types=[_F64], cache_dir=tmp_path)
+        assert math.isnan(float(q(1000.0)))
+        assert math.isnan(k(1000.0))
+        assert k(448.0) == 448.0
+
+    def test_wrap(self, tmp_path):
+        @fp.fpy
+        def q(x: fp.Real) -> fp.Real:
+            with fp.FixedContext(True, -8, 16):
+                return fp.round(x)
+
+        k = CppCompiler().load(q, arg_types=[_F64], cache_dir=tmp_path)
+        for x in (200.3, -200.3, 127.99, 1e10, -0.001):
+            assert _same(k(x), float(q(x))), x
+
+        # results far past the range, whose last digits only the error holds
+        @fp.fpy
+        def ops(x: fp.Real, y: fp.Real):
+            with fp.FixedContext(True, -8, 16):
+                return x * y, x + y, x - y, x / y
+
+        k = CppCompiler().load(ops, arg_types=[_F32, _F32], cache_dir=tmp_path)
+        rng = random.Random(0)
+        for _ in range(200):
+            x, y = (_float32(rng.uniform(-1, 1) * rng.choice([1e6, 3e7, 1e20])) for _ in range(2))
+            y = y or 1.0
+            want = tuple(float(v) for v in ops(x, y))
+            got = k(x, y)
+            assert all(_same(a, b) for a, b in zip(got, want)), (x, y, got, want)
+        for x, y in ((1e6, 1.5e6), (_float32(1e30), _float32(1e-30)), (_float32(3e7), _float32(-1e-3))):
+            want = tuple(float(v) for v in ops(x, y))
+            assert all(_same(a, b) for a, b in zip(k(x, y), want)), (x, y)
+
+
+class TestRefused:
+
+    @staticmethod
+    def _compile(ctx, arg_ctx=fp.FP32):
+        @fp.fpy
+        def q(x: fp.Real, y: fp.Real) -> fp.Real:
+            with ctx:
+                return x * y
+        return CppCompiler().compile(q, arg_types=[RealType(arg_ctx)] * 2)
+
+    def test_stochastic_rounding(self):
+        ctx = fp.FP16.with_params(num_randbits=4)
+        with pytest.raises(CppCompileError, match='stochastic'):
+            self._compile(ctx)
+
+    def test_no_nan(self):
+        with pytest.raises(CppCompileError, match='has no NaN'):
+            self._compile(fp.MX_E2M1)
+
+    def test_operand_wider_than_float(self):
+        with pytest.raises(CppCompileError, match='Round the operand'):
+            self._compile(fp.FP16, arg_ctx=fp.FP64)
+
+    def test_wrapping_square_root_of_an_unbounded_operand(self):
+        @fp.fpy
+        def q(x: fp.Real) -> fp.Real:
+            with fp.FixedContext(True, -8, 16):
+                return fp.sqrt(x)
+
+        with pytest.raises(CppCompileError, match='too large to wrap exactly'):
+            CppCompiler().compile(q, arg_types=[_F32])
+
+    def test_op_without_an_exact_error_term(self):
+        @fp.fpy
+        def q(x: fp.Real, y: fp.Real, z: fp.Real) -> fp.Real:
+            with fp.FP16:
+                return fp.fma(x, y, z)
+
+        with pytest.raises(CppCompileError, match='no matching signature for Fma'):
+            CppCompiler().compile(q, arg_types=[_F32] * 3)
+
+
+class TestEmulationOf:
+
+    def test_edges_of_a_format_without_infinity(self):
+        emu = emulation_of(fp.MX_E4M3)
+        assert (emu.prec, emu.expmin) == (4, -9)
+        assert emu.pos_overflow is Edge.NAN and emu.inf is Edge.NAN
+
+    def test_edges_of_a_wrapping_fixed_point_format(self):
+        emu = emulation_of(fp.FixedContext(True, -8, 16))
+        assert emu.prec is None and emu.expmin == -8
+        assert emu.pos_overflow is Edge.WRAP and emu.neg_overflow is Edge.WRAP
+        assert not emu.neg_zero
+
+    def test_overflow_follows_the_rounding_direction(self):
+        emu = emulation_of(fp.FP16.with_params(rm=fp.RM.RTP))
+        assert emu.pos_overflow is Edge.INF
+        assert emu.neg_overflow is Edge.MAXVAL
+
+    def test_too_many_digits(self):
+        with pytest.raises(EmulationError, match='53 digits'):
+            emulation_of(fp.FP64)
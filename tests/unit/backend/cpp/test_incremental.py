@@ -0,0 +1,102 @@
+"""Incremental recompilation (``CppCompiler(spec_cache=...)``).
+
+A reused spec must be exactly what emitting it again would give, so every
+test compares against a compile without a cache.
+"""
+
+import fpy2 as fp
+
+from fpy2.backend.cpp import CppCompiler, SpecCache
+from fpy2.module import Module
+from fpy2.types import RealType
+
+R = RealType(fp.FP64)
+
+
+@fp.fpy
+def _leaf(x: fp.Real) -> fp.Real:
+    with fp.FP64:
+        return x * x
+
+
+@fp.fpy
+def _caller(x: fp.Real, y: fp.Real) -> fp.Real:
+    with fp.FP64:
+        return _leaf(x) + y
+
+
+@fp.fpy
+def _edited_caller(x: fp.Real, y: fp.Real) -> fp.Real:
+    with fp.FP64:
+        return _leaf(x) - y
+
+
+def _module(caller: fp.Function) -> Module:
+    m = Module()
+    m.add(caller, ctx=fp.FP64, arg_types=[R, R])
+    return m
+
+
+def test_unchanged_module(tmp_path):
+    cache = SpecCache(tmp_path)
+    cc = CppCompiler(spec_cache=cache)
+    expect = CppCompiler().compile_module(_module(_caller))
+    assert cc.compile_module(_module(_caller)) == expect
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert cc.compile_module(_module(_caller)) == expect
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_edited_function(tmp_path):
+    cache = SpecCache(tmp_path)
+    cc = CppCompiler(spec_cache=cache)
+    cc.compile_module(_module(_caller))
+    out = cc.compile_module(_module(_edited_caller))
+    # only the edited caller is emitted again
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert out == CppCompiler().compile_module(_module(_edited_caller))
+
+
+def test_options(tmp_path):
+    cache = SpecCache(tmp_path)
+    CppCompiler(spec_cache=cache).compile_module(_module(_caller))
+    cc = CppCompiler(spec_cache=cache, unbox=CppCompiler.UnboxMode.NEVER)
+    cc.compile_module(_module(_caller))
+    assert cache.hits == 0
+
+
+def test_persist(tmp_path):
+    expect = CppCompiler(spec_cache=SpecCache(tmp_path)).compile_module(_module(_caller))
+    cache = SpecCache(tmp_path)
+    assert CppCompiler(spec_cache=cache).compile_module(_module(_caller)) == expect
+    assert cache.misses == 0
+
+    cache = SpecCache(tmp_path, persist=False)
+    CppCompiler(spec_cache=cache).compile_module(_module(_caller))
+    assert cache.hits == 0
+
+
+def test_parallel(tmp_path):
+    cache = SpecCache(tmp_path)
+    expect = CppCompiler().compile_module(_module(_edited_caller))
+    CppCompiler(spec_cache=cache).compile_module(_module(_caller))
+    cc = CppCompiler(spec_cache=cache, jobs=2)
+    assert cc.compile_module(_module(_edited_caller)) == expect
+    assert cache.hits == 1
+
+
+def test_salt_covers_package(monkeypatch):
+    # emitting depends on code outside the backend, e.g., transforms
+    # and nested analyses, so editing any module changes every key
+    import pathlib
+    from fpy2.backend.cpp import incremental
+
+    salt = incremental._cache_salt.__wrapped__()
+    read_bytes = pathlib.Path.read_bytes
+    for edited in ('transform/monomorphize.py', 'analysis/format_infer/format.py', 'number/context/ieee754.py'):
+        def fake(self, edited=edited):
+            data = read_bytes(self)
+            return data + b'#' if self.as_posix().endswith(edited) else data
+        monkeypatch.setattr(pathlib.Path, 'read_bytes', fake)
+        assert incremental._cache_salt.__wrapped__() != salt, edited
+        monkeypatch.undo()
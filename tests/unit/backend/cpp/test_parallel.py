@@ -0,0 +1,76 @@
+"""Level-parallel compilation (``CppCompiler(jobs=...)``).
+
+Workers emit one call-graph level at a time, so the only thing that can go
+wrong is the parent stitching their results together: the output and the
+error raised must be exactly what a sequential compile gives.
+"""
+
+import fpy2 as fp
+import pytest
+
+from fpy2.backend.cpp.compiler import (
+    CppCompileError,
+    CppCompiler,
+    _call_levels,
+    _function_calls,
+)
+from fpy2.backend.cpp.unbox import UnboxMode
+from fpy2.module import Module
+from fpy2.types import RealType
+
+from tests.unit.backend.cpp.test_module_boundary import _module
+
+R = RealType(fp.FP64)
+
+
+@fp.fpy
+def _leaf(x: fp.Real) -> fp.Real:
+    with fp.FP64:
+        return x + 1.0
+
+
+@fp.fpy
+def _bad_caller(x: fp.Real):
+    with fp.FP64:
+        t = _leaf(x)
+        return []
+
+
+@fp.fpy
+def _bad_leaf(x: fp.Real):
+    with fp.FP64:
+        return []
+
+
+def test_levels_only_call_earlier_levels():
+    specs = CppCompiler().specialize(_module())
+    levels = _call_levels(specs)
+    assert sorted(i for level in levels for i in level) == list(range(len(specs)))
+    depth = {id(specs[i].ast): d for d, level in enumerate(levels) for i in level}
+    for f in specs:
+        for c in _function_calls(f.ast).values():
+            assert depth[id(c.ast)] < depth[id(f.ast)]
+
+
+@pytest.mark.parametrize('unbox', [UnboxMode.STRICT, UnboxMode.NEVER])
+def test_same_output_as_sequential(unbox):
+    m = _module()
+    expect = CppCompiler(unbox=unbox).compile_module(m)
+    assert CppCompiler(unbox=unbox, jobs=2).compile_module(m) == expect
+
+
+def test_same_error_as_sequential():
+    """`_bad_leaf` fails a level before `_bad_caller` does, but a sequential
+    compile reaches `_bad_caller` first."""
+    m = Module()
+    m.add(_bad_caller, ctx=fp.FP64, arg_types=[R])
+    m.add(_bad_leaf, ctx=fp.FP64, arg_types=[R])
+    with pytest.raises(CppCompileError, match='_bad_caller'):
+        CppCompiler().compile_module(m)
+    with pytest.raises(CppCompileError, match='_bad_caller'):
+        CppCompiler(jobs=2).compile_module(m)
+
+
+def test_rejects_no_jobs():
+    with pytest.raises(ValueError, match='jobs'):
+        CppCompiler(jobs=0)
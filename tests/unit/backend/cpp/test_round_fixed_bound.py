@@ -92,6 +92,15 @@ class TestAgreesWithTheInterpreter:
         # the wrapping the docstrings claim is checked rather than assumed
         pytest.param(fp.SINT8, id='sint8'),
         pytest.param(fp.UINT16, id='uint16'),
+    ] + [
+        # float storage and an edge rule the libm lowering lacks: emulated
+        pytest.param(
+            fp.MPBFixedContext(-1, fp.RealFloat(exp=0, c=100), rm=rm,
+                               overflow=overflow, enable_neg_zero=True),
+            id=f'emulated_{overflow.name.lower()}_{rm.name.lower()}')
+        for overflow in (fp.OverflowMode.SATURATE, fp.OverflowMode.WRAP,
+                         fp.OverflowMode.OVERFLOW)
+        for rm in (fp.RM.RTZ, fp.RM.RNE)
     ] + [
         # every mode, so a composed spelling is diffed and not just inspected
         pytest.param(
@@ -157,19 +166,30 @@ class TestBoundAndSpecialsAreAsserted:
 
 
 class TestEdgeRulesAreRefused:
-    @pytest.mark.parametrize('overflow', [
+    _OVERFLOW_MODES = pytest.mark.parametrize('overflow', [
         fp.OverflowMode.SATURATE, fp.OverflowMode.WRAP, fp.OverflowMode.OVERFLOW,
     ], ids=['saturate', 'wrap', 'overflow'])
-    @pytest.mark.parametrize('neg_zero', [True, False], ids=['float', 'integer'])
-    def test_a_rule_this_lowering_does_not_implement(self, overflow, neg_zero):
+
+    @_OVERFLOW_MODES
+    def test_a_rule_this_lowering_does_not_implement(self, overflow):
         """Emitting the rounding and dropping the rule is a miscompile: at 120,
         `SATURATE` says 100 and `WRAP` says -81, and the old output said 120."""
         ctx = fp.MPBFixedContext(
             -1, fp.RealFloat(exp=0, c=100), rm=fp.RM.RTZ, overflow=overflow,
-            enable_neg_zero=neg_zero)
+            enable_neg_zero=False)
         with pytest.raises(CppCompileError, match='has no C'):
             _emit(ctx)
 
+    @_OVERFLOW_MODES
+    def test_float_storage_is_emulated_instead(self, overflow):
+        """In float storage the rule is emulated (see `.emulate`), and
+        `TestAgreesWithTheInterpreter` checks its values."""
+        ctx = fp.MPBFixedContext(
+            -1, fp.RealFloat(exp=0, c=100), rm=fp.RM.RTZ, overflow=overflow,
+            enable_neg_zero=True)
+        out = _emit(ctx)
+        assert 'std::scalbn(' in out
+
 
 class TestOperandTypesAndSpecials:
     """Cases the bound test has to spell differently, all found in review."""
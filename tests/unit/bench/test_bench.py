@@ -0,0 +1,170 @@
+"""
+Tests for the benchmark suite (`fpy2.bench`).
+
+Only a few contexts and a small corpus are measured; the values
+themselves depend on the machine, so only their presence is checked.
+"""
+
+import json
+import textwrap
+
+import pytest
+
+import fpy2 as fp
+
+from fpy2.bench import (
+    BenchResults,
+    Corpus,
+    Metric,
+    bench_cpp,
+    bench_interpret,
+    bench_ops,
+    compare,
+    run_benchmarks,
+    standard_contexts,
+)
+from fpy2.bench.__main__ import main
+
+_CORPUS = textwrap.dedent('''
+    from fpy2 import *
+
+    @fpy
+    def poly(x, y):
+        return x * x + y
+
+    @fpy
+    def total(xs: list[Real]) -> Real:
+        s = 0.0
+        for x in xs:
+            s = s + x
+        return s
+
+    @fpy
+    def spin(x):
+        while x > 0.0:
+            x = x + 1.0
+        return x
+''')
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    path = tmp_path / 'corpus.py'
+    path.write_text(_CORPUS)
+    broken = tmp_path / 'broken.py'
+    broken.write_text('from fpy2 import *\n\n@fpy\ndef f(x):\n    return undefined_op(x)\n')
+    return [path, broken]
+
+
+def _results(**values: float) -> BenchResults:
+    results = BenchResults()
+    for name, value in values.items():
+        unit, higher = ('s', False) if name.startswith('t') else ('op/s', True)
+        results.add(name.replace('_', '.'), Metric(value, unit, higher))
+    return results
+
+
+class TestSections:
+
+    def test_standard_contexts(self):
+        contexts = standard_contexts()
+        assert contexts['FP64'] is fp.FP64 and contexts['REAL'] is fp.REAL
+        assert 'MX_E4M3' in contexts
+
+    def test_ops(self):
+        results = BenchResults()
+        bench_ops(results, contexts={'FP32': fp.FP32, 'REAL': fp.REAL}, op_names=['add', 'sqrt'], number=10, repeat=1)
+        assert results.metrics['ops.add.FP32'].value > 0
+        assert results.metrics['ops.add.FP32'].higher_is_better
+        assert 'ops.add.REAL' in results.metrics
+        # the square root of a real is not computable exactly
+        assert 'ops.sqrt.REAL' not in results.metrics
+        assert 'ops.sqrt.REAL' in results.skipped
+
+    def test_unknown_op(self):
+        with pytest.raises(ValueError, match='unknown operation'):
+            bench_ops(BenchResults(), op_names=['frobnicate'])
+
+    def test_corpus(self, corpus):
+        loaded = Corpus.load(corpus)
+        assert [f.name for f in loaded.functions['corpus']] == ['poly', 'total', 'spin']
+        assert 'broken' in loaded.failed and 'broken' not in loaded.functions
+        assert loaded.load_seconds['corpus'] > 0
+
+    def test_interpret(self, corpus):
+        results = BenchResults()
+        bench_interpret(results, Corpus.load(corpus), repeat=1, time_limit=0.5)
+        assert results.metrics['interpret.corpus'].unit == 'prog/s'
+        # `spin` does not terminate
+        assert [s.split(':')[0] for s in results.skipped['interpret.corpus']] == ['spin']
+
+    def test_cpp(self, corpus):
+        results = BenchResults()
+        bench_cpp(results, Corpus.load(corpus))
+        for phase in ('parse', 'specialize', 'analyze', 'compile'):
+            metric = results.metrics[f'cpp.corpus.{phase}']
+            assert metric.unit == 's' and not metric.higher_is_better
+
+    def test_unknown_section(self):
+        with pytest.raises(ValueError, match='unknown section'):
+            run_benchmarks(['everything'])
+
+    def test_json(self, tmp_path):
+        results = run_benchmarks(['ops'], contexts={'FP16': fp.FP16}, op_names=['mul'], repeat=1)
+        path = tmp_path / 'results.json'
+        results.save(path)
+        loaded = BenchResults.load(path)
+        assert loaded.metrics == results.metrics
+        assert loaded.meta['sections'] == ['ops']
+        assert 'python' in json.loads(path.read_text())['meta']
+
+
+class TestCompare:
+
+    def test_directions(self):
+        base = _results(ops_add=100.0, t_compile=1.0)
+        assert not compare(base, _results(ops_add=95.0, t_compile=1.05)).regressions
+        slower = compare(base, _results(ops_add=50.0, t_compile=2.0))
+        assert [c.name for c in slower.regressions] == ['ops.add', 't.compile']
+        assert slower.changes[0].slowdown == pytest.approx(2.0)
+        faster = compare(base, _results(ops_add=200.0, t_compile=0.5))
+        assert not faster.regressions and len(faster.improvements) == 2
+        report = faster.report()
+        assert '2.000x faster' in report and 'slower' not in report
+        assert '2.000x slower' in slower.report()
+
+    def test_thresholds_by_prefix(self):
+        base = _results(ops_add=100.0, ops_mul=100.0)
+        cur = _results(ops_add=70.0, ops_mul=70.0)
+        cmp = compare(base, cur, threshold=0.1, thresholds={'ops': 0.5, 'ops.mul': 0.2})
+        assert [c.name for c in cmp.regressions] == ['ops.mul']
+        with pytest.raises(ValueError):
+            compare(base, cur, threshold=-1.0)
+
+    def test_missing_and_added(self):
+        cmp = compare(_results(ops_add=1.0, ops_mul=1.0), _results(ops_add=1.0, ops_fma=1.0))
+        assert cmp.missing == ['ops.mul'] and cmp.added == ['ops.fma']
+        assert '1 missing, 1 new' in cmp.report()
+
+
+class TestMain:
+
+    def test_baseline(self, tmp_path, capsys):
+        base = tmp_path / 'base.json'
+        args = ['ops', '--contexts', 'FP64', '--ops', 'add', '--repeat', '1']
+        assert main([*args, '-o', str(base)]) == 0
+
+        # a baseline 100 times faster than this machine
+        data = json.loads(base.read_text())
+        data['metrics']['ops.add.FP64']['value'] *= 100
+        fast = tmp_path / 'fast.json'
+        fast.write_text(json.dumps(data))
+        assert main([*args, '--baseline', str(fast)]) == 1
+        assert 'REGRESSED' in capsys.readouterr().out
+        assert main([*args, '--baseline', str(fast), '--threshold', 'ops.add=1000']) == 0
+
+    def test_invalid_arguments(self):
+        with pytest.raises(SystemExit):
+            main(['everything'])
+        with pytest.raises(SystemExit):
+            main(['--threshold', 'ops=fast'])
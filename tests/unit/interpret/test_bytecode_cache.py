@@ -0,0 +1,89 @@
+"""
+Tests for the persistent bytecode cache.
+
+A function loaded from `BytecodeCache` must behave exactly like a fresh
+compilation: same results, and foreign values taken from the function
+being loaded, not from the one that populated the cache.
+"""
+
+import fpy2 as fp
+
+from fpy2.ast import ForeignVal
+from fpy2.ast.visitor import DefaultTransformVisitor
+from fpy2.interpret.byte import BytecodeCompiler
+
+
+@fp.fpy
+def _poly(x: fp.Real, xs: list[fp.Real]) -> fp.Real:
+    with fp.FP32:
+        y = x * 2 + 0.1
+        for z in xs:
+            if z < y:
+                y = y + z
+        return y
+
+
+@fp.fpy
+def _tag(x: fp.Real):
+    return ('hello', x + 1)
+
+
+class _Retag(DefaultTransformVisitor):
+    """Replaces every foreign value with `val`."""
+
+    def __init__(self, val):
+        self.val = val
+
+    def _visit_foreign(self, e: ForeignVal, ctx):
+        return ForeignVal(self.val, e.loc)
+
+    def apply(self, func: fp.Function) -> fp.Function:
+        return func.with_ast(self._visit_function(func.ast, None))
+
+
+class TestBytecodeCache:
+
+    def test_matches_compile(self, tmp_path):
+        cache = fp.BytecodeCache(tmp_path)
+        args = (1.0, [1.0, 5.0, -2.0])
+        expect = fp.BytecodeInterpreter().eval(_poly, args)
+        for _ in range(2):
+            # populates the cache, then loads from it
+            rt = fp.BytecodeInterpreter(disk_cache=cache)
+            assert rt.eval(_poly, args) == expect
+        assert len(list(tmp_path.glob('*.bin'))) == 1
+
+    def test_foreign_values(self, tmp_path):
+        cache = fp.BytecodeCache(tmp_path)
+        retagged = _Retag('world').apply(_tag)
+        rt = fp.BytecodeInterpreter(disk_cache=cache)
+        assert rt.eval(_tag, (1.0,))[0] == 'hello'
+        rt = fp.BytecodeInterpreter(disk_cache=cache)
+        assert rt.eval(retagged, (1.0,))[0] == 'world'
+        # structurally identical up to foreign values
+        assert len(list(tmp_path.glob('*.bin'))) == 1
+
+    def test_skips_compiler(self, tmp_path, monkeypatch):
+        cache = fp.BytecodeCache(tmp_path)
+        cache.compile(_poly.ast, _poly.env)
+
+        def fail(self):
+            raise AssertionError('recompiled')
+
+        monkeypatch.setattr(BytecodeCompiler, 'compile_code', fail)
+        fn = cache.compile(_poly.ast, _poly.env)
+        assert fn is not None
+
+    def test_corrupt_entry(self, tmp_path):
+        cache = fp.BytecodeCache(tmp_path)
+        cache.compile(_poly.ast, _poly.env)
+        for path in tmp_path.glob('*.bin'):
+            path.write_bytes(b'garbage')
+        rt = fp.BytecodeInterpreter(disk_cache=cache)
+        assert rt.eval(_poly, (1.0, [])) == fp.BytecodeInterpreter().eval(_poly, (1.0, []))
+
+    def test_clear(self, tmp_path):
+        cache = fp.BytecodeCache(tmp_path)
+        cache.compile(_poly.ast, _poly.env)
+        cache.clear()
+        assert list(tmp_path.glob('*.bin')) == []
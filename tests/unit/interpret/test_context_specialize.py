@@ -0,0 +1,139 @@
+"""
+Tests for context-specialized code in `BytecodeCompiler`.
+
+An operation whose context is known at compile time calls a version
+bound to that context (`ops.bind`); every other operation reads the
+active context `__ctx__`.  Either way, the results are the same.
+"""
+
+import ast as pyast
+
+import pytest
+
+import fpy2 as fp
+
+from fpy2.analysis.context_use import ContextUse
+from fpy2.fpc_context import FPCoreContext, NoSuchContextError
+from fpy2.interpret.byte import BytecodeCompiler
+
+
+def _source(func: fp.Function, **kwargs) -> str:
+    tree = BytecodeCompiler(func.ast, func.env, **kwargs)._visit_function(func.ast, None)
+    return pyast.unparse(pyast.Module(body=[tree], type_ignores=[]))
+
+
+@fp.fpy
+def _static(x: fp.Real, y: fp.Real) -> fp.Real:
+    with fp.FP32:
+        a = x * y + x
+        b = fp.fma(x, y, a) - fp.sqrt(fp.fabs(y))
+        return fp.round(b) + fp.const_pi()
+
+
+@fp.fpy
+def _dynamic(x: fp.Real, y: fp.Real) -> fp.Real:
+    return x * y + x
+
+
+@fp.fpy(ctx=fp.FP16)
+def _annotated(x: fp.Real, y: fp.Real) -> fp.Real:
+    return x / y
+
+
+@fp.fpy
+def _mixed(x: fp.Real, y: fp.Real) -> fp.Real:
+    a = x + y
+    with fp.BF16:
+        b = a * y
+    return a - b
+
+
+_ARGS = [(1.0, 3.0), (0.1, -7.25), (-2.5, 1e-3), (1e30, 1e30)]
+
+
+class TestSpecialized:
+
+    def test_static_context_is_bound(self):
+        src = _source(_static)
+        assert 'ctx=__ctx__' not in src, src
+        assert '__fpy_bound_Mul(' in src and '__fpy_bound_Fma(' in src
+
+    def test_one_binding_per_operation_and_context(self):
+        compiler = BytecodeCompiler(_static.ast, _static.env)
+        compiler.compile()
+        # `+` appears twice under one context
+        assert len([n for n in compiler.bound_ops if 'Add' in n]) == 1
+
+    def test_dynamic_context_is_not_bound(self):
+        src = _source(_dynamic)
+        assert '__fpy_bound' not in src
+        assert src.count('ctx=__ctx__') == 2
+
+    def test_function_context_is_static(self):
+        assert '__fpy_bound_Div(' in _source(_annotated)
+
+    def test_only_the_static_scope_is_bound(self):
+        src = _source(_mixed)
+        assert '__fpy_bound_Mul(' in src
+        assert '__fpy_Add(x, y, ctx=__ctx__)' in src
+
+    def test_opt_out(self):
+        assert '__fpy_bound' not in _source(_static, specialize=False)
+
+    def test_unknown_context(self):
+        """A program with an FPCore context that has no counterpart
+        still compiles, and fails when it is called."""
+        @fp.fpy(ctx=FPCoreContext(precision='quaternion'))
+        def f(x: fp.Real) -> fp.Real:
+            return x + 1
+
+        assert '__fpy_bound' not in _source(f)
+        with pytest.raises(NoSuchContextError):
+            f(1.0)
+
+    def test_analysis_errors_propagate(self, monkeypatch):
+        def broken(func, **kwargs):
+            raise RuntimeError('broken analysis')
+
+        monkeypatch.setattr(ContextUse, 'analyze', staticmethod(broken))
+        with pytest.raises(RuntimeError, match='broken analysis'):
+            BytecodeCompiler(_static.ast, _static.env)
+
+
+class TestSameResults:
+
+    def test_agrees_with_generic_code(self):
+        rt = fp.BytecodeInterpreter()
+        for f in (_static, _dynamic, _annotated, _mixed):
+            spec = BytecodeCompiler(f.ast, f.env).compile()
+            generic = BytecodeCompiler(f.ast, f.env, specialize=False).compile()
+            for caller_ctx in (fp.FP64, fp.FP32, fp.REAL):
+                # as the interpreter calls it: an annotation overrides the caller
+                ctx = rt._func_ctx(f.ast, caller_ctx)
+                for x, y in _ARGS:
+                    args = (fp.Float.from_float(x), fp.Float.from_float(y))
+                    expect = generic(*args, __ctx__=ctx)
+                    actual = spec(*args, __ctx__=ctx)
+                    assert actual == expect or (actual.isnan and expect.isnan), (f.name, ctx, x, y)
+
+    def test_dynamic_context_follows_the_caller(self):
+        x, y = 0.1, 3.0
+        assert _dynamic(x, y, ctx=fp.FP16) != _dynamic(x, y, ctx=fp.FP64)
+        assert _dynamic(x, y, ctx=fp.FP16) == _dynamic(x, y, ctx=fp.FP16)
+
+    def test_disk_cache_is_generic(self, tmp_path):
+        """Code is shared by functions that differ only in foreign values,
+        so it must not carry the context of the first one compiled."""
+        def make(ctx):
+            @fp.fpy
+            def f(x: fp.Real) -> fp.Real:
+                with ctx:
+                    return x / 3
+            return f
+
+        cache = fp.BytecodeCache(tmp_path)
+        for ctx in (fp.FP64, fp.FP16):
+            rt = fp.BytecodeInterpreter(disk_cache=cache)
+            expect = fp.BytecodeInterpreter().eval(make(ctx), (1.0,))
+            assert rt.eval(make(ctx), (1.0,)) == expect
+        assert len(list(tmp_path.glob('*.bin'))) == 1
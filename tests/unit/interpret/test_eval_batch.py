@@ -0,0 +1,65 @@
+"""
+Tests for batched evaluation.
+
+`eval_batch` takes one column of inputs per parameter and must
+produce exactly what a loop of `eval` calls would, lazily and in order.
+"""
+
+import pytest
+
+import fpy2 as fp
+
+
+@fp.fpy
+def _axpy(a: fp.Real, x: fp.Real, y: fp.Real) -> fp.Real:
+    return a * x + y
+
+
+@fp.fpy(ctx=fp.FP32)
+def _third(x: fp.Real) -> fp.Real:
+    return x / 3
+
+
+class TestEvalBatch:
+
+    def test_matches_eval(self):
+        rt = fp.BytecodeInterpreter()
+        xs = [1.0, 2.5, -3.0, 0.1]
+        ys = [4.0, 0.5, 1.0, 0.2]
+        zs = [1.0, 1.0, -1.0, 0.3]
+        batch = list(rt.eval_batch(_axpy, [xs, ys, zs], fp.FP64))
+        expect = [rt.eval(_axpy, args, fp.FP64) for args in zip(xs, ys, zs)]
+        assert batch == expect
+
+    def test_function_context(self):
+        rt = fp.BytecodeInterpreter()
+        xs = [1.0, 2.0, 10.0]
+        batch = list(rt.eval_batch(_third, [xs], fp.FP64))
+        assert all(x.ctx == fp.FP32 for x in batch)
+        assert batch == [rt.eval(_third, (x,)) for x in xs]
+
+    def test_lazy(self):
+        rt = fp.BytecodeInterpreter()
+        seen: list[float] = []
+
+        def column():
+            for x in (1.0, 2.0, 3.0):
+                seen.append(x)
+                yield x
+
+        it = rt.eval_batch(_third, [column()], fp.FP64)
+        assert seen == []
+        next(it)
+        assert seen == [1.0]
+
+    def test_compiles_once(self):
+        rt = fp.BytecodeInterpreter()
+        list(rt.eval_batch(_axpy, [[1.0], [2.0], [3.0]], fp.FP64))
+        assert list(rt.func_cache) == [_axpy.ast]
+
+    def test_column_mismatch(self):
+        rt = fp.BytecodeInterpreter()
+        with pytest.raises(TypeError):
+            rt.eval_batch(_axpy, [[1.0], [2.0]], fp.FP64)
+        with pytest.raises(ValueError):
+            list(rt.eval_batch(_axpy, [[1.0, 2.0], [2.0], [3.0]], fp.FP64))
@@ -0,0 +1,68 @@
+"""
+Tests for the compilation cache of `BytecodeInterpreter`.
+
+Functions and expressions share one bounded cache; an expression is
+reused across structurally identical expressions, but always evaluates
+with its own foreign values.
+"""
+
+import fpy2 as fp
+
+from fpy2.ast import Add, ForeignVal, Mul, Var
+from fpy2.utils import NamedId
+
+
+@fp.fpy
+def _f(x: fp.Real) -> fp.Real:
+    return x + 1
+
+
+@fp.fpy
+def _g(x: fp.Real) -> fp.Real:
+    return x * 2
+
+
+_X = NamedId('x')
+
+
+def _add(c: int):
+    return Add(Var(_X, None), ForeignVal(fp.Float.from_int(c), None), None)
+
+
+class TestFuncCache:
+
+    def test_bounded(self):
+        rt = fp.BytecodeInterpreter(cache_size=1)
+        rt.eval(_f, (1.0,))
+        rt.eval(_g, (1.0,))
+        assert list(rt.func_cache) == [_g.ast]
+        stats = rt.func_cache.stats()
+        assert (stats.misses, stats.evictions, stats.size) == (2, 1, 1)
+        rt.eval(_g, (2.0,))
+        assert rt.func_cache.stats().hits == 1
+
+    def test_expr_reused(self):
+        rt = fp.BytecodeInterpreter()
+        one = fp.Float.from_int(1)
+        results = [rt.eval_expr(_add(c), {_X: one}, fp.FP64) for c in range(3)]
+        assert results == [1, 2, 3]
+        stats = rt.func_cache.stats()
+        assert (stats.misses, stats.hits, stats.size) == (1, 2, 1)
+
+    def test_expr_structure(self):
+        rt = fp.BytecodeInterpreter()
+        one = fp.Float.from_int(1)
+        mul = Mul(Var(_X, None), ForeignVal(fp.Float.from_int(3), None), None)
+        assert rt.eval_expr(_add(3), {_X: one}, fp.FP64) == 4
+        assert rt.eval_expr(mul, {_X: one}, fp.FP64) == 3
+        assert rt.func_cache.stats().misses == 2
+
+    def test_expr_free_vars(self):
+        rt = fp.BytecodeInterpreter()
+        y = NamedId('y')
+        e = Add(Var(_X, None), Var(y, None), None)
+        one = fp.Float.from_int(1)
+        assert rt.eval_expr(e, {_X: one, y: one}, fp.FP64) == 2
+        # same expression, different free variables
+        assert rt.eval_expr(e, {y: one, _X: one}, fp.FP64) == 2
+        assert rt.func_cache.stats().misses == 2
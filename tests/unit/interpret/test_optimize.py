@@ -0,0 +1,148 @@
+"""
+Tests for the optimizing tier of `BytecodeInterpreter`.
+
+An optimized function must compute exactly what the original does;
+the interpreter keys its cache on the original function and keeps
+the optimized one alongside the compiled code.
+"""
+
+import pytest
+
+import fpy2 as fp
+
+from fpy2.ast.fpyast import ContextStmt, ForeignVal
+from fpy2.ast.visitor import DefaultVisitor
+from fpy2.interpret.optimize import OPT_LEVELS, PASSES, Optimizer
+from fpy2.number import REAL
+from fpy2.transform import Monomorphize
+from fpy2.types import RealType
+
+
+@fp.fpy
+def _poly(x: fp.Real, xs: list[fp.Real]) -> fp.Real:
+    with fp.FP64:
+        a = 1.0 + 2.0
+        y = x * a
+        z = y
+        for w in xs:
+            if w < z:
+                z = z + w
+        return z
+
+
+@fp.fpy(ctx=fp.FP64)
+def _widen(x: fp.Real, y: fp.Real) -> fp.Real:
+    # FP32 operands: the product and sum are exact in FP64
+    return x * y + x
+
+
+@fp.fpy
+def _triple_fst(t: tuple[fp.Real, fp.Real, fp.Real]) -> fp.Real:
+    return fp.fst(t)
+
+
+def _has_real_block(ast: fp.ast.FuncDef) -> bool:
+    found = False
+
+    class _C(DefaultVisitor):
+        def _visit_context(self, stmt: ContextStmt, ctx):
+            nonlocal found
+            if isinstance(stmt.ctx, ForeignVal) and stmt.ctx.val is REAL:
+                found = True
+            super()._visit_context(stmt, ctx)
+
+    _C()._visit_function(ast, None)
+    return found
+
+
+class TestOptimizingInterpreter:
+
+    @pytest.mark.parametrize('level', sorted(OPT_LEVELS))
+    def test_agrees_with_unoptimized(self, level):
+        rt = fp.BytecodeInterpreter(opt_level=level)
+        for x in (0.0, 1.5, -2.25, 100.0):
+            args = (x, [1.0, -3.0, 0.5])
+            assert rt.eval(_poly, args) == fp.BytecodeInterpreter().eval(_poly, args)
+
+    def test_unoptimized_by_default(self):
+        rt = fp.BytecodeInterpreter()
+        assert rt.optimizer is None
+        assert rt.optimized(_poly) is _poly.ast
+
+    def test_simplify_folds_constants(self):
+        rt = fp.BytecodeInterpreter(opt_level=1)
+        assert '1.0 + 2.0' not in rt.optimized(_poly).format()
+
+    def test_round_elim_on_a_monomorphized_function(self):
+        f = _widen.with_ast(Monomorphize.apply(_widen.ast, fp.FP64, [RealType(fp.FP32)] * 2))
+        rt = fp.BytecodeInterpreter(opt_level=2)
+        assert _has_real_block(rt.optimized(f))
+        for x, y in ((0.1, 3.0), (-7.5, 0.3), (1e30, 1e-30)):
+            x, y = float(fp.FP32.round(x)), float(fp.FP32.round(y))
+            assert rt.eval(f, (x, y)) == fp.BytecodeInterpreter().eval(f, (x, y))
+
+    def test_optimizes_once(self):
+        rt = fp.BytecodeInterpreter(passes=['const_fold'])
+        for x in (1.0, 2.0, 3.0):
+            rt.eval(_poly, (x, []))
+        assert rt.optimized(_poly) is rt.optimized(_poly)
+        assert rt.optimizer is not None
+        assert rt.optimizer.stats['const_fold'].runs == 1
+        assert len(rt.func_cache) == 1
+
+    def test_a_failing_pass_leaves_the_program_to_fail_at_runtime(self):
+        """Type inference rejects `_triple_fst`; optimizing it must not."""
+        rt = fp.BytecodeInterpreter(opt_level=2)
+        assert rt.optimizer is not None
+        rt.optimized(_triple_fst)
+        assert any(stats.declined for stats in rt.optimizer.stats.values())
+        with pytest.raises(ValueError, match='fst requires a pair'):
+            rt.eval(_triple_fst, ((1.0, 2.0, 3.0),))
+
+    def test_optimized_requires_a_function(self):
+        with pytest.raises(TypeError):
+            fp.BytecodeInterpreter().optimized(_poly.ast)  # type: ignore[arg-type]
+
+
+class TestOptimizer:
+
+    def test_levels_name_known_passes(self):
+        for passes in OPT_LEVELS.values():
+            assert set(passes) <= set(PASSES)
+
+    def test_unknown_pass(self):
+        with pytest.raises(ValueError, match='unknown pass'):
+            Optimizer(['const_fold', 'loop_fusion'])
+        with pytest.raises(ValueError, match='unknown pass'):
+            fp.BytecodeInterpreter(passes=['loop_fusion'])
+
+    def test_unknown_level(self):
+        with pytest.raises(ValueError, match='unknown optimization level'):
+            Optimizer.for_level(7)
+        with pytest.raises(ValueError, match='unknown optimization level'):
+            fp.BytecodeInterpreter(opt_level=-1)
+
+    def test_pass_errors_propagate(self, monkeypatch):
+        def broken(func):
+            raise RuntimeError('bug in the pass')
+
+        monkeypatch.setitem(PASSES, 'const_fold', broken)
+        with pytest.raises(RuntimeError, match='bug in the pass'):
+            Optimizer(['const_fold']).run(_poly.ast)
+
+    def test_stats_and_report(self):
+        opt = Optimizer(['const_fold', 'dead_code'])
+        opt.run(_poly.ast)
+        opt.run(_poly.ast)
+        assert opt.stats['const_fold'].runs == 2
+        assert opt.stats['const_fold'].changed == 2
+        assert opt.stats['dead_code'].seconds >= 0.0
+        lines = opt.report().splitlines()
+        assert lines[0].split() == ['pass', 'runs', 'changed', 'declined', 'ms']
+        assert [line.split()[0] for line in lines[1:]] == ['const_fold', 'dead_code']
+        opt.reset()
+        assert opt.stats['const_fold'].runs == 0
+
+    def test_run_requires_a_function_definition(self):
+        with pytest.raises(TypeError):
+            Optimizer(['const_fold']).run(_poly)  # type: ignore[arg-type]
@@ -0,0 +1,148 @@
+"""
+Tests for the source-level profiler (`Profiler`).
+
+Counts are exact; times are only checked for consistency, since
+they depend on the machine.
+"""
+
+import pstats
+
+import pytest
+
+import fpy2 as fp
+
+from fpy2.interpret.profiler import ProfileSite
+
+
+@fp.fpy
+def _square(x: fp.Real) -> fp.Real:
+    return x * x
+
+
+@fp.fpy
+def _kernel(xs: list[fp.Real]) -> bool:
+    with fp.FP32:
+        acc = 0.0
+        for x in xs:
+            acc = acc + _square(x)
+        n = len(xs)
+    return fp.isnan(acc) or acc / n > 1.0
+
+
+_XS = [0.5, 1.5, 2.5, 3.5]
+
+
+@pytest.fixture
+def profiled():
+    """A profiling interpreter, made the default so callees are profiled too."""
+    prof = fp.Profiler()
+    rt = fp.BytecodeInterpreter(profiler=prof)
+    old = fp.get_default_interpreter()
+    fp.set_default_interpreter(rt)
+    try:
+        yield prof, rt
+    finally:
+        fp.set_default_interpreter(old)
+
+
+def _ops(prof: fp.Profiler) -> dict[str, ProfileSite]:
+    return {site.name: site for site in prof.sites if site.func is not None}
+
+
+def _funcs(prof: fp.Profiler) -> dict[str, ProfileSite]:
+    return {site.name: site for site in prof.sites if site.func is None}
+
+
+class TestCounts:
+
+    def test_same_result(self, profiled):
+        _, rt = profiled
+        assert rt.eval(_kernel, (_XS,)) == fp.BytecodeInterpreter().eval(_kernel, (_XS,))
+
+    def test_operations_by_location(self, profiled):
+        prof, rt = profiled
+        rt.eval(_kernel, (_XS,))
+        ops = _ops(prof)
+        add, mul = ops['Add'], ops['Mul']
+        assert prof.sites[add].calls == len(_XS)
+        assert prof.sites[mul].calls == len(_XS)
+        assert add.func is not None and add.func.name == '_kernel'
+        assert mul.func is not None and mul.func.name == '_square'
+        assert add.source == _kernel.ast.loc.source
+        assert add.line == _kernel.ast.loc.start_line + 4
+
+    def test_roundings_by_context(self, profiled):
+        """`_square` has no context of its own: its roundings are under the caller's."""
+        prof, rt = profiled
+        rt.eval(_kernel, (_XS,), ctx=fp.FP64)
+        ops = _ops(prof)
+        assert prof.sites[ops['Mul']].roundings == {str(fp.FP32): len(_XS)}
+        assert prof.sites[ops['Div']].roundings == {str(fp.FP64): 1}
+        # a predicate is evaluated, but does not round
+        assert prof.sites[ops['IsNan']].calls == 1
+        assert prof.sites[ops['IsNan']].roundings == {}
+
+    def test_functions_and_callers(self, profiled):
+        prof, rt = profiled
+        rt.eval(_kernel, (_XS,))
+        rt.eval(_kernel, (_XS,))
+        funcs = _funcs(prof)
+        kernel, square = prof.sites[funcs['_kernel']], prof.sites[funcs['_square']]
+        assert kernel.calls == 2 and square.calls == 2 * len(_XS)
+        assert list(kernel.callers) == [None]
+        assert list(square.callers) == [funcs['_kernel']]
+        # a function's time includes its callees
+        assert kernel.seconds >= square.seconds
+
+    def test_by_line(self, profiled):
+        prof, rt = profiled
+        rt.eval(_kernel, (_XS,))
+        lines = prof.by_line()
+        line = _ops(prof)['Div'].line
+        # `acc / n > 1.0` and `isnan(acc)` share a line
+        assert lines[(_kernel.ast.loc.source, line)].calls == 2
+
+    def test_reset(self, profiled):
+        prof, rt = profiled
+        rt.eval(_kernel, (_XS,))
+        prof.reset()
+        assert all(stats.calls == 0 for stats in prof.sites.values())
+        # compiled code still records into the same statistics
+        rt.eval(_kernel, (_XS,))
+        assert prof.sites[_ops(prof)['Add']].calls == len(_XS)
+
+
+class TestOutput:
+
+    def test_report(self, profiled):
+        prof, rt = profiled
+        rt.eval(_kernel, (_XS,))
+        report = prof.report()
+        for title in ('functions', 'operations', 'lines'):
+            assert title in report
+        assert '(_square)' in report and '(Mul)' in report
+        assert str(fp.FP32) in report
+        assert len(prof.report(limit=1).splitlines()) < len(report.splitlines())
+
+    def test_pstats(self, profiled, tmp_path):
+        prof, rt = profiled
+        rt.eval(_kernel, (_XS,))
+        path = tmp_path / 'kernel.prof'
+        prof.dump_stats(path)
+        stats = pstats.Stats(str(path))
+        by_name = {name: entry for (_, _, name), entry in stats.stats.items()}  # type: ignore[attr-defined]
+        kernel = by_name['_kernel']
+        square = by_name['_square']
+        assert kernel[1] == 1 and square[1] == len(_XS)
+        # self time excludes operations and callees
+        assert kernel[2] <= kernel[3]
+        assert any(name.startswith('Mul:') for name in by_name)
+        # `pstats` also reads a profiler directly, as it does `cProfile.Profile`
+        assert pstats.Stats(prof).total_calls == stats.total_calls  # type: ignore[attr-defined]
+
+    def test_not_cached_on_disk(self, tmp_path):
+        prof = fp.Profiler()
+        rt = fp.BytecodeInterpreter(profiler=prof, disk_cache=fp.BytecodeCache(tmp_path))
+        rt.eval(_square, (3.0,))
+        assert not list(tmp_path.glob('*.bin'))
+        assert prof.sites[_ops(prof)['Mul']].calls == 1
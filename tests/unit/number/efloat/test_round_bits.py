@@ -0,0 +1,80 @@
+"""
+Testing `EFloatContext.round_to_bits()` and `EFloatContext.round_from_bits()`.
+
+Both must agree with the general path, `encode(round(x))` and `decode(i)`,
+for every rounding mode and overflow behavior.
+"""
+
+import random
+
+import fpy2 as fp
+
+from hypothesis import given, strategies as st
+
+from ...generators import rounding_modes
+
+_common: list[fp.EFloatContext] = [
+    fp.S1E5M2, fp.S1E4M3,
+    fp.MX_E5M2, fp.MX_E4M3, fp.MX_E3M2, fp.MX_E2M3, fp.MX_E2M1,
+    fp.FP8P1, fp.FP8P2, fp.FP8P3, fp.FP8P4, fp.FP8P5, fp.FP8P6, fp.FP8P7,
+    fp.FP16, fp.BF16, fp.FP32, fp.FP64,
+]
+
+_overflow = [fp.OV.OVERFLOW, fp.OV.SATURATE]
+
+
+def _round_bits(ctx: fp.EFloatContext, s: bool, exp: int, c: int):
+    try:
+        return ctx.encode(ctx.round(fp.Float(s=s, exp=exp, c=c)))
+    except (ValueError, OverflowError) as e:
+        return type(e)
+
+
+class TestRoundToBits():
+
+    @given(
+        st.sampled_from(_common),
+        rounding_modes(),
+        st.sampled_from(_overflow),
+        st.booleans(),
+        st.integers(-1100, 1100),
+        st.integers(0, 2 ** 80)
+    )
+    def test_round_to_bits(self, ctx, rm, ov, s, exp, c):
+        ctx = ctx.with_params(rm=rm, overflow=ov)
+        expect = _round_bits(ctx, s, exp, c)
+        try:
+            actual = ctx.round_to_bits(s, exp, c)
+        except (ValueError, OverflowError) as e:
+            actual = type(e)
+        assert actual == expect
+
+    def test_small_exhaustive(self):
+        ctx = fp.MX_E2M1
+        for rm in fp.RM:
+            rctx = ctx.with_params(rm=rm)
+            for s in (False, True):
+                for exp in range(ctx.expmin - 3, ctx.expmax + 3):
+                    for c in range(32):
+                        assert rctx.round_to_bits(s, exp, c) == _round_bits(rctx, s, exp, c)
+
+    def test_stochastic(self):
+        ctx = fp.FP16.with_params(num_randbits=4, rng=random.Random(1))
+        bits = ctx.round_to_bits(False, -30, 12345678)
+        assert ctx.round_from_bits(bits) == ctx.decode(bits)
+
+
+class TestRoundFromBits():
+
+    def test_round_from_bits(self):
+        for ctx in _common:
+            n = min(1 << ctx.nbits, 1 << 12)
+            for i in range(0, 1 << ctx.nbits, (1 << ctx.nbits) // n):
+                for j in (i, (1 << ctx.nbits) - 1 - i):
+                    x = ctx.decode(j)
+                    y = ctx.round_from_bits(j)
+                    assert y.ctx == ctx
+                    if x.isnan:
+                        assert y.isnan
+                    else:
+                        assert x == y and x.s == y.s and x.isinf == y.isinf
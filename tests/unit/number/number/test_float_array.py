@@ -0,0 +1,88 @@
+"""
+Testing `FloatArray`.
+"""
+
+import numpy as np
+import pytest
+import fpy2 as fp
+
+from hypothesis import given, settings, strategies as st
+
+from ...generators import floats
+
+
+def _same(x: fp.Float, y: fp.Float) -> bool:
+    return (
+        x.isnan == y.isnan
+        and x.isinf == y.isinf
+        and x.s == y.s
+        and x.exp == y.exp
+        and x.c == y.c
+        and x.ctx == y.ctx
+        and x.inexact == y.inexact
+    )
+
+
+class TestFloatArray():
+
+    @given(st.lists(floats(prec_max=100, exp_min=-100, exp_max=100), max_size=20))
+    @settings(deadline=None)
+    def test_roundtrip(self, xs: list[fp.Float]):
+        arr = fp.FloatArray(xs)
+        assert len(arr) == len(xs)
+        assert all(_same(x, y) for x, y in zip(arr, xs))
+        assert all(_same(arr[i], xs[i]) for i in range(len(xs)))
+
+    def test_context(self):
+        xs = [fp.FP32.round(0.1), fp.FP32.round(3)]
+        arr = fp.FloatArray(xs)
+        assert arr.ctx == fp.FP32
+        assert arr[0].ctx == fp.FP32 and arr[0].inexact
+        assert fp.FloatArray([]).ctx is None
+        with pytest.raises(ValueError):
+            fp.FloatArray([fp.FP32.round(1), fp.FP64.round(1)])
+
+    def test_wide_significand(self):
+        xs = [fp.Float(c=3 ** 100, exp=-5), fp.Float(c=1, exp=0)]
+        arr = fp.FloatArray(xs)
+        assert arr.c.dtype == object
+        assert arr.tolist() == xs
+
+    def test_wide_exponent(self):
+        xs = [fp.Float(c=1, exp=2 ** 70), fp.Float(s=True, c=3, exp=-2 ** 70), fp.Float(c=1, exp=0)]
+        arr = fp.FloatArray(xs)
+        assert arr.exp.dtype == object
+        assert arr.tolist() == xs
+        assert arr[1:].tolist() == xs[1:]
+
+    def test_view(self):
+        xs = [fp.FP64.round(i) for i in range(10)]
+        arr = fp.FloatArray(xs)
+        view = arr[2:8:2]
+        assert view.tolist() == xs[2:8:2]
+        assert view.exp.base is not None  # shares columns
+        assert not arr.exp.flags.writeable
+
+    def test_from_columns(self):
+        arr = fp.FloatArray.from_columns(
+            np.array([False, True]),
+            np.array([0, -1]),
+            np.array([3, 5], dtype=np.uint64),
+            ctx=fp.FP64
+        )
+        assert arr.tolist() == [fp.Float(c=3, exp=0), fp.Float(s=True, c=5, exp=-1)]
+        assert arr[1].ctx == fp.FP64
+
+    def test_round(self):
+        xs = [fp.FP64.round(0.1), fp.FP64.round(-2.5)]
+        arr = fp.FloatArray(xs).round(fp.FP16)
+        assert arr.ctx == fp.FP16
+        assert all(_same(x, fp.FP16.round(y)) for x, y in zip(arr, xs))
+
+    @given(st.lists(st.integers(0, 2 ** 16 - 1), max_size=20))
+    def test_encode_decode(self, bits: list[int]):
+        arr = fp.FloatArray.decode(bits, fp.FP16)
+        encoded = arr.encode().tolist()
+        for x, b, e in zip(arr, bits, encoded):
+            # NaN payloads are not preserved
+            assert x.isnan or b == e
@@ -0,0 +1,154 @@
+"""
+Tests for rounding-event counters (`RoundingCounters`).
+
+Counts are collected only while counters are active, and agree with
+the flags of the rounded results.
+"""
+
+import pickle
+import threading
+
+import pytest
+
+import fpy2 as fp
+
+from fpy2.number import get_rounding_counters, set_rounding_counters
+
+_CTX = fp.MX_E5M2
+
+
+@fp.fpy
+def _scale(xs: list[fp.Real], k: fp.Real) -> list[fp.Real]:
+    with fp.MX_E5M2:
+        return [x * k for x in xs]
+
+
+class TestCounts:
+
+    def test_inactive_by_default(self):
+        assert get_rounding_counters() is None
+        fp.ops.mul(1e6, 1e6, _CTX)
+        assert get_rounding_counters() is None
+
+    def test_events(self):
+        with fp.RoundingCounters() as counters:
+            fp.ops.add(1.0, 2.0, _CTX)           # exact
+            fp.ops.mul(1e5, 1e5, _CTX)           # overflow
+            fp.ops.mul(1e-5, 1e-5, _CTX)         # underflow
+            fp.ops.div(1.0, 0.0, _CTX)           # division by zero
+            fp.ops.sqrt(-1.0, _CTX)              # invalid
+        assert get_rounding_counters() is None
+
+        by_op = counters.by_op()
+        assert by_op['add'] == fp.RoundingEvents(roundings=1)
+        assert by_op['mul'].roundings == 2
+        assert by_op['mul'].overflow == 1 and by_op['mul'].underflow == 1
+        assert by_op['div'].divzero == 1 and by_op['div'].inexact == 0
+        assert by_op['sqrt'].invalid == 1
+        assert counters.by_context().keys() == {str(_CTX)}
+        assert counters.total().roundings == 5
+
+    def test_agrees_with_flags(self):
+        xs = [_CTX.decode(i) for i in range(0, 256, 7)]
+        expect = fp.RoundingEvents()
+        with fp.RoundingCounters() as counters:
+            for x in xs:
+                for y in xs:
+                    r = fp.ops.mul(x, y, _CTX)
+                    expect += fp.RoundingEvents(
+                        roundings=1,
+                        inexact=int(r.inexact),
+                        overflow=int(r._real._flags.overflow),
+                        underflow=int(r._real._flags.underflow_post),
+                        invalid=int(r._real._flags.invalid),
+                        divzero=int(r._real._flags.divzero),
+                    )
+        assert counters.counts() == {(str(_CTX), 'mul'): expect}
+
+    def test_interpreted_and_bound(self):
+        xs = [1.0, 3.0, 1e5]
+        with fp.RoundingCounters() as counters:
+            _scale(xs, 7.0)
+            fp.ops.bind(fp.ops.mul, _CTX)(3.0, 7.0)
+        mul = counters.counts()[(str(_CTX), 'mul')]
+        assert mul.roundings == len(xs) + 1
+        assert mul.overflow == 1
+
+    def test_rounding_operations(self):
+        with fp.RoundingCounters() as counters:
+            fp.ops.round(0.1, fp.FP16)
+            fp.ops.cast(0.5, fp.FP16)
+            fp.ops.ceil(1.5, fp.FP16)
+            fp.ops.const_pi(fp.FP16)
+            fp.ops.round(0.1, fp.REAL)
+        by_op = counters.by_op()
+        assert by_op.keys() == {'round', 'cast', 'ceil', 'const_pi'}
+        assert by_op['round'].inexact == 1 and by_op['cast'].inexact == 0
+        assert by_op['ceil'].inexact == 1
+
+    def test_nested(self):
+        with fp.RoundingCounters() as outer:
+            with fp.RoundingCounters() as inner:
+                fp.ops.add(1.0, 2.0, _CTX)
+            fp.ops.add(1.0, 2.0, _CTX)
+        assert inner.total().roundings == 1
+        assert outer.total().roundings == 1
+
+    def test_set_requires_counters(self):
+        with pytest.raises(TypeError):
+            set_rounding_counters(object())  # type: ignore[arg-type]
+
+
+class TestAggregation:
+
+    def test_reset(self):
+        with fp.RoundingCounters() as counters:
+            fp.ops.add(1.0, 2.0, _CTX)
+            counters.reset()
+            fp.ops.mul(1.0, 2.0, _CTX)
+        assert list(counters.by_op()) == ['mul']
+
+    def test_merge_and_pickle(self):
+        a, b = fp.RoundingCounters(), fp.RoundingCounters()
+        with a:
+            fp.ops.mul(1e5, 1e5, _CTX)
+        with b:
+            fp.ops.mul(1e5, 1e5, _CTX)
+            fp.ops.add(1.0, 2.0, fp.FP16)
+        a.merge(pickle.loads(pickle.dumps(b)))
+        assert a.counts()[(str(_CTX), 'mul')] == fp.RoundingEvents(roundings=2, inexact=2, overflow=2)
+        assert a.by_context()[str(fp.FP16)].roundings == 1
+        with pytest.raises(ValueError):
+            a.merge(a)
+
+    def test_threads(self):
+        n, k = 4, 200
+        counters = fp.RoundingCounters()
+        def work():
+            with counters:
+                for _ in range(k):
+                    fp.ops.add(1.0, 2.0, _CTX)
+
+        threads = [threading.Thread(target=work) for _ in range(n)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert counters.total().roundings == n * k
+        assert get_rounding_counters() is None
+
+    def test_thread_local(self):
+        # counters activated in one thread are not active in another
+        seen = []
+        with fp.RoundingCounters():
+            t = threading.Thread(target=lambda: seen.append(get_rounding_counters()))
+            t.start()
+            t.join()
+        assert seen == [None]
+
+    def test_report(self):
+        with fp.RoundingCounters() as counters:
+            fp.ops.mul(1e5, 1e5, _CTX)
+        lines = counters.report().splitlines()
+        assert lines[0].split()[:3] == ['context', 'op', 'roundings']
+        assert len(lines) == 2 and 'mul' in lines[1]
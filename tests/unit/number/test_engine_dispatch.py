@@ -0,0 +1,109 @@
+"""
+Tests for engine dispatch.
+
+`EngineList.dispatch` resolves the engine methods for an operation once
+per context and argument types, and forgets them whenever an engine
+is registered; `ops.bind` specializes an operation to a context.
+"""
+
+import pytest
+
+import fpy2 as fp
+
+from fractions import Fraction
+
+from fpy2.number.engine import MPFREngine, NativeEngine, RealEngine
+from fpy2.number.engine.engine import EngineList
+
+
+class _ConstEngine(RealEngine):
+    """Answers `add` with a fixed value."""
+
+    def add(self, x, y, ctx):
+        return fp.Float.from_int(42)
+
+
+class TestEngineDispatch:
+
+    def test_cached(self):
+        engines = EngineList()
+        engines.register(MPFREngine.instance(), priority=1)
+        kinds = (fp.Float, fp.Float)
+        fns = engines.dispatch('add', fp.FP64, kinds)
+        assert engines.dispatch('add', fp.FP64, kinds) is fns
+        # equal contexts share an entry
+        assert engines.dispatch('add', fp.IEEEContext(11, 64), kinds) is fns
+
+    def test_resolution(self):
+        engines = EngineList()
+        engines.register(NativeEngine.instance(), priority=2)
+        engines.register(MPFREngine.instance(), priority=1)
+        engines.register(RealEngine.instance(), priority=0)
+        # every engine may compute a double-precision sum
+        assert len(engines.dispatch('add', fp.FP64, (fp.Float, fp.Float))) == 3
+        # the native engine declines wide contexts
+        assert len(engines.dispatch('add', fp.FP128, (fp.Float, fp.Float))) == 2
+        # only the real engine handles rationals
+        assert len(engines.dispatch('add', fp.FP64, (Fraction, fp.Float))) == 1
+        # only the MPFR engine computes transcendental functions
+        assert len(engines.dispatch('sin', fp.REAL, (fp.Float,))) == 1
+
+    def test_register_invalidates(self):
+        engines = EngineList()
+        engines.register(MPFREngine.instance(), priority=1)
+        kinds = (fp.Float, fp.Float)
+        x = fp.Float.from_int(1)
+        fns = engines.dispatch('add', fp.FP64, kinds)
+        assert fns[0](x, x) == 2
+        engines.register(_ConstEngine(), priority=2)
+        fns = engines.dispatch('add', fp.FP64, kinds)
+        assert fns[0](x, x) == 42
+
+    def test_unregister(self):
+        engines = EngineList()
+        const = _ConstEngine()
+        engines.register(MPFREngine.instance(), priority=1)
+        engines.register(const, priority=2)
+        kinds = (fp.Float, fp.Float)
+        x = fp.Float.from_int(1)
+        assert engines.dispatch('add', fp.FP64, kinds)[0](x, x) == 42
+        engines.unregister(const)
+        assert list(engines) == [MPFREngine.instance()]
+        assert engines.dispatch('add', fp.FP64, kinds)[0](x, x) == 2
+
+
+class TestBind:
+
+    @pytest.mark.parametrize('ctx', [fp.FP64, fp.FP32, fp.MX_E4M3, fp.REAL])
+    def test_bind_matches(self, ctx: fp.Context):
+        x = fp.Float.from_float(1.75)
+        y = fp.Float.from_float(0.3)
+        for op, args in [
+            (fp.ops.add, (x, y)),
+            (fp.ops.div, (x, y)),
+            (fp.ops.fma, (x, y, x)),
+            (fp.ops.neg, (y,)),
+            (fp.ops.floor, (x,)),
+        ]:
+            expect = op(*args, ctx=ctx)
+            actual = fp.ops.bind(op, ctx)(*args)
+            assert actual == expect and type(actual) is type(expect)
+
+    def test_bind_converts_arguments(self):
+        """Arguments that are not a `Float` are converted, as by `op` itself."""
+        third = Fraction(1, 3)
+        for op, args in [
+            (fp.ops.sqrt, (2,)),
+            (fp.ops.add, (1.5, third)),
+            (fp.ops.mul, (third, fp.Float.from_int(3))),
+            (fp.ops.fma, (2, 0.25, third)),
+        ]:
+            assert fp.ops.bind(op, fp.FP32)(*args) == op(*args, ctx=fp.FP32)
+
+    def test_bind_constant(self):
+        pi = fp.ops.bind(fp.ops.const_pi, fp.FP32)
+        assert pi() == fp.ops.const_pi(fp.FP32)
+
+    def test_bind_invalid(self):
+        with pytest.raises(TypeError):
+            fp.ops.bind(fp.ops.add, None)
@@ -1,7 +1,8 @@
+import gmpy2 as gmp
 import fpy2 as fp
 
-from fpy2.number.gmputils import float_to_mpfr, mpfr_to_float
-from hypothesis import given
+from fpy2.number.gmputils import float_to_mpfr, mpfr_call, mpfr_call_many, mpfr_to_float
+from hypothesis import given, strategies as st
 
 from ..generators import floats
 
@@ -21,3 +22,28 @@ class TestGMPConversion():
         x2 = mpfr_to_float(y)
         assert isinstance(x2, fp.Float)
         self.assertEqualOrNan(x, x2)
+
+    @given(floats(prec_max=32, exp_min=-100, exp_max=100))
+    def test_to_gmp_hex(self, x: fp.Float):
+        if x.is_finite():
+            y = float_to_mpfr(x)
+            fmt = f'{"-" if x.s else "+"}{hex(x.c)}p{x.exp}'
+            assert y == gmp.mpfr(fmt, precision=max(x.p, 2), base=16)
+            assert y.is_signed() == x.s
+
+
+class TestGMPCall():
+    """Testing batched evaluation with `gmpy2`."""
+
+    @given(st.lists(st.tuples(
+        floats(prec_max=32, exp_min=-100, exp_max=100),
+        floats(prec_max=32, exp_min=-100, exp_max=100)
+    ), max_size=10), st.sampled_from([(8, None), (None, -20), (None, 4)]))
+    def test_call_many(self, xs: list[tuple[fp.Float, fp.Float]], params):
+        prec, n = params
+        argss = [(float_to_mpfr(x), float_to_mpfr(y)) for x, y in xs]
+        expect = [mpfr_call(gmp.div, args, prec=prec, n=n) for args in argss]
+        actual = mpfr_call_many(gmp.div, argss, prec=prec, n=n)
+        assert len(actual) == len(expect)
+        for x, y in zip(actual, expect):
+            assert (x.isnan and y.isnan) or (x == y and x.inexact == y.inexact)
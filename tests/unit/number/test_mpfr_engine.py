@@ -0,0 +1,58 @@
+"""
+Tests for the MPFR engine.
+"""
+
+import pytest
+
+import fpy2 as fp
+
+from fpy2.number.engine import MPFREngine
+
+_CONSTANTS = [
+    fp.ops.const_pi,
+    fp.ops.const_e,
+    fp.ops.const_ln2,
+    fp.ops.const_sqrt2,
+    fp.ops.const_2_sqrt_pi,
+]
+
+
+class TestConstantCache():
+
+    @pytest.mark.parametrize('op', _CONSTANTS)
+    @pytest.mark.parametrize('ctx', [fp.FP64, fp.FP16, fp.MX_E4M3, fp.FixedContext(True, -10, 16)])
+    def test_cached(self, op, ctx: fp.Context):
+        engine = MPFREngine.instance()
+        engine.clear()
+        expect = op(ctx)
+        actual = op(ctx)
+        assert actual == expect and actual.ctx == ctx
+        assert actual.inexact == expect.inexact
+        # the same value is computed without the cache
+        engine.clear()
+        assert op(ctx) == expect
+
+    def test_shared_params(self):
+        engine = MPFREngine(cache_size=8)
+        x = engine.const_pi(fp.FP64)
+        y = engine.const_pi(fp.FP64.with_params(rm=fp.RM.RTP))
+        # both contexts share one round-to-odd value
+        assert len(engine._constants) == 1
+        assert len(engine._rounded) == 2
+        assert x < y
+
+    def test_stochastic(self):
+        engine = MPFREngine(cache_size=8)
+        ctx = fp.IEEEContext(5, 16, num_randbits=4)
+        x = engine.const_pi(ctx)
+        # the result is not rounded under a stochastic context
+        assert x is not None and x.ctx is None
+        assert len(engine._rounded) == 0
+        assert fp.ops.const_pi(ctx).ctx == ctx
+
+    def test_bounded(self):
+        engine = MPFREngine(cache_size=2)
+        for p in range(2, 10):
+            engine.const_e(fp.MPFloatContext(p))
+        assert len(engine._constants) == 2
+        assert len(engine._rounded) == 2
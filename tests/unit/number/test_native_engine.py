@@ -0,0 +1,85 @@
+"""
+Tests for the native engine.
+
+After re-rounding, every result of `NativeEngine` must agree with
+`MPFREngine` bit-for-bit, including the sign of zero and every flag.
+"""
+
+import fpy2 as fp
+
+from hypothesis import given, strategies as st
+
+from fpy2.number.engine import MPFREngine, NativeEngine
+from fpy2.ops import _normalize
+
+from ..generators import floats, rounding_modes
+
+_CONTEXTS = [fp.FP64, fp.FP32, fp.FP16, fp.BF16]
+
+def _contexts():
+    return st.builds(
+        lambda ctx, rm: ctx.with_params(rm=rm),
+        st.sampled_from(_CONTEXTS),
+        rounding_modes()
+    )
+
+def _args():
+    return floats(prec_max=53, exp_min=-1100, exp_max=1000)
+
+def _assert_same(x: fp.Float, y: fp.Float):
+    if x.isnan or y.isnan:
+        assert x.isnan and y.isnan
+    else:
+        assert x == y and x.s == y.s
+    assert x.ctx == y.ctx
+    assert repr(x._real._flags) == repr(y._real._flags)
+
+
+class TestNativeEngine():
+
+    def _check(self, op: str, ctx: fp.Context, *args: fp.Float):
+        native = getattr(NativeEngine.instance(), op)(*args, ctx)
+        if native is not None:
+            mpfr = getattr(MPFREngine.instance(), op)(*args, ctx)
+            _assert_same(_normalize(native, ctx, args), _normalize(mpfr, ctx, args))
+
+    @given(_args(), _args(), _contexts())
+    def test_add(self, x: fp.Float, y: fp.Float, ctx: fp.Context):
+        self._check('add', ctx, x, y)
+
+    @given(_args(), _args(), _contexts())
+    def test_sub(self, x: fp.Float, y: fp.Float, ctx: fp.Context):
+        self._check('sub', ctx, x, y)
+
+    @given(_args(), _args(), _contexts())
+    def test_mul(self, x: fp.Float, y: fp.Float, ctx: fp.Context):
+        self._check('mul', ctx, x, y)
+
+    @given(_args(), _args(), _contexts())
+    def test_div(self, x: fp.Float, y: fp.Float, ctx: fp.Context):
+        self._check('div', ctx, x, y)
+
+    @given(_args(), _contexts())
+    def test_sqrt(self, x: fp.Float, ctx: fp.Context):
+        self._check('sqrt', ctx, x)
+
+    @given(_args(), _contexts())
+    def test_neg(self, x: fp.Float, ctx: fp.Context):
+        self._check('neg', ctx, x)
+
+    def test_midpoint(self):
+        # 1 + 2^-53 is a tie at double precision
+        x = fp.Float.from_float(1.0)
+        y = fp.Float.from_float(2.0 ** -53)
+        for rm in fp.RM:
+            self._check('add', fp.FP64.with_params(rm=rm), x, y)
+
+    def test_fallback(self):
+        engine = NativeEngine.instance()
+        x = fp.Float.from_float(1e-310)
+        y = fp.Float.from_float(3.0)
+        # subnormal inputs, wide contexts, and special values are declined
+        assert engine.div(x, y, fp.FP64) is None
+        assert engine.add(y, y, fp.FP128) is None
+        assert engine.add(fp.Float.inf(), y, fp.FP64) is None
+        assert engine.div(y, fp.Float.from_float(0.0), fp.FP64) is None
@@ -0,0 +1,74 @@
+"""
+Tests for the table engine.
+
+After re-rounding, every result of `TableEngine` must agree with the
+engines it was computed from bit-for-bit, including every flag.
+"""
+
+import pytest
+
+import fpy2 as fp
+
+from fpy2.number.engine import TableEngine, register_engine, unregister_engine
+
+_CTX = fp.MX_E2M1
+
+
+def _same(x: fp.Float, y: fp.Float) -> bool:
+    if x.isnan or y.isnan:
+        same = x.isnan and y.isnan
+    else:
+        same = x == y and x.s == y.s
+    return same and x.ctx == y.ctx and repr(x._real._flags) == repr(y._real._flags)
+
+def _encodings(ctx: fp.EncodableContext) -> list[fp.Float]:
+    return [ctx.decode(i) for i in range(1 << ctx.total_bits())]
+
+
+class TestTableEngine():
+
+    @pytest.mark.parametrize('op', [fp.ops.add, fp.ops.sub, fp.ops.mul, fp.ops.div, fp.ops.pow])
+    def test_binary(self, op, tmp_path):
+        xs = _encodings(_CTX)
+        expect = [op(x, y, _CTX) for x in xs for y in xs]
+        engine = TableEngine(path=tmp_path)
+        register_engine(engine, priority=3)
+        try:
+            actual = [op(x, y, _CTX) for x in xs for y in xs]
+        finally:
+            unregister_engine(engine)
+        assert all(_same(x, y) for x, y in zip(actual, expect))
+
+    @pytest.mark.parametrize('op', [fp.ops.neg, fp.ops.sqrt, fp.ops.exp, fp.ops.log])
+    def test_unary(self, op, tmp_path):
+        ctx = fp.MX_E4M3
+        xs = _encodings(ctx)
+        expect = [op(x, ctx) for x in xs]
+        engine = TableEngine(path=tmp_path)
+        register_engine(engine, priority=3)
+        try:
+            actual = [op(x, ctx) for x in xs]
+        finally:
+            unregister_engine(engine)
+        assert all(_same(x, y) for x, y in zip(actual, expect))
+
+    def test_disk_cache(self, tmp_path, monkeypatch):
+        x, y = _CTX.decode(3), _CTX.decode(5)
+        engine = TableEngine(path=tmp_path)
+        expect = engine.add(x, y, _CTX)
+        assert len(list(tmp_path.glob('*.npz'))) == 1
+
+        def fail(*args):
+            raise AssertionError('recomputed')
+
+        engine = TableEngine(path=tmp_path)
+        monkeypatch.setattr(engine, '_fallback', fail)
+        assert _same(engine.add(x, y, _CTX), expect)
+
+    def test_unsupported(self, tmp_path):
+        engine = TableEngine(path=tmp_path)
+        assert engine.resolve('add', fp.FP16, (fp.Float, fp.Float)) is None
+        assert engine.resolve('fma', _CTX, (fp.Float, fp.Float, fp.Float)) is None
+        assert engine.add(fp.FP16.round(1), fp.FP16.round(1), fp.FP16) is None
+        # arguments that are not values of the context
+        assert engine.add(fp.FP32.round(0.1), _CTX.decode(1), _CTX) is None
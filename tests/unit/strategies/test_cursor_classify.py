@@ -37,6 +37,14 @@ def rounded(x: fp.Real) -> fp.Real:
     return y
 
 
+@fp.fpy(ctx=fp.REAL)
+def exact(x: fp.Real) -> fp.Real:
+    a = x * SCALE
+    with fp.FP64:
+        y = 1.0 + 2.0
+    return y
+
+
 @fp.fpy(ctx=fp.REAL)
 def in_a_loop(xs: list[fp.Real]) -> fp.Real:
     acc = 0.0
@@ -133,7 +141,7 @@ def test_lift_context_shifts_statements_but_not_expressions():
 # Opaque: a cursor cannot cross
 
 
-@pytest.mark.parametrize('strategy', [simplify, elim_round, fuse, elim_iter])
+@pytest.mark.parametrize('strategy', [simplify, fuse, elim_iter])
 def test_an_opaque_pass_stops_a_cursor(strategy):
     """These rewrite at sites they do not report, so forwarding says so rather
     than guessing."""
@@ -143,3 +151,22 @@ def test_an_opaque_pass_stops_a_cursor(strategy):
     assert out.edits is None
     with pytest.raises(TransformReferenceError, match='does not report'):
         out.forward(site)
+
+
+def test_rounding_elimination_stops_a_cursor():
+    site = _site(exact)
+    out = elim_round(exact)
+
+    assert out.edits is None and out.ast is not exact.ast
+    with pytest.raises(TransformReferenceError, match='does not report'):
+        out.forward(site)
+
+
+def test_an_opaque_pass_that_rewrites_nothing_keeps_the_program():
+    """With nothing to eliminate, the program is passed through as is, so
+    every cursor still names the same statement."""
+    site = _site(rounded)
+    out = elim_round(rounded)
+
+    assert out.ast is rounded.ast
+    assert out.forward(site) == site
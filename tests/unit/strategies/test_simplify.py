@@ -140,6 +140,22 @@ def _branch_merge_expect(c: bool) -> fp.Real:
         return 5
 
 
+@fp.fpy
+def _copy_of_redefined(x: fp.Real) -> fp.Real:
+    with fp.FP64:
+        # ``y`` is not ``x`` after the redefinition, so it stays until DCE
+        # drops the dead store and ``x`` has one definition again.
+        y = x
+        x = x + 1.0
+        return y
+
+
+@fp.fpy
+def _copy_of_redefined_expect(x: fp.Real) -> fp.Real:
+    with fp.FP64:
+        return x
+
+
 _examples: list[tuple[fp.Function, fp.Function]] = [
     (_kitchen_sink, _kitchen_sink_expect),
     (_just_const_fold, _just_const_fold_expect),
@@ -147,6 +163,7 @@ _examples: list[tuple[fp.Function, fp.Function]] = [
     (_just_dead_branches, _just_dead_branches_expect),
     (_if_expr_fold, _if_expr_fold_expect),
     (_branch_merge, _branch_merge_expect),
+    (_copy_of_redefined, _copy_of_redefined_expect),
 ]
 
 
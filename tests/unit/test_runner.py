@@ -0,0 +1,218 @@
+"""
+Unit tests for `Runner`.
+
+A sweep checkpoints each result as it completes, so a run that fails
+partway can be resumed without rerunning finished configurations.
+Parallel sweeps send tasks to workers in chunks, most expensive first.
+Samples written as `.fpys` files store numbers in columns that are
+decoded once per process, and each read rebuilds a fresh copy.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+import fpy2 as fp
+
+
+class _Squares(fp.Runner[int, int, int]):
+    """Squares each configuration; fails on `fail_on`."""
+
+    def __init__(self, n: int, fail_on: int | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self.n = n
+        self.fail_on = fail_on
+        self.ran: list[int] = []
+        self.plotted: dict[int, int] | None = None
+
+    def configs(self):
+        return list(range(self.n))
+
+    def sample_key(self, config, seed):
+        return config % 2
+
+    def sample(self, key, output_dir, seed, no_cache):
+        return output_dir / f'sample_{key}'
+
+    def run_one(self, task):
+        if task.config == self.fail_on:
+            raise RuntimeError('failed')
+        self.ran.append(task.config)
+        return task.config * task.config
+
+    def plot(self, configs, results, output_dir, seed):
+        self.plotted = results
+
+
+class _Costly(_Squares):
+    """Estimates larger configurations as more expensive."""
+
+    def estimate_cost(self, config):
+        return config
+
+
+class _Overflows(_Squares):
+    """Also rounds each square under `MX_E5M2`, which overflows past 57344."""
+
+    def run_one(self, task):
+        fp.ops.mul(task.config * 100.0, task.config * 100.0, fp.MX_E5M2)
+        return super().run_one(task)
+
+
+class _Shared(_Squares):
+    """Reads a `.fpys` sample in each task; results identify its numbers."""
+
+    def sample(self, key, output_dir, seed, no_cache):
+        path = output_dir / f'sample_{key}.fpys'
+        self._write_cache(path, [fp.FP64.round(key), fp.FP64.round(key + 1)])
+        return path
+
+    def run_one(self, task):
+        xs = self._read_cache(task.sample)
+        return os.getpid(), task.sample.name, id(xs[0])
+
+
+def _checkpoint(output_dir: Path) -> Path:
+    return output_dir / 'results.pkl.gz.ckpt'
+
+
+class TestRunner:
+
+    def test_run(self, tmp_path):
+        runner = _Squares(6)
+        runner.run(tmp_path)
+        assert runner.plotted == { i: i * i for i in range(6) }
+        assert not _checkpoint(tmp_path).exists()
+
+    def test_parallel(self, tmp_path):
+        runner = _Squares(6)
+        runner.run(tmp_path, num_threads=2)
+        assert runner.plotted == { i: i * i for i in range(6) }
+
+    def test_resume(self, tmp_path):
+        with pytest.raises(RuntimeError):
+            _Squares(6, fail_on=4).run(tmp_path)
+        assert _checkpoint(tmp_path).exists()
+
+        runner = _Squares(6)
+        runner.run(tmp_path, resume=True)
+        assert runner.ran == [4, 5]
+        assert runner.plotted == { i: i * i for i in range(6) }
+        assert not _checkpoint(tmp_path).exists()
+
+    def test_resume_finished(self, tmp_path):
+        _Squares(6).run(tmp_path)
+        runner = _Squares(8)
+        runner.run(tmp_path, resume=True)
+        assert runner.ran == [6, 7]
+        assert runner.plotted == { i: i * i for i in range(8) }
+
+    def test_partial_record(self, tmp_path):
+        with pytest.raises(RuntimeError):
+            _Squares(6, fail_on=3).run(tmp_path)
+        with open(_checkpoint(tmp_path), 'ab') as f:
+            f.write(b'\x80\x04\x95')  # a truncated pickle
+
+        runner = _Squares(6)
+        runner.run(tmp_path, resume=True)
+        assert runner.ran == [3, 4, 5]
+        assert runner.plotted == { i: i * i for i in range(6) }
+
+    def test_no_resume(self, tmp_path):
+        with pytest.raises(RuntimeError):
+            _Squares(6, fail_on=4).run(tmp_path)
+        runner = _Squares(6)
+        runner.run(tmp_path)
+        assert runner.ran == list(range(6))
+
+    def test_chunked(self, tmp_path):
+        runner = _Squares(11, chunk_size=3, max_in_flight=1)
+        runner.run(tmp_path, num_threads=2)
+        assert runner.plotted == { i: i * i for i in range(11) }
+        assert not _checkpoint(tmp_path).exists()
+
+    def test_chunk_failure(self, tmp_path):
+        # configs 0, 1 share a chunk with the failing config 2
+        with pytest.raises(RuntimeError):
+            _Squares(6, fail_on=2, chunk_size=3, max_in_flight=1).run(tmp_path, num_threads=2)
+        runner = _Squares(6)
+        runner.run(tmp_path, resume=True)
+        assert sorted(runner.ran) == [2, 3, 4, 5]
+
+    def test_cost_order(self, tmp_path):
+        # one worker with one chunk in flight runs chunks in submission order
+        with pytest.raises(RuntimeError):
+            _Costly(6, fail_on=2, max_in_flight=1).run(tmp_path, num_threads=2)
+        runner = _Squares(6)
+        runner.run(tmp_path, resume=True)
+        assert runner.ran == [0, 1, 2]
+
+    @pytest.mark.parametrize('num_threads', [1, 2])
+    def test_rounding_counters(self, tmp_path, num_threads):
+        # worker counts are merged into the active counters
+        with fp.RoundingCounters() as counters:
+            _Overflows(6, chunk_size=2).run(tmp_path, num_threads=num_threads)
+        mul = counters.by_op()['mul']
+        assert mul.roundings == 6
+        assert mul.overflow == 3
+
+    def test_invalid_options(self):
+        with pytest.raises(ValueError):
+            _Squares(1, chunk_size=0)
+        with pytest.raises(ValueError):
+            _Squares(1, max_in_flight=0)
+
+
+class TestSampleCache:
+
+    def test_roundtrip(self, tmp_path):
+        path = tmp_path / 'sample.fpys'
+        data = {
+            'xs': [fp.FP32.round(0.1), fp.FP32.round(-3), fp.Float(isnan=True, ctx=fp.FP32)],
+            'ys': (fp.Float(isinf=True, s=True), fp.RealFloat(c=3 ** 50, exp=-7)),
+            'n': 3,
+        }
+        runner = _Squares(0)
+        runner._write_cache(path, data)
+        read = runner._read_cache(path)
+        assert read['n'] == 3
+        assert read['xs'][:2] == data['xs'][:2]
+        assert read['xs'][2].isnan and read['xs'][2].ctx == fp.FP32
+        assert read['xs'][0].inexact and read['xs'][0].ctx == fp.FP32
+        assert read['ys'][0].isinf and read['ys'][0].s
+        assert read['ys'][1] == data['ys'][1]
+
+    def test_fresh_copy(self, tmp_path):
+        path = tmp_path / 'sample.fpys'
+        runner = _Squares(0)
+        runner._write_cache(path, {'xs': [fp.FP64.round(1)]})
+        first = runner._read_cache(path)
+        # callers own what they read
+        first['xs'].append(fp.FP64.round(2))
+        first['ys'] = []
+        second = runner._read_cache(path)
+        assert second == {'xs': [fp.FP64.round(1)]}
+        # but share the decoded numbers
+        assert second['xs'][0] is first['xs'][0]
+        # rewriting the file is seen by the next read
+        runner._write_cache(path, [fp.FP64.round(2), fp.FP64.round(3)])
+        assert len(runner._read_cache(path)) == 2
+
+    @pytest.mark.parametrize('num_threads', [1, 2])
+    def test_decoded_once(self, tmp_path, num_threads):
+        # every task of a worker sees the same decoded numbers
+        runner = _Shared(12, chunk_size=1)
+        runner.run(tmp_path, num_threads=num_threads)
+        assert runner.plotted is not None and len(runner.plotted) == 12
+        decoded: dict[tuple[int, str], set[int]] = {}
+        for pid, name, ident in runner.plotted.values():
+            decoded.setdefault((pid, name), set()).add(ident)
+        assert all(len(ids) == 1 for ids in decoded.values())
+        assert len(decoded) < 12
+
+    def test_corrupt(self, tmp_path):
+        path = tmp_path / 'sample.fpys'
+        path.write_bytes(b'garbage')
+        assert _Squares(0)._read_cache(path) is None
+        assert _Squares(0)._read_cache(tmp_path / 'missing.fpys') is None
@@ -0,0 +1,34 @@
+"""
+Unit tests for `LRUCache`: eviction order and counters.
+"""
+
+from fpy2.utils import CacheStats, LRUCache
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache.get('a') == 1  # `b` is now the oldest
+    cache['c'] = 3
+    assert list(cache) == ['a', 'c']
+    assert cache.stats() == CacheStats(hits=1, misses=0, evictions=1, size=2, maxsize=2)
+
+
+def test_counts_misses():
+    cache = LRUCache(2)
+    assert cache.get('a') is None
+    cache['a'] = 1
+    assert cache.get('a') == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.reset_stats()
+    assert (cache.hits, cache.misses, cache.evictions) == (0, 0, 0)
+
+
+def test_unbounded():
+    cache = LRUCache(None)
+    for i in range(100):
+        cache[i] = i
+    assert len(cache) == 100 and cache.evictions == 0
+    cache.clear()
+    assert len(cache) == 0